@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Performance Benchmark: Collaborative Editing with Large Scenes
+
+Measures how many local add and move edits per second the collaboration
+manager can broadcast in a scene of a given size, and how long assembling
+the full session state takes. Messages are counted instead of sent, so only
+the manager's own work (serializing items, maintaining the session state)
+is measured.
+
+Usage:
+    python benchmark_collaboration.py
+
+    Or with specific parameters:
+    python benchmark_collaboration.py --items 1000 --edits 500
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6 import QtWidgets
+
+from optiverse.core.models import SourceParams
+from optiverse.objects import SourceItem
+from optiverse.services.collaboration_manager import CollaborationManager
+
+
+class _BenchmarkWindow:
+    """The parts of MainWindow used by CollaborationManager."""
+
+    def __init__(self):
+        self.scene = QtWidgets.QGraphicsScene()
+        self.autotrace = False
+
+
+def create_session(num_items: int) -> tuple[CollaborationManager, list[SourceItem], list]:
+    """
+    Create a connected host session with a scene of num_items sources.
+
+    Returns:
+        The manager, the scene items and the list receiving sent commands
+    """
+    window = _BenchmarkWindow()
+    items = []
+    for i in range(num_items):
+        item = SourceItem(SourceParams(x_mm=float(i % 100) * 20.0, y_mm=float(i // 100) * 20.0))
+        window.scene.addItem(item)
+        items.append(item)
+
+    manager = CollaborationManager(window)
+    manager.create_session("benchmark", "host")
+    manager.enabled = True
+
+    sent = []
+    manager.collaboration_service.send_command = lambda *args, **kwargs: sent.append(args)
+    return manager, items, sent
+
+
+def benchmark_adds(manager: CollaborationManager, window_scene, edits: int) -> float:
+    """Add and broadcast new sources; returns edits per second."""
+    start = time.perf_counter()
+    for i in range(edits):
+        item = SourceItem(SourceParams(x_mm=float(i), y_mm=-100.0))
+        window_scene.addItem(item)
+        manager.broadcast_add_item(item)
+    return edits / (time.perf_counter() - start)
+
+
+def benchmark_moves(manager: CollaborationManager, items: list, edits: int) -> float:
+    """Move and broadcast existing sources; returns edits per second."""
+    start = time.perf_counter()
+    for i in range(edits):
+        item = items[i % len(items)]
+        item.setPos(item.x() + 1.0, item.y())
+        manager.broadcast_move_item(item)
+    return edits / (time.perf_counter() - start)
+
+
+def benchmark_state(manager: CollaborationManager) -> tuple[float, float]:
+    """Time get_session_state() after an edit and without changes (ms)."""
+    manager.rebuild_uuid_map()
+    start = time.perf_counter()
+    manager.get_session_state()
+    cold = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    manager.get_session_state()
+    warm = (time.perf_counter() - start) * 1000
+    return cold, warm
+
+
+def run_benchmark(num_items: int, edits: int) -> dict:
+    """
+    Run the add, move and session state benchmarks for one scene size.
+
+    Args:
+        num_items: Number of items in the scene
+        edits: Number of adds and of moves to broadcast
+    """
+    print(f"\n{'=' * 80}")
+    print(f"BENCHMARK: {num_items} items, {edits} edits")
+    print(f"{'=' * 80}")
+
+    manager, items, sent = create_session(num_items)
+    adds_per_s = benchmark_adds(manager, manager.main_window.scene, edits)
+    moves_per_s = benchmark_moves(manager, items, edits)
+    cold_ms, warm_ms = benchmark_state(manager)
+
+    print(f"  Adds:                 {adds_per_s:10.0f} /s")
+    print(f"  Moves:                {moves_per_s:10.0f} /s")
+    print(f"  Session state (cold): {cold_ms:10.2f} ms")
+    print(f"  Session state (warm): {warm_ms:10.2f} ms")
+    print(f"  Commands sent:        {len(sent):10d}")
+
+    return {
+        "num_items": num_items,
+        "adds_per_s": adds_per_s,
+        "moves_per_s": moves_per_s,
+        "state_cold_ms": cold_ms,
+        "state_warm_ms": warm_ms,
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark collaborative editing throughput")
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--edits", type=int, default=500)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)  # noqa: F841
+
+    results = [run_benchmark(n, args.edits) for n in args.items]
+
+    print(f"\n{'=' * 80}")
+    print("SCALING SUMMARY:")
+    print(f"{'=' * 80}")
+    print(f"{'Items':<10} {'Adds/s':>12} {'Moves/s':>12} {'State cold (ms)':>18}")
+    for r in results:
+        print(
+            f"{r['num_items']:<10} {r['adds_per_s']:>12.0f} {r['moves_per_s']:>12.0f} "
+            f"{r['state_cold_ms']:>18.2f}"
+        )
+    print(f"{'=' * 80}\n")
+
+
+if __name__ == "__main__":
+    main()
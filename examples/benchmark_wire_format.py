@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+Performance Benchmark: Collaboration Wire Formats
+
+Measures bytes on the wire and encode/decode time of typical collaboration
+messages (a full session state of standard library components and sources,
+a move and a field-level update) in each wire format: JSON text frames (as
+sent to older clients and servers), binary JSON frames and, if the msgpack
+package is installed, MessagePack frames, each with and without zlib
+compression of large payloads.
+
+Usage:
+    python benchmark_wire_format.py
+
+    Or with specific parameters:
+    python benchmark_wire_format.py --items 100 1000 --repeat 50
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6 import QtWidgets
+
+from optiverse.core.models import SourceParams
+from optiverse.objects import ComponentFactory, SourceItem
+from optiverse.objects.component_registry import ComponentRegistry
+from optiverse.services import wire_format
+from optiverse.services.collaboration_manager import CollaborationManager
+
+
+class _BenchmarkWindow:
+    """The parts of MainWindow used by CollaborationManager."""
+
+    def __init__(self):
+        self.scene = QtWidgets.QGraphicsScene()
+        self.autotrace = False
+
+
+def create_messages(num_items: int) -> dict[str, dict]:
+    """
+    Build typical messages for a scene of num_items items.
+
+    Every tenth item is a source, the others cycle through the standard
+    components (with their interfaces).
+    """
+    window = _BenchmarkWindow()
+    records = ComponentRegistry.get_standard_components()
+    for i in range(num_items):
+        x, y = float(i % 50) * 30.0, float(i // 50) * 30.0
+        if i % 10 == 0:
+            item = SourceItem(SourceParams(x_mm=x, y_mm=y))
+        else:
+            item = ComponentFactory.create_item_from_dict(records[i % len(records)], x, y)
+        window.scene.addItem(item)
+
+    manager = CollaborationManager(window)
+    manager.create_session("benchmark", "host")
+    state = manager.get_session_state()
+    item = state["items"][-1]
+    return {
+        "full state": {"type": "sync:full_state", "state": state, "seq": 1, "ops": []},
+        "move": {
+            "type": "command",
+            "command": {
+                "action": "move_item",
+                "item_type": item["item_type"],
+                "item_id": item["uuid"],
+                "data": {"x_mm": 12.5, "y_mm": -3.25, "angle_deg": 45.0},
+            },
+            "timestamp": "2025-01-01T12:00:00.000000",
+            "user_id": "host",
+            "seq": 2,
+        },
+        "update": {
+            "type": "command",
+            "command": {
+                "action": "update_item",
+                "item_type": item["item_type"],
+                "item_id": item["uuid"],
+                "data": {"name": "Renamed", "item_uuid": item["uuid"]},
+                "base_version": 0,
+                "version": 1,
+            },
+            "timestamp": "2025-01-01T12:00:00.000000",
+            "user_id": "host",
+            "seq": 3,
+        },
+    }
+
+
+def wire_formats() -> list[tuple[str, str | None, str | None]]:
+    """(label, encoding, compression) of the formats to compare."""
+    formats = [("json text", None, None)]
+    for encoding in reversed(wire_format.supported_encodings()):
+        formats.append((f"{encoding}", encoding, None))
+        formats.append((f"{encoding}+zlib", encoding, "zlib"))
+    return formats
+
+
+def measure(message: dict, encoding, compression, repeat: int) -> tuple[int, float, float]:
+    """
+    Encode and decode a message repeat times.
+
+    Returns:
+        Frame size (bytes), encode and decode time per message (µs)
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        frame = wire_format.encode_message(message, encoding, compression)
+    encode_us = (time.perf_counter() - start) / repeat * 1e6
+    start = time.perf_counter()
+    for _ in range(repeat):
+        wire_format.decode_message(frame)
+    decode_us = (time.perf_counter() - start) / repeat * 1e6
+    size = len(frame) if isinstance(frame, bytes) else len(frame.encode("utf-8"))
+    return size, encode_us, decode_us
+
+
+def run_benchmark(num_items: int, repeat: int) -> None:
+    """Compare the wire formats for the messages of one scene size."""
+    print(f"\n{'=' * 80}")
+    print(f"BENCHMARK: {num_items} items, {repeat} repeats")
+    print(f"{'=' * 80}")
+
+    messages = create_messages(num_items)
+    print(
+        f"{'Message':<12} {'Format':<14} {'Bytes':>10} {'Ratio':>7} "
+        f"{'Encode µs':>11} {'Decode µs':>11}"
+    )
+    for name, message in messages.items():
+        # Fewer repeats for full states, which take milliseconds
+        count = max(1, repeat // 10) if name == "full state" else repeat * 20
+        baseline = len(json.dumps(message).encode("utf-8"))
+        for label, encoding, compression in wire_formats():
+            size, encode_us, decode_us = measure(message, encoding, compression, count)
+            print(
+                f"{name:<12} {label:<14} {size:>10} {size / baseline:>7.2f} "
+                f"{encode_us:>11.1f} {decode_us:>11.1f}"
+            )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark collaboration wire formats")
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)  # noqa: F841
+
+    if "msgpack" not in wire_format.supported_encodings():
+        print("msgpack is not installed: comparing JSON frames only")
+    for n in args.items:
+        run_benchmark(n, args.repeat)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from __future__ import annotations
 import logging
 import os
 import sys
+from contextlib import ExitStack
 from pathlib import Path
 
 from PyQt6 import QtCore, QtGui, QtWidgets
@@ -74,11 +75,24 @@ def main() -> int:
     Application entry point.
 
     Bootstraps the Qt application, configures platform-specific settings,
-    and launches the main window.
+    and launches the main window. With --profile-startup, the time spent in
+    each startup phase and module import is reported on stderr.
 
     Returns:
         Exit code (0 for success, 1 for error)
     """
+    from .startup_profile import (
+        PROFILE_OPTION,
+        enable_startup_profiling,
+        finish_startup_profiling,
+        startup_phase,
+    )
+
+    profile_startup = PROFILE_OPTION in sys.argv[1:]
+    if profile_startup:
+        sys.argv.remove(PROFILE_OPTION)
+        enable_startup_profiling()
+
     # Install stderr filter to suppress harmless macOS warnings (TSM errors)
     from ..platform.macos import install_macos_stderr_filter
 
@@ -91,9 +105,10 @@ def main() -> int:
     )
 
     # Install global error handler FIRST (before any Qt code)
-    from ..services.error_handler import get_error_handler, install_qt_message_handler
+    with startup_phase("Error handler"):
+        from ..services.error_handler import get_error_handler, install_qt_message_handler
 
-    error_handler = get_error_handler()
+        error_handler = get_error_handler()
     _logger.info("Global error handler installed")
 
     # Increase Qt's image allocation limit for large SVG cache files
@@ -107,7 +122,8 @@ def main() -> int:
     original_argv0 = _configure_macos_app_name()
 
     # Create QApplication (Qt6 enables high DPI by default)
-    app = QtWidgets.QApplication(sys.argv)
+    with startup_phase("QApplication"):
+        app = QtWidgets.QApplication(sys.argv)
 
     # Force period as decimal separator program-wide (regardless of system locale)
     QtCore.QLocale.setDefault(QtCore.QLocale.c())
@@ -134,21 +150,36 @@ def main() -> int:
         app.setWindowIcon(QtGui.QIcon(str(icon_path)))
 
     # Apply initial theme based on system preference
-    from ..ui.theme_manager import apply_theme, detect_system_dark_mode
+    with startup_phase("Theme"):
+        from ..ui.theme_manager import apply_theme, detect_system_dark_mode
 
-    system_dark_mode = detect_system_dark_mode()
-    apply_theme(system_dark_mode)
+        system_dark_mode = detect_system_dark_mode()
+        apply_theme(system_dark_mode)
 
     # Create and show main window
-    from ..ui.views.main_window import MainWindow
+    with startup_phase("Import main window"):
+        from ..ui.views.main_window import MainWindow
 
     try:
-        window = MainWindow()
-        window.show()
+        with startup_phase("Create main window"):
+            window = MainWindow()
+        with startup_phase("Show main window"):
+            window.show()
     except Exception as e:
         error_handler.handle_error(e, "during application startup")
         return 1
 
+    if profile_startup:
+        # Report once the first event loop turn (initial paint) is done
+        first_turn = ExitStack()
+        first_turn.enter_context(startup_phase("First event loop turn"))
+
+        def report() -> None:
+            first_turn.close()
+            finish_startup_profiling()
+
+        QtCore.QTimer.singleShot(0, report)
+
     return app.exec()
 
 
@@ -0,0 +1,238 @@
+"""
+Startup profiling (``optiverse --profile-startup``).
+
+Measures how long each startup phase takes (QApplication, theme, main
+window import and construction, first event loop turn) and which modules
+are imported during startup, with their own and cumulative import time.
+The report is written to stderr once the main window has been shown.
+
+Cold-start target: the main window should be shown within 1.5 s of
+main() on a typical laptop with the OS file cache warm. Modules only
+needed for specific features (numba and the raytracing kernels, the
+collaboration WebSocket, the Zemax importer, the component editor, the log
+window, the settings dialog) are imported on first use and should not show
+up in the report.
+"""
+
+from __future__ import annotations
+
+import importlib.abc
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TextIO
+
+# Command line option enabling the profiler
+PROFILE_OPTION = "--profile-startup"
+
+# Main window shown within this time after main() (see module docstring)
+COLD_START_TARGET_S = 1.5
+
+# Number of modules listed in the report
+REPORT_TOP_MODULES = 25
+
+
+@dataclass
+class ModuleTiming:
+    """Import time of one module."""
+
+    name: str
+    # Including the modules it imported
+    cumulative_s: float = 0.0
+    # Excluding the modules it imported
+    self_s: float = 0.0
+    # Phase the module was imported in
+    phase: str = ""
+
+
+@dataclass
+class PhaseTiming:
+    """Duration of one startup phase."""
+
+    name: str
+    duration_s: float
+    modules: int = 0
+
+
+@dataclass
+class StartupProfile:
+    """Collected startup timings."""
+
+    phases: list[PhaseTiming] = field(default_factory=list)
+    modules: dict[str, ModuleTiming] = field(default_factory=dict)
+    total_s: float = 0.0
+
+    def slowest_modules(self, count: int = REPORT_TOP_MODULES) -> list[ModuleTiming]:
+        """Modules with the longest own import time."""
+        return sorted(self.modules.values(), key=lambda m: m.self_s, reverse=True)[:count]
+
+    def format_report(self) -> str:
+        """Human-readable report."""
+        status = "OK" if self.total_s <= COLD_START_TARGET_S else "over target"
+        lines = [
+            f"Startup: {self.total_s * 1000:.0f} ms "
+            f"(target {COLD_START_TARGET_S * 1000:.0f} ms, {status})",
+            "",
+            f"{'Phase':<28}{'Time (ms)':>10}{'Modules':>9}",
+        ]
+        for phase in self.phases:
+            lines.append(f"{phase.name:<28}{phase.duration_s * 1000:>10.1f}{phase.modules:>9}")
+        lines += ["", f"{'Module':<52}{'Self (ms)':>10}{'Cum. (ms)':>10}  Phase"]
+        for module in self.slowest_modules():
+            lines.append(
+                f"{module.name:<52}{module.self_s * 1000:>10.1f}"
+                f"{module.cumulative_s * 1000:>10.1f}  {module.phase}"
+            )
+        return "\n".join(lines)
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Loader wrapper timing module creation and execution."""
+
+    def __init__(self, loader, profiler: StartupProfiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        with self._profiler._timed(spec.name):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler._timed(module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        # Resource readers, get_source() etc. of the wrapped loader
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Meta path finder wrapping the loaders found by the other finders."""
+
+    def __init__(self, profiler: StartupProfiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Records phase durations and module import times.
+
+    Usage:
+        profiler = StartupProfiler()
+        profiler.start()
+        with profiler.phase("QApplication"):
+            ...
+        profiler.stop()
+        print(profiler.profile.format_report())
+    """
+
+    def __init__(self) -> None:
+        self.profile = StartupProfile()
+        self._finder = _TimingFinder(self)
+        self._start: float | None = None
+        self._phase = ""
+        # Import stack: [start time, time spent in nested imports] per module
+        self._stack: list[list[float]] = []
+
+    def start(self) -> None:
+        """Start timing and install the import hook."""
+        self._start = time.perf_counter()
+        if self._finder not in sys.meta_path:
+            sys.meta_path.insert(0, self._finder)
+
+    def stop(self) -> StartupProfile:
+        """Remove the import hook and record the total startup time."""
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        if self._start is not None:
+            self.profile.total_s = time.perf_counter() - self._start
+        return self.profile
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a startup phase."""
+        previous, self._phase = self._phase, name
+        imported_before = len(self.profile.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.profile.phases.append(
+                PhaseTiming(
+                    name,
+                    time.perf_counter() - start,
+                    len(self.profile.modules) - imported_before,
+                )
+            )
+            self._phase = previous
+
+    @contextmanager
+    def _timed(self, module_name: str) -> Iterator[None]:
+        frame = [time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[0]
+            timing = self.profile.modules.get(module_name)
+            if timing is None:
+                timing = self.profile.modules[module_name] = ModuleTiming(
+                    module_name, phase=self._phase
+                )
+            # create_module() and exec_module() both count
+            timing.cumulative_s += elapsed
+            timing.self_s += elapsed - frame[1]
+            if self._stack:
+                self._stack[-1][1] += elapsed
+
+
+_profiler: StartupProfiler | None = None
+
+
+def enable_startup_profiling() -> StartupProfiler:
+    """Start the application's startup profiler."""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+        _profiler.start()
+    return _profiler
+
+
+def get_startup_profiler() -> StartupProfiler | None:
+    """The running startup profiler, or None if profiling is disabled."""
+    return _profiler
+
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    """Time a startup phase if profiling is enabled (no-op otherwise)."""
+    if _profiler is None:
+        yield
+        return
+    with _profiler.phase(name):
+        yield
+
+
+def finish_startup_profiling(stream: TextIO | None = None) -> StartupProfile | None:
+    """Stop the profiler and write its report (to stderr by default)."""
+    global _profiler
+    if _profiler is None:
+        return None
+    profile = _profiler.stop()
+    _profiler = None
+    print(profile.format_report(), file=stream or sys.stderr, flush=True)
+    return profile
@@ -32,7 +32,8 @@ class InterfaceDefinition:
     y2_mm: float = 0.0
 
     # Element type
-    # Options: lens, mirror, beam_splitter, dichroic, polarizing_interface, refractive_interface
+    # Options: lens, mirror, beam_splitter, dichroic, polarizing_interface, refractive_interface,
+    # beam_block, detector
     element_type: str = "refractive_interface"
 
     # Common properties
@@ -75,6 +76,12 @@ class InterfaceDefinition:
     # Faraday rotator properties (future)
     rotation_angle_deg: float = 45.0  # Rotation angle in degrees (non-reciprocal)
 
+    # Detector properties (histogram binning)
+    detector_bins: int = 100  # Number of bins per histogram
+    detector_angle_range_deg: float = 30.0  # Angle histogram spans ± this around the normal
+    detector_wavelength_min_nm: float = 380.0
+    detector_wavelength_max_nm: float = 780.0
+
     # Curved surface properties (for Zemax import)
     is_curved: bool = False  # True if this is a curved surface
     radius_of_curvature_mm: float = 0.0  # Radius of curvature (0 or inf = flat)
@@ -171,6 +178,8 @@ class InterfaceDefinition:
             return (255, 0, 255)  # Magenta
         elif self.element_type == "polarizing_interface":
             return (255, 215, 0)  # Gold
+        elif self.element_type == "detector":
+            return (220, 40, 40)  # Red
         elif self.element_type == "refractive_interface":
             # Blue for refractive, gray if same index
             if abs(self.n1 - self.n2) > 0.01:
@@ -217,6 +226,8 @@ class InterfaceDefinition:
                 return "Polarizer"
         elif self.element_type == "refractive_interface":
             return f"n={self.n1:.3f}→{self.n2:.3f}"
+        elif self.element_type == "detector":
+            return f"Detector ({int(self.detector_bins)} bins)"
         else:
             return "Interface"
 
@@ -181,6 +181,42 @@ INTERFACE_TYPES: dict[str, dict[str, Any]] = {
         "property_ranges": {},
         "property_defaults": {},
     },
+    "detector": {
+        "name": "Detector",
+        "description": "Absorbs incident rays and histograms position, angle and wavelength",
+        "color": (220, 40, 40),
+        "emoji": "🟥",
+        "properties": [
+            "detector_bins",
+            "detector_angle_range_deg",
+            "detector_wavelength_min_nm",
+            "detector_wavelength_max_nm",
+        ],
+        "property_labels": {
+            "detector_bins": "Histogram Bins",
+            "detector_angle_range_deg": "Angle Range (±)",
+            "detector_wavelength_min_nm": "Min Wavelength",
+            "detector_wavelength_max_nm": "Max Wavelength",
+        },
+        "property_units": {
+            "detector_bins": "",
+            "detector_angle_range_deg": "°",
+            "detector_wavelength_min_nm": "nm",
+            "detector_wavelength_max_nm": "nm",
+        },
+        "property_ranges": {
+            "detector_bins": (1.0, 10000.0),
+            "detector_angle_range_deg": (0.1, 90.0),
+            "detector_wavelength_min_nm": (100.0, 5000.0),
+            "detector_wavelength_max_nm": (100.0, 5000.0),
+        },
+        "property_defaults": {
+            "detector_bins": 100,
+            "detector_angle_range_deg": 30.0,
+            "detector_wavelength_min_nm": 380.0,
+            "detector_wavelength_max_nm": 780.0,
+        },
+    },
 }
 
 
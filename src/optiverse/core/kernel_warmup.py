@@ -0,0 +1,52 @@
+"""
+Background warm-up of the Numba raytracing kernels.
+
+raytracing_math is imported on the first trace (numba takes ~0.4 s to
+import) and its kernels are JIT-compiled, or loaded from numba's cache, on
+their first call. Both would make the first trace after launch hitch, so
+start_kernel_warmup() does them on a background thread once the main
+window is up. Kernels built with tools/compile_kernels.py need no
+compilation at all.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+_thread: threading.Thread | None = None
+
+
+def _warm_up() -> None:
+    start = time.perf_counter()
+    try:
+        from ..raytracing import engine  # noqa: F401
+        from . import raytracing_math
+
+        timings = raytracing_math.warm_up_kernels()
+    except Exception as e:  # Not fatal: the first trace compiles instead
+        _logger.warning("Raytracing kernel warm-up failed: %s", e)
+        return
+    if not timings:
+        _logger.info("Raytracing kernels: nothing to warm up")
+        return
+    slowest = max(timings, key=lambda name: timings[name])
+    _logger.info(
+        "Raytracing kernels ready in %.0f ms (%s, slowest: %s %.0f ms)",
+        (time.perf_counter() - start) * 1000,
+        "AOT" if raytracing_math.AOT_KERNELS_LOADED else "JIT",
+        slowest,
+        timings[slowest] * 1000,
+    )
+
+
+def start_kernel_warmup() -> threading.Thread:
+    """Warm up the raytracing kernels on a background thread (once per process)."""
+    global _thread
+    if _thread is None:
+        _thread = threading.Thread(target=_warm_up, name="kernel-warmup", daemon=True)
+        _thread.start()
+    return _thread
@@ -8,6 +8,7 @@ import numpy as np
 # Import path utilities for relative/absolute path conversion
 from ..platform.paths import (
     get_all_library_roots,
+    make_image_ref,
     make_library_relative,
     to_absolute_path,
     to_relative_path,
@@ -157,7 +158,11 @@ def serialize_component(rec: ComponentRecord, settings_service=None) -> dict[str
     """
     # Determine best path format for image
     image_path_serialized: str = ""
-    if rec.image_path:
+    image_ref = make_image_ref(rec.image_path)
+    if image_ref:
+        # Images in a library's image store are referenced by content hash
+        image_path_serialized = image_ref
+    elif rec.image_path:
         # Try library-relative first (makes assemblies portable)
         library_roots = get_all_library_roots(settings_service)
         library_relative = make_library_relative(rec.image_path, library_roots)
@@ -282,6 +287,14 @@ class SourceParams:
     custom_jones_ey_real: float = 0.0
     custom_jones_ey_imag: float = 0.0
     use_custom_jones: bool = False
+    # Ray sampling: "fan" (evenly spaced) or "monte_carlo" (random draws)
+    sampling_mode: str = "fan"
+    # Monte Carlo angular distribution: "gaussian", "lambertian" or "uniform"
+    angular_distribution: str = "gaussian"
+    # Monte Carlo spectral width (FWHM) in nm; 0 means monochromatic
+    bandwidth_nm: float = 0.0
+    # Seed for Monte Carlo sampling (same seed -> same rays)
+    random_seed: int = 0
 
     def get_polarization(self) -> Polarization:
         """Get Polarization object based on current parameters."""
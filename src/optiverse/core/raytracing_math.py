@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import functools
+import hashlib
 import logging
 import math
+import re
+import time
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import numpy as np
 
+# Angle conversions live in utils so the UI can use them without importing
+# numba; re-exported here for existing callers
+from .utils import qt_angle_to_user, user_angle_to_qt  # noqa: F401
+
 # Try to import numba, but make it optional
 try:
     from numba import jit
@@ -46,39 +55,6 @@ def normalize(v: np.ndarray) -> np.ndarray:
         return normalized_vec
 
 
-def user_angle_to_qt(user_deg: float) -> float:
-    """
-    Convert user angle (CW from right) to Qt angle (CCW from right).
-
-    User convention (clockwise):
-    - 0° = right (→)
-    - 90° = down (↓)
-    - 180° = left (←)
-    - 270° = up (↑)
-
-    Qt convention (counter-clockwise):
-    - 0° = right (→)
-    - 90° = up (↑)
-    - 180° = left (←)
-    - 270° = down (↓)
-    """
-    return -user_deg
-
-
-def qt_angle_to_user(qt_deg: float) -> float:
-    """
-    Convert Qt angle (CCW from right) to user angle (CW from right).
-
-    Returns angle normalized to 0-360 range.
-    """
-    angle = -qt_deg
-    # Normalize to 0-360
-    angle = angle % 360
-    if angle < 0:
-        angle += 360
-    return angle
-
-
 @jit(nopython=True, cache=True)
 def reflect_vec(v: np.ndarray, n_hat: np.ndarray) -> np.ndarray:
     """
@@ -605,6 +581,82 @@ def ray_hit_element(
     return (t, X, t_hat, n_hat, C, L)
 
 
+@jit(nopython=True, cache=True)
+def ray_hit_segment(
+    P: np.ndarray,
+    V: np.ndarray,
+    C: np.ndarray,
+    t_hat: np.ndarray,
+    n_hat: np.ndarray,
+    half_L: float,
+    tol: float = 1e-9,
+):
+    """
+    Intersect ray (P + t V, t>0) with a segment given by precomputed data.
+
+    Same result as ray_hit_element, but consumes the center, unit tangent,
+    unit normal and half length of a SegmentRecord instead of recomputing
+    them from the endpoints. JIT-compiled for maximum performance.
+
+    Returns (t, X) or None if no hit.
+    """
+    if 2.0 * half_L < tol:
+        return None
+
+    denom = V[0] * n_hat[0] + V[1] * n_hat[1]
+    if abs(denom) < tol:
+        return None
+
+    t = ((C[0] - P[0]) * n_hat[0] + (C[1] - P[1]) * n_hat[1]) / denom
+    if t <= tol:
+        return None
+
+    X = P + t * V
+    s = (X[0] - C[0]) * t_hat[0] + (X[1] - C[1]) * t_hat[1]
+    if abs(s) > half_L + 1e-7:
+        return None
+
+    return (t, X)
+
+
+@jit(nopython=True, cache=True)
+def ray_hit_segments(
+    P: np.ndarray,
+    V: np.ndarray,
+    centers: np.ndarray,
+    tangents: np.ndarray,
+    normals: np.ndarray,
+    half_lengths: np.ndarray,
+    tol: float = 1e-9,
+) -> np.ndarray:
+    """
+    Intersect one ray with many flat segments in a single vectorized call.
+
+    Args:
+        P: Ray start point [x, y]
+        V: Ray direction [x, y]
+        centers, tangents, normals: (N, 2) arrays from a SegmentTable
+        half_lengths: (N,) array of segment half lengths
+        tol: Tolerance, same meaning as in ray_hit_element
+
+    Returns:
+        (N,) array of ray parameters t, with np.inf where a segment is missed
+    """
+    denom = V[0] * normals[:, 0] + V[1] * normals[:, 1]
+    parallel = np.abs(denom) < tol
+    safe_denom = np.where(parallel, 1.0, denom)
+
+    dx = centers[:, 0] - P[0]
+    dy = centers[:, 1] - P[1]
+    t = (dx * normals[:, 0] + dy * normals[:, 1]) / safe_denom
+
+    # Offset of the hit point from the segment center, along the tangent
+    s = (t * V[0] - dx) * tangents[:, 0] + (t * V[1] - dy) * tangents[:, 1]
+
+    hit = ~parallel & (t > tol) & (np.abs(s) <= half_lengths + 1e-7) & (2.0 * half_lengths >= tol)
+    return np.where(hit, t, np.inf)
+
+
 def ray_hit_curved_element(
     P: np.ndarray,
     V: np.ndarray,
@@ -780,3 +832,118 @@ def calculate_path_length(points: list[np.ndarray]) -> float:
         total_length += math.sqrt(dx * dx + dy * dy)
 
     return total_length
+
+
+# ----- Kernel warm-up and ahead-of-time compilation -----
+
+# Kernels compiled ahead of time by tools/compile_kernels.py, with their
+# numba signatures. ray_hit_element and ray_hit_segment return None or a
+# tuple, which numba.pycc cannot export; they are only JIT-compiled.
+AOT_KERNELS = {
+    "deg2rad": "f8(f8)",
+    "normalize": "f8[:](f8[:])",
+    "reflect_vec": "f8[:](f8[:], f8[:])",
+    "ray_hit_segments": "f8[:](f8[:], f8[:], f8[:, :], f8[:, :], f8[:, :], f8[:], f8)",
+}
+
+# Name of the extension module built by tools/compile_kernels.py
+AOT_MODULE = "_raytracing_kernels"
+
+
+def kernel_source_hash() -> int:
+    """
+    Hash of this module's source, stored in the AOT module when it is built.
+
+    An AOT module built from a different source is ignored.
+    """
+    digest = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    return int(digest[:15], 16)
+
+
+def warm_up_kernels() -> dict[str, float]:
+    """
+    Compile (or load from numba's cache) every JIT kernel.
+
+    Calls each kernel with the argument types the raytracing engine uses,
+    so the first trace does not pay for compilation. Safe to call from a
+    background thread.
+
+    Returns:
+        Seconds spent per kernel
+    """
+    P = np.array([0.0, 0.0])
+    V = np.array([1.0, 0.0])
+    A = np.array([5.0, -1.0])
+    B = np.array([5.0, 1.0])
+    t_hat = np.array([0.0, 1.0])
+    n_hat = np.array([-1.0, 0.0])
+    C = 0.5 * (A + B)
+    calls = {
+        "deg2rad": lambda: deg2rad(45.0),
+        "normalize": lambda: normalize(V),
+        "reflect_vec": lambda: reflect_vec(V, n_hat),
+        "ray_hit_element": lambda: ray_hit_element(P, V, A, B),
+        "ray_hit_segment": lambda: ray_hit_segment(P, V, C, t_hat, n_hat, 1.0),
+        "ray_hit_segments": lambda: ray_hit_segments(
+            P, V, C.reshape(1, 2), t_hat.reshape(1, 2), n_hat.reshape(1, 2), np.array([1.0])
+        ),
+    }
+    timings = {}
+    for name, call in calls.items():
+        start = time.perf_counter()
+        call()
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def _with_jit_fallback(aot_func, jit_func, signature: str):
+    """
+    Call an AOT-compiled kernel, falling back to the JIT kernel.
+
+    AOT kernels take exactly the exported argument types and no defaults;
+    omitted arguments get the JIT kernel's defaults. Array arguments that
+    are not float64 arrays of the exported dimension go to the JIT kernel:
+    the AOT kernel would reinterpret (or crash on) them instead of raising.
+    """
+    py_func = getattr(jit_func, "py_func", jit_func)
+    nargs = py_func.__code__.co_argcount
+    defaults = py_func.__defaults__ or ()
+    arg_types = re.findall(r"f8(?:\[[^\]]*\])?", signature[signature.index("(") :])
+    array_dims = [(i, t.count(":")) for i, t in enumerate(arg_types) if "[" in t]
+
+    @functools.wraps(py_func)
+    def kernel(*args):
+        if len(args) < nargs:
+            args = args + defaults[len(args) - nargs :]
+        for i, ndim in array_dims:
+            arg = args[i]
+            if type(arg) is not np.ndarray or arg.dtype != np.float64 or arg.ndim != ndim:
+                return jit_func(*args)
+        try:
+            return aot_func(*args)
+        except TypeError:
+            return jit_func(*args)
+
+    return kernel
+
+
+def _use_aot_kernels() -> bool:
+    """Replace JIT kernels by the AOT-compiled ones if an up-to-date build exists."""
+    import importlib
+
+    try:
+        aot = importlib.import_module(f"{__package__}.{AOT_MODULE}")
+    except ImportError:
+        return False
+    if aot.source_hash() != kernel_source_hash():
+        logging.info("Ignoring outdated AOT raytracing kernels, run tools/compile_kernels.py")
+        return False
+    module_globals = globals()
+    for name, signature in AOT_KERNELS.items():
+        module_globals[name] = _with_jit_fallback(
+            getattr(aot, name), module_globals[name], signature
+        )
+    return True
+
+
+AOT_KERNELS_LOADED = _use_aot_kernels()
@@ -6,7 +6,7 @@ Each command encapsulates an action that can be executed and undone.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, cast
 
 from PyQt6 import QtCore
 
@@ -39,6 +39,16 @@ class Command(ABC):
         """Attempt to merge with another command. Return True if successful."""
         return False
 
+    @abstractmethod
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """
+        Return the scene items whose state this command changes.
+
+        Used to journal changes incrementally (autosave); commands that only
+        change groups affect no items.
+        """
+        pass
+
 
 class AddItemCommand(Command):
     """Command to add an item to the scene."""
@@ -67,6 +77,10 @@ class AddItemCommand(Command):
             self.scene.removeItem(self.item)
             self._executed = False
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Return the item this command changes."""
+        return [self.item]
+
 
 class RemoveItemCommand(Command):
     """Command to remove an item from the scene."""
@@ -126,6 +140,10 @@ class RemoveItemCommand(Command):
                 self._group_manager.add_item_to_group(self.item.item_uuid, self._group_uuid)
             self._executed = False
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Return the item this command changes."""
+        return [self.item]
+
 
 class MoveItemCommand(Command):
     """Command to move an item to a new position."""
@@ -174,6 +192,10 @@ class MoveItemCommand(Command):
         self.new_pos = QtCore.QPointF(other.new_pos)
         return True
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Return the item this command changes."""
+        return [self.item]
+
 
 class AddMultipleItemsCommand(Command):
     """Command to add multiple items to the scene in a single operation."""
@@ -204,6 +226,10 @@ class AddMultipleItemsCommand(Command):
                 self.scene.removeItem(item)
             self._executed = False
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Return the items this command changes."""
+        return list(self.items)
+
 
 class RemoveMultipleItemsCommand(Command):
     """Command to remove multiple items from the scene in a single operation."""
@@ -275,6 +301,10 @@ class RemoveMultipleItemsCommand(Command):
                             self._group_manager.add_item_to_group(item.item_uuid, item_group_uuid)
             self._executed = False
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Return the items this command changes."""
+        return list(self.items)
+
 
 class PasteItemsCommand(Command):
     """Command to paste multiple items to the scene."""
@@ -305,6 +335,10 @@ class PasteItemsCommand(Command):
                 self.scene.removeItem(item)
             self._executed = False
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Return the items this command changes."""
+        return list(self.items)
+
 
 class PropertyChangeCommand(Command):
     """Command to change properties of an item using memento pattern."""
@@ -361,6 +395,10 @@ class PropertyChangeCommand(Command):
         # All QGraphicsItems have update() - no hasattr check needed
         self.item.update()
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Return the item this command changes."""
+        return [cast("QtWidgets.QGraphicsItem", self.item)]
+
 
 class RotateItemCommand(Command):
     """Command to rotate an item to a new angle."""
@@ -391,6 +429,10 @@ class RotateItemCommand(Command):
         """Rotate the item back to the old angle."""
         self.item.setRotation(self.old_rotation)
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Return the item this command changes."""
+        return [self.item]
+
 
 class RotateItemsCommand(Command):
     """Command to rotate multiple items together (group rotation)."""
@@ -431,6 +473,10 @@ class RotateItemsCommand(Command):
             item.setPos(self.old_positions[item])
             item.setRotation(self.old_rotations[item])
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Return the items this command changes."""
+        return list(self.items)
+
 
 class ZOrderCommand(Command):
     """Command to change z-order (stacking order) of items."""
@@ -463,6 +509,10 @@ class ZOrderCommand(Command):
         for item in self.items:
             item.setZValue(self.old_z_values[item])
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Return the items this command changes."""
+        return list(self.items)
+
 
 # =============================================================================
 # Group Commands
@@ -535,6 +585,10 @@ class CreateGroupCommand(Command):
 
             self._executed = False
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Groups are not scene items: no items change."""
+        return []
+
 
 class DeleteGroupCommand(Command):
     """Command to delete a group."""
@@ -605,6 +659,10 @@ class DeleteGroupCommand(Command):
         group = LayerGroup.from_dict(self._group_data)
         self._group_manager.add_group(group)
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Return the items this command changes."""
+        return list(self._items)
+
 
 class AddItemToGroupCommand(Command):
     """Command to add an item to a group."""
@@ -646,6 +704,10 @@ class AddItemToGroupCommand(Command):
                 self._group_manager.add_item_to_group(self._item_uuid, self._previous_group_uuid)
             self._executed = False
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Groups are not scene items: no items change."""
+        return []
+
 
 class RemoveItemFromGroupCommand(Command):
     """Command to remove an item from its group."""
@@ -697,6 +759,10 @@ class RemoveItemFromGroupCommand(Command):
             self._group_manager.add_item_to_group(self._item_uuid, self._group_uuid)
             self._executed = False
 
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Groups are not scene items: no items change."""
+        return []
+
 
 class ImportAsLayerCommand(Command):
     """Command to import an assembly file as a layer (group)."""
@@ -760,3 +826,7 @@ class ImportAsLayerCommand(Command):
         for item in self._items:
             if item.scene() is not None:
                 self._scene.removeItem(item)
+
+    def affected_items(self) -> list[QtWidgets.QGraphicsItem]:
+        """Return the items this command changes."""
+        return list(self._items)
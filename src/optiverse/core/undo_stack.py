@@ -17,11 +17,14 @@ class UndoStack(QtCore.QObject):
         canUndoChanged: Emitted when undo availability changes
         canRedoChanged: Emitted when redo availability changes
         commandPushed: Emitted when a command is pushed (for modification tracking)
+        commandApplied: Emitted with the command after every push (including
+            merged pushes), undo and redo (for incremental autosave)
     """
 
     canUndoChanged = QtCore.pyqtSignal(bool)
     canRedoChanged = QtCore.pyqtSignal(bool)
     commandPushed = QtCore.pyqtSignal()
+    commandApplied = QtCore.pyqtSignal(object)
 
     def __init__(self):
         """Initialize an empty undo stack."""
@@ -45,6 +48,7 @@ class UndoStack(QtCore.QObject):
             last_command = self._undo_stack[-1]
             if last_command.id() == command.id() and last_command.merge_with(command):
                 # Successfully merged, no need to add new command
+                self.commandApplied.emit(last_command)
                 return
 
         # Clear redo stack when new command is pushed
@@ -61,6 +65,7 @@ class UndoStack(QtCore.QObject):
 
         # Notify listeners that a command was pushed
         self.commandPushed.emit()
+        self.commandApplied.emit(command)
 
     def undo(self) -> None:
         """Undo the last command."""
@@ -78,6 +83,8 @@ class UndoStack(QtCore.QObject):
         if not self.can_undo():
             self.canUndoChanged.emit(False)
 
+        self.commandApplied.emit(command)
+
     def redo(self) -> None:
         """Redo the last undone command."""
         if not self.can_redo():
@@ -94,6 +101,8 @@ class UndoStack(QtCore.QObject):
         if not self.can_redo():
             self.canRedoChanged.emit(False)
 
+        self.commandApplied.emit(command)
+
     def can_undo(self) -> bool:
         """Check if undo is available."""
         return len(self._undo_stack) > 0
@@ -30,3 +30,36 @@ def slugify(name: str, separator: str = "_") -> str:
     # Replace any non-alphanumeric characters with the separator
     s = re.sub(r"[^a-z0-9]+", separator, s).strip(separator)
     return s or "component"
+
+
+def user_angle_to_qt(user_deg: float) -> float:
+    """
+    Convert user angle (CW from right) to Qt angle (CCW from right).
+
+    User convention (clockwise):
+    - 0° = right (→)
+    - 90° = down (↓)
+    - 180° = left (←)
+    - 270° = up (↑)
+
+    Qt convention (counter-clockwise):
+    - 0° = right (→)
+    - 90° = up (↑)
+    - 180° = left (←)
+    - 270° = down (↓)
+    """
+    return -user_deg
+
+
+def qt_angle_to_user(qt_deg: float) -> float:
+    """
+    Convert Qt angle (CCW from right) to user angle (CW from right).
+
+    Returns angle normalized to 0-360 range.
+    """
+    angle = -qt_deg
+    # Normalize to 0-360
+    angle = angle % 360
+    if angle < 0:
+        angle += 360
+    return angle
@@ -10,6 +10,7 @@ from .optical_interface import OpticalInterface
 from .optical_properties import (
     BeamBlockProperties,
     BeamsplitterProperties,
+    DetectorProperties,
     DichroicProperties,
     LensProperties,
     MirrorProperties,
@@ -29,6 +30,7 @@ __all__ = [
     "WaveplateProperties",
     "DichroicProperties",
     "BeamBlockProperties",
+    "DetectorProperties",
     "OpticalProperties",
     "OpticalInterface",
 ]
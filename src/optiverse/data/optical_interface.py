@@ -12,6 +12,7 @@ from .geometry import CurvedSegment, GeometrySegment, LineSegment
 from .optical_properties import (
     BeamBlockProperties,
     BeamsplitterProperties,
+    DetectorProperties,
     DichroicProperties,
     LensProperties,
     MirrorProperties,
@@ -61,6 +62,8 @@ class OpticalInterface:
             return "dichroic"
         elif isinstance(self.properties, BeamBlockProperties):
             return "beam_block"
+        elif isinstance(self.properties, DetectorProperties):
+            return "detector"
         else:
             return "unknown"
 
@@ -114,6 +117,8 @@ class OpticalInterface:
             properties = cast(OpticalProperties, WaveplateProperties(**properties_data))
         elif property_type == "dichroic":
             properties = cast(OpticalProperties, DichroicProperties(**properties_data))
+        elif property_type == "detector":
+            properties = cast(OpticalProperties, DetectorProperties(**properties_data))
         else:
             raise ValueError(f"Unknown property type: {property_type}")
 
@@ -212,6 +217,17 @@ class OpticalInterface:
         elif element_type == "beam_block":
             # Beam block absorbs all incident rays
             properties = cast(OpticalProperties, BeamBlockProperties())
+        elif element_type == "detector":
+            # Detector absorbs like a beam block and records hits
+            properties = cast(
+                OpticalProperties,
+                DetectorProperties(
+                    bins=int(old_interface.detector_bins),
+                    angle_range_deg=old_interface.detector_angle_range_deg,
+                    wavelength_min_nm=old_interface.detector_wavelength_min_nm,
+                    wavelength_max_nm=old_interface.detector_wavelength_max_nm,
+                ),
+            )
         else:
             # Default to refractive
             properties = cast(
@@ -97,6 +97,21 @@ class BeamBlockProperties:
     pass  # No properties needed - beam blocks simply absorb
 
 
+@dataclass
+class DetectorProperties:
+    """
+    Properties for a detector screen (absorber that records hits).
+
+    Absorbs all incident rays like a beam block and bins the hits into
+    position, incidence-angle and wavelength histograms.
+    """
+
+    bins: int = 100  # Number of bins per histogram
+    angle_range_deg: float = 30.0  # Angle histogram spans ± this around the normal
+    wavelength_min_nm: float = 380.0
+    wavelength_max_nm: float = 780.0
+
+
 # Union type for type-safe property handling
 OpticalProperties = Union[
     RefractiveProperties,
@@ -106,4 +121,5 @@ OpticalProperties = Union[
     WaveplateProperties,
     DichroicProperties,
     BeamBlockProperties,
+    DetectorProperties,
 ]
@@ -5,16 +5,58 @@ This module provides adapters and utilities for:
 1. Converting legacy InterfaceDefinition/RefractiveInterface to OpticalInterface (Phase 1)
 2. Converting OpticalInterface to IOpticalElement (Phase 2)
 3. Providing a unified API for the MainWindow to use either system
+4. Sweeping item parameters over Qt-free scene snapshots
+5. Optimizing item layouts against trace-based objectives
+6. Tracing collaboration session states for clients (shared raytracing)
 """
 
 from .adapter import (
     convert_legacy_interfaces,
     convert_scene_to_polymorphic,
+    create_element_at,
     create_polymorphic_element,
 )
+from .optimize import (
+    OptimizationResult,
+    OptimizationVariable,
+    SpotSize,
+    TargetDistance,
+    TotalPathLength,
+    optimize_layout,
+)
+from .shared_trace import decode_trace_result, encode_trace_result, trace_session_state
+from .sweep import (
+    DetectorCentroid,
+    DetectorHits,
+    DetectorPower,
+    PathLength,
+    SceneSnapshot,
+    SweepParameter,
+    run_sweep,
+)
 
 __all__ = [
     "create_polymorphic_element",
     "convert_legacy_interfaces",
     "convert_scene_to_polymorphic",
+    "create_element_at",
+    # Parameter sweeps
+    "SceneSnapshot",
+    "SweepParameter",
+    "run_sweep",
+    "DetectorPower",
+    "DetectorHits",
+    "DetectorCentroid",
+    "PathLength",
+    # Layout optimization
+    "OptimizationVariable",
+    "OptimizationResult",
+    "optimize_layout",
+    "SpotSize",
+    "TargetDistance",
+    "TotalPathLength",
+    # Shared raytracing of collaboration sessions
+    "trace_session_state",
+    "encode_trace_result",
+    "decode_trace_result",
 ]
@@ -17,6 +17,7 @@ from ..data import OpticalInterface
 from ..data.optical_properties import (
     BeamBlockProperties,
     BeamsplitterProperties,
+    DetectorProperties,
     DichroicProperties,
     LensProperties,
     MirrorProperties,
@@ -28,6 +29,7 @@ from ..data.optical_properties import (
 from ..raytracing.elements import (
     BeamBlock,
     Beamsplitter,
+    Detector,
     Dichroic,
     IOpticalElement,
     Lens,
@@ -39,6 +41,8 @@ from ..raytracing.elements import (
 _logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
+    import numpy as np
+
     from ..core.interface_definition import InterfaceDefinition
     from ..core.models import RefractiveInterface
 
@@ -91,6 +95,10 @@ def create_polymorphic_element(optical_iface: OpticalInterface) -> IOpticalEleme
         assert isinstance(properties, BeamBlockProperties)
         return BeamBlock(optical_iface)
 
+    elif element_type == "detector":
+        assert isinstance(properties, DetectorProperties)
+        return Detector(optical_iface)
+
     else:
         raise ValueError(f"Unknown element type: {element_type}")
 
@@ -148,6 +156,45 @@ def convert_legacy_interfaces(
     return elements
 
 
+def create_element_at(
+    iface: InterfaceDefinition | RefractiveInterface, p1: np.ndarray, p2: np.ndarray
+) -> IOpticalElement:
+    """
+    Convert a legacy interface to a polymorphic element placed at scene coordinates.
+
+    Args:
+        iface: Legacy interface (its own coordinates are item-local and ignored)
+        p1: Current start point in scene coordinates
+        p2: Current end point in scene coordinates
+
+    Returns:
+        IOpticalElement ready for raytracing
+    """
+    from ..data.geometry import CurvedSegment, LineSegment
+
+    # Convert legacy interface to OpticalInterface
+    optical_iface = convert_legacy_interface_to_optical(iface)
+
+    # UPDATE geometry with CURRENT scene coordinates
+    # This is essential for dynamic updates when items move!
+    # We must CREATE NEW geometry objects to ensure derived values
+    # (like center of curvature) are recalculated correctly.
+    if hasattr(optical_iface.geometry, "is_curved") and optical_iface.geometry.is_curved:
+        # For curved geometry, create new CurvedSegment with updated endpoints
+        # This ensures the center of curvature is recalculated
+        optical_iface.geometry = CurvedSegment(
+            p1=p1,
+            p2=p2,
+            radius_of_curvature_mm=optical_iface.geometry.radius_of_curvature_mm,
+        )
+    else:
+        # For flat geometry, create new LineSegment
+        optical_iface.geometry = LineSegment(p1=p1, p2=p2)
+
+    # Convert OpticalInterface to polymorphic element
+    return create_polymorphic_element(optical_iface)
+
+
 def convert_scene_to_polymorphic(scene_items) -> list[IOpticalElement]:
     """
     Convert all optical elements from a QGraphicsScene to polymorphic elements.
@@ -172,34 +219,7 @@ def convert_scene_to_polymorphic(scene_items) -> list[IOpticalElement]:
                 # CRITICAL: p1 and p2 are CURRENT scene coordinates (updated when item moves)
                 # The iface object has STALE coordinates, so we must use the current p1, p2!
                 for p1, p2, iface in interfaces_scene:
-                    # Convert legacy interface to OpticalInterface
-                    optical_iface = convert_legacy_interface_to_optical(iface)
-
-                    # UPDATE geometry with CURRENT scene coordinates
-                    # This is essential for dynamic updates when items move!
-                    # We must CREATE NEW geometry objects to ensure derived values
-                    # (like center of curvature) are recalculated correctly.
-                    from ..data.geometry import CurvedSegment, LineSegment
-
-                    if (
-                        hasattr(optical_iface.geometry, "is_curved")
-                        and optical_iface.geometry.is_curved
-                    ):
-                        # For curved geometry, create new CurvedSegment with updated endpoints
-                        # This ensures the center of curvature is recalculated
-                        optical_iface.geometry = CurvedSegment(
-                            p1=p1,
-                            p2=p2,
-                            radius_of_curvature_mm=optical_iface.geometry.radius_of_curvature_mm,
-                        )
-                    else:
-                        # For flat geometry, create new LineSegment
-                        optical_iface.geometry = LineSegment(p1=p1, p2=p2)
-
-                    # Convert OpticalInterface to polymorphic element
-                    element = create_polymorphic_element(optical_iface)
-
-                    elements.append(element)
+                    elements.append(create_element_at(iface, p1, p2))
 
             except Exception as e:
                 # Log error but continue with other components
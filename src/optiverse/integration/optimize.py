@@ -0,0 +1,328 @@
+"""
+Gradient-free layout optimization on top of the tracer.
+
+optimize_layout adjusts item parameters (typically position and angle of
+mirrors) within bounds to minimize an objective computed from trace
+results. It uses a bounded compass (pattern) search: every iteration polls
+±step along each variable, evaluates all poll points as one parallel batch
+and moves to the best improvement, halving the step when none improves.
+The method needs no gradients, copes with the piecewise-constant objectives
+ray tracing produces and parallelizes naturally.
+
+Objectives that are the mean of a per-ray cost (TargetDistance,
+TotalPathLength) support early exit: a candidate is abandoned as soon as
+its running cost can no longer beat the best point found so far.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+
+import numpy as np
+
+from ..core.models import ComponentParams
+from ..raytracing.engine import TraceResult
+from ..raytracing.ray import RayPath
+from .sweep import (
+    SceneSnapshot,
+    SweepMetric,
+    SweepParameter,
+    _evaluate_point,
+    _init_worker,
+    _SweepEvaluator,
+)
+
+_logger = logging.getLogger(__name__)
+
+# Objective value used when a detector objective receives no light
+MISS_PENALTY = 1e9
+
+
+# ----- Objectives -----
+
+
+@dataclass(frozen=True)
+class SpotSize:
+    """Power-weighted RMS spot radius on a detector (mm); misses are penalized."""
+
+    detector: int = 0
+
+    def __call__(self, result: TraceResult) -> float:
+        if self.detector >= len(result.detectors):
+            return MISS_PENALTY
+        reading = result.detectors[self.detector]
+        if reading.total_power <= 0.0:
+            return MISS_PENALTY
+        return reading.rms_width_mm
+
+
+def _distance_to_polyline(point: np.ndarray, points: np.ndarray) -> float:
+    """Shortest distance from point to a polyline given as (N, 2) vertices."""
+    if len(points) == 1:
+        return float(np.hypot(*(point - points[0])))
+    a = points[:-1]
+    d = points[1:] - a
+    length_sq = np.einsum("ij,ij->i", d, d)
+    t = np.einsum("ij,ij->i", point - a, d) / np.where(length_sq > 0.0, length_sq, 1.0)
+    closest = a + np.clip(t, 0.0, 1.0)[:, None] * d
+    return float(np.min(np.hypot(*(point - closest).T)))
+
+
+@dataclass(frozen=True)
+class TargetDistance:
+    """
+    Mean closest approach of the rays to a target point (mm).
+
+    For each source ray the closest branch counts, so a beamsplitter output
+    reaching the target is enough.
+    """
+
+    x_mm: float
+    y_mm: float
+
+    def ray_cost(self, paths: list[RayPath]) -> float:
+        target = np.array([self.x_mm, self.y_mm])
+        distances = [
+            _distance_to_polyline(target, np.asarray(path.points))
+            for path in paths
+            if len(path.points) > 0
+        ]
+        return min(distances) if distances else MISS_PENALTY
+
+    def __call__(self, result: TraceResult) -> float:
+        costs = [self.ray_cost(paths) for paths in result.ray_groups()]
+        return float(np.mean(costs)) if costs else math.nan
+
+
+@dataclass(frozen=True)
+class TotalPathLength:
+    """
+    Mean total drawn path length per source ray (mm).
+
+    With target_mm set, the deviation |length - target_mm| is minimized
+    instead, e.g. to match the arms of an interferometer.
+    """
+
+    target_mm: float | None = None
+
+    def ray_cost(self, paths: list[RayPath]) -> float:
+        length = sum(
+            float(np.sum(np.hypot(*np.diff(np.asarray(path.points), axis=0).T)))
+            for path in paths
+            if len(path.points) >= 2
+        )
+        return length if self.target_mm is None else abs(length - self.target_mm)
+
+    def __call__(self, result: TraceResult) -> float:
+        costs = [self.ray_cost(paths) for paths in result.ray_groups()]
+        return float(np.mean(costs)) if costs else math.nan
+
+
+# ----- Optimizer -----
+
+
+@dataclass(frozen=True)
+class OptimizationVariable:
+    """A parameter adjusted by the optimizer, with inclusive bounds."""
+
+    parameter: SweepParameter
+    lower: float
+    upper: float
+
+
+@dataclass
+class OptimizationResult:
+    """Outcome of optimize_layout."""
+
+    values: np.ndarray  # Best value of every variable
+    objective: float  # Objective at values
+    initial_objective: float  # Objective at the starting point
+    evaluations: int  # Number of traced candidates (including early exits)
+    iterations: int
+    converged: bool  # Step fell below min_step
+    cancelled: bool = False
+    history: list[float] = field(default_factory=list)  # Best objective per iteration
+
+    @property
+    def improved(self) -> bool:
+        """Whether the optimizer found a better layout than the starting one."""
+        return self.objective < self.initial_objective
+
+
+class _CandidatePool:
+    """Evaluates batches of candidates inline or on a process pool."""
+
+    def __init__(
+        self,
+        snapshot: SceneSnapshot,
+        parameters: list[SweepParameter],
+        objective: SweepMetric,
+        trace_kwargs: dict,
+        workers: int,
+    ):
+        self._executor: ProcessPoolExecutor | None = None
+        self._evaluator: _SweepEvaluator | None = None
+        if workers > 0:
+            # Workers receive the snapshot once; candidates only carry values
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(snapshot, parameters, objective, trace_kwargs),
+            )
+        else:
+            self._evaluator = _SweepEvaluator(snapshot, parameters, objective, trace_kwargs)
+
+    def evaluate(self, candidates: list[tuple[float, ...]], bound: float) -> list[float]:
+        if self._executor is not None:
+            return list(self._executor.map(_evaluate_point, candidates, repeat(bound)))
+        assert self._evaluator is not None
+        return [self._evaluator.evaluate(values, bound) for values in candidates]
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def optimize_layout(
+    snapshot: SceneSnapshot,
+    variables: Sequence[OptimizationVariable],
+    objective: SweepMetric,
+    *,
+    initial_step: float = 0.25,
+    min_step: float = 1e-3,
+    max_evaluations: int = 400,
+    workers: int | None = None,
+    progress: Callable[[int, float], None] | None = None,
+    cancel: threading.Event | None = None,
+    max_events: int = 80,
+) -> OptimizationResult:
+    """
+    Minimize objective over the variables with a bounded compass search.
+
+    Args:
+        snapshot: Scene to optimize (not modified)
+        variables: Parameters to adjust, with bounds
+        objective: Callable on a TraceResult (SpotSize, TargetDistance,
+                   TotalPathLength or any picklable metric), minimized
+        initial_step: Initial poll step as a fraction of each variable's range
+        min_step: Stop once the step falls below this fraction of the range
+        max_evaluations: Budget of traced candidates
+        workers: Worker processes for batched evaluation; 0 evaluates in this
+                 process, None uses one process per CPU (capped at 2 per variable)
+        progress: Called as progress(iteration, best_objective) after each iteration
+        cancel: Event that stops the search; the best point so far is returned
+        max_events: Maximum interactions per ray
+
+    Returns:
+        OptimizationResult with the best values found
+
+    Raises:
+        ValueError: If a variable does not exist or has an empty range
+    """
+    if not variables:
+        raise ValueError("Nothing to optimize")
+    parameters = [variable.parameter for variable in variables]
+    for parameter in parameters:
+        parameter.validate(snapshot)
+
+    lower = np.array([variable.lower for variable in variables], dtype=float)
+    upper = np.array([variable.upper for variable in variables], dtype=float)
+    span = upper - lower
+    if np.any(span <= 0.0):
+        raise ValueError("Every variable needs lower < upper")
+
+    start = np.array([_current_value(snapshot, p) for p in parameters], dtype=float)
+    # Work in normalized coordinates so one step size fits all variables
+    u = np.clip((start - lower) / span, 0.0, 1.0)
+
+    def to_values(point: np.ndarray) -> tuple[float, ...]:
+        return tuple(float(v) for v in lower + point * span)
+
+    n = len(variables)
+    if workers is None:
+        workers = min(os.cpu_count() or 1, 2 * n)
+
+    pool = _CandidatePool(
+        snapshot, parameters, objective, {"max_events": max_events, "parallel": False}, workers
+    )
+    try:
+        best = pool.evaluate([to_values(u)], math.inf)[0]
+        if math.isnan(best):
+            best = math.inf
+        initial = best
+        evaluations = 1
+        iterations = 0
+        history: list[float] = []
+        step = initial_step
+        cancelled = False
+
+        while step >= min_step and evaluations < max_evaluations:
+            if cancel is not None and cancel.is_set():
+                cancelled = True
+                break
+
+            polls: list[np.ndarray] = []
+            for i in range(n):
+                for sign in (1.0, -1.0):
+                    candidate = u.copy()
+                    candidate[i] = np.clip(candidate[i] + sign * step, 0.0, 1.0)
+                    if candidate[i] != u[i]:
+                        polls.append(candidate)
+            polls = polls[: max_evaluations - evaluations]
+            if not polls:
+                break
+
+            # Candidates that cannot beat the incumbent are cut short
+            scores = pool.evaluate([to_values(p) for p in polls], best)
+            evaluations += len(polls)
+            scores = [math.inf if math.isnan(s) else s for s in scores]
+            winner = int(np.argmin(scores))
+            if scores[winner] < best:
+                best = scores[winner]
+                u = polls[winner]
+            else:
+                step *= 0.5
+
+            iterations += 1
+            history.append(best)
+            if progress is not None:
+                progress(iterations, best)
+    finally:
+        pool.close()
+
+    _logger.debug(
+        "Layout optimization: %d iterations, %d evaluations, objective %.6g -> %.6g",
+        iterations,
+        evaluations,
+        initial,
+        best,
+    )
+    return OptimizationResult(
+        values=np.array(to_values(u)),
+        objective=best,
+        initial_objective=initial,
+        evaluations=evaluations,
+        iterations=iterations,
+        converged=step < min_step,
+        cancelled=cancelled,
+        history=history,
+    )
+
+
+def _current_value(snapshot: SceneSnapshot, parameter: SweepParameter) -> float:
+    """Read the snapshot's current value of a parameter."""
+    params = snapshot.find(parameter.item_id).params
+    if parameter.field.startswith("interfaces."):
+        _, index, attr = parameter.field.split(".", 2)
+        assert isinstance(params, ComponentParams)
+        return float(getattr((params.interfaces or [])[int(index)], attr))
+    return float(getattr(params, parameter.field))
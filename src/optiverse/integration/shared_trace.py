@@ -0,0 +1,170 @@
+"""
+Shared raytracing of collaboration sessions.
+
+The collaboration server can trace a session's scene once per op and push
+the result to every client of the session (see tools/collaboration_server.py
+--trace), instead of each client retracing the same scene after every remote
+change. This module is the Qt-free part of that: it traces a session state
+(the dict of CollaborationManager.get_session_state()) and converts the
+result to and from a compact message payload.
+
+Ray paths are sent as packed little-endian arrays, base64-encoded so that
+the payload fits JSON as well as MessagePack frames: the points of all
+paths as float32 (x, y) pairs with the number of points per path, and per
+path its RGBA color, wavelength and Jones vector. float32 keeps points to
+about 0.1 µm within a meter, well below what the view or the measure tools
+resolve. Detector readings are small and sent as plain lists.
+"""
+
+from __future__ import annotations
+
+import base64
+from typing import Any
+
+import numpy as np
+
+from ..core.constants import MAX_RAYTRACING_EVENTS
+from ..core.models import Polarization
+from ..raytracing.elements.detector import DetectorReading, Histogram
+from ..raytracing.engine import TraceResult, trace_rays_with_detectors
+from ..raytracing.ray import RayPath
+from .sweep import SceneSnapshot
+
+# Version of the payload layout
+TRACE_FORMAT = 1
+
+_POINT = np.dtype("<f4")
+_COUNT = np.dtype("<u4")
+
+
+def trace_session_state(
+    state: dict[str, Any], max_events: int = MAX_RAYTRACING_EVENTS
+) -> TraceResult:
+    """
+    Trace the scene of a session state.
+
+    Args:
+        state: Session state with serialized items
+        max_events: Interactions per ray, as for interactive traces
+
+    Returns:
+        TraceResult (empty if the scene has no sources)
+    """
+    snapshot = SceneSnapshot.from_session_state(state)
+    sources = snapshot.sources
+    if not sources:
+        return TraceResult()
+    return trace_rays_with_detectors(snapshot.build_elements(), sources, max_events=max_events)
+
+
+def _pack(array: np.ndarray, dtype: np.dtype) -> str:
+    return base64.b64encode(np.ascontiguousarray(array, dtype=dtype).tobytes()).decode("ascii")
+
+
+def _unpack(text: str, dtype: np.dtype) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(text), dtype=dtype)
+
+
+def _encode_histogram(histogram: Histogram) -> dict[str, list]:
+    return {
+        "edges": histogram.edges.tolist(),
+        "power": histogram.power.tolist(),
+        "counts": histogram.counts.tolist(),
+    }
+
+
+def _decode_histogram(data: dict[str, list]) -> Histogram:
+    return Histogram(
+        edges=np.asarray(data["edges"], dtype=float),
+        power=np.asarray(data["power"], dtype=float),
+        counts=np.asarray(data["counts"], dtype=np.int64),
+    )
+
+
+def encode_trace_result(result: TraceResult) -> dict[str, Any]:
+    """
+    Convert a trace result to a message payload.
+
+    Returns:
+        JSON-serializable dict, see decode_trace_result()
+    """
+    paths = result.paths
+    counts = np.array([len(p.points) for p in paths], dtype=np.int64)
+    points = (
+        np.concatenate([np.asarray(p.points, dtype=float).reshape(-1, 2) for p in paths])
+        if counts.sum()
+        else np.zeros((0, 2))
+    )
+    jones = np.array([p.polarization.jones_vector for p in paths], dtype=complex).reshape(-1, 2)
+    return {
+        "format": TRACE_FORMAT,
+        "counts": _pack(counts, _COUNT),
+        "points": _pack(points, _POINT),
+        "rgba": _pack(np.array([p.rgba for p in paths], dtype=np.uint8), np.dtype("u1")),
+        "wavelength_nm": _pack(np.array([p.wavelength_nm for p in paths]), _POINT),
+        "jones": _pack(np.stack([jones.real, jones.imag], axis=-1), _POINT),
+        "detectors": [
+            {
+                "name": r.name,
+                "n_hits": r.n_hits,
+                "total_power": r.total_power,
+                "out_of_range_power": r.out_of_range_power,
+                "position_sum": r.position_sum,
+                "position_sq_sum": r.position_sq_sum,
+                "position": _encode_histogram(r.position),
+                "angle": _encode_histogram(r.angle),
+                "wavelength": _encode_histogram(r.wavelength),
+            }
+            for r in result.detectors
+        ],
+    }
+
+
+def decode_trace_result(data: dict[str, Any]) -> TraceResult:
+    """
+    Convert a message payload of encode_trace_result() back to a trace result.
+
+    Raises:
+        ValueError: If the payload has an unknown format or inconsistent arrays
+    """
+    if data.get("format") != TRACE_FORMAT:
+        raise ValueError(f"Unsupported trace format {data.get('format')!r}")
+    try:
+        counts = _unpack(data["counts"], _COUNT).astype(np.int64)
+        points = _unpack(data["points"], _POINT).astype(float).reshape(-1, 2)
+        rgba = _unpack(data["rgba"], np.dtype("u1")).reshape(-1, 4)
+        wavelengths = _unpack(data["wavelength_nm"], _POINT).astype(float)
+        jones = _unpack(data["jones"], _POINT).astype(float).reshape(-1, 2, 2)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid trace payload: {e}") from e
+    n = len(counts)
+    if int(counts.sum()) != len(points) or not (len(rgba) == len(wavelengths) == len(jones) == n):
+        raise ValueError("Trace payload arrays do not match")
+
+    paths = []
+    starts = np.concatenate(([0], np.cumsum(counts)))
+    for i in range(n):
+        r, g, b, a = (int(c) for c in rgba[i])
+        paths.append(
+            RayPath(
+                points=list(points[starts[i] : starts[i + 1]]),
+                rgba=(r, g, b, a),
+                polarization=Polarization(jones[i, :, 0] + 1j * jones[i, :, 1]),
+                wavelength_nm=float(wavelengths[i]),
+            )
+        )
+    detectors = [
+        DetectorReading(
+            name=d["name"],
+            n_hits=d["n_hits"],
+            total_power=d["total_power"],
+            position=_decode_histogram(d["position"]),
+            angle=_decode_histogram(d["angle"]),
+            wavelength=_decode_histogram(d["wavelength"]),
+            out_of_range_power=d.get("out_of_range_power", 0.0),
+            position_sum=d.get("position_sum", 0.0),
+            position_sq_sum=d.get("position_sq_sum", 0.0),
+        )
+        for d in data.get("detectors", [])
+    ]
+    return TraceResult(paths=paths, detectors=detectors)
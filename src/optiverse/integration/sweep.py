@@ -0,0 +1,494 @@
+"""
+Parameter sweeps over scene items.
+
+A sweep varies one or more item parameters (component position, rotation,
+ComponentParams/SourceParams fields or interface properties) over a grid
+of values, traces the scene for every grid point and reduces each trace
+to a single number with a metric.
+
+The scene is captured once as a Qt-free SceneSnapshot. Sweeps run in a
+process pool whose workers receive the snapshot once at start-up and
+prebuild the elements of all items that are not swept; jobs only carry
+grid indices and values, so element tables are never re-pickled per job.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Protocol
+
+import numpy as np
+
+from ..core.models import ComponentParams, SourceParams
+from ..raytracing.elements.base import IOpticalElement
+from ..raytracing.engine import (
+    TraceResult,
+    count_source_rays,
+    iter_ray_paths,
+    trace_rays_with_detectors,
+)
+from .adapter import create_element_at
+
+_logger = logging.getLogger(__name__)
+
+_INTERFACE_PREFIX = "interfaces."
+
+
+@dataclass
+class ItemSnapshot:
+    """Parameters of one scene item, detached from Qt."""
+
+    item_id: str  # item_uuid of the scene item
+    kind: str  # "component" or "source"
+    params: ComponentParams | SourceParams
+    offset_mm: tuple[float, float] = (0.0, 0.0)  # Picked-line offset of components
+
+    @property
+    def name(self) -> str:
+        """Display name"""
+        name = getattr(self.params, "name", None)
+        if name:
+            return str(name)
+        return "Source" if self.kind == "source" else "Component"
+
+    def build_elements(self) -> list[IOpticalElement]:
+        """Convert the component's interfaces to elements in scene coordinates."""
+        if self.kind != "component":
+            return []
+        params = self.params
+        assert isinstance(params, ComponentParams)
+
+        # Same transform as the item: translate by position, rotate by the Qt angle
+        theta = math.radians(-params.angle_deg)
+        cos_t, sin_t = math.cos(theta), math.sin(theta)
+        origin = np.array([params.x_mm, params.y_mm])
+        ox, oy = self.offset_mm
+
+        def to_scene(x: float, y: float) -> np.ndarray:
+            x -= ox
+            y -= oy
+            point: np.ndarray = origin + np.array([x * cos_t - y * sin_t, x * sin_t + y * cos_t])
+            return point
+
+        return [
+            create_element_at(
+                iface, to_scene(iface.x1_mm, iface.y1_mm), to_scene(iface.x2_mm, iface.y2_mm)
+            )
+            for iface in params.interfaces or []
+        ]
+
+
+@dataclass
+class SceneSnapshot:
+    """
+    Picklable copy of everything a trace needs from the scene.
+
+    Items are kept in scene order so that element (and detector) indices
+    match those of an interactive retrace.
+    """
+
+    items: list[ItemSnapshot] = field(default_factory=list)
+
+    @classmethod
+    def from_scene_items(cls, scene_items) -> SceneSnapshot:
+        """
+        Capture components and sources from QGraphicsScene items.
+
+        Args:
+            scene_items: Items from a QGraphicsScene (typically scene.items())
+
+        Returns:
+            SceneSnapshot with deep copies of the item parameters
+        """
+        from ..objects import SourceItem
+
+        items: list[ItemSnapshot] = []
+        for item in scene_items:
+            if isinstance(item, SourceItem):
+                items.append(ItemSnapshot(item.item_uuid, "source", copy.deepcopy(item.params)))
+            elif hasattr(item, "get_interfaces_scene") and isinstance(
+                getattr(item, "params", None), ComponentParams
+            ):
+                items.append(
+                    ItemSnapshot(
+                        item.item_uuid,
+                        "component",
+                        copy.deepcopy(item.params),
+                        tuple(getattr(item, "_picked_line_offset_mm", (0.0, 0.0))),
+                    )
+                )
+        return cls(items=items)
+
+    @classmethod
+    def from_session_state(cls, state: dict[str, Any]) -> SceneSnapshot:
+        """
+        Capture components and sources from a collaboration session state.
+
+        Args:
+            state: Session state with serialized items (see
+                CollaborationManager.get_session_state())
+
+        Returns:
+            SceneSnapshot of the sources and components; annotations are skipped
+        """
+        from ..core.interface_definition import InterfaceDefinition
+
+        component_fields = {f.name for f in fields(ComponentParams)}
+        source_fields = {f.name for f in fields(SourceParams)}
+
+        items: list[ItemSnapshot] = []
+        for data in state.get("items", []):
+            item_id = data.get("uuid") or data.get("item_uuid") or ""
+            item_type = data.get("item_type") or data.get("_type")
+            if item_type == "source":
+                params = SourceParams(**{k: v for k, v in data.items() if k in source_fields})
+                items.append(ItemSnapshot(item_id, "source", params))
+            elif data.get("interfaces") is not None and item_type not in ("ruler", "text"):
+                d = {k: v for k, v in data.items() if k in component_fields}
+                d["interfaces"] = [InterfaceDefinition.from_dict(i) for i in d["interfaces"]]
+                component = ComponentParams(**d)
+                # Items with a sprite are positioned by the first interface's center
+                offset = (0.0, 0.0)
+                if component.image_path and component.interfaces:
+                    first = component.interfaces[0]
+                    offset = (
+                        0.5 * (first.x1_mm + first.x2_mm),
+                        0.5 * (first.y1_mm + first.y2_mm),
+                    )
+                items.append(ItemSnapshot(item_id, "component", component, offset))
+        return cls(items=items)
+
+    def find(self, item_id: str) -> ItemSnapshot:
+        """Get an item by id, raising KeyError if it is not in the snapshot."""
+        for item in self.items:
+            if item.item_id == item_id:
+                return item
+        raise KeyError(f"Item {item_id} not in scene snapshot")
+
+    @property
+    def sources(self) -> list[SourceParams]:
+        """Source parameters in scene order"""
+        return [item.params for item in self.items if isinstance(item.params, SourceParams)]
+
+    def build_elements(self) -> list[IOpticalElement]:
+        """Convert all components to elements, in scene order."""
+        return [element for item in self.items for element in item.build_elements()]
+
+
+def _coerce(current: Any, value: float) -> Any:
+    """Keep integer fields (ray counts, bin counts) integral."""
+    if isinstance(current, int) and not isinstance(current, bool):
+        return int(round(value))
+    return value
+
+
+@dataclass(frozen=True)
+class SweepParameter:
+    """
+    One swept quantity on one item.
+
+    field is a ComponentParams or SourceParams attribute (e.g. "x_mm",
+    "y_mm", "angle_deg", "n_rays") or an interface property written as
+    "interfaces.<index>.<attribute>" (e.g. "interfaces.0.efl_mm").
+    """
+
+    item_id: str
+    field: str
+
+    def apply(self, item: ItemSnapshot, value: float) -> ItemSnapshot:
+        """Return a copy of item with this parameter set to value."""
+        if self.field.startswith(_INTERFACE_PREFIX):
+            index_text, _, attr = self.field[len(_INTERFACE_PREFIX) :].partition(".")
+            component = item.params
+            assert isinstance(component, ComponentParams)
+            interfaces = list(component.interfaces or [])
+            index = int(index_text)
+            target = interfaces[index]
+            interfaces[index] = replace(target, **{attr: _coerce(getattr(target, attr), value)})
+            return replace(item, params=replace(component, interfaces=interfaces))
+        current = getattr(item.params, self.field)
+        params = replace(item.params, **{self.field: _coerce(current, value)})  # type: ignore[type-var]
+        return replace(item, params=params)
+
+    def validate(self, snapshot: SceneSnapshot) -> None:
+        """Check that the parameter exists on its item, raising ValueError otherwise."""
+        try:
+            item = snapshot.find(self.item_id)
+        except KeyError as e:
+            raise ValueError(str(e)) from e
+
+        if self.field.startswith(_INTERFACE_PREFIX):
+            index_text, _, attr = self.field[len(_INTERFACE_PREFIX) :].partition(".")
+            interfaces = getattr(item.params, "interfaces", None) or []
+            if not index_text.isdigit() or int(index_text) >= len(interfaces):
+                raise ValueError(f"No interface {index_text!r} on {item.name}")
+            target = interfaces[int(index_text)]
+        else:
+            attr = self.field
+            target = item.params
+
+        names = {f.name for f in fields(target)}
+        if attr not in names:
+            raise ValueError(f"{type(target).__name__} has no field {attr!r}")
+
+
+# ----- Metrics -----
+
+
+class SweepMetric(Protocol):
+    """Reduces one trace to a number. Must be picklable (module-level class or function)."""
+
+    def __call__(self, result: TraceResult) -> float: ...
+
+
+@dataclass(frozen=True)
+class DetectorPower:
+    """Total power absorbed by a detector."""
+
+    detector: int = 0  # Index among the detectors in the scene
+
+    def __call__(self, result: TraceResult) -> float:
+        if self.detector >= len(result.detectors):
+            return math.nan
+        return result.detectors[self.detector].total_power
+
+
+@dataclass(frozen=True)
+class DetectorHits:
+    """Number of rays absorbed by a detector."""
+
+    detector: int = 0
+
+    def __call__(self, result: TraceResult) -> float:
+        if self.detector >= len(result.detectors):
+            return math.nan
+        return float(result.detectors[self.detector].n_hits)
+
+
+@dataclass(frozen=True)
+class DetectorCentroid:
+    """Power-weighted mean hit position along a detector (mm from its center)."""
+
+    detector: int = 0
+
+    def __call__(self, result: TraceResult) -> float:
+        if self.detector >= len(result.detectors):
+            return math.nan
+        return result.detectors[self.detector].centroid_mm
+
+
+@dataclass(frozen=True)
+class PathLength:
+    """Statistic ("mean", "min" or "max") of the drawn ray path lengths."""
+
+    statistic: str = "mean"
+
+    def __call__(self, result: TraceResult) -> float:
+        lengths = [
+            float(np.sum(np.linalg.norm(np.diff(np.asarray(path.points), axis=0), axis=1)))
+            for path in result.paths
+            if len(path.points) >= 2
+        ]
+        if not lengths:
+            return math.nan
+        reducers: dict[str, Callable[[Any], Any]] = {"mean": np.mean, "min": np.min, "max": np.max}
+        if self.statistic not in reducers:
+            raise ValueError(f"Unknown path length statistic: {self.statistic}")
+        return float(reducers[self.statistic](lengths))
+
+
+# ----- Evaluation -----
+
+
+class _SweepEvaluator:
+    """
+    Traces one grid point at a time.
+
+    Elements of items that are not swept are built once and reused; only
+    the swept items are rebuilt for each point.
+    """
+
+    def __init__(
+        self,
+        snapshot: SceneSnapshot,
+        parameters: Sequence[SweepParameter],
+        metric: SweepMetric,
+        trace_kwargs: dict[str, Any],
+    ):
+        self.snapshot = snapshot
+        self.parameters = list(parameters)
+        self.metric = metric
+        self.trace_kwargs = trace_kwargs
+        swept = {p.item_id for p in self.parameters}
+        self._static: list[list[IOpticalElement] | None] = [
+            None if item.item_id in swept else item.build_elements() for item in snapshot.items
+        ]
+
+    def build_scene(
+        self, values: Sequence[float]
+    ) -> tuple[list[IOpticalElement], list[SourceParams]]:
+        """Apply parameter values and return the elements and sources to trace."""
+        items = list(self.snapshot.items)
+        for parameter, value in zip(self.parameters, values):
+            index = next(i for i, it in enumerate(items) if it.item_id == parameter.item_id)
+            items[index] = parameter.apply(items[index], float(value))
+
+        elements: list[IOpticalElement] = []
+        sources: list[SourceParams] = []
+        for item, static in zip(items, self._static):
+            elements.extend(item.build_elements() if static is None else static)
+            if isinstance(item.params, SourceParams):
+                sources.append(item.params)
+        return elements, sources
+
+    def evaluate(self, values: Sequence[float], bound: float = math.inf) -> float:
+        """
+        Trace the scene for one set of parameter values and apply the metric.
+
+        Metrics that define ray_cost(paths) are the mean of a non-negative
+        per-source-ray cost. For those, rays are traced one at a time and the
+        evaluation stops early (returning inf) as soon as the running mean is
+        guaranteed to reach bound.
+        """
+        elements, sources = self.build_scene(values)
+        ray_cost = getattr(self.metric, "ray_cost", None)
+        if ray_cost is None:
+            result = trace_rays_with_detectors(elements, sources, **self.trace_kwargs)
+            return float(self.metric(result))
+
+        # Normalize by the rays actually emitted (a point source emits one)
+        n_total = sum(count_source_rays(source) for source in sources)
+        if n_total == 0:
+            return math.nan
+        total = 0.0
+        limit = bound * n_total
+        max_events = self.trace_kwargs.get("max_events", 80)
+        for paths in iter_ray_paths(elements, sources, max_events=max_events):
+            total += ray_cost(paths)
+            if total >= limit:
+                return math.inf
+        return total / n_total
+
+
+# Per-process evaluator, created once by the pool initializer
+_worker_evaluator: _SweepEvaluator | None = None
+
+
+def _init_worker(snapshot, parameters, metric, trace_kwargs) -> None:
+    global _worker_evaluator
+    _worker_evaluator = _SweepEvaluator(snapshot, parameters, metric, trace_kwargs)
+
+
+def _evaluate_point(values: tuple[float, ...], bound: float = math.inf) -> float:
+    assert _worker_evaluator is not None, "Sweep worker not initialized"
+    return _worker_evaluator.evaluate(values, bound)
+
+
+def _evaluate_batch(batch: list[tuple[int, tuple[float, ...]]]) -> list[tuple[int, float]]:
+    assert _worker_evaluator is not None, "Sweep worker not initialized"
+    return [(index, _worker_evaluator.evaluate(values)) for index, values in batch]
+
+
+def run_sweep(
+    snapshot: SceneSnapshot,
+    parameters: Sequence[SweepParameter],
+    grids: Sequence[Sequence[float] | np.ndarray],
+    metric: SweepMetric,
+    *,
+    workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+    cancel: threading.Event | None = None,
+    max_events: int = 80,
+) -> np.ndarray:
+    """
+    Evaluate metric on the full grid of parameter values.
+
+    Args:
+        snapshot: Scene to trace (not modified)
+        parameters: Swept parameters, one per grid axis
+        grids: Values for each parameter; the sweep covers their outer product
+        metric: Callable reducing a TraceResult to a float (must be picklable
+                when workers > 0, e.g. DetectorPower or PathLength)
+        workers: Number of worker processes; 0 evaluates in this process,
+                 None uses one process per CPU
+        progress: Called as progress(done, total) after every finished batch
+        cancel: Event that stops the sweep when set; unfinished points stay NaN
+        max_events: Maximum interactions per ray
+
+    Returns:
+        Array of shape tuple(len(g) for g in grids) with one metric value per point
+
+    Raises:
+        ValueError: If the parameters and grids do not match or a parameter does not exist
+    """
+    if len(parameters) != len(grids):
+        raise ValueError("Need exactly one value grid per parameter")
+    for parameter in parameters:
+        parameter.validate(snapshot)
+
+    axes = [np.asarray(g, dtype=float).ravel() for g in grids]
+    shape = tuple(len(a) for a in axes)
+    result = np.full(shape, np.nan)
+    total = int(result.size)
+    if total == 0:
+        return result
+
+    points = [
+        (flat, tuple(float(axes[k][i]) for k, i in enumerate(np.unravel_index(flat, shape))))
+        for flat in range(total)
+    ]
+    # Traces inside a worker are sequential; the pool provides the parallelism
+    trace_kwargs = {"max_events": max_events, "parallel": False}
+    done = 0
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, total)
+
+    if workers <= 0 or total == 1:
+        evaluator = _SweepEvaluator(snapshot, parameters, metric, trace_kwargs)
+        for flat, values in points:
+            if cancel is not None and cancel.is_set():
+                break
+            result.flat[flat] = evaluator.evaluate(values)
+            done += 1
+            if progress is not None:
+                progress(done, total)
+        return result
+
+    # Several small batches per worker keep progress and cancellation responsive
+    batch_size = max(1, total // (workers * 8))
+    batches = [points[i : i + batch_size] for i in range(0, total, batch_size)]
+
+    # Spawn so that workers never inherit Qt state from a forked GUI process
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(snapshot, list(parameters), metric, trace_kwargs),
+    )
+    try:
+        pending: set[Future] = {executor.submit(_evaluate_batch, batch) for batch in batches}
+        while pending:
+            if cancel is not None and cancel.is_set():
+                _logger.debug("Sweep cancelled after %d of %d points", done, total)
+                break
+            finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in finished:
+                for flat, value in future.result():
+                    result.flat[flat] = value
+                done += len(future.result())
+                if progress is not None:
+                    progress(done, total)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return result
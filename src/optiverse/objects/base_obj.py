@@ -66,6 +66,8 @@ class BaseObj(QtWidgets.QGraphicsObject):
         self.setCursor(QtCore.Qt.CursorShape.OpenHandCursor)
         self.setTransformOriginPoint(0.0, 0.0)
         self._ready = False  # Set to True after full initialization
+        # True while edited is emitted for a position/rotation change
+        self._transform_edit = False
 
         # Rotation handlers (extracted for cleaner code)
         self._single_rotation: SingleItemRotationHandler | None = None
@@ -144,15 +146,12 @@ class BaseObj(QtWidgets.QGraphicsObject):
         ):
             if getattr(self, "_ready", False) and self.scene() is not None:
                 self._sync_params_from_item()
-                self.edited.emit()
+                self._emit_transform_edit()
 
                 # Broadcast position/rotation change to collaboration
-                if self.scene():
-                    views = self.scene().views()
-                    if views:
-                        main_window = views[0].window()
-                        if isinstance(main_window, HasCollaboration):
-                            main_window.collaboration_manager.broadcast_move_item(self)
+                collaboration_manager = self._collaboration_manager()
+                if collaboration_manager is not None:
+                    collaboration_manager.broadcast_move_item(self)
 
         # Phase 2.2: Ensure sprite re-renders when selection toggles (remove lingering tint)
         if change in (
@@ -173,6 +172,14 @@ class BaseObj(QtWidgets.QGraphicsObject):
 
         return super().itemChange(change, value)
 
+    def _emit_transform_edit(self):
+        """Emit edited for a position/rotation change (broadcast as a move, not an update)."""
+        self._transform_edit = True
+        try:
+            self.edited.emit()
+        finally:
+            self._transform_edit = False
+
     def _sync_params_from_item(self):
         """
         Sync internal params from item's position and rotation.
@@ -328,7 +335,7 @@ class BaseObj(QtWidgets.QGraphicsObject):
             # Single item rotation
             new_rotation = self._single_rotation.update_rotation(mouse_pos, snap_to_45)
             self.setRotation(new_rotation)
-            self.edited.emit()
+            self._emit_transform_edit()
             ev.accept()
         else:
             # Normal drag behavior
@@ -352,6 +359,22 @@ class BaseObj(QtWidgets.QGraphicsObject):
         else:
             super().mouseReleaseEvent(ev)
 
+        # Send the final position now instead of with the next coalesced flush
+        collaboration_manager = self._collaboration_manager()
+        if collaboration_manager is not None:
+            collaboration_manager.flush_broadcasts()
+
+    def _collaboration_manager(self):
+        """The main window's CollaborationManager, if the item is in its scene."""
+        scene = self.scene()
+        if scene is not None:
+            views = scene.views()
+            if views:
+                main_window = views[0].window()
+                if isinstance(main_window, HasCollaboration):
+                    return main_window.collaboration_manager
+        return None
+
     def wheelEvent(self, ev: QtWidgets.QGraphicsSceneWheelEvent | None):
         """Ctrl + wheel → rotate element(s)."""
         if ev is None:
@@ -105,5 +105,6 @@ class ComponentRegistry:
             "slm": "Misc",
             "refractive_interface": "Other",  # Generic refractive interfaces
             "beam_block": "Misc",
+            "detector": "Misc",
         }
         return element_type_to_category.get(element_type, "Other")
@@ -4,11 +4,15 @@ import hashlib
 import logging
 import math
 import os
+from collections import OrderedDict
+from collections.abc import Callable
 from pathlib import Path
 
 from PyQt6 import QtCore, QtGui, QtWidgets
 from PyQt6.QtSvgWidgets import QGraphicsSvgItem
 
+from ..platform.paths import image_content_hash
+
 # Optional QtSvg for SVG support
 try:
     from PyQt6 import QtSvg
@@ -17,15 +21,6 @@ try:
 except ImportError:
     HAVE_QTSVG = False
 
-# Import cache directory function
-try:
-    from ..platform.paths import svg_cache_dir
-
-    HAVE_CACHE = True
-except Exception as e:
-    HAVE_CACHE = False
-    logging.warning(f"SVG caching disabled due to import error: {e}")
-
 
 class ComponentSvgSprite(QGraphicsSvgItem):
     """
@@ -208,6 +203,12 @@ class ComponentSprite(QtWidgets.QGraphicsPixmapItem):
 
         # Store the actual reference line length in mm (for parent to use)
         self.picked_line_length_mm = 0.0
+        self._reference_line_mm = reference_line_mm
+        self._object_height_mm = object_height_mm
+        # True while an outline stands in for an SVG rendered in the background
+        self._placeholder = False
+        # Track parent selection state for cache invalidation
+        self._parent_was_selected = False
 
         if not (image_path and os.path.exists(image_path)):
             self.setVisible(False)
@@ -215,33 +216,50 @@ class ComponentSprite(QtWidgets.QGraphicsPixmapItem):
 
         # Load pixmap - handle SVG or raster images
         if image_path.lower().endswith(".svg") and HAVE_QTSVG:
-            # Render SVG to high-resolution pixmap once
-            # High resolution ensures sharpness at all zoom levels
-            pix = self._render_svg_to_pixmap(image_path, object_height_mm)
-            if not pix or pix.isNull():
-                self.setVisible(False)
-                return
+            # SVGs are rendered to a high-resolution pixmap once (sharp at all
+            # zoom levels); until then a same-shaped placeholder is shown
+            pix = self._svg_pixmap_or_placeholder(image_path, object_height_mm)
         else:
-            # Load raster image and ensure device pixel ratio = 1.0
-            pix0 = QtGui.QPixmap(image_path)
-            img = pix0.toImage()
-            img.setDevicePixelRatio(1.0)
-            pix = QtGui.QPixmap.fromImage(img)
+            pix = ComponentSprite._shared_pixmap(
+                f"raster:{ComponentSprite._content_key(image_path)}",
+                lambda: ComponentSprite._load_raster(image_path),
+            )
 
-        self.setPixmap(pix)
+        if pix is None or not self._apply_pixmap(pix):
+            self.setVisible(False)
+            return
+
+        # Calculate the actual length of the reference line in mm
+        x1_mm, y1_mm, x2_mm, y2_mm = reference_line_mm
+        self.picked_line_length_mm = math.hypot(x2_mm - x1_mm, y2_mm - y1_mm)
+
+        # Render below the element geometry
+        self.setZValue(-100)
+        self.setOpacity(0.95)
+        self.setTransformationMode(QtCore.Qt.TransformationMode.SmoothTransformation)
+        # Use device coordinate cache for better performance
+        # Cache is invalidated when selection state changes
+        self.setCacheMode(QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
+    def _apply_pixmap(self, pix: QtGui.QPixmap) -> bool:
+        """
+        Show a pixmap, scaled and offset so the reference line sits on the origin.
 
+        Returns:
+            False if the pixmap is empty
+        """
         actual_width = pix.width()
         actual_height = pix.height()
         if actual_height <= 0:
-            self.setVisible(False)
-            return
+            return False
+        self.setPixmap(pix)
 
         # Compute mm_per_pixel from object_height_mm
         # Scale image so that the FULL IMAGE HEIGHT is exactly object_height_mm
-        mm_per_pixel = object_height_mm / actual_height
+        mm_per_pixel = self._object_height_mm / actual_height
 
         # Convert reference line from mm (centered, Y-up) to image pixels (top-left origin, Y-up)
-        x1_mm, y1_mm, x2_mm, y2_mm = reference_line_mm
+        x1_mm, y1_mm, x2_mm, y2_mm = self._reference_line_mm
 
         # Convert from centered mm to pixel coordinates
         # Storage: Y-up (positive = up, negative = down)
@@ -258,15 +276,6 @@ class ComponentSprite(QtWidgets.QGraphicsPixmapItem):
         x2_px = (x2_mm / mm_per_pixel) + image_center_x_px
         y2_px = (-y2_mm / mm_per_pixel) + image_center_y_px  # Negate Y
 
-        # Extract line vector for alignment
-        x2_px - x1_px
-        y2_px - y1_px
-
-        # Calculate the actual length of the reference line in mm
-        dx_mm = x2_mm - x1_mm
-        dy_mm = y2_mm - y1_mm
-        self.picked_line_length_mm = math.hypot(dx_mm, dy_mm)
-
         # Center point of reference line (in pixel coordinates)
         cx_px = 0.5 * (x1_px + x2_px)
         cy_px = 0.5 * (y1_px + y2_px)
@@ -279,20 +288,70 @@ class ComponentSprite(QtWidgets.QGraphicsPixmapItem):
         self.setScale(s_px_to_mm)
 
         # Flip sprite in Y to convert pixmap from native Y-down to scene Y-up
-        transform = self.transform()
-        transform.scale(1.0, -1.0)
-        self.setTransform(transform)
+        self.setTransform(QtGui.QTransform.fromScale(1.0, -1.0))
+        return True
 
-        # Render below the element geometry
-        self.setZValue(-100)
-        self.setOpacity(0.95)
-        self.setTransformationMode(QtCore.Qt.TransformationMode.SmoothTransformation)
-        # Use device coordinate cache for better performance
-        # Cache is invalidated when selection state changes
-        self.setCacheMode(QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache)
+    def _svg_pixmap_or_placeholder(
+        self, svg_path: str, object_height_mm: float
+    ) -> QtGui.QPixmap | None:
+        """
+        Get the rendered SVG if it is in memory, else request it in the background.
 
-        # Track parent selection state for cache invalidation
-        self._parent_was_selected = False
+        Args:
+            svg_path: Path to SVG file
+            object_height_mm: Physical height of object in mm (sets the render size)
+
+        Returns:
+            Rendered pixmap, a transparent placeholder of the same aspect
+            ratio, or None if the SVG is invalid
+        """
+        # Calculate target resolution based on physical size
+        # Larger objects need higher resolution for zoom detail
+        # Use ~100 pixels per mm as a base (0.01mm per pixel at 1:1 zoom)
+        # Clamp between 4000px (small) and 8000px (large) to stay under Qt's 256MB limit
+        # 8000x8000 RGBA = 256MB uncompressed, so 8000px is the safe maximum
+        target_height = max(4000, min(8000, int(object_height_mm * 100)))
+
+        # Identical images (any path) are rendered and decoded once
+        cache_key = ComponentSprite._get_cache_key(svg_path, target_height)
+        pix = ComponentSprite._recent_pixmap(cache_key)
+        if pix is not None:
+            return pix
+
+        size = ComponentSprite._svg_size(svg_path)
+        if size is None:
+            return None
+        placeholder = QtGui.QPixmap(
+            max(1, round(ComponentSprite._PLACEHOLDER_HEIGHT * size.width() / size.height())),
+            ComponentSprite._PLACEHOLDER_HEIGHT,
+        )
+        placeholder.fill(QtCore.Qt.GlobalColor.transparent)
+        self._placeholder = True
+
+        from .svg_rasterizer import get_svg_rasterizer
+
+        logging.debug(f"Rendering SVG in background: {Path(svg_path).name} at {target_height}px")
+        get_svg_rasterizer().request(
+            cache_key,
+            svg_path,
+            target_height,
+            self,
+            lambda rendered: self._on_svg_rendered(cache_key, rendered),
+        )
+        return placeholder
+
+    def _on_svg_rendered(self, cache_key: str, pix: QtGui.QPixmap | None) -> None:
+        """Swap the placeholder for the background render."""
+        self._placeholder = False
+        if pix is None or pix.isNull():
+            self.setVisible(False)
+            return
+        shared = ComponentSprite._shared_pixmap(cache_key, lambda: pix)
+        par = self.parentItem()
+        if par is not None:
+            # The sprite is part of the parent's bounds
+            par.prepareGeometryChange()
+        self._apply_pixmap(pix if shared is None else shared)
 
     def paint(
         self,
@@ -317,8 +376,16 @@ class ComponentSprite(QtWidgets.QGraphicsPixmapItem):
             self._parent_was_selected = is_selected
             self.update()  # Force cache refresh
 
-        # Draw the pixmap
-        super().paint(p, opt, widget)
+        if self._placeholder:
+            # Outline until the background render arrives
+            pen = QtGui.QPen(QtGui.QColor(150, 150, 150), 1.0, QtCore.Qt.PenStyle.DashLine)
+            pen.setCosmetic(True)
+            p.setPen(pen)
+            p.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+            p.drawRect(self.boundingRect())
+        else:
+            # Draw the pixmap
+            super().paint(p, opt, widget)
 
         # Add blue tint if parent is selected
         if is_selected:
@@ -327,82 +394,81 @@ class ComponentSprite(QtWidgets.QGraphicsPixmapItem):
             p.setBrush(QtGui.QColor(30, 144, 255, 70))  # Translucent blue
             p.drawRect(self.boundingRect())
 
-    @staticmethod
-    def _render_svg_to_pixmap(svg_path: str, object_height_mm: float) -> QtGui.QPixmap | None:
-        """
-        Render SVG to high-resolution pixmap with caching.
-
-        Renders at high resolution (4000-8000px) to ensure sharpness at all zoom levels.
-        Qt's image allocation limit is increased to 1GB to support large PNG cache files.
-        Qt's GPU-accelerated smooth transformation handles scaling efficiently.
-
-        Uses disk cache (PNG format - lossless) to avoid re-rendering the same SVG.
-        Shows busy cursor during rendering. Cache persists between app sessions.
-
-        Args:
-            svg_path: Path to SVG file
-            object_height_mm: Physical height of object in mm (used to calculate target pixel size)
-
-        Returns:
-            QPixmap with rendered SVG, or None if rendering fails
-        """
-        if not HAVE_QTSVG:
-            return None
-
-        # Calculate target resolution based on physical size
-        # Larger objects need higher resolution for zoom detail
-        # Use ~100 pixels per mm as a base (0.01mm per pixel at 1:1 zoom)
-        # Clamp between 4000px (small) and 8000px (large) to stay under Qt's 256MB limit
-        # 8000x8000 RGBA = 256MB uncompressed, so 8000px is the safe maximum
-        target_height = max(4000, min(8000, int(object_height_mm * 100)))
+    # Recently used pixmaps by content key. QPixmap is implicitly shared, so
+    # sprites of components with identical images share one decoded copy.
+    _shared_pixmaps: OrderedDict[str, QtGui.QPixmap] = OrderedDict()
+    _SHARED_PIXMAPS_BYTES = 256 * 1024 * 1024
 
-        logging.debug(
-            f"Rendering SVG: {Path(svg_path).name} at {target_height}px (HAVE_CACHE={HAVE_CACHE})"
-        )
+    @staticmethod
+    def _shared_pixmap(key: str, load: Callable[[], QtGui.QPixmap | None]) -> QtGui.QPixmap | None:
+        """Return the pixmap for key, loading it with load() if not recently used."""
+        shared = ComponentSprite._shared_pixmaps
+        pix = ComponentSprite._recent_pixmap(key)
+        if pix is not None:
+            return pix
+        pix = load()
+        if pix is None or pix.isNull():
+            return pix
 
-        # Try to load from cache first
-        cached_pix = ComponentSprite._load_from_cache(svg_path, target_height)
-        if cached_pix and not cached_pix.isNull():
-            return cached_pix
+        def size(p: QtGui.QPixmap) -> int:
+            return p.width() * p.height() * 4
 
-        # Cache miss - show loading indicator and render
-        logging.debug("Rendering SVG from scratch...")
-        QtGui.QGuiApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
+        budget = ComponentSprite._SHARED_PIXMAPS_BYTES
+        if size(pix) <= budget:
+            shared[key] = pix
+            used = sum(size(p) for p in shared.values())
+            while used > budget:
+                _, evicted = shared.popitem(last=False)
+                used -= size(evicted)
+        return pix
 
+    @staticmethod
+    def _content_key(image_path: str) -> str:
+        """Content hash of an image file (path and mtime if it cannot be hashed)."""
         try:
-            renderer = QtSvg.QSvgRenderer(svg_path)
-            if not renderer.isValid():
-                return None
-
-            # Get SVG's default size and aspect ratio
-            default_size = renderer.defaultSize()
-            if default_size.height() <= 0:
-                return None
-
-            aspect = default_size.width() / default_size.height()
-
-            # Calculate width maintaining aspect ratio
-            target_width = int(target_height * aspect)
-            target_size = QtCore.QSize(target_width, target_height)
+            return image_content_hash(image_path)
+        except OSError:
+            try:
+                mtime = os.path.getmtime(image_path)
+            except OSError:
+                mtime = 0
+            return f"{image_path}:{mtime}"
 
-            # Create pixmap and render SVG
-            pix = QtGui.QPixmap(target_size)
-            pix.fill(QtCore.Qt.GlobalColor.transparent)
+    @staticmethod
+    def _load_raster(image_path: str) -> QtGui.QPixmap:
+        """Load a raster image with device pixel ratio 1.0."""
+        img = QtGui.QPixmap(image_path).toImage()
+        img.setDevicePixelRatio(1.0)
+        return QtGui.QPixmap.fromImage(img)
 
-            painter = QtGui.QPainter(pix)
-            painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, True)
-            painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform, True)
-            renderer.render(painter)
-            painter.end()
+    # Height of the placeholder pixmap shown while an SVG renders; only its
+    # aspect ratio matters, it is scaled to the final size
+    _PLACEHOLDER_HEIGHT = 512
 
-            # Save to cache for future use
-            ComponentSprite._save_to_cache(svg_path, target_height, pix)
+    # Default SVG sizes by content key (parsing is cheap, rendering is not)
+    _svg_sizes: dict[str, QtCore.QSize] = {}
 
-            return pix
+    @staticmethod
+    def _recent_pixmap(key: str) -> QtGui.QPixmap | None:
+        """Pixmap for key if it is among the recently used ones."""
+        shared = ComponentSprite._shared_pixmaps
+        pix = shared.get(key)
+        if pix is not None:
+            shared.move_to_end(key)
+        return pix
 
-        finally:
-            # Always restore cursor
-            QtGui.QGuiApplication.restoreOverrideCursor()
+    @staticmethod
+    def _svg_size(svg_path: str) -> QtCore.QSize | None:
+        """Default size of an SVG, or None if it is invalid or empty."""
+        content_key = ComponentSprite._content_key(svg_path)
+        size = ComponentSprite._svg_sizes.get(content_key)
+        if size is None:
+            renderer = QtSvg.QSvgRenderer(svg_path)
+            size = renderer.defaultSize() if renderer.isValid() else QtCore.QSize()
+            ComponentSprite._svg_sizes[content_key] = size
+        if size.width() <= 0 or size.height() <= 0:
+            return None
+        return size
 
     @staticmethod
     def _get_cache_key(svg_path: str, target_height: int) -> str:
@@ -416,100 +482,12 @@ class ComponentSprite(QtWidgets.QGraphicsPixmapItem):
         Returns:
             Cache key (hash string)
         """
-        # Include file modification time to invalidate cache when SVG changes
-        try:
-            mtime = os.path.getmtime(svg_path)
-        except OSError:
-            mtime = 0
-
-        # Create hash from path, height, and modification time
-        key_str = f"{svg_path}:{target_height}:{mtime}"
+        # Key on the file content, so copies of the same SVG share one
+        # rendering and edits to the file invalidate it
+        key_str = f"{ComponentSprite._content_key(svg_path)}:{target_height}"
         hash_obj = hashlib.sha256(key_str.encode("utf-8"))
         return hash_obj.hexdigest()[:16]  # Use first 16 chars for shorter filename
 
-    @staticmethod
-    def _load_from_cache(svg_path: str, target_height: int) -> QtGui.QPixmap | None:
-        """
-        Load rendered SVG from cache.
-
-        Args:
-            svg_path: Path to SVG file
-            target_height: Target render height in pixels
-
-        Returns:
-            Cached pixmap if found, None otherwise
-        """
-        if not HAVE_CACHE:
-            return None
-
-        try:
-            cache_dir = svg_cache_dir()
-            cache_key = ComponentSprite._get_cache_key(svg_path, target_height)
-            cache_file = Path(cache_dir) / f"{cache_key}.png"  # Use PNG for lossless quality
-
-            if cache_file.exists():
-                pix = QtGui.QPixmap(str(cache_file))
-                if not pix.isNull():
-                    file_size_mb = cache_file.stat().st_size / (1024 * 1024)
-                    logging.debug(
-                        f"SVG cache hit: {cache_file.name} "
-                        f"({pix.width()}x{pix.height()}, {file_size_mb:.1f}MB)"
-                    )
-                    return pix
-                else:
-                    logging.warning(
-                        f"SVG cache file corrupted or exceeds Qt limit: {cache_file.name}"
-                    )
-                    # Delete corrupted file
-                    try:
-                        cache_file.unlink()
-                    except OSError:
-                        pass  # File may be locked or already deleted
-            else:
-                logging.debug(f"SVG cache miss: {cache_key}.png not found in {cache_dir}")
-        except OSError as e:
-            logging.error(f"Error loading from SVG cache: {e}")
-
-        return None
-
-    @staticmethod
-    def _save_to_cache(svg_path: str, target_height: int, pixmap: QtGui.QPixmap) -> None:
-        """
-        Save rendered SVG to cache.
-
-        Args:
-            svg_path: Path to SVG file
-            target_height: Target render height in pixels
-            pixmap: Rendered pixmap to cache
-        """
-        if not HAVE_CACHE:
-            logging.debug("SVG caching disabled (HAVE_CACHE=False)")
-            return
-
-        if pixmap.isNull():
-            logging.warning("Cannot save null pixmap to cache")
-            return
-
-        try:
-            cache_dir = svg_cache_dir()
-            cache_key = ComponentSprite._get_cache_key(svg_path, target_height)
-            cache_file = Path(cache_dir) / f"{cache_key}.png"
-
-            # Save as PNG for lossless quality
-            # Qt's image allocation limit has been increased to 1GB to support large cached files
-            # PNG provides perfect quality for technical drawings
-            success = pixmap.save(str(cache_file), "PNG")
-            if success:
-                file_size_mb = cache_file.stat().st_size / (1024 * 1024)
-                logging.debug(
-                    f"SVG cached successfully: {cache_file.name} "
-                    f"({pixmap.width()}x{pixmap.height()}, {file_size_mb:.1f}MB)"
-                )
-            else:
-                logging.error(f"Failed to save SVG cache file: {cache_file}")
-        except OSError as e:
-            logging.error(f"Error saving to SVG cache: {e}")
-
 
 def create_component_sprite(
     image_path: str,
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import json
 import logging
-import os
 from pathlib import Path
 from typing import Any
 
 from ..core.models import ComponentRecord, deserialize_component
+from .library_index import LibraryIndex, read_component_data
 
 _logger = logging.getLogger(__name__)
 
@@ -51,25 +51,8 @@ def load_component_records(
     is_builtin = library_path is None
 
     for folder in _iter_component_json_files(library_path):
-        json_path = folder / "component.json"
         try:
-            with open(json_path, encoding="utf-8") as f:
-                data: dict[str, Any] = json.load(f)
-
-            # Resolve image_path
-            image_path = data.get("image_path")
-            if isinstance(image_path, str) and image_path and not os.path.isabs(image_path):
-                if is_builtin:
-                    # Convert images/file.png -> objects/library/<component>/images/file.png
-                    component_name = folder.name
-                    package_relative = f"objects/library/{component_name}/{image_path}"
-                    data["image_path"] = package_relative
-                else:
-                    # For user/custom libraries, make path absolute relative to component folder
-                    abs_path = (folder / image_path).resolve()
-                    data["image_path"] = str(abs_path)
-
-            rec = deserialize_component(data, settings_service)
+            rec = deserialize_component(read_component_data(folder, is_builtin), settings_service)
             if rec is not None:
                 records.append(rec)
         except (json.JSONDecodeError, OSError, KeyError, TypeError, ValueError) as e:
@@ -109,6 +92,9 @@ def load_component_dicts(library_path: Path | None = None) -> list[dict[str, Any
     """
     Load components and return them as JSON-serializable dicts.
 
+    Goes through the library's persistent index, so only component folders
+    that changed since the last load are parsed.
+
     Note: Unlike serialize_component(), this preserves absolute image paths
     so that the library UI can load thumbnail icons.
 
@@ -118,32 +104,9 @@ def load_component_dicts(library_path: Path | None = None) -> list[dict[str, Any
     Returns:
         List of component dictionaries
     """
-    result: list[dict[str, Any]] = []
-    for rec in load_component_records(library_path):
-        try:
-            # Create dict manually to preserve absolute image_path
-            # (serialize_component() would convert to relative for portability)
-            component_dict = {
-                "name": rec.name,
-                "image_path": rec.image_path,  # Keep absolute for UI thumbnails
-                "object_height_mm": float(rec.object_height_mm),
-                "angle_deg": float(rec.angle_deg),
-                "notes": rec.notes or "",
-            }
-
-            # Include category if present
-            if rec.category:
-                component_dict["category"] = rec.category
-
-            # Serialize interfaces
-            if rec.interfaces:
-                component_dict["interfaces"] = [iface.to_dict() for iface in rec.interfaces]
-
-            result.append(component_dict)
-        except (json.JSONDecodeError, OSError, KeyError, TypeError, ValueError) as e:
-            _logger.warning("Failed to load component dict from %s: %s", rec.name, e)
-            continue
-    return result
+    is_builtin = library_path is None
+    root = _library_root() if library_path is None else library_path
+    return LibraryIndex(root, builtin=is_builtin).load()
 
 
 def load_component_dicts_from_multiple(
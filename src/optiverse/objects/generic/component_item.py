@@ -7,7 +7,7 @@ from PyQt6 import QtCore, QtGui, QtWidgets
 
 from ...core.interface_definition import InterfaceDefinition
 from ...core.models import ComponentParams
-from ...core.raytracing_math import qt_angle_to_user, user_angle_to_qt
+from ...core.utils import qt_angle_to_user, user_angle_to_qt
 from ...ui.widgets.interface_properties_widget import InterfacePropertiesWidget
 from ...ui.widgets.smart_spinbox import SmartDoubleSpinBox
 from ..base_obj import BaseObj
@@ -206,6 +206,7 @@ class ComponentItem(BaseObj):
             "polarizing_interface": QtGui.QColor(100, 200, 100),  # Light green
             "refractive_interface": QtGui.QColor(100, 100, 255),  # Light blue
             "beam_block": QtGui.QColor(50, 50, 50),  # Dark grey
+            "detector": QtGui.QColor(220, 40, 40),  # Red
         }
         return color_map.get(element_type, QtGui.QColor(150, 100, 255))  # Purple default
 
@@ -0,0 +1,325 @@
+"""
+Persistent on-disk index of component libraries.
+
+Loading a library means opening, parsing and normalizing every
+component.json below the library root, which is slow for large libraries
+on network drives. LibraryIndex keeps one compact JSON file per library
+root with the normalized component dicts plus the mtime and size of every
+component.json. On load the root is scanned once; only folders whose
+component.json changed (or appeared) are parsed again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ..core.models import ComponentRecord, deserialize_component
+from ..platform.paths import IMAGE_REF_PREFIX, resolve_image_ref
+
+_logger = logging.getLogger(__name__)
+
+# Bump when the parsed record format changes to invalidate existing indexes
+INDEX_VERSION = 1
+
+# Files modified this close to the index write are re-parsed on the next
+# load: a coarse-grained filesystem clock (FAT, some network shares) could
+# otherwise hide a same-size rewrite within the same timestamp tick
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def read_component_data(folder: Path, is_builtin: bool) -> dict[str, Any]:
+    """
+    Read a component folder's component.json with its image path resolved.
+
+    Built-in components get package-relative image paths, other libraries
+    absolute paths relative to the component folder. @image references are
+    resolved against the component's library first (other roots otherwise).
+
+    Raises:
+        OSError, json.JSONDecodeError: If the file cannot be read or parsed
+    """
+    with open(folder / "component.json", encoding="utf-8") as f:
+        data: dict[str, Any] = json.load(f)
+
+    image_path = data.get("image_path")
+    if isinstance(image_path, str) and image_path.startswith(IMAGE_REF_PREFIX):
+        # Image store blob: prefer the component's own library
+        data["image_path"] = resolve_image_ref(image_path, [folder.parent]) or image_path
+    elif isinstance(image_path, str) and image_path and not os.path.isabs(image_path):
+        if is_builtin:
+            # Convert images/file.png -> objects/library/<component>/images/file.png
+            data["image_path"] = f"objects/library/{folder.name}/{image_path}"
+        else:
+            # For user/custom libraries, make path absolute relative to component folder
+            data["image_path"] = str((folder / image_path).resolve())
+    return data
+
+
+def component_record_to_dict(rec: ComponentRecord) -> dict[str, Any]:
+    """
+    Convert a ComponentRecord to the dict used by the library UI.
+
+    Unlike serialize_component(), this keeps absolute image paths so that
+    the library can load thumbnail icons.
+    """
+    component_dict: dict[str, Any] = {
+        "name": rec.name,
+        "image_path": rec.image_path,
+        "object_height_mm": float(rec.object_height_mm),
+        "angle_deg": float(rec.angle_deg),
+        "notes": rec.notes or "",
+    }
+    if rec.category:
+        component_dict["category"] = rec.category
+    if rec.interfaces:
+        component_dict["interfaces"] = [iface.to_dict() for iface in rec.interfaces]
+    return component_dict
+
+
+def _stat_component(folder: Path) -> list[int] | None:
+    """(mtime_ns, size) of a folder's component.json, or None if it has none."""
+    try:
+        st = os.stat(folder / "component.json")
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def default_index_path(root: Path) -> Path:
+    """Index file for a library root, inside the application data directory."""
+    from ..platform.paths import library_index_dir
+
+    digest = hashlib.sha1(str(root.resolve()).encode("utf-8")).hexdigest()[:16]
+    return Path(library_index_dir()) / f"{digest}.json"
+
+
+@dataclass
+class IndexStats:
+    """What the last LibraryIndex.load() did."""
+
+    reused: int = 0  # Records taken from the index
+    parsed: int = 0  # component.json files parsed
+    removed: int = 0  # Indexed folders that no longer exist
+
+
+class LibraryIndex:
+    """
+    Component library index for one library root.
+
+    The index file is a cache: if it is missing, unreadable, from another
+    version or was built with different library roots, the library is
+    simply parsed again and the index rewritten. Write failures (e.g. a
+    read-only data directory) are logged and otherwise ignored.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        builtin: bool = False,
+        settings_service=None,
+        index_path: Path | None = None,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            root: Library root containing one folder per component
+            builtin: Whether root is the built-in library (package-relative images)
+            settings_service: Optional SettingsService for image path resolution
+            index_path: Index file location; defaults to the app data directory
+        """
+        self.root = Path(root)
+        self.builtin = builtin
+        self.settings_service = settings_service
+        self._index_path = index_path
+        self.stats = IndexStats()
+
+    @property
+    def index_path(self) -> Path:
+        if self._index_path is None:
+            self._index_path = default_index_path(self.root)
+        return self._index_path
+
+    def load(
+        self,
+        executor: Executor | None = None,
+        on_batch: Callable[[list[dict[str, Any]]], None] | None = None,
+        batch_size: int = 64,
+    ) -> list[dict[str, Any]]:
+        """
+        Load all component dicts of the library, using the index where valid.
+
+        Args:
+            executor: Optional executor used to stat and parse component
+                      folders concurrently (worthwhile on network drives)
+            on_batch: Optional callback receiving the component dicts while
+                      loading, in batches of up to batch_size: the indexed
+                      ones right after the scan, then the parsed ones as
+                      they become available
+            batch_size: Component dicts per on_batch call
+
+        Returns:
+            Component dicts in directory order (same as load_component_dicts)
+        """
+        self.stats = IndexStats()
+        if not self.root.is_dir():
+            return []
+
+        roots_key = self._roots_key()
+        cached = self._read_index(roots_key)
+        entries: dict[str, dict[str, Any]] = {}
+
+        # A single scan of the root; one stat per component.json
+        with os.scandir(self.root) as it:
+            names = [entry.name for entry in it if entry.is_dir()]
+        folders = [self.root / name for name in names]
+        stamps = list(
+            executor.map(_stat_component, folders) if executor else map(_stat_component, folders)
+        )
+
+        batch: list[dict[str, Any]] = []
+
+        def deliver(record: dict[str, Any] | None, last: bool = False) -> None:
+            if on_batch is None:
+                return
+            if record is not None:
+                batch.append(record)
+            if batch and (last or len(batch) >= batch_size):
+                on_batch(batch.copy())
+                batch.clear()
+
+        stale: list[int] = []
+        for i, (name, stamp) in enumerate(zip(names, stamps)):
+            if stamp is None:
+                continue
+            old = cached.pop(name, None)
+            if old is not None and old["stamp"] == stamp and not old.get("racy"):
+                entries[name] = old
+                self.stats.reused += 1
+                deliver(old["record"])
+            else:
+                entries[name] = {"stamp": stamp, "record": None}
+                stale.append(i)
+        deliver(None, last=True)
+
+        to_parse = [folders[i] for i in stale]
+        parsed = executor.map(self._parse, to_parse) if executor else map(self._parse, to_parse)
+        for i, record in zip(stale, parsed):
+            entries[names[i]]["record"] = record
+            deliver(record)
+        deliver(None, last=True)
+        self.stats.parsed = len(stale)
+        self.stats.removed = len(cached)
+
+        if stale or cached:
+            self._write_index(roots_key, entries)
+        return [entry["record"] for entry in entries.values() if entry["record"] is not None]
+
+    def invalidate(self) -> None:
+        """Delete the index file so the next load parses everything."""
+        try:
+            self.index_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            _logger.debug("Failed to delete library index %s: %s", self.index_path, e)
+
+    def _parse(self, folder: Path) -> dict[str, Any] | None:
+        """Parse one component folder; failures are cached as None."""
+        try:
+            rec = deserialize_component(
+                read_component_data(folder, self.builtin), self.settings_service
+            )
+            return component_record_to_dict(rec) if rec is not None else None
+        except (json.JSONDecodeError, OSError, KeyError, TypeError, ValueError) as e:
+            _logger.warning("Failed to load component from %s: %s", folder, e)
+            return None
+
+    def _roots_key(self) -> list[str]:
+        """Library roots used to resolve @component/@library image paths."""
+        if self.builtin:
+            # Built-in records only use package-relative paths
+            return []
+        from ..platform.paths import get_all_library_roots
+
+        return [str(p) for p in get_all_library_roots(self.settings_service)]
+
+    def _read_index(self, roots_key: list[str]) -> dict[str, dict[str, Any]]:
+        """Read the index file, returning {} if it is missing or stale."""
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            _logger.debug("Ignoring unreadable library index %s: %s", self.index_path, e)
+            return {}
+
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != INDEX_VERSION
+            or data.get("root") != str(self.root.resolve())
+            or data.get("builtin") != self.builtin
+            or data.get("roots") != roots_key
+            or not isinstance(data.get("entries"), dict)
+        ):
+            return {}
+
+        # Entries written too close to their file's mtime are re-validated
+        written_ns = int(data.get("written_ns", 0))
+        entries: dict[str, dict[str, Any]] = data["entries"]
+        for entry in entries.values():
+            if entry["stamp"][0] >= written_ns - _RACY_WINDOW_NS:
+                entry["racy"] = True
+        return entries
+
+    def _write_index(self, roots_key: list[str], entries: dict[str, dict[str, Any]]) -> None:
+        """Atomically replace the index file."""
+        for entry in entries.values():
+            entry.pop("racy", None)
+        data = {
+            "version": INDEX_VERSION,
+            "root": str(self.root.resolve()),
+            "builtin": self.builtin,
+            "roots": roots_key,
+            "written_ns": time.time_ns(),
+            "entries": entries,
+        }
+        try:
+            path = self.index_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.stem, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            _logger.debug("Failed to write library index %s: %s", self._index_path, e)
+
+
+def load_indexed_component_dicts(
+    root: Path,
+    *,
+    builtin: bool = False,
+    settings_service=None,
+    executor: Executor | None = None,
+    on_batch: Callable[[list[dict[str, Any]]], None] | None = None,
+    batch_size: int = 64,
+) -> list[dict[str, Any]]:
+    """Load a library's component dicts through its persistent index (see LibraryIndex.load)."""
+    index = LibraryIndex(root, builtin=builtin, settings_service=settings_service)
+    return index.load(executor, on_batch, batch_size)
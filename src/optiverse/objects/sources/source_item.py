@@ -11,7 +11,7 @@ from ...core.color_utils import (
     wavelength_to_hex,
 )
 from ...core.models import SourceParams
-from ...core.raytracing_math import qt_angle_to_user, user_angle_to_qt
+from ...core.utils import qt_angle_to_user, user_angle_to_qt
 from ...ui.widgets.smart_spinbox import SmartDoubleSpinBox
 from ..base_obj import BaseObj
 from ..type_registry import deserialize_item, register_type, serialize_item
@@ -181,6 +181,41 @@ class SourceItem(BaseObj):
         spr.setSuffix(" °")
         spr.setValue(self.params.spread_deg)
 
+        # Monte Carlo sampling controls
+        sampling = QtWidgets.QComboBox()
+        sampling.addItem("Fan (evenly spaced)", "fan")
+        sampling.addItem("Monte Carlo (random)", "monte_carlo")
+        sampling.setCurrentIndex(max(0, sampling.findData(self.params.sampling_mode)))
+
+        ang_dist = QtWidgets.QComboBox()
+        ang_dist.addItems(["gaussian", "lambertian", "uniform"])
+        ang_dist.setCurrentIndex(max(0, ang_dist.findText(self.params.angular_distribution)))
+        ang_dist.setToolTip(
+            "Gaussian: spread is the 1/e² half-angle\n"
+            "Lambertian: cosine law, truncated at the spread\n"
+            "Uniform: flat within ± spread"
+        )
+
+        bandwidth = QtWidgets.QDoubleSpinBox()
+        bandwidth.setRange(0, 1000)
+        bandwidth.setDecimals(2)
+        bandwidth.setSuffix(" nm")
+        bandwidth.setValue(self.params.bandwidth_nm)
+        bandwidth.setToolTip("Spectral width (FWHM); 0 = monochromatic")
+
+        seed = QtWidgets.QSpinBox()
+        seed.setRange(0, 2**31 - 1)
+        seed.setValue(self.params.random_seed)
+
+        def on_sampling_changed(_idx: int):
+            use_mc = sampling.currentData() == "monte_carlo"
+            ang_dist.setEnabled(use_mc)
+            bandwidth.setEnabled(use_mc)
+            seed.setEnabled(use_mc)
+
+        sampling.currentIndexChanged.connect(on_sampling_changed)
+        on_sampling_changed(sampling.currentIndex())
+
         # Wavelength controls
         wl_mode = QtWidgets.QComboBox()
         wl_mode.addItems(["Custom Color", "Wavelength"])
@@ -322,6 +357,10 @@ class SourceItem(BaseObj):
         f.addRow("# Rays", nr)
         f.addRow("Ray length", rlen)
         f.addRow("Angular spread (±)", spr)
+        f.addRow("Sampling", sampling)
+        f.addRow("Angular distribution", ang_dist)
+        f.addRow("Bandwidth (FWHM)", bandwidth)
+        f.addRow("Random seed", seed)
         f.addRow("Color Mode", wl_mode)
         f.addRow("Wavelength Preset", wl_preset)
         f.addRow("Wavelength", wl_spin)
@@ -351,6 +390,10 @@ class SourceItem(BaseObj):
             self.params.n_rays = nr.value()
             self.params.ray_length_mm = rlen.value()
             self.params.spread_deg = spr.value()
+            self.params.sampling_mode = sampling.currentData()
+            self.params.angular_distribution = ang_dist.currentText()
+            self.params.bandwidth_nm = bandwidth.value()
+            self.params.random_seed = seed.value()
 
             # Save wavelength and color based on mode
             # Wavelength is always saved regardless of mode
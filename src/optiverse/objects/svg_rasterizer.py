@@ -0,0 +1,263 @@
+"""
+Background rasterization of component SVGs.
+
+Rendering a component SVG at 4000-8000 px takes up to seconds, and even
+decoding a cached render is slow, so sprites no longer do either on the
+GUI thread. SvgRasterizer loads the render from the disk cache or renders
+the SVG into a QImage (safe to paint outside the GUI thread) on a small
+worker pool and delivers it to the waiting sprites through a queued
+signal. Requests are deduplicated by cache key and dispatched once the
+event loop runs, so sprites that are already in a scene are known:
+renders for sprites inside a view's visible area start first.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+_logger = logging.getLogger(__name__)
+
+# Concurrent renders; an 8000 px render needs 256 MB of image memory
+RENDER_WORKERS = 2
+
+# Job priorities (lower runs first)
+PRIORITY_VISIBLE = 0
+PRIORITY_HIDDEN = 1
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    key: str = field(compare=False)
+    svg_path: str = field(compare=False)
+    target_height: int = field(compare=False)
+
+
+def render_svg_image(svg_path: str, target_height: int) -> QtGui.QImage | None:
+    """
+    Render an SVG at target_height pixels (width keeps the aspect ratio).
+
+    Safe to call from any thread.
+
+    Returns:
+        Rendered image, or None if the SVG is invalid or empty
+    """
+    from PyQt6 import QtSvg
+
+    renderer = QtSvg.QSvgRenderer(svg_path)
+    if not renderer.isValid():
+        return None
+    default_size = renderer.defaultSize()
+    if default_size.height() <= 0:
+        return None
+
+    aspect = default_size.width() / default_size.height()
+    image = QtGui.QImage(
+        max(1, int(target_height * aspect)),
+        target_height,
+        QtGui.QImage.Format.Format_ARGB32_Premultiplied,
+    )
+    image.fill(QtCore.Qt.GlobalColor.transparent)
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, True)
+    painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform, True)
+    renderer.render(painter)
+    painter.end()
+    return image
+
+
+def _load_cached(key: str) -> QtGui.QImage | None:
+    """Decode a render from the disk cache (None on a miss or a damaged file)."""
+    from .svg_render_cache import get_svg_render_cache
+
+    cache = get_svg_render_cache()
+    path = cache.lookup(key)
+    if path is None:
+        return None
+    image = QtGui.QImage(str(path))
+    if image.isNull():
+        _logger.warning("SVG cache file missing, corrupted or exceeds Qt limit: %s", path.name)
+        cache.discard(key)
+        return None
+    return image
+
+
+def _store_cached(key: str, svg_path: str, target_height: int, image: QtGui.QImage) -> None:
+    """Save a render to the disk cache, replacing older renders of the same file."""
+    from .svg_render_cache import get_svg_render_cache
+
+    cache = get_svg_render_cache()
+    path = cache.file_for(key)
+    # PNG: lossless, technical drawings stay sharp
+    if image.save(str(path), "PNG"):
+        cache.add(key, path, source=f"{svg_path}:{target_height}")
+    else:
+        _logger.error("Failed to save SVG cache file: %s", path)
+
+
+def is_in_viewport(item: QtWidgets.QGraphicsItem) -> bool:
+    """Whether an item intersects the visible area of any view of its scene."""
+    scene = item.scene()
+    if scene is None:
+        return False
+    bounds = item.sceneBoundingRect()
+    for view in scene.views():
+        viewport = view.viewport()
+        if viewport is None:
+            continue
+        visible = view.mapToScene(viewport.rect()).boundingRect()
+        if visible.intersects(bounds):
+            return True
+    return False
+
+
+class SvgRasterizer(QtCore.QObject):
+    """
+    Renders SVGs on a worker pool, visible sprites first.
+
+    Signals:
+        rendered(str, QImage): Emitted from a worker thread when the render
+            for a cache key is ready (a null image if rendering failed)
+    """
+
+    rendered = QtCore.pyqtSignal(str, QtGui.QImage)
+
+    def __init__(self, workers: int = RENDER_WORKERS, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self._workers = workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._heap: list[_Job] = []
+        self._seq = itertools.count()
+        # Waiting sprites per cache key: (item, callback)
+        self._waiters: dict[str, list[tuple[QtWidgets.QGraphicsItem, Callable]]] = {}
+        # Requested keys not yet queued (queued by _dispatch())
+        self._undispatched: dict[str, tuple[str, int]] = {}
+        # The PyQt6 stubs omit connect()'s connection type argument
+        self.rendered.connect(
+            self._on_rendered,
+            QtCore.Qt.ConnectionType.QueuedConnection,  # type: ignore[call-arg]
+        )
+
+    def request(
+        self,
+        key: str,
+        svg_path: str,
+        target_height: int,
+        item: QtWidgets.QGraphicsItem,
+        callback: Callable[[QtGui.QPixmap | None], None],
+    ) -> None:
+        """
+        Render an SVG in the background.
+
+        Args:
+            key: Render cache key (requests for the same key share one render)
+            svg_path: SVG file
+            target_height: Render height in pixels
+            item: Waiting graphics item (used for viewport prioritization)
+            callback: Called in the GUI thread with the pixmap, or None on failure
+        """
+        waiters = self._waiters.setdefault(key, [])
+        waiters.append((item, callback))
+        if len(waiters) > 1:
+            return  # Already requested
+        if not self._undispatched:
+            QtCore.QTimer.singleShot(0, self._dispatch)
+        self._undispatched[key] = (svg_path, target_height)
+
+    def pending(self) -> int:
+        """Number of renders requested and not yet delivered."""
+        return len(self._waiters)
+
+    def cancel_pending(self) -> None:
+        """Drop renders that have not started (e.g. on shutdown)."""
+        with self._lock:
+            self._heap.clear()
+        self._undispatched.clear()
+        self._waiters.clear()
+
+    def shutdown(self) -> None:
+        """
+        Drop pending renders and stop the worker pool (e.g. on shutdown).
+
+        Renders already running finish in the background; their results are
+        not delivered to any sprite.
+        """
+        self.cancel_pending()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _dispatch(self) -> None:
+        """Queue requested renders, those of visible sprites first."""
+        requests, self._undispatched = self._undispatched, {}
+        for key, (svg_path, target_height) in requests.items():
+            visible = any(_safe_in_viewport(item) for item, _callback in self._waiters.get(key, []))
+            job = _Job(
+                PRIORITY_VISIBLE if visible else PRIORITY_HIDDEN,
+                next(self._seq),
+                key,
+                svg_path,
+                target_height,
+            )
+            with self._lock:
+                heapq.heappush(self._heap, job)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="svg-render"
+            )
+        # Each task runs whichever queued job has the highest priority
+        for _ in requests:
+            self._executor.submit(self._run_next)
+
+    def _run_next(self) -> None:
+        with self._lock:
+            if not self._heap:
+                return  # Cancelled
+            job = heapq.heappop(self._heap)
+        image: QtGui.QImage | None = None
+        try:
+            image = _load_cached(job.key)
+            if image is None:
+                image = render_svg_image(job.svg_path, job.target_height)
+                if image is not None:
+                    _store_cached(job.key, job.svg_path, job.target_height, image)
+        except (OSError, RuntimeError) as e:
+            _logger.error("Failed to render %s: %s", job.svg_path, e)
+        self.rendered.emit(job.key, image if image is not None else QtGui.QImage())
+
+    def _on_rendered(self, key: str, image: QtGui.QImage) -> None:
+        waiters = self._waiters.pop(key, [])
+        pix = QtGui.QPixmap.fromImage(image) if not image.isNull() else None
+        for _item, callback in waiters:
+            try:
+                callback(pix)
+            except RuntimeError:
+                pass  # Sprite deleted while waiting
+
+
+def _safe_in_viewport(item: QtWidgets.QGraphicsItem) -> bool:
+    try:
+        return is_in_viewport(item)
+    except RuntimeError:
+        return False  # Deleted item
+
+
+_rasterizer: SvgRasterizer | None = None
+
+
+def get_svg_rasterizer() -> SvgRasterizer:
+    """The application's shared SVG rasterizer."""
+    global _rasterizer
+    if _rasterizer is None:
+        _rasterizer = SvgRasterizer()
+    return _rasterizer
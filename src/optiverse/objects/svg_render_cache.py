@@ -0,0 +1,338 @@
+"""
+Size-bounded disk cache of rendered SVG sprites.
+
+Component SVGs are rendered to PNGs of up to 8000 px, tens of MB each, and
+kept in svg_cache_dir() between sessions. SvgRenderCache keeps a small
+index file in that directory (key -> file, size, last access, source) so
+lookups need no file system probes, and evicts the least recently used
+renders once the cache exceeds its size budget.
+
+A render replaces older renders of the same source (same SVG path and
+size), so renders of an SVG that has since changed are reclaimed right
+away. cleanup() additionally reconciles the index with the directory:
+files missing from the index (e.g. renders from older versions) are
+deleted, index entries without a file are dropped. It runs on a background
+thread at startup.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+_logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.json"
+
+# Bump when the index format changes to discard existing indexes
+INDEX_VERSION = 1
+
+# Settings key of the cache size budget in MB
+MAX_SIZE_SETTING = "svg_cache_max_mb"
+DEFAULT_MAX_MB = 1024
+
+# Unindexed files younger than this are left alone by cleanup(): they may
+# have just been written and not be registered yet
+_ORPHAN_GRACE_SECONDS = 60.0
+
+_MB = 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    """Current size of an SvgRenderCache."""
+
+    entries: int
+    total_bytes: int
+    max_bytes: int
+
+
+class SvgRenderCache:
+    """
+    Indexed SVG render cache for one directory.
+
+    Thread-safe: lookups and additions happen on the GUI thread while
+    cleanup() may run on a background thread. Index write failures are
+    logged and otherwise ignored; the index is rebuilt from the directory
+    if it is missing or unreadable.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_MB * _MB):
+        """
+        Initialize the cache (the index is read on first use).
+
+        Args:
+            directory: Directory holding the rendered files and the index
+            max_bytes: Size budget of the rendered files
+        """
+        self._dir = Path(directory)
+        self._max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._entries: dict[str, dict] | None = None
+        self._dirty = False
+
+    @property
+    def directory(self) -> Path:
+        """Directory holding the cache files."""
+        return self._dir
+
+    @property
+    def max_bytes(self) -> int:
+        """Size budget of the cache."""
+        return self._max_bytes
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """Change the size budget, evicting entries if the cache is now too large."""
+        with self._lock:
+            self._max_bytes = max(0, int(max_bytes))
+            if self._evict():
+                self._save()
+
+    def lookup(self, key: str) -> Path | None:
+        """
+        Get the file of a cached render and mark it as recently used.
+
+        The file is not checked for existence; if loading it fails, the
+        caller should discard() the key.
+
+        Returns:
+            Path of the cached file, or None if the key is not cached
+        """
+        with self._lock:
+            entry = self._index().get(key)
+            if entry is None:
+                return None
+            entry["atime"] = time.time()
+            self._dirty = True
+            return self._dir / str(entry["file"])
+
+    def file_for(self, key: str, suffix: str = ".png") -> Path:
+        """Path a new render for key should be written to before add()."""
+        self._dir.mkdir(parents=True, exist_ok=True)
+        return self._dir / f"{key}{suffix}"
+
+    def add(self, key: str, path: Path, source: str = "") -> None:
+        """
+        Register a render written to file_for(key).
+
+        Args:
+            key: Cache key
+            path: Written file inside the cache directory
+            source: What the render was made from (e.g. SVG path and size);
+                older renders of the same source are deleted
+        """
+        try:
+            size = path.stat().st_size
+        except OSError as e:
+            _logger.debug("Not caching missing render %s: %s", path, e)
+            return
+        with self._lock:
+            entries = self._index()
+            if source:
+                for old_key in [
+                    k for k, e in entries.items() if e.get("source") == source and k != key
+                ]:
+                    self._remove(old_key)
+            entries[key] = {
+                "file": path.name,
+                "size": size,
+                "atime": time.time(),
+                "source": source,
+            }
+            self._evict()
+            self._save()
+
+    def discard(self, key: str) -> None:
+        """Delete a cached render (e.g. a corrupted file)."""
+        with self._lock:
+            if key in self._index():
+                self._remove(key)
+                self._save()
+
+    def clear(self) -> None:
+        """Delete all cached renders."""
+        with self._lock:
+            for key in list(self._index()):
+                self._remove(key)
+            for path in self._render_files():
+                _unlink(path)
+            self._save()
+
+    def stats(self) -> CacheStats:
+        """Number and total size of the cached renders."""
+        with self._lock:
+            entries = self._index()
+            return CacheStats(
+                entries=len(entries),
+                total_bytes=sum(e["size"] for e in entries.values()),
+                max_bytes=self._max_bytes,
+            )
+
+    def flush(self) -> None:
+        """Write recent access times to the index file."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def cleanup(self) -> None:
+        """
+        Reconcile the index with the cache directory and enforce the budget.
+
+        Deletes unindexed render files (older than a grace period), drops
+        entries whose file is gone, refreshes sizes and evicts least
+        recently used entries beyond the size budget. The directory scan and
+        the deletions run without holding the lock, so lookups and additions
+        are not blocked meanwhile.
+        """
+        with self._lock:
+            scanned = dict(self._index())
+        indexed = {e["file"]: k for k, e in scanned.items()}
+        now = time.time()
+        sizes: dict[str, int] = {}
+        orphans: list[Path] = []
+        for path in self._render_files():
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            key = indexed.get(path.name)
+            if key is not None:
+                sizes[key] = st.st_size
+            elif now - st.st_mtime > _ORPHAN_GRACE_SECONDS:
+                orphans.append(path)
+
+        with self._lock:
+            entries = self._index()
+            for key, entry in scanned.items():
+                if entries.get(key) is not entry:
+                    continue  # Replaced or removed during the scan
+                if key in sizes:
+                    entry["size"] = sizes[key]
+                else:
+                    del entries[key]  # File deleted outside the cache
+            files = {e["file"] for e in entries.values()}
+            victims = [path for path in orphans if path.name not in files]
+            victims += [self._dir / e["file"] for e in self._pop_evicted()]
+        for path in victims:
+            _unlink(path)
+        with self._lock:
+            self._save()
+
+    def start_cleanup(self) -> threading.Thread:
+        """Run cleanup() on a background thread."""
+        thread = threading.Thread(target=self._cleanup_quietly, name="svg-cache-cleanup")
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def _cleanup_quietly(self) -> None:
+        try:
+            self.cleanup()
+        except OSError as e:
+            _logger.warning("SVG cache cleanup failed: %s", e)
+
+    def _index(self) -> dict[str, dict]:
+        """Index entries, read from the index file on first use."""
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self._dir / INDEX_FILENAME, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    self._entries = {
+                        k: e
+                        for k, e in data["entries"].items()
+                        if isinstance(e, dict) and {"file", "size", "atime"} <= e.keys()
+                    }
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                _logger.info("Rebuilding SVG cache index (%s)", e)
+        return self._entries
+
+    def _remove(self, key: str) -> None:
+        entry = self._index().pop(key)
+        _unlink(self._dir / entry["file"])
+
+    def _evict(self) -> bool:
+        """Delete least recently used entries beyond the budget; True if any were."""
+        evicted = self._pop_evicted()
+        for entry in evicted:
+            _unlink(self._dir / entry["file"])
+        return bool(evicted)
+
+    def _pop_evicted(self) -> list[dict]:
+        """Remove least recently used entries beyond the budget from the index."""
+        entries = self._index()
+        total = sum(e["size"] for e in entries.values())
+        evicted: list[dict] = []
+        if total <= self._max_bytes:
+            return evicted
+        for key in sorted(entries, key=lambda k: entries[k]["atime"]):
+            total -= entries[key]["size"]
+            evicted.append(entries.pop(key))
+            if total <= self._max_bytes:
+                break
+        return evicted
+
+    def _render_files(self) -> list[Path]:
+        try:
+            return [p for p in self._dir.iterdir() if p.suffix == ".png" and p.is_file()]
+        except OSError:
+            return []
+
+    def _save(self) -> None:
+        """Atomically write the index file."""
+        self._dirty = False
+        data = {"version": INDEX_VERSION, "entries": self._index()}
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp, self._dir / INDEX_FILENAME)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            _logger.warning("Failed to write SVG cache index: %s", e)
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        _logger.debug("Failed to delete cached render %s: %s", path, e)
+
+
+_cache: SvgRenderCache | None = None
+
+
+def get_svg_render_cache() -> SvgRenderCache:
+    """The application's SVG render cache in svg_cache_dir()."""
+    global _cache
+    if _cache is None:
+        import atexit
+
+        from ..platform.paths import svg_cache_dir
+
+        _cache = SvgRenderCache(Path(svg_cache_dir()))
+        atexit.register(_cache.flush)
+    return _cache
+
+
+def apply_cache_settings(settings_service) -> SvgRenderCache:
+    """Apply the configured size budget to the application's render cache."""
+    cache = get_svg_render_cache()
+    max_mb = settings_service.get_value(MAX_SIZE_SETTING, DEFAULT_MAX_MB, int)
+    cache.set_max_bytes(max_mb * _MB)
+    return cache
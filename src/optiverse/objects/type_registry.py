@@ -17,6 +17,7 @@ from ..core.protocols import HasSettings, Serializable
 from ..platform.paths import (
     get_all_library_roots,
     make_component_relative,
+    make_image_ref,
     make_library_relative,
     to_absolute_path,
     to_relative_path,
@@ -154,7 +155,7 @@ def serialize_item(item: Serializable) -> dict[str, Any]:
     # Convert Qt rotation to user angle (if item uses angles)
     if hasattr(item, "rotation"):
         # Import here to avoid circular dependency
-        from ..core.raytracing_math import qt_angle_to_user
+        from ..core.utils import qt_angle_to_user
 
         d["angle_deg"] = qt_angle_to_user(item.rotation())
 
@@ -193,10 +194,13 @@ def serialize_item(item: Serializable) -> dict[str, Any]:
             # If we can't get library roots, that's okay - will use defaults
             pass
 
-        # Try component-relative first (PREFERRED - library name independent)
-        component_relative = make_component_relative(d["image_path"], library_roots)
-        if component_relative:
-            d["image_path"] = component_relative
+        # Image store blobs are referenced by content hash; otherwise try
+        # component-relative first (PREFERRED - library name independent)
+        relative = make_image_ref(d["image_path"]) or make_component_relative(
+            d["image_path"], library_roots
+        )
+        if relative:
+            d["image_path"] = relative
         else:
             # Try library-relative (backward compatibility)
             lib_relative = make_library_relative(d["image_path"], library_roots)
@@ -287,7 +291,56 @@ def deserialize_item(data: dict[str, Any], strict: bool = False):
     # Restore metadata
     if z_value is not None:
         item.setZValue(z_value)
-    if locked is not None:
-        item.set_locked(locked)
+    if locked:
+        item.set_locked(True)
 
     return item
+
+
+def apply_item_fields(item, data: dict[str, Any]) -> None:
+    """
+    Apply serialized fields to an existing item in place.
+
+    Counterpart of deserialize_item() for updates: data may be a complete
+    serialize_item() dict or only some of its fields (a diff). Params fields
+    are set on item.params, transform and metadata on the item; no new item
+    is constructed.
+
+    Args:
+        item: Item with params (e.g. a ComponentItem or SourceItem)
+        data: Serialized fields to apply
+    """
+    from ..core.utils import user_angle_to_qt
+
+    d = data.copy()
+    for key in ("_type", "item_uuid", "uuid", "item_type"):
+        d.pop(key, None)
+
+    if d.get("image_path"):
+        d["image_path"] = to_absolute_path(d["image_path"], get_all_library_roots())
+    if d.get("interfaces"):
+        d["interfaces"] = [InterfaceDefinition.from_dict(iface) for iface in d["interfaces"]]
+
+    z_value = d.pop("z_value", None)
+    locked = d.pop("locked", None)
+
+    # Unlock before moving (locked items ignore position changes), lock after
+    if locked is False:
+        item.set_locked(False)
+
+    params = item.params
+    field_names = {f.name for f in fields(params)}
+    for key, value in d.items():
+        # JSON converts tuples to lists, convert back if needed (see deserialize_item)
+        if key not in field_names and isinstance(value, list) and key.endswith("_mm"):
+            value = tuple(value)
+        setattr(params, key, value)
+
+    if "x_mm" in d or "y_mm" in d:
+        item.setPos(d.get("x_mm", item.pos().x()), d.get("y_mm", item.pos().y()))
+    if "angle_deg" in d:
+        item.setRotation(user_angle_to_qt(d["angle_deg"]))
+    if z_value is not None:
+        item.setZValue(z_value)
+    if locked is not None:
+        item.set_locked(locked)
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
+import re
 import sys
 from pathlib import Path
 
 _logger = logging.getLogger(__name__)
 
+# Content-addressed image store: one folder per library root holding images
+# named by the hash of their content; components refer to them as
+# @image/{hash}{ext} so identical images are stored (and cached) once.
+IMAGE_STORE_DIRNAME = "_images"
+IMAGE_REF_PREFIX = "@image/"
+_IMAGE_BLOB_RE = re.compile(r"^[0-9a-f]{32}\.[A-Za-z0-9]+$")
+
+# Content hashes of image files keyed by (path, mtime_ns, size)
+_content_hash_cache: dict[tuple[str, int, int], str] = {}
+
 
 def _get_qt_core():
     """Lazy import of QtCore to avoid initialization issues in headless environments."""
@@ -66,6 +78,13 @@ def svg_cache_dir() -> str:
     return str(d)
 
 
+def library_index_dir() -> str:
+    """Get the directory holding the per-library component indexes."""
+    d = _app_data_root() / "library_index"
+    d.mkdir(parents=True, exist_ok=True)
+    return str(d)
+
+
 def get_user_library_root() -> Path:
     """
     Get the default user component library root directory.
@@ -268,12 +287,91 @@ def to_relative_path(image_path: str | None) -> str | None:
         return image_path
 
 
+def image_store_dir(library_root: Path) -> Path:
+    """
+    Get the content-addressed image store of a library root.
+
+    Returns:
+        Path to {library_root}/_images (not created)
+    """
+    return Path(library_root) / IMAGE_STORE_DIRNAME
+
+
+def image_content_hash(path: str | os.PathLike) -> str:
+    """
+    Hash an image file's content (128-bit hex of SHA-256).
+
+    Image store blobs are named by this hash, so their hash is read from the
+    name. Other files are hashed once per (path, mtime, size).
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    path = Path(path)
+    if path.parent.name == IMAGE_STORE_DIRNAME and _IMAGE_BLOB_RE.match(path.name):
+        return path.stem
+    st = path.stat()
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    digest = _content_hash_cache.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()[:32]
+        _content_hash_cache[key] = digest
+    return digest
+
+
+def make_image_ref(abs_path: str | None) -> str | None:
+    """
+    Convert the path of an image store blob to its @image/{hash}{ext} reference.
+
+    Returns:
+        The reference, or None if the path is not inside an image store
+    """
+    if not abs_path:
+        return None
+    path = Path(abs_path)
+    if path.parent.name == IMAGE_STORE_DIRNAME and _IMAGE_BLOB_RE.match(path.name):
+        return f"{IMAGE_REF_PREFIX}{path.name}"
+    return None
+
+
+def resolve_image_ref(image_ref: str, library_roots: list[Path] | None = None) -> str | None:
+    """
+    Resolve an @image/{hash}{ext} reference to a blob in a library's image store.
+
+    Args:
+        image_ref: Reference starting with @image/
+        library_roots: Library roots whose stores are searched in order.
+            If None, uses all configured libraries.
+
+    Returns:
+        Absolute path of the first store containing the blob, None if none does
+    """
+    if not image_ref or not image_ref.startswith(IMAGE_REF_PREFIX):
+        return None
+    name = image_ref[len(IMAGE_REF_PREFIX) :]
+    if not _IMAGE_BLOB_RE.match(name):
+        return None
+
+    if library_roots is None:
+        library_roots = get_all_library_roots()
+    for lib_root in library_roots:
+        blob = image_store_dir(lib_root) / name
+        if blob.is_file():
+            return str(blob.resolve())
+    return None
+
+
 def to_absolute_path(image_path: str | None, library_roots: list[Path] | None = None) -> str | None:
     """
     Convert a relative image path to absolute, assuming it's relative to package root.
     If already absolute, verify it exists or leave as-is.
 
     Supports multiple path formats:
+    - @image/{hash}{ext} - Content-addressed blob in a library's image store
     - @component/{component_name}/... - Component-relative (library-agnostic, PREFERRED)
     - @library/{library_name}/... - Library-relative (backward compatibility)
     - Relative paths - Assumed relative to package root
@@ -289,6 +387,10 @@ def to_absolute_path(image_path: str | None, library_roots: list[Path] | None =
         return image_path
 
     try:
+        # Handle image store references: @image/{hash}{ext}
+        if image_path.startswith(IMAGE_REF_PREFIX):
+            return resolve_image_ref(image_path, library_roots)
+
         # Handle component-relative paths: @component/{component_name}/... (PREFERRED)
         if image_path.startswith("@component/"):
             return resolve_component_path(image_path, library_roots)
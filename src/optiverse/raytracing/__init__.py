@@ -9,20 +9,50 @@ Architecture:
     - RayPath: Data structure for traced path
     - Polarization: Jones vector formalism
     - IOpticalElement: Interface for all optical elements
-    - Concrete elements: Mirror, Lens, Refractive, Beamsplitter, Waveplate, Dichroic
+    - SegmentRecord: Precomputed intersection data for flat segments
+    - Concrete elements: Mirror, Lens, Refractive, Beamsplitter, Waveplate, Dichroic, Detector
     - trace_rays_polymorphic: Main raytracing engine (O(n) per ray)
+    - trace_rays_streaming: Chunked Monte Carlo tracing into accumulators
 """
 
-from .elements import Beamsplitter, Dichroic, Lens, Mirror, RefractiveInterfaceElement, Waveplate
+from .elements import (
+    Beamsplitter,
+    Detector,
+    DetectorElement,
+    DetectorReading,
+    Dichroic,
+    Histogram,
+    Lens,
+    Mirror,
+    RefractiveInterfaceElement,
+    Waveplate,
+)
 from .elements.base import IOpticalElement, RayIntersection
-from .engine import trace_rays_polymorphic
-from .ray import Polarization, Ray, RayPath
+from .engine import (
+    TraceResult,
+    collect_detector_readings,
+    iter_ray_paths,
+    trace_rays_polymorphic,
+    trace_rays_with_detectors,
+)
+from .ray import Polarization, Ray, RayPath, RayTerminal, RayTermination
+from .segments import SegmentRecord, SegmentTable
+from .streaming import (
+    DetectorAccumulator,
+    PowerAccumulator,
+    RayAccumulator,
+    TraceChunk,
+    accumulate_trace,
+    trace_rays_streaming,
+)
 
 __all__ = [
     # Ray data structures
     "Ray",
     "RayPath",
     "Polarization",
+    "RayTerminal",
+    "RayTermination",
     # Element interface and implementations
     "IOpticalElement",
     "RayIntersection",
@@ -32,6 +62,25 @@ __all__ = [
     "Beamsplitter",
     "Waveplate",
     "Dichroic",
+    "Detector",
+    "DetectorElement",
+    # Detector results
+    "DetectorReading",
+    "Histogram",
+    # Precomputed intersection data
+    "SegmentRecord",
+    "SegmentTable",
     # Raytracing engine
     "trace_rays_polymorphic",
+    "trace_rays_with_detectors",
+    "collect_detector_readings",
+    "iter_ray_paths",
+    "TraceResult",
+    # Streaming traces
+    "trace_rays_streaming",
+    "accumulate_trace",
+    "TraceChunk",
+    "RayAccumulator",
+    "PowerAccumulator",
+    "DetectorAccumulator",
 ]
@@ -9,6 +9,7 @@ Each element type implements the IOpticalElement interface.
 from .base import IOpticalElement
 from .beam_block import BeamBlockElement
 from .beamsplitter import BeamsplitterElement
+from .detector import DetectorElement, DetectorReading, Histogram
 from .dichroic import DichroicElement
 from .lens import LensElement
 from .mirror import MirrorElement
@@ -114,6 +115,23 @@ class BeamBlock(BeamBlockElement):
         )
 
 
+class Detector(DetectorElement):
+    """Detector that accepts OpticalInterface with curved geometry support."""
+
+    def __init__(self, optical_iface):
+        self._geometry = optical_iface.geometry
+        self.interface = optical_iface
+        props = optical_iface.properties
+        super().__init__(
+            p1=optical_iface.geometry.p1,
+            p2=optical_iface.geometry.p2,
+            bins=props.bins,
+            angle_range_deg=props.angle_range_deg,
+            wavelength_range_nm=(props.wavelength_min_nm, props.wavelength_max_nm),
+            name=optical_iface.name,
+        )
+
+
 __all__ = [
     "IOpticalElement",
     # Base element classes
@@ -124,6 +142,10 @@ __all__ = [
     "WaveplateElement",
     "DichroicElement",
     "BeamBlockElement",
+    "DetectorElement",
+    # Detector results
+    "DetectorReading",
+    "Histogram",
     # Wrapper classes with curved geometry support
     "Mirror",
     "Lens",
@@ -132,4 +154,5 @@ __all__ = [
     "Waveplate",
     "Dichroic",
     "BeamBlock",
+    "Detector",
 ]
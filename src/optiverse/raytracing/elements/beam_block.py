@@ -7,6 +7,7 @@ Implements ray absorption - terminates ray propagation at the hit point.
 import numpy as np
 
 from ..ray import RayState
+from ..segments import SegmentRecord
 from .base import IOpticalElement
 
 
@@ -28,6 +29,7 @@ class BeamBlockElement(IOpticalElement):
         """
         self.p1 = np.array(p1, dtype=float)
         self.p2 = np.array(p2, dtype=float)
+        self.segment = SegmentRecord.from_endpoints(self.p1, self.p2)
 
     def get_geometry(self) -> tuple[np.ndarray, np.ndarray]:
         """Get beam block line segment"""
@@ -12,6 +12,7 @@ from ...core.raytracing_math import (
     transform_polarization_beamsplitter,
 )
 from ..ray import RayState
+from ..segments import SegmentRecord
 from .base import IOpticalElement
 
 
@@ -44,6 +45,7 @@ class BeamsplitterElement(IOpticalElement):
         """
         self.p1 = np.array(p1, dtype=float)
         self.p2 = np.array(p2, dtype=float)
+        self.segment = SegmentRecord.from_endpoints(self.p1, self.p2)
         self.transmission = transmission
         self.reflection = reflection
         self.is_polarizing = is_polarizing
@@ -0,0 +1,287 @@
+"""
+Detector element implementation.
+
+Absorbs rays like a beam block and records every hit so that the power
+distribution on the detector can be read back as histograms.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ..ray import RayState
+from ..segments import SegmentRecord
+from .base import IOpticalElement
+
+
+@dataclass
+class Histogram:
+    """Power-weighted 1D histogram with fixed bin edges."""
+
+    edges: np.ndarray  # (bins + 1,) bin edges
+    power: np.ndarray  # (bins,) summed intensity per bin
+    counts: np.ndarray  # (bins,) number of hits per bin
+
+    @property
+    def centers(self) -> np.ndarray:
+        """Bin centers"""
+        return 0.5 * (self.edges[:-1] + self.edges[1:])  # type: ignore[no-any-return]
+
+    def merge(self, other: Histogram) -> None:
+        """Add another histogram with identical edges into this one."""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bin edges")
+        self.power += other.power
+        self.counts += other.counts
+
+
+@dataclass
+class DetectorReading:
+    """
+    Accumulated hits on one detector.
+
+    Positions are measured along the detector from its center (p1 side
+    negative), angles are signed incidence angles relative to the normal.
+    """
+
+    name: str
+    n_hits: int
+    total_power: float
+    position: Histogram  # mm
+    angle: Histogram  # degrees
+    wavelength: Histogram  # nm
+    out_of_range_power: float = 0.0  # Power outside the angle/wavelength ranges
+    # Power-weighted position moments (exact, not binned)
+    position_sum: float = 0.0  # Σ p·x in mm
+    position_sq_sum: float = 0.0  # Σ p·x² in mm²
+
+    @property
+    def centroid_mm(self) -> float:
+        """Power-weighted mean hit position (NaN if no power arrived)."""
+        if self.total_power <= 0.0:
+            return float("nan")
+        return self.position_sum / self.total_power
+
+    @property
+    def rms_width_mm(self) -> float:
+        """Power-weighted RMS spot radius around the centroid (NaN if no power arrived)."""
+        if self.total_power <= 0.0:
+            return float("nan")
+        mean = self.position_sum / self.total_power
+        variance = self.position_sq_sum / self.total_power - mean * mean
+        return float(np.sqrt(max(variance, 0.0)))
+
+    def merge(self, other: DetectorReading) -> None:
+        """Fold another reading of the same detector into this one."""
+        self.n_hits += other.n_hits
+        self.total_power += other.total_power
+        self.out_of_range_power += other.out_of_range_power
+        self.position_sum += other.position_sum
+        self.position_sq_sum += other.position_sq_sum
+        self.position.merge(other.position)
+        self.angle.merge(other.angle)
+        self.wavelength.merge(other.wavelength)
+
+
+def _histogram(
+    values: np.ndarray, weights: np.ndarray, lo: float, hi: float, bins: int
+) -> tuple[Histogram, np.ndarray]:
+    """
+    Bin values into equal-width bins with a single bincount.
+
+    Returns the histogram and a mask of values that fell inside [lo, hi].
+    """
+    edges = np.linspace(lo, hi, bins + 1)
+    width = (hi - lo) / bins if hi > lo else 1.0
+    index = np.floor((values - lo) / width).astype(np.int64)
+    # Values exactly on the upper edge belong to the last bin
+    index[values == hi] = bins - 1
+    inside = (index >= 0) & (index < bins)
+    power = np.bincount(index[inside], weights=weights[inside], minlength=bins).astype(float)
+    counts = np.bincount(index[inside], minlength=bins).astype(np.int64)
+    return Histogram(edges=edges, power=power, counts=counts), inside
+
+
+@dataclass
+class _HitBuffer:
+    """Per-thread list of raw hits: (x, y, dx, dy, wavelength_nm, intensity)."""
+
+    hits: list[tuple[float, float, float, float, float, float]] = field(default_factory=list)
+
+
+class DetectorElement(IOpticalElement):
+    """
+    Detector screen that absorbs all incident rays and records the hits.
+
+    Hits are appended to a buffer owned by the calling thread, so the
+    parallel engine can trace into the same detector without locking per
+    ray; reading() merges all buffers and bins them in one vectorized pass.
+    """
+
+    def __init__(
+        self,
+        p1: np.ndarray,
+        p2: np.ndarray,
+        bins: int = 100,
+        angle_range_deg: float = 30.0,
+        wavelength_range_nm: tuple[float, float] = (380.0, 780.0),
+        name: str = "",
+    ):
+        """
+        Initialize detector element.
+
+        Args:
+            p1: Start point of detector line segment [x, y] in mm
+            p2: End point of detector line segment [x, y] in mm
+            bins: Number of bins per histogram
+            angle_range_deg: Angle histogram spans ± this around the normal
+            wavelength_range_nm: (min, max) of the wavelength histogram
+            name: Label used when displaying readings
+        """
+        self.p1 = np.array(p1, dtype=float)
+        self.p2 = np.array(p2, dtype=float)
+        self.segment = SegmentRecord.from_endpoints(self.p1, self.p2)
+        self.bins = max(1, int(bins))
+        self.angle_range_deg = float(angle_range_deg)
+        self.wavelength_range_nm = (float(wavelength_range_nm[0]), float(wavelength_range_nm[1]))
+        self.name = name
+
+        length = self.segment.length
+        self._axis = (self.p2 - self.p1) / length if length > 0 else np.array([1.0, 0.0])
+        self._normal = np.array([-self._axis[1], self._axis[0]])
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._buffers: list[_HitBuffer] = []
+
+    def __getstate__(self):
+        """Drop thread-local state so elements can be pickled (e.g. for process pools)."""
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        state.pop("_local", None)
+        state["_buffers"] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def get_geometry(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get detector line segment"""
+        return self.p1, self.p2
+
+    def interact(
+        self, ray: RayState, hit_point: np.ndarray, normal: np.ndarray, tangent: np.ndarray
+    ) -> list[RayState]:
+        """
+        Record the hit and absorb the ray.
+
+        Only the raw hit is stored here; projection and binning happen
+        vectorized in reading().
+        """
+        self._buffer().hits.append(
+            (
+                float(hit_point[0]),
+                float(hit_point[1]),
+                float(ray.direction[0]),
+                float(ray.direction[1]),
+                float(ray.wavelength_nm),
+                float(ray.intensity),
+            )
+        )
+        return []
+
+    def get_bounding_box(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get axis-aligned bounding box"""
+        min_corner = np.minimum(self.p1, self.p2)
+        max_corner = np.maximum(self.p1, self.p2)
+        return min_corner, max_corner
+
+    def _buffer(self) -> _HitBuffer:
+        """Get (or lazily register) the hit buffer of the current thread."""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = _HitBuffer()
+            with self._lock:
+                self._buffers.append(buffer)
+            self._local.buffer = buffer
+        return buffer
+
+    def reset(self) -> None:
+        """Discard all recorded hits."""
+        with self._lock:
+            for buffer in self._buffers:
+                buffer.hits.clear()
+
+    def project_hits(
+        self, points: np.ndarray, directions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Convert hit points and ray directions to detector coordinates.
+
+        Args:
+            points: (N, 2) hit points in mm
+            directions: (N, 2) ray directions
+
+        Returns:
+            Tuple of (positions_mm, angles_deg): position along the detector
+            measured from its center, and signed incidence angle
+        """
+        rel = points - self.segment.center
+        positions = rel @ self._axis
+        along = directions @ self._axis
+        across = np.abs(directions @ self._normal)
+        angles = np.degrees(np.arctan2(along, across))
+        return positions, angles
+
+    def bin_hits(
+        self,
+        positions_mm: np.ndarray,
+        angles_deg: np.ndarray,
+        wavelengths_nm: np.ndarray,
+        powers: np.ndarray,
+    ) -> DetectorReading:
+        """
+        Bin hits (already in detector coordinates) into a DetectorReading.
+
+        Args:
+            positions_mm: Position along the detector from its center
+            angles_deg: Signed incidence angles
+            wavelengths_nm: Ray wavelengths
+            powers: Ray intensities used as histogram weights
+
+        Returns:
+            DetectorReading for these hits
+        """
+        half = 0.5 * self.segment.length
+        position, _ = _histogram(positions_mm, powers, -half, half, self.bins)
+        angle, angle_ok = _histogram(
+            angles_deg, powers, -self.angle_range_deg, self.angle_range_deg, self.bins
+        )
+        wl_lo, wl_hi = self.wavelength_range_nm
+        wavelength, wl_ok = _histogram(wavelengths_nm, powers, wl_lo, wl_hi, self.bins)
+
+        return DetectorReading(
+            name=self.name,
+            n_hits=len(powers),
+            total_power=float(powers.sum()),
+            position=position,
+            angle=angle,
+            wavelength=wavelength,
+            out_of_range_power=float(powers[~(angle_ok & wl_ok)].sum()),
+            position_sum=float(np.dot(powers, positions_mm)),
+            position_sq_sum=float(np.dot(powers, positions_mm * positions_mm)),
+        )
+
+    def reading(self) -> DetectorReading:
+        """Merge all per-thread buffers and bin the recorded hits."""
+        with self._lock:
+            hits = [hit for buffer in self._buffers for hit in buffer.hits]
+
+        data = np.array(hits, dtype=float).reshape(len(hits), 6)
+        positions, angles = self.project_hits(data[:, 0:2], data[:, 2:4])
+        return self.bin_hits(positions, angles, data[:, 4], data[:, 5])
@@ -13,6 +13,7 @@ from ...core.raytracing_math import (
     transform_polarization_mirror,
 )
 from ..ray import RayState
+from ..segments import SegmentRecord
 from .base import IOpticalElement
 
 
@@ -44,6 +45,7 @@ class DichroicElement(IOpticalElement):
         """
         self.p1 = np.array(p1, dtype=float)
         self.p2 = np.array(p2, dtype=float)
+        self.segment = SegmentRecord.from_endpoints(self.p1, self.p2)
         self.cutoff_wavelength_nm = cutoff_wavelength_nm
         self.transition_width_nm = transition_width_nm
         self.pass_type = pass_type
@@ -10,6 +10,7 @@ import numpy as np
 
 from ...core.raytracing_math import normalize
 from ..ray import RayState
+from ..segments import SegmentRecord
 from .base import IOpticalElement
 
 
@@ -32,6 +33,7 @@ class LensElement(IOpticalElement):
         """
         self.p1 = np.array(p1, dtype=float)
         self.p2 = np.array(p2, dtype=float)
+        self.segment = SegmentRecord.from_endpoints(self.p1, self.p2)
         self.efl_mm = efl_mm
 
     def get_geometry(self) -> tuple[np.ndarray, np.ndarray]:
@@ -9,6 +9,7 @@ import numpy as np
 from ...core.models import Polarization
 from ...core.raytracing_math import normalize, reflect_vec
 from ..ray import RayState
+from ..segments import SegmentRecord
 from .base import IOpticalElement
 
 
@@ -39,6 +40,7 @@ class MirrorElement(IOpticalElement):
         """
         self.p1 = np.array(p1, dtype=float)
         self.p2 = np.array(p2, dtype=float)
+        self.segment = SegmentRecord.from_endpoints(self.p1, self.p2)
         self.reflectivity = reflectivity
 
     def get_geometry(self) -> tuple[np.ndarray, np.ndarray]:
@@ -16,6 +16,7 @@ from ...core.raytracing_math import (
     transform_polarization_mirror,
 )
 from ..ray import RayState
+from ..segments import SegmentRecord
 from .base import IOpticalElement
 
 
@@ -41,6 +42,7 @@ class RefractiveElement(IOpticalElement):
         """
         self.p1 = np.array(p1, dtype=float)
         self.p2 = np.array(p2, dtype=float)
+        self.segment = SegmentRecord.from_endpoints(self.p1, self.p2)
         self.n1 = n1
         self.n2 = n2
 
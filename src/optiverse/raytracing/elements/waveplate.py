@@ -14,6 +14,7 @@ from ...core.raytracing_math import (
     transform_polarization_waveplate,
 )
 from ..ray import RayState
+from ..segments import SegmentRecord
 from .base import IOpticalElement
 
 
@@ -46,6 +47,7 @@ class WaveplateElement(IOpticalElement):
         """
         self.p1 = np.array(p1, dtype=float)
         self.p2 = np.array(p2, dtype=float)
+        self.segment = SegmentRecord.from_endpoints(self.p1, self.p2)
         self.phase_shift_deg = phase_shift_deg
         self.fast_axis_deg = fast_axis_deg
         self.waveplate_angle_deg = waveplate_angle_deg
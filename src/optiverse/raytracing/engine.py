@@ -13,15 +13,26 @@ Features:
 import logging
 import math
 import os
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 
 import numpy as np
 
 from ..core.color_utils import qcolor_from_hex
 from ..core.models import SourceParams
-from ..core.raytracing_math import NUMBA_AVAILABLE, deg2rad, ray_hit_element
+from ..core.raytracing_math import (
+    NUMBA_AVAILABLE,
+    calculate_path_length,
+    deg2rad,
+    ray_hit_curved_element,
+    ray_hit_segments,
+)
 from .elements.base import IOpticalElement, RayIntersection
-from .ray import Ray, RayPath
+from .elements.detector import DetectorElement, DetectorReading
+from .ray import Ray, RayPath, RayTerminal, RayTermination
+from .sampling import is_monte_carlo, sample_source, source_rng
+from .segments import SegmentTable
 
 _logger = logging.getLogger(__name__)
 
@@ -70,18 +81,38 @@ def trace_rays_polymorphic(
         Parallel processing REQUIRES Numba to be effective. Without Numba, the Python
         GIL prevents true parallelism and threading overhead makes it slower.
     """
+    groups = _trace_ray_groups(
+        elements, sources, max_events, epsilon, min_intensity, parallel, parallel_threshold
+    )
+    return [path for group in groups for path in group]
+
+
+def _trace_ray_groups(
+    elements: list[IOpticalElement],
+    sources: list[SourceParams],
+    max_events: int = 80,
+    epsilon: float = 1e-3,
+    min_intensity: float = 0.02,
+    parallel: bool | None = None,
+    parallel_threshold: int = 20,
+) -> list[list[RayPath]]:
+    """Trace like trace_rays_polymorphic, returning the paths of each source ray separately."""
     # Auto-detect: only enable parallel if Numba is available
     if parallel is None:
         parallel = NUMBA_AVAILABLE
         if not NUMBA_AVAILABLE and parallel:
             _logger.debug("Parallel processing disabled (Numba not available)")
 
+    # Precompute intersection data once; shared read-only by all workers
+    table = SegmentTable.from_elements(elements)
+    reset_detectors(elements)
+
     # Build ray job list
-    ray_jobs: list[tuple[Ray, list[IOpticalElement], int, float, float, SourceParams]] = []
+    ray_jobs: list[_RayJob] = []
     for source in sources:
         initial_rays = _generate_rays_from_source(source)
         for ray in initial_rays:
-            ray_jobs.append((ray, elements, max_events, epsilon, min_intensity, source))
+            ray_jobs.append((ray, elements, table, max_events, epsilon, min_intensity, source))
 
     # Decide whether to use parallel processing
     total_rays = len(ray_jobs)
@@ -99,70 +130,208 @@ def trace_rays_polymorphic(
             with ThreadPoolExecutor(max_workers=num_workers) as executor:
                 results = executor.map(_trace_single_ray_worker, ray_jobs)
 
-            # Flatten results
-            paths: list[RayPath] = []
-            for ray_paths in results:
-                paths.extend(ray_paths)
-
-            return paths
+            return list(results)
         except Exception as e:
             # If parallel processing fails, fall back to sequential
             _logger.warning(
                 "Parallel raytracing failed (%s), falling back to sequential processing", e
             )
             use_parallel = False
+            reset_detectors(elements)
 
     # Sequential processing (fallback or when parallel disabled)
-    paths = []
-    for job in ray_jobs:
-        ray_paths = _trace_single_ray_worker(job)
-        paths.extend(ray_paths)
+    return [_trace_single_ray_worker(job) for job in ray_jobs]
 
-    return paths
 
+@dataclass
+class TraceResult:
+    """Ray paths of a trace together with the readings of all detectors hit."""
 
-def _trace_single_ray_worker(
-    args: tuple[Ray, list[IOpticalElement], int, float, float, SourceParams],
-) -> list[RayPath]:
+    paths: list[RayPath] = field(default_factory=list)
+    detectors: list[DetectorReading] = field(default_factory=list)
+    # Number of consecutive paths produced by each source ray; None if unknown
+    ray_path_counts: list[int] | None = None
+
+    def ray_groups(self) -> list[list[RayPath]]:
+        """
+        Paths grouped per source ray (a ray and the branches split off it).
+
+        Without ray_path_counts every path is its own group.
+        """
+        if self.ray_path_counts is None:
+            return [[path] for path in self.paths]
+        groups = []
+        start = 0
+        for count in self.ray_path_counts:
+            groups.append(self.paths[start : start + count])
+            start += count
+        return groups
+
+
+def trace_rays_with_detectors(
+    elements: list[IOpticalElement], sources: list[SourceParams], **kwargs
+) -> TraceResult:
+    """
+    Trace rays and collect detector histograms in the same pass.
+
+    Args:
+        elements: Optical elements (DetectorElements among them record hits)
+        sources: Light sources
+        **kwargs: Passed to trace_rays_polymorphic
+
+    Returns:
+        TraceResult with paths (grouped per source ray) and one DetectorReading
+        per detector, in element order
+    """
+    groups = _trace_ray_groups(elements, sources, **kwargs)
+    return TraceResult(
+        paths=[path for group in groups for path in group],
+        detectors=collect_detector_readings(elements),
+        ray_path_counts=[len(group) for group in groups],
+    )
+
+
+def iter_ray_paths(
+    elements: list[IOpticalElement],
+    sources: list[SourceParams],
+    max_events: int = 80,
+    epsilon: float = 1e-3,
+    min_intensity: float = 0.02,
+) -> Iterator[list[RayPath]]:
+    """
+    Trace source rays one at a time, yielding the branches of each.
+
+    Sequential counterpart of trace_rays_polymorphic for callers that reduce
+    results incrementally and may stop early (e.g. an optimizer that abandons
+    a candidate once it can no longer beat the best one).
+
+    Args:
+        elements: Optical elements
+        sources: Light sources
+        max_events: Maximum interactions per ray
+        epsilon: Minimum distance between interactions
+        min_intensity: Intensity below which a branch is truncated
+
+    Yields:
+        List of RayPaths produced by each source ray, in source order
+    """
+    table = SegmentTable.from_elements(elements)
+    for source in sources:
+        for ray in _generate_rays_from_source(source):
+            yield _trace_single_ray(
+                ray, elements, max_events, epsilon, min_intensity, source, table=table
+            )
+
+
+def reset_detectors(elements: list[IOpticalElement]) -> None:
+    """Clear recorded hits on all detectors in the element list."""
+    for element in elements:
+        if isinstance(element, DetectorElement):
+            element.reset()
+
+
+def collect_detector_readings(elements: list[IOpticalElement]) -> list[DetectorReading]:
+    """Merge per-thread hit buffers of every detector into binned readings."""
+    return [element.reading() for element in elements if isinstance(element, DetectorElement)]
+
+
+_RayJob = tuple[Ray, list[IOpticalElement], SegmentTable, int, float, float, SourceParams]
+
+
+def _trace_single_ray_worker(args: _RayJob) -> list[RayPath]:
     """
     Worker function for parallel ray tracing. Must be at module level for ThreadPoolExecutor.
 
     Args:
-        args: Tuple containing (ray, elements, max_events, epsilon, min_intensity, source)
+        args: Tuple containing (ray, elements, table, max_events, epsilon, min_intensity, source)
 
     Returns:
         List of RayPath objects generated by tracing this single ray
     """
-    ray, elements, max_events, epsilon, min_intensity, source = args
-    return _trace_single_ray(ray, elements, max_events, epsilon, min_intensity, source)
+    ray, elements, table, max_events, epsilon, min_intensity, source = args
+    return _trace_single_ray(ray, elements, max_events, epsilon, min_intensity, source, table=table)
+
+
+def count_source_rays(source: SourceParams) -> int:
+    """
+    Number of rays a source emits.
+
+    Fan sources of zero size (point sources) or with n_rays <= 1 emit a
+    single ray; every other source emits n_rays.
+    """
+    if is_monte_carlo(source):
+        return max(0, int(source.n_rays))
+    if source.n_rays <= 1 or source.size_mm == 0:
+        return 1
+    return int(source.n_rays)
 
 
-def _generate_rays_from_source(source: SourceParams) -> list[Ray]:
+def _generate_rays_from_source(
+    source: SourceParams,
+    rng: np.random.Generator | None = None,
+    n_rays: int | None = None,
+) -> list[Ray]:
     """
     Generate initial rays from a source configuration.
 
+    Fan sources produce evenly spaced positions and angles. Monte Carlo
+    sources draw them at random (see raytracing.sampling).
+
     Args:
         source: SourceParams object
+        rng: Random generator for Monte Carlo sources (seeded from
+             source.random_seed if omitted)
+        n_rays: Number of rays to draw, overriding source.n_rays (Monte Carlo only)
 
     Returns:
         List of Ray objects
     """
     base = -deg2rad(source.angle_deg)  # Convert user (CW) to math (CCW) convention
+
+    if is_monte_carlo(source):
+        if rng is None:
+            rng = source_rng(source)
+        count = source.n_rays if n_rays is None else n_rays
+        offsets, fan, wavelengths = sample_source(source, count, rng)
+        return _build_rays(source, offsets, base + fan, wavelengths)
+
     spread = deg2rad(source.spread_deg)
 
     # Generate ray positions
-    if source.n_rays <= 1 or source.size_mm == 0:
-        y_offsets = [0.0]
+    n_rays = count_source_rays(source)
+    if n_rays == 1:
+        y_offsets = np.zeros(1)
     else:
-        y_offsets = list(np.linspace(-source.size_mm / 2, source.size_mm / 2, source.n_rays))
+        y_offsets = np.linspace(-source.size_mm / 2, source.size_mm / 2, n_rays)
 
     # Generate ray angles
     if spread == 0 or source.n_rays <= 1:
-        angles = [base] * len(y_offsets)
+        angles = np.full(len(y_offsets), base)
     else:
-        fan = np.linspace(-spread, +spread, len(y_offsets))
-        angles = [base + a for a in fan]
+        angles = base + np.linspace(-spread, +spread, len(y_offsets))
+
+    wavelengths = np.full(len(y_offsets), float(source.wavelength_nm))
+    return _build_rays(source, y_offsets, angles, wavelengths)
+
 
+def _build_rays(
+    source: SourceParams,
+    offsets: np.ndarray,
+    angles: np.ndarray,
+    wavelengths: np.ndarray,
+) -> list[Ray]:
+    """
+    Create Ray objects from per-ray offsets, absolute angles and wavelengths.
+
+    Args:
+        source: Source the rays belong to (origin, length, color, polarization)
+        offsets: Offsets perpendicular to each ray's direction, in mm
+        angles: Ray angles in radians (math/CCW convention)
+        wavelengths: Ray wavelengths in nm
+
+    Returns:
+        List of Ray objects
+    """
     # Get initial polarization
     initial_polarization = source.get_polarization()
 
@@ -170,21 +339,24 @@ def _generate_rays_from_source(source: SourceParams) -> list[Ray]:
     src_col = qcolor_from_hex(source.color_hex)
     base_rgb = (src_col.red(), src_col.green(), src_col.blue())
 
+    cos_a = np.cos(angles)
+    sin_a = np.sin(angles)
+    origin = np.array([source.x_mm, source.y_mm], dtype=float)
+
     # Create rays
     rays = []
-    for i, y_offset in enumerate(y_offsets):
-        angle = angles[i]
-        direction = np.array([math.cos(angle), math.sin(angle)], dtype=float)
+    for i in range(len(offsets)):
+        direction = np.array([cos_a[i], sin_a[i]], dtype=float)
         # Apply offset perpendicular to ray direction (90° CCW from direction)
-        perpendicular = np.array([-math.sin(angle), math.cos(angle)], dtype=float)
-        position = np.array([source.x_mm, source.y_mm], dtype=float) + y_offset * perpendicular
+        perpendicular = np.array([-sin_a[i], cos_a[i]], dtype=float)
+        position = origin + offsets[i] * perpendicular
 
         ray = Ray(
             position=position,
             direction=direction,
             remaining_length=source.ray_length_mm,
             polarization=initial_polarization,
-            wavelength_nm=source.wavelength_nm,
+            wavelength_nm=float(wavelengths[i]),
             base_rgb=base_rgb,
             intensity=1.0,
             events=0,
@@ -202,6 +374,9 @@ def _trace_single_ray(
     epsilon: float,
     min_intensity: float,
     source: SourceParams,
+    table: SegmentTable | None = None,
+    terminals: list[RayTerminal] | None = None,
+    record_paths: bool = True,
 ) -> list[RayPath]:
     """
     Trace a single ray through elements.
@@ -216,13 +391,46 @@ def _trace_single_ray(
         epsilon: Small distance to advance after interaction
         min_intensity: Minimum intensity to continue
         source: Source parameters (for color/wavelength info)
+        table: Precomputed segment table for elements (built here if omitted)
+        terminals: If given, a RayTerminal is appended for every finished branch
+        record_paths: If False, no RayPath objects are built (streaming mode)
 
     Returns:
         List of RayPath objects (can be multiple due to beamsplitters)
     """
+    if table is None:
+        table = SegmentTable.from_elements(elements)
+
     paths = []
     base_rgb = ray.base_rgb
 
+    def finish(current: Ray, termination: RayTermination, element=None) -> None:
+        """Record a finished ray branch as a RayPath and/or a RayTerminal."""
+        points = current.path_points
+        if record_paths and (termination != RayTermination.TRUNCATED or len(points) >= 2):
+            alpha = int(255 * max(0.0, min(1.0, current.intensity)))
+            paths.append(
+                RayPath(
+                    points=points,
+                    rgba=(base_rgb[0], base_rgb[1], base_rgb[2], alpha),
+                    polarization=current.polarization,
+                    wavelength_nm=current.wavelength_nm,
+                )
+            )
+        if terminals is not None:
+            terminals.append(
+                RayTerminal(
+                    point=points[-1] if points else current.position,
+                    direction=current.direction,
+                    intensity=current.intensity,
+                    wavelength_nm=current.wavelength_nm,
+                    path_length_mm=calculate_path_length(points),
+                    events=current.events,
+                    termination=termination,
+                    element=element,
+                )
+            )
+
     # Stack for ray processing (enables beam splitting)
     # Each stack item is a Ray object
     stack = [ray]
@@ -240,85 +448,14 @@ def _trace_single_ray(
             or current_ray.remaining_length <= 0
         ):
             # Finalize this path
-            if len(current_ray.path_points) >= 2:
-                alpha = int(255 * max(0.0, min(1.0, current_ray.intensity)))
-                paths.append(
-                    RayPath(
-                        points=current_ray.path_points,
-                        rgba=(base_rgb[0], base_rgb[1], base_rgb[2], alpha),
-                        polarization=current_ray.polarization,
-                        wavelength_nm=current_ray.wavelength_nm,
-                    )
-                )
+            finish(current_ray, RayTermination.TRUNCATED)
             continue
 
         # Find nearest intersection
         # TODO Phase 4: Replace with BVH spatial index for O(log n)
-        nearest_element: IOpticalElement | None = None
-        nearest_distance = float("inf")
-        nearest_intersection: RayIntersection | None = None
-        last_elem = last_element_for_ray.get(id(current_ray))
-
-        for element in elements:
-            # Skip the last element this ray interacted with
-            if element is last_elem:
-                continue
-
-            # Get geometry (may be LineSegment or CurvedSegment)
-            geometry = getattr(element, "_geometry", None)
-
-            if geometry is not None:
-                # NEW: Support for curved surfaces!
-                is_curved = getattr(geometry, "is_curved", False)
-
-                if is_curved:
-                    # Use curved intersection for curved surfaces
-                    from ..core.raytracing_math import (
-                        ray_hit_curved_element,
-                    )
-
-                    result = ray_hit_curved_element(
-                        current_ray.position,
-                        current_ray.direction,
-                        geometry.get_center(),
-                        geometry.get_radius(),
-                        geometry.p1,
-                        geometry.p2,
-                    )
-                else:
-                    # Use flat intersection for flat surfaces
-                    result = ray_hit_element(
-                        current_ray.position, current_ray.direction, geometry.p1, geometry.p2
-                    )
-            else:
-                # Fallback for elements without _geometry attribute (legacy)
-                p1, p2 = element.get_geometry()
-                result = ray_hit_element(current_ray.position, current_ray.direction, p1, p2)
-
-            if result is not None:
-                t, hit_point, tangent, normal, center, length = result
-                distance = t
-
-                # Check if within remaining ray length
-                if distance * np.linalg.norm(current_ray.direction) > current_ray.remaining_length:
-                    continue
-
-                if (
-                    distance < nearest_distance and distance > epsilon
-                ):  # epsilon prevents immediate re-intersection
-                    nearest_distance = distance
-                    nearest_element = element
-                    # Get the optical interface from the element
-                    # Assuming elements have an 'interface' attribute from Phase 2
-                    nearest_intersection = RayIntersection(
-                        distance=distance,
-                        point=hit_point,
-                        tangent=tangent,
-                        normal=normal,
-                        center=center,
-                        length=length,
-                        interface=getattr(element, "interface", None),
-                    )
+        nearest_element, nearest_intersection = _find_nearest_hit(
+            current_ray, elements, table, last_element_for_ray.get(id(current_ray)), epsilon
+        )
 
         # No intersection - ray escapes
         if nearest_element is None:
@@ -327,21 +464,13 @@ def _trace_single_ray(
                 current_ray.position + current_ray.direction * current_ray.remaining_length
             )
             current_ray.path_points.append(final_point)
-
-            alpha = int(255 * max(0.0, min(1.0, current_ray.intensity)))
-            paths.append(
-                RayPath(
-                    points=current_ray.path_points,
-                    rgba=(base_rgb[0], base_rgb[1], base_rgb[2], alpha),
-                    polarization=current_ray.polarization,
-                    wavelength_nm=current_ray.wavelength_nm,
-                )
-            )
+            finish(current_ray, RayTermination.ESCAPED)
             continue
 
         # Add intersection point to path before interaction
         if nearest_intersection is None:
             continue
+        nearest_distance = nearest_intersection.distance
         current_ray.path_points.append(nearest_intersection.point)
 
         # Interact with element - POLYMORPHIC DISPATCH!
@@ -358,15 +487,7 @@ def _trace_single_ray(
         # The ray path ends at the absorption point and should be rendered
         if not output_rays:
             # Ray was absorbed - save the path up to the absorption point
-            alpha = int(255 * max(0.0, min(1.0, current_ray.intensity)))
-            paths.append(
-                RayPath(
-                    points=current_ray.path_points,
-                    rgba=(base_rgb[0], base_rgb[1], base_rgb[2], alpha),
-                    polarization=current_ray.polarization,
-                    wavelength_nm=current_ray.wavelength_nm,
-                )
-            )
+            finish(current_ray, RayTermination.ABSORBED, nearest_element)
             continue
 
         # Track last element and propagate engine-specific fields to output rays
@@ -390,5 +511,103 @@ def _trace_single_ray(
     return paths
 
 
+def _find_nearest_hit(
+    ray: Ray,
+    elements: list[IOpticalElement],
+    table: SegmentTable,
+    last_elem: IOpticalElement | None,
+    epsilon: float,
+) -> tuple[IOpticalElement | None, RayIntersection | None]:
+    """
+    Find the closest element hit by a ray.
+
+    Flat segments are tested in a single batched call against the
+    precomputed segment table; curved segments are tested individually.
+
+    Args:
+        ray: Ray to test
+        elements: Element list the table was built from
+        table: Segment table for elements
+        last_elem: Element the ray just left (skipped to prevent re-intersection)
+        epsilon: Minimum hit distance
+
+    Returns:
+        Tuple of (element, intersection), or (None, None) if nothing is hit
+    """
+    position = ray.position
+    direction = ray.direction
+    # Hits beyond the remaining ray length are ignored
+    speed = math.hypot(direction[0], direction[1])
+    max_t = ray.remaining_length / speed if speed > 0.0 else float("inf")
+
+    nearest_distance = float("inf")
+    nearest_row = -1
+
+    if len(table):
+        t = ray_hit_segments(
+            position, direction, table.centers, table.tangents, table.normals, table.half_lengths
+        )
+        # epsilon prevents immediate re-intersection
+        t[(t <= epsilon) | (t > max_t)] = np.inf
+        if last_elem is not None:
+            for hit in np.flatnonzero(np.isfinite(t)):
+                if elements[table.element_indices[hit]] is last_elem:
+                    t[hit] = np.inf
+        row = int(np.argmin(t))
+        if t[row] < nearest_distance:
+            nearest_distance = float(t[row])
+            nearest_row = row
+
+    nearest_element: IOpticalElement | None = None
+    nearest_intersection: RayIntersection | None = None
+
+    if nearest_row >= 0:
+        nearest_element = elements[table.element_indices[nearest_row]]
+        record = table.records[nearest_row]
+        nearest_intersection = RayIntersection(
+            distance=nearest_distance,
+            point=position + nearest_distance * direction,
+            tangent=record.tangent,
+            normal=record.normal,
+            center=record.center,
+            length=record.length,
+            interface=getattr(nearest_element, "interface", None),
+        )
+
+    for index in table.curved_indices:
+        element = elements[index]
+        if element is last_elem:
+            continue
+        geometry = element._geometry  # type: ignore[attr-defined]
+        result = ray_hit_curved_element(
+            position,
+            direction,
+            geometry.get_center(),
+            geometry.get_radius(),
+            geometry.p1,
+            geometry.p2,
+        )
+        if result is None:
+            continue
+
+        distance, hit_point, tangent, normal, center, length = result
+        if distance > max_t:
+            continue
+        if epsilon < distance < nearest_distance:
+            nearest_distance = distance
+            nearest_element = element
+            nearest_intersection = RayIntersection(
+                distance=distance,
+                point=hit_point,
+                tangent=tangent,
+                normal=normal,
+                center=center,
+                length=length,
+                interface=getattr(element, "interface", None),
+            )
+
+    return nearest_element, nearest_intersection
+
+
 # Convenience alias for the main function
 trace_rays = trace_rays_polymorphic
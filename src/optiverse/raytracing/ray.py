@@ -7,6 +7,8 @@ Pure data structures with no UI dependencies.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import NamedTuple
 
 import numpy as np
 
@@ -121,5 +123,31 @@ class RayPath:
     wavelength_nm: float  # Wavelength in nanometers
 
 
+class RayTermination(IntEnum):
+    """Why a ray branch stopped propagating."""
+
+    ESCAPED = 0  # Left the scene without hitting anything
+    ABSORBED = 1  # Hit an element that returned no output rays
+    TRUNCATED = 2  # Hit the event, intensity or length limit
+
+
+class RayTerminal(NamedTuple):
+    """
+    Final state of a ray branch.
+
+    Lightweight alternative to RayPath for streaming traces where only
+    where the light ended up matters, not the full path.
+    """
+
+    point: np.ndarray  # Last point of the branch [x, y] in mm
+    direction: np.ndarray  # Propagation direction at the last point
+    intensity: float  # Remaining intensity (0.0 to 1.0)
+    wavelength_nm: float  # Wavelength in nanometers
+    path_length_mm: float  # Geometric length of the whole branch
+    events: int  # Number of interactions along the branch
+    termination: RayTermination
+    element: object | None = None  # Absorbing element, if any
+
+
 # Alias for backward compatibility and simpler imports
 Ray = RayState
@@ -0,0 +1,133 @@
+"""
+Precomputed intersection data for flat optical segments.
+
+Each flat element carries a frozen SegmentRecord holding everything the
+ray-segment intersection needs (center, unit tangent, unit normal, half
+length). The engine stacks the records of a scene into a SegmentTable so a
+ray can be tested against every flat segment in one vectorized call.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .elements.base import IOpticalElement
+
+# Segments shorter than this are treated as degenerate (never hit), matching
+# the tolerance used by ray_hit_element.
+_DEGENERATE_LENGTH = 1e-9
+
+
+@dataclass(frozen=True, eq=False)
+class SegmentRecord:
+    """
+    Immutable intersection data for a flat segment p1-p2.
+
+    Conventions match ray_hit_element: the tangent points from p2 to p1 and
+    the normal is the tangent rotated 90° counterclockwise, which keeps the
+    n1/n2 sides of refractive interfaces consistent with the legacy code.
+    """
+
+    p1: np.ndarray  # Start point [x, y] in mm
+    center: np.ndarray  # Midpoint [x, y] in mm
+    tangent: np.ndarray  # Unit tangent (p2 -> p1)
+    normal: np.ndarray  # Unit normal (tangent rotated 90° CCW)
+    half_length: float  # Half of the segment length in mm
+
+    @classmethod
+    def from_endpoints(cls, p1: np.ndarray, p2: np.ndarray) -> SegmentRecord:
+        """
+        Build a record from segment endpoints.
+
+        Degenerate segments get a zero half length and are skipped by the
+        intersection routines.
+        """
+        a = np.asarray(p1, dtype=float)
+        b = np.asarray(p2, dtype=float)
+        diff = a - b
+        length = math.sqrt(diff[0] ** 2 + diff[1] ** 2)
+        if length < _DEGENERATE_LENGTH:
+            tangent = np.array([1.0, 0.0])
+            length = 0.0
+        else:
+            tangent = diff / length
+        normal = np.array([-tangent[1], tangent[0]])
+
+        for arr in (a, tangent, normal):
+            arr.setflags(write=False)
+        center = 0.5 * (a + b)
+        center.setflags(write=False)
+
+        return cls(p1=a, center=center, tangent=tangent, normal=normal, half_length=0.5 * length)
+
+    @property
+    def length(self) -> float:
+        """Full segment length in mm"""
+        return 2.0 * self.half_length
+
+
+@dataclass
+class SegmentTable:
+    """
+    Stacked SegmentRecords of a scene for batched intersection tests.
+
+    Row i of each array belongs to elements[element_indices[i]]. Curved
+    elements cannot be described by a SegmentRecord; their positions in the
+    element list are kept in curved_indices and tested one by one.
+    """
+
+    centers: np.ndarray  # (N, 2)
+    tangents: np.ndarray  # (N, 2)
+    normals: np.ndarray  # (N, 2)
+    half_lengths: np.ndarray  # (N,)
+    element_indices: np.ndarray  # (N,) int
+    records: list[SegmentRecord] = field(default_factory=list)
+    curved_indices: list[int] = field(default_factory=list)
+
+    @classmethod
+    def from_elements(cls, elements: Sequence[IOpticalElement]) -> SegmentTable:
+        """
+        Collect the segment records of a list of elements.
+
+        Elements built by the element classes already carry a record; for
+        anything else (e.g. third-party IOpticalElement implementations) the
+        record is derived from get_geometry().
+        """
+        records: list[SegmentRecord] = []
+        indices: list[int] = []
+        curved: list[int] = []
+
+        for i, element in enumerate(elements):
+            geometry = getattr(element, "_geometry", None)
+            if geometry is not None and getattr(geometry, "is_curved", False):
+                curved.append(i)
+                continue
+
+            record = getattr(element, "segment", None)
+            if record is None:
+                if geometry is not None:
+                    record = SegmentRecord.from_endpoints(geometry.p1, geometry.p2)
+                else:
+                    record = SegmentRecord.from_endpoints(*element.get_geometry())
+            records.append(record)
+            indices.append(i)
+
+        n = len(records)
+        return cls(
+            centers=np.array([r.center for r in records], dtype=float).reshape(n, 2),
+            tangents=np.array([r.tangent for r in records], dtype=float).reshape(n, 2),
+            normals=np.array([r.normal for r in records], dtype=float).reshape(n, 2),
+            half_lengths=np.array([r.half_length for r in records], dtype=float),
+            element_indices=np.array(indices, dtype=np.int64),
+            records=records,
+            curved_indices=curved,
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
@@ -0,0 +1,362 @@
+"""
+Streaming raytracing for large Monte Carlo runs.
+
+trace_rays_polymorphic keeps a RayPath (with every vertex) for each traced
+branch, which is what the canvas needs but does not scale to millions of
+rays. The streaming API traces rays in chunks and reduces every finished
+branch to its RayTerminal, so memory stays bounded by the chunk size.
+Chunks are either consumed directly or fed to accumulators such as
+PowerAccumulator and DetectorAccumulator.
+
+Sampling is reproducible: each (source, chunk) pair gets its own random
+stream derived from the seed, independent of thread scheduling.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Protocol, runtime_checkable
+
+import numpy as np
+
+from ..core.models import SourceParams
+from ..core.raytracing_math import NUMBA_AVAILABLE
+from .elements.base import IOpticalElement
+from .elements.detector import DetectorElement, DetectorReading
+from .engine import _generate_rays_from_source, _trace_single_ray, reset_detectors
+from .ray import Ray, RayPath, RayTerminal, RayTermination
+from .sampling import is_monte_carlo, source_rng
+from .segments import SegmentTable
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TraceChunk:
+    """
+    Terminal states of all ray branches traced from one chunk of source rays.
+
+    Stored as a struct of arrays (one row per finished branch) so that
+    accumulators can bin it with vectorized numpy calls.
+    """
+
+    source_index: int  # Index of the source in the list passed to the tracer
+    chunk_index: int  # Running chunk number within that source
+    n_emitted: int  # Number of source rays launched in this chunk
+    points: np.ndarray  # (N, 2) last point of each branch in mm
+    directions: np.ndarray  # (N, 2) direction at the last point
+    intensities: np.ndarray  # (N,) remaining intensity
+    wavelengths_nm: np.ndarray  # (N,)
+    path_lengths_mm: np.ndarray  # (N,)
+    events: np.ndarray  # (N,) int
+    terminations: np.ndarray  # (N,) RayTermination values
+    element_indices: np.ndarray  # (N,) absorbing element index, -1 if none
+    paths: list[RayPath] | None = None  # Only filled when keep_paths=True
+
+    def __len__(self) -> int:
+        return len(self.intensities)
+
+    @classmethod
+    def from_terminals(
+        cls,
+        terminals: Sequence[RayTerminal],
+        source_index: int,
+        chunk_index: int,
+        n_emitted: int,
+        element_index: dict[int, int],
+        paths: list[RayPath] | None = None,
+    ) -> TraceChunk:
+        """
+        Pack a list of RayTerminal records into arrays.
+
+        Args:
+            terminals: Finished branches
+            source_index: Source the chunk was drawn from
+            chunk_index: Chunk number within the source
+            n_emitted: Number of source rays in the chunk
+            element_index: Map from id(element) to its position in the element list
+            paths: Optional full paths to keep alongside
+        """
+        n = len(terminals)
+        return cls(
+            source_index=source_index,
+            chunk_index=chunk_index,
+            n_emitted=n_emitted,
+            points=np.array([t.point for t in terminals], dtype=float).reshape(n, 2),
+            directions=np.array([t.direction for t in terminals], dtype=float).reshape(n, 2),
+            intensities=np.array([t.intensity for t in terminals], dtype=float),
+            wavelengths_nm=np.array([t.wavelength_nm for t in terminals], dtype=float),
+            path_lengths_mm=np.array([t.path_length_mm for t in terminals], dtype=float),
+            events=np.array([t.events for t in terminals], dtype=np.int64),
+            terminations=np.array([int(t.termination) for t in terminals], dtype=np.int8),
+            element_indices=np.array(
+                [element_index.get(id(t.element), -1) for t in terminals], dtype=np.int64
+            ),
+            paths=paths,
+        )
+
+
+@runtime_checkable
+class RayAccumulator(Protocol):
+    """
+    Consumer of streamed trace chunks.
+
+    Accumulators must be mergeable so that independent runs (or per-worker
+    buffers) can be combined at the end.
+    """
+
+    def add(self, chunk: TraceChunk) -> None:
+        """Fold one chunk into the accumulated statistics."""
+        ...
+
+    def merge(self, other: RayAccumulator) -> None:
+        """Fold another accumulator of the same type into this one."""
+        ...
+
+
+@dataclass
+class PowerAccumulator:
+    """
+    Power bookkeeping for a streamed trace.
+
+    Every source ray carries unit power. Power that ends in a terminal
+    state is split by termination reason; the remainder ("lost") is what
+    elements removed during interactions (e.g. reflectivity < 1, PBS
+    rejection) plus power below the truncation threshold.
+    """
+
+    n_elements: int = 0
+    emitted: float = 0.0
+    escaped: float = 0.0
+    absorbed: float = 0.0
+    truncated: float = 0.0
+    absorbed_by_element: np.ndarray = field(default_factory=lambda: np.zeros(0))
+
+    def __post_init__(self):
+        if len(self.absorbed_by_element) != self.n_elements:
+            self.absorbed_by_element = np.zeros(self.n_elements)
+
+    @property
+    def lost(self) -> float:
+        """Power removed inside elements or not otherwise accounted for."""
+        return self.emitted - self.escaped - self.absorbed - self.truncated
+
+    def add(self, chunk: TraceChunk) -> None:
+        """Fold one chunk into the totals."""
+        self.emitted += chunk.n_emitted
+        power = chunk.intensities
+        reasons = chunk.terminations
+        self.escaped += float(power[reasons == RayTermination.ESCAPED].sum())
+        self.truncated += float(power[reasons == RayTermination.TRUNCATED].sum())
+
+        absorbed = (reasons == RayTermination.ABSORBED) & (chunk.element_indices >= 0)
+        self.absorbed += float(power[reasons == RayTermination.ABSORBED].sum())
+        if self.n_elements and absorbed.any():
+            self.absorbed_by_element += np.bincount(
+                chunk.element_indices[absorbed],
+                weights=power[absorbed],
+                minlength=self.n_elements,
+            )[: self.n_elements]
+
+    def merge(self, other: RayAccumulator) -> None:
+        """Fold another PowerAccumulator into this one."""
+        if not isinstance(other, PowerAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__} into PowerAccumulator")
+        self.emitted += other.emitted
+        self.escaped += other.escaped
+        self.absorbed += other.absorbed
+        self.truncated += other.truncated
+        if other.n_elements == self.n_elements:
+            self.absorbed_by_element += other.absorbed_by_element
+
+
+class DetectorAccumulator:
+    """
+    Histograms of the rays absorbed by one detector in a streamed trace.
+
+    Binning is done from the chunk's terminal states, so the detector's own
+    hit buffers (which only hold the current chunk) are not needed.
+    """
+
+    def __init__(self, detector: DetectorElement, element_index: int):
+        """
+        Args:
+            detector: Detector whose geometry and binning are used
+            element_index: Position of the detector in the traced element list
+        """
+        self.detector = detector
+        self.element_index = element_index
+        empty = np.zeros(0)
+        self.reading: DetectorReading = detector.bin_hits(empty, empty, empty, empty)
+
+    @classmethod
+    def for_elements(cls, elements: Sequence[IOpticalElement]) -> list[DetectorAccumulator]:
+        """Create one accumulator for every detector in an element list."""
+        return [
+            cls(element, i)
+            for i, element in enumerate(elements)
+            if isinstance(element, DetectorElement)
+        ]
+
+    def add(self, chunk: TraceChunk) -> None:
+        """Bin the rays of the chunk that ended on this detector."""
+        mask = (chunk.terminations == RayTermination.ABSORBED) & (
+            chunk.element_indices == self.element_index
+        )
+        if not mask.any():
+            return
+        positions, angles = self.detector.project_hits(chunk.points[mask], chunk.directions[mask])
+        self.reading.merge(
+            self.detector.bin_hits(
+                positions, angles, chunk.wavelengths_nm[mask], chunk.intensities[mask]
+            )
+        )
+
+    def merge(self, other: RayAccumulator) -> None:
+        """Fold another DetectorAccumulator for the same detector into this one."""
+        if not isinstance(other, DetectorAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__} into DetectorAccumulator")
+        self.reading.merge(other.reading)
+
+
+def trace_rays_streaming(
+    elements: list[IOpticalElement],
+    sources: list[SourceParams],
+    *,
+    rays_per_source: int | None = None,
+    chunk_size: int = 4096,
+    seed: int | None = None,
+    accumulators: Iterable[RayAccumulator] = (),
+    keep_paths: bool = False,
+    max_events: int = 80,
+    epsilon: float = 1e-3,
+    min_intensity: float = 0.02,
+    parallel: bool | None = None,
+) -> Iterator[TraceChunk]:
+    """
+    Trace rays chunk by chunk, yielding terminal states instead of full paths.
+
+    Monte Carlo sources are sampled chunk_size rays at a time, up to
+    rays_per_source (or source.n_rays) rays. Fan sources are traced as a
+    single chunk with their usual evenly spaced rays.
+
+    Args:
+        elements: Optical elements implementing IOpticalElement
+        sources: Light sources
+        rays_per_source: Number of rays per Monte Carlo source (default: source.n_rays)
+        chunk_size: Number of source rays traced per chunk
+        seed: Run-wide seed; if None, each source's random_seed is used
+        accumulators: Receive every chunk via add() before it is yielded
+        keep_paths: Also attach full RayPaths to each chunk (debugging/small runs)
+        max_events: Maximum interactions per ray
+        epsilon: Minimum distance between interactions
+        min_intensity: Intensity below which a branch is truncated
+        parallel: Trace each chunk on a thread pool (default: when Numba is available)
+
+    Yields:
+        TraceChunk for every chunk, in deterministic order
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if parallel is None:
+        parallel = NUMBA_AVAILABLE
+
+    accumulators = list(accumulators)
+    table = SegmentTable.from_elements(elements)
+    element_index = {id(element): i for i, element in enumerate(elements)}
+    num_workers = (os.cpu_count() or 4) if parallel else 1
+
+    def trace_batch(rays: list[Ray], source: SourceParams):
+        terminals: list[RayTerminal] = []
+        paths: list[RayPath] = []
+        for ray in rays:
+            paths.extend(
+                _trace_single_ray(
+                    ray,
+                    elements,
+                    max_events,
+                    epsilon,
+                    min_intensity,
+                    source,
+                    table=table,
+                    terminals=terminals,
+                    record_paths=keep_paths,
+                )
+            )
+        return terminals, paths
+
+    def trace_chunk(executor: Executor | None, rays: list[Ray], source: SourceParams):
+        if executor is None or len(rays) < 2 * num_workers:
+            return trace_batch(rays, source)
+        step = -(-len(rays) // num_workers)
+        batches = [rays[i : i + step] for i in range(0, len(rays), step)]
+        terminals: list[RayTerminal] = []
+        paths: list[RayPath] = []
+        for batch_terminals, batch_paths in executor.map(
+            lambda batch: trace_batch(batch, source), batches
+        ):
+            terminals.extend(batch_terminals)
+            paths.extend(batch_paths)
+        return terminals, paths
+
+    executor = ThreadPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+    try:
+        for source_index, source in enumerate(sources):
+            if is_monte_carlo(source):
+                total = source.n_rays if rays_per_source is None else rays_per_source
+                counts = [min(chunk_size, total - start) for start in range(0, total, chunk_size)]
+            else:
+                counts = [source.n_rays]
+
+            for chunk_index, count in enumerate(counts):
+                rng = source_rng(source, seed, (source_index, chunk_index))
+                rays = _generate_rays_from_source(source, rng=rng, n_rays=count)
+                terminals, paths = trace_chunk(executor, rays, source)
+
+                chunk = TraceChunk.from_terminals(
+                    terminals,
+                    source_index=source_index,
+                    chunk_index=chunk_index,
+                    n_emitted=len(rays),
+                    element_index=element_index,
+                    paths=paths if keep_paths else None,
+                )
+                # Detectors buffer every hit; drop them so memory stays bounded
+                # by the chunk size (use DetectorAccumulator for streamed runs)
+                reset_detectors(elements)
+                for accumulator in accumulators:
+                    accumulator.add(chunk)
+                yield chunk
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def accumulate_trace(
+    elements: list[IOpticalElement],
+    sources: list[SourceParams],
+    accumulators: Iterable[RayAccumulator],
+    **kwargs,
+) -> list[RayAccumulator]:
+    """
+    Run a streaming trace to completion, feeding every chunk to accumulators.
+
+    Args:
+        elements: Optical elements
+        sources: Light sources
+        accumulators: Accumulators to fill
+        **kwargs: Passed to trace_rays_streaming
+
+    Returns:
+        The accumulators, for convenience
+    """
+    accumulators = list(accumulators)
+    n_chunks = 0
+    for _chunk in trace_rays_streaming(elements, sources, accumulators=accumulators, **kwargs):
+        n_chunks += 1
+    _logger.debug("Streaming trace finished after %d chunks", n_chunks)
+    return accumulators
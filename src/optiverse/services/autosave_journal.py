@@ -0,0 +1,283 @@
+"""
+Incremental autosave: a scene snapshot plus an append-only change journal.
+
+Rewriting the whole scene on every autosave makes autosave cost grow with
+scene size. Instead, each undo-stack change is recorded as journal records
+holding only the serialized state of the items it touched:
+
+    {"gen": "9f2c...", "ts": "...", "op": "put", "section": "items", "uuid": "...", "data": {...}}
+    {"gen": "9f2c...", "ts": "...", "op": "del", "uuid": "..."}
+    {"gen": "9f2c...", "ts": "...", "op": "groups", "data": [...]}
+
+Records are appended to "<name>.autosave.journal" next to the snapshot
+"<name>.autosave.json" (a serialize_scene() dict with "_autosave_meta").
+After COMPACT_AFTER_RECORDS records a new snapshot is written and the
+journal starts over. Every snapshot has a random generation id and records
+carry the generation they apply to, so a crash between replacing the
+snapshot and truncating the journal cannot replay stale records, not even
+those of an earlier session writing to the same autosave path.
+
+All file I/O runs on a single background writer thread, which keeps the
+writes in submission order.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+from uuid import uuid4
+
+_logger = logging.getLogger(__name__)
+
+SNAPSHOT_SUFFIX = ".autosave.json"
+JOURNAL_SUFFIX = ".autosave.journal"
+
+# Journal records after which the next autosave writes a fresh snapshot
+COMPACT_AFTER_RECORDS = 500
+
+
+def journal_path(snapshot_path: str) -> str:
+    """Journal file belonging to an autosave snapshot path."""
+    if snapshot_path.endswith(SNAPSHOT_SUFFIX):
+        snapshot_path = snapshot_path[: -len(SNAPSHOT_SUFFIX)]
+    return snapshot_path + JOURNAL_SUFFIX
+
+
+def replay_journal(snapshot: dict, records: Iterable[dict]) -> dict:
+    """
+    Apply journal records to a snapshot dict.
+
+    Args:
+        snapshot: Scene dict as written by AutosaveJournal.write_snapshot()
+        records: Records of the snapshot's generation, oldest first
+
+    Returns:
+        The scene dict with all records applied (snapshot is modified)
+    """
+    sections: dict[str, dict[Any, dict]] = {}
+    location: dict[str, str] = {}
+    for name, entries in snapshot.items():
+        if name.startswith("_") or name == "groups" or not isinstance(entries, list):
+            continue
+        keyed: dict[Any, dict] = {}
+        for i, entry in enumerate(entries):
+            uuid = entry.get("item_uuid") if isinstance(entry, dict) else None
+            key = uuid if isinstance(uuid, str) else (None, i)
+            keyed[key] = entry
+            if isinstance(uuid, str):
+                location[uuid] = name
+        sections[name] = keyed
+
+    for record in records:
+        op = record.get("op")
+        if op == "put" and location.get(record["uuid"]) == record["section"]:
+            # In-place update keeps the entry's position
+            sections[record["section"]][record["uuid"]] = record["data"]
+        elif op == "put" or op == "del":
+            uuid = record["uuid"]
+            old_section = location.pop(uuid, None)
+            if old_section is not None:
+                sections[old_section].pop(uuid, None)
+            if op == "put":
+                section = record["section"]
+                sections.setdefault(section, {})[uuid] = record["data"]
+                location[uuid] = section
+        elif op == "groups":
+            snapshot["groups"] = record["data"]
+
+    for name, keyed in sections.items():
+        snapshot[name] = list(keyed.values())
+    return snapshot
+
+
+def read_autosave(snapshot_path: str) -> dict:
+    """
+    Read an autosave snapshot and replay its journal.
+
+    A torn last journal line (crash during an append) is ignored. The
+    recovered dict's _autosave_meta timestamp is that of the last record.
+
+    Raises:
+        OSError: If the snapshot cannot be read
+        ValueError: If the snapshot is not valid JSON (json.JSONDecodeError)
+    """
+    with open(snapshot_path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("Autosave snapshot does not contain an object")
+    meta = data.setdefault("_autosave_meta", {})
+    generation = meta.get("generation", 0)
+
+    records: list[dict] = []
+    try:
+        with open(journal_path(snapshot_path), encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    _logger.warning("Ignoring damaged autosave journal record")
+                    continue
+                if isinstance(record, dict) and record.get("gen") == generation:
+                    records.append(record)
+    except FileNotFoundError:
+        pass
+
+    if records:
+        meta["timestamp"] = records[-1].get("ts", meta.get("timestamp"))
+    return replay_journal(data, records)
+
+
+def remove_autosave(snapshot_path: str) -> None:
+    """Delete an autosave snapshot and its journal (missing files are ignored)."""
+    for path in (snapshot_path, journal_path(snapshot_path)):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+class AutosaveJournal:
+    """
+    Writer side of the autosave journal.
+
+    Records are collected in memory (record()) and handed to the background
+    writer by flush() or write_snapshot(). The GUI thread only serializes
+    the touched items; encoding and file I/O happen on the writer thread.
+    """
+
+    def __init__(self, compact_after: int = COMPACT_AFTER_RECORDS):
+        """
+        Initialize the journal.
+
+        Args:
+            compact_after: Journal records after which a new snapshot is due
+        """
+        self._compact_after = compact_after
+        self._executor: ThreadPoolExecutor | None = None
+        self._path: str | None = None
+        self._generation: str | None = None
+        self._pending: list[dict] = []
+        self._journaled = 0
+        self._stale = True
+
+    @property
+    def path(self) -> str | None:
+        """Snapshot path currently written to (None before the first snapshot)."""
+        return self._path
+
+    def record(self, records: Iterable[dict]) -> None:
+        """Queue journal records (written on the next flush())."""
+        ts = datetime.datetime.now().isoformat()
+        for record in records:
+            record["gen"] = self._generation
+            record["ts"] = ts
+            self._pending.append(record)
+
+    def invalidate(self) -> None:
+        """Require a full snapshot next (e.g. after the scene was replaced)."""
+        self._stale = True
+        self._pending.clear()
+
+    def needs_snapshot(self, path: str) -> bool:
+        """Whether the next autosave to path must write a snapshot."""
+        return (
+            self._stale
+            or path != self._path
+            or self._journaled + len(self._pending) >= self._compact_after
+        )
+
+    def write_snapshot(self, path: str, data: dict) -> Future:
+        """
+        Write a snapshot in the background; queued records are superseded by it.
+
+        Args:
+            path: Snapshot path (journal path is derived from it)
+            data: serialize_scene() dict; must not be modified afterwards
+        """
+        previous = self._path
+        self._generation = uuid4().hex
+        self._pending.clear()
+        self._journaled = 0
+        self._stale = False
+        self._path = path
+        data.setdefault("_autosave_meta", {})["generation"] = self._generation
+        if previous and previous != path:
+            self._submit(remove_autosave, previous)
+        return self._submit(_write_snapshot, path, data)
+
+    def flush(self) -> Future | None:
+        """Append queued records to the journal in the background."""
+        if not self._pending or self._path is None:
+            return None
+        records, self._pending = self._pending, []
+        self._journaled += len(records)
+        return self._submit(_append_records, journal_path(self._path), records)
+
+    def discard(self) -> Future | None:
+        """Delete the autosave files (after pending writes) and start over."""
+        self._pending.clear()
+        self._stale = True
+        path, self._path = self._path, None
+        if path is None:
+            return None
+        return self._submit(remove_autosave, path)
+
+    def remove(self, path: str) -> Future:
+        """Delete another autosave (e.g. a recovered one) after pending writes."""
+        return self._submit(remove_autosave, path)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until all submitted writes have finished."""
+        if self._executor is not None:
+            self._executor.submit(lambda: None).result(timeout)
+
+    def close(self) -> None:
+        """Finish pending writes and stop the writer thread."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _submit(self, fn, *args) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(_log_failure)
+        return future
+
+
+def _log_failure(future: Future) -> None:
+    error = future.exception()
+    if error is not None:
+        _logger.error("Autosave write failed: %s", error)
+
+
+def _write_snapshot(path: str, data: dict) -> None:
+    """Atomically replace the snapshot, then truncate its journal."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    # Records of older generations are ignored on recovery, so a crash
+    # before this truncation is harmless
+    with open(journal_path(path), "w", encoding="utf-8"):
+        pass
+
+
+def _append_records(path: str, records: list[dict]) -> None:
+    lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
@@ -7,12 +7,14 @@ for real-time collaborative editing.
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 
 from ..core.log_categories import LogCategory
-from ..core.protocols import Editable, HasShape, Lockable, Serializable
+from ..core.protocols import Editable, HasShape, Serializable
+from ..core.utils import user_angle_to_qt
 from ..objects.type_registry import TypeRegistry
 from .collaboration_service import CollaborationService
 from .log_service import get_log_service
@@ -20,6 +22,9 @@ from .log_service import get_log_service
 if TYPE_CHECKING:
     from ..ui.views.main_window import MainWindow
 
+# How long to wait for the server's trace of a remote change before tracing locally
+SHARED_TRACE_TIMEOUT_MS = 250
+
 
 class CollaborationManager(QObject):
     """
@@ -47,6 +52,10 @@ class CollaborationManager(QObject):
         self.collaboration_service = CollaborationService(self)
         self.enabled = False
         self._suppress_broadcast = False  # Flag to prevent re-broadcasting remote changes
+        self._broadcast_suspended = 0  # Nesting depth of suspend_broadcasts()
+        self._remote_suspended = 0  # Nesting depth of suspend_remote_changes()
+        # Remote messages received while suspended: (handler, message)
+        self._queued_remote: list[tuple[Callable[[dict[str, Any]], None], dict[str, Any]]] = []
 
         # Get log service
         self.log = get_log_service()
@@ -54,6 +63,13 @@ class CollaborationManager(QObject):
         # Track items by UUID
         self.item_uuid_map: dict[str, Any] = {}  # uuid -> item object
 
+        # Serialized items for get_session_state(), updated per edited item
+        self._item_states: dict[str, dict[str, Any]] = {}  # uuid -> item dict
+        self._state_items: list[dict[str, Any]] | None = None  # Assembled on demand
+        # Update count of each item, for detecting concurrent updates
+        self._item_versions: dict[str, int] = {}  # uuid -> version
+        self.update_conflicts = 0
+
         # Session management
         self.role: str | None = None  # "host" or "client"
         self.session_id: str | None = None
@@ -62,9 +78,26 @@ class CollaborationManager(QObject):
 
         # Reconnection handling
         self.needs_resync: bool = False  # Flag to trigger resync on reconnect
-        self.last_known_state: dict[str, Any] | None = None  # Cached state
+        self.last_seq: int = 0  # Sequence number of the last server op applied
+        self._last_known_state: dict[str, Any] | None = None  # See last_known_state
+        self._last_known_state_stale = False  # Reassemble on access
         self.pending_changes: list[dict[str, Any]] = []  # Changes made while offline
 
+        # Shared raytracing: a server started with --trace traces the session
+        # once per op, and remote changes are shown with its rays instead of
+        # retracing locally (see _begin_remote_change)
+        self.use_shared_trace = True  # Accept the server's traces
+        self.shared_trace = False  # Subscribed to the server's traces
+        self._trace_result: dict[str, Any] | None = None  # Latest trace:result
+        self._awaiting_trace = False  # Remote changes shown without rays yet
+        self._deferring_trace = False  # Applying remote changes, not retracing
+        self.shared_traces_shown = 0
+        self.trace_fallbacks = 0  # Server traces that came too late
+        self._trace_timer = QTimer(self)
+        self._trace_timer.setSingleShot(True)
+        self._trace_timer.setInterval(SHARED_TRACE_TIMEOUT_MS)
+        self._trace_timer.timeout.connect(self._on_trace_timeout)
+
         # Connect signals
         self.collaboration_service.connected.connect(self._on_connected)
         self.collaboration_service.disconnected.connect(self._on_disconnected)
@@ -74,6 +107,9 @@ class CollaborationManager(QObject):
         self.collaboration_service.user_left.connect(self._on_user_left)
         self.collaboration_service.error_occurred.connect(self._on_error)
         self.collaboration_service.connection_acknowledged.connect(self._on_connection_acknowledged)
+        self.collaboration_service.ops_received.connect(self._on_ops_received)
+        self.collaboration_service.command_acknowledged.connect(self._on_command_acknowledged)
+        self.collaboration_service.trace_received.connect(self._on_trace_received)
 
     def create_session(
         self, session_id: str, user_id: str, use_current_canvas: bool = True
@@ -90,6 +126,7 @@ class CollaborationManager(QObject):
         self.role = "host"
         self.session_id = session_id
         self.session_version = 0
+        self.last_seq = 0
         self.initial_sync_complete = True  # Host starts with sync complete
 
         if not use_current_canvas:
@@ -97,6 +134,7 @@ class CollaborationManager(QObject):
             if self.main_window.scene:
                 self.main_window.scene.clear()
             self.item_uuid_map.clear()
+            self._clear_item_states()
         else:
             # Rebuild UUID map from current canvas
             self.rebuild_uuid_map()
@@ -120,12 +158,14 @@ class CollaborationManager(QObject):
         """
         self.role = "client"
         self.session_id = session_id
+        self.last_seq = 0
         self.initial_sync_complete = False  # Client needs initial sync
 
         # Clear canvas before joining
         if self.main_window.scene:
             self.main_window.scene.clear()
         self.item_uuid_map.clear()
+        self._clear_item_states()
 
         # Connect to session
         self.connect_to_session(server_url, session_id, user_id)
@@ -143,7 +183,9 @@ class CollaborationManager(QObject):
         """
         self.session_id = session_id
         self.collaboration_service.set_server_url(server_url)
-        self.collaboration_service.connect_to_session(session_id, user_id)
+        self.collaboration_service.connect_to_session(
+            session_id, user_id, as_host=self.role == "host"
+        )
         self.status_changed.emit(f"Connecting to {server_url}...")
 
     def disconnect(self) -> None:
@@ -151,6 +193,7 @@ class CollaborationManager(QObject):
         self.collaboration_service.disconnect_from_session()
         self.enabled = False
         self.item_uuid_map.clear()
+        self._clear_item_states()
 
     def is_connected(self) -> bool:
         """Check if connected to a collaboration session."""
@@ -159,6 +202,7 @@ class CollaborationManager(QObject):
     def rebuild_uuid_map(self) -> None:
         """Rebuild the UUID map from current scene items."""
         self.item_uuid_map.clear()
+        self._clear_item_states()
         if not self.main_window.scene:
             return
 
@@ -166,6 +210,49 @@ class CollaborationManager(QObject):
             if isinstance(item, Serializable):
                 self.item_uuid_map[item.item_uuid] = item
 
+    def suspend_broadcasts(self) -> None:
+        """
+        Stop broadcasting local changes until resume_broadcasts() is called.
+
+        Used while the scene is rebuilt locally (e.g. opening a file). Calls nest.
+        """
+        self._broadcast_suspended += 1
+
+    def resume_broadcasts(self) -> None:
+        """Undo one suspend_broadcasts() call."""
+        self._broadcast_suspended = max(0, self._broadcast_suspended - 1)
+        if not self._broadcast_suspended:
+            # Items changed without broadcasts; serialize them again on demand
+            self._clear_item_states()
+
+    def suspend_remote_changes(self) -> None:
+        """
+        Queue remote changes instead of applying them until resume_remote_changes().
+
+        Used while the scene is rebuilt locally (e.g. opening a file), whose
+        event processing would otherwise apply them to a half-built scene.
+        Calls nest.
+        """
+        self._remote_suspended += 1
+
+    def resume_remote_changes(self) -> None:
+        """Undo one suspend_remote_changes() call, applying the queued changes."""
+        self._remote_suspended = max(0, self._remote_suspended - 1)
+        if self._remote_suspended:
+            return
+        queued, self._queued_remote = self._queued_remote, []
+        for handler, message in queued:
+            handler(message)
+
+    def _queue_remote(
+        self, handler: Callable[[dict[str, Any]], None], message: dict[str, Any]
+    ) -> bool:
+        """Queue a remote message while remote changes are suspended; True if queued."""
+        if not self._remote_suspended:
+            return False
+        self._queued_remote.append((handler, message))
+        return True
+
     def broadcast_add_item(self, item: Serializable) -> None:
         """
         Broadcast that an item was added locally.
@@ -173,7 +260,7 @@ class CollaborationManager(QObject):
         Args:
             item: The item that was added (must be Serializable)
         """
-        if not self.enabled or self._suppress_broadcast:
+        if not self.enabled or self._suppress_broadcast or self._broadcast_suspended:
             return
 
         # Suppress during initial sync
@@ -190,9 +277,6 @@ class CollaborationManager(QObject):
         # Add to UUID map
         self.item_uuid_map[item.item_uuid] = item
 
-        # Increment version
-        self._increment_version()
-
         # Log the broadcast (all QGraphicsItems have x/y)
         if hasattr(item, "x") and hasattr(item, "y") and callable(item.x) and callable(item.y):
             pos = (item.x(), item.y())
@@ -205,6 +289,8 @@ class CollaborationManager(QObject):
 
         # Broadcast to other users
         data = item.to_dict()
+        self._store_item_state(item.item_uuid, item_type, data)
+        self._increment_version()
         # Ensure UUID is in the data for remote recreation
         data["item_uuid"] = item.item_uuid
         self.collaboration_service.send_command(
@@ -218,7 +304,7 @@ class CollaborationManager(QObject):
         Args:
             item: The item that was moved (must be Serializable)
         """
-        if not self.enabled or self._suppress_broadcast:
+        if not self.enabled or self._suppress_broadcast or self._broadcast_suspended:
             return
 
         if not isinstance(item, Serializable):
@@ -242,9 +328,13 @@ class CollaborationManager(QObject):
             LogCategory.COLLABORATION,
         )
 
-        data = item.to_dict()
+        data = self._transform_data(item)
+        cached = self._item_states.get(item.item_uuid)
+        if cached is not None:
+            self._store_item_state(item.item_uuid, item_type, {**cached, **data})
         data["item_uuid"] = item.item_uuid
-        self.collaboration_service.send_command(
+        # Coalesced with the item's other queued moves, see flush_broadcasts()
+        self.collaboration_service.queue_command(
             action="move_item", item_type=item_type, item_id=item.item_uuid, data=data
         )
 
@@ -255,7 +345,7 @@ class CollaborationManager(QObject):
         Args:
             item: The item that was removed (must be Serializable)
         """
-        if not self.enabled or self._suppress_broadcast:
+        if not self.enabled or self._suppress_broadcast or self._broadcast_suspended:
             return
 
         if not isinstance(item, Serializable):
@@ -268,6 +358,8 @@ class CollaborationManager(QObject):
         # Remove from UUID map
         if item.item_uuid in self.item_uuid_map:
             del self.item_uuid_map[item.item_uuid]
+        self._discard_item_state(item.item_uuid)
+        self._item_versions.pop(item.item_uuid, None)
 
         # Log the broadcast
         self.log.info(f"Broadcasting REMOVE: {item_type}", LogCategory.COLLABORATION)
@@ -283,12 +375,16 @@ class CollaborationManager(QObject):
         Args:
             item: The item that was updated (must be Serializable)
         """
-        if not self.enabled or self._suppress_broadcast:
+        if not self.enabled or self._suppress_broadcast or self._broadcast_suspended:
             return
 
         if not isinstance(item, Serializable):
             return
 
+        # Edits from moving or rotating the item are sent by broadcast_move_item()
+        if getattr(item, "_transform_edit", False):
+            return
+
         item_type = self._get_item_type(item)
         if not item_type:
             return
@@ -297,11 +393,37 @@ class CollaborationManager(QObject):
         self.log.info(f"Broadcasting UPDATE: {item_type}", LogCategory.COLLABORATION)
 
         data = item.to_dict()
+        previous = self._item_states.get(item.item_uuid)
+        self._store_item_state(item.item_uuid, item_type, data)
+        if previous is not None and getattr(item, "params", None) is not None:
+            # Only the changed fields (applied in place by apply_item_fields())
+            data = {key: value for key, value in data.items() if previous.get(key) != value}
+            if not data:
+                return
         data["item_uuid"] = item.item_uuid
-        self.collaboration_service.send_command(
-            action="update_item", item_type=item_type, item_id=item.item_uuid, data=data
+
+        base_version = self._item_versions.get(item.item_uuid, 0)
+        self._item_versions[item.item_uuid] = base_version + 1
+        self.collaboration_service.queue_command(
+            action="update_item",
+            item_type=item_type,
+            item_id=item.item_uuid,
+            data=data,
+            base_version=base_version,
         )
 
+    def flush_broadcasts(self) -> None:
+        """Send queued move/update broadcasts now (e.g. when a drag ends)."""
+        if self.enabled:
+            self.collaboration_service.flush_commands()
+
+    def _transform_data(self, item: Serializable) -> dict[str, Any]:
+        """Position and rotation of an item as sent in move_item commands."""
+        params = getattr(item, "params", None)
+        if params is not None and hasattr(params, "angle_deg"):
+            return {"x_mm": params.x_mm, "y_mm": params.y_mm, "angle_deg": params.angle_deg}
+        return item.to_dict()
+
     def _get_item_type(self, item: Serializable) -> str | None:
         """Get the type string for an item using centralized TypeRegistry."""
         return TypeRegistry.get_type_for_item(item)
@@ -312,13 +434,17 @@ class CollaborationManager(QObject):
 
         self.status_changed.emit("Connected!")
 
-        # If reconnecting, request sync
+        # If reconnecting, request the ops missed while disconnected
         if self.needs_resync and self.role == "client":
-            self.log.info("Reconnected - requesting state sync", LogCategory.COLLABORATION)
-            # Send sync request with local version
+            self.log.info(
+                f"Reconnected - requesting ops since #{self.last_seq}", LogCategory.COLLABORATION
+            )
+            # The server answers with sync:ops, or with sync:full_state if the
+            # ops are no longer in its log
             self.collaboration_service.send_message(
                 {
-                    "type": "sync:request",
+                    "type": "sync:since",
+                    "since": self.last_seq,
                     "local_version": self.session_version,
                     "timestamp": datetime.now().isoformat(),
                 }
@@ -332,6 +458,9 @@ class CollaborationManager(QObject):
 
         self.enabled = False
         self.needs_resync = True  # Flag for reconnection
+        self.shared_trace = False
+        self._awaiting_trace = False
+        self._trace_timer.stop()
         # Don't clear item_uuid_map yet - keep it for reconnection comparison
         self.status_changed.emit("Disconnected")
 
@@ -342,12 +471,24 @@ class CollaborationManager(QObject):
         user_count = len(users)
         self.status_changed.emit(f"Connected ({user_count} users)")
 
-        # Request initial state sync
-        self.collaboration_service.request_sync()
-
         # Rebuild UUID map from current scene
         self.rebuild_uuid_map()
 
+        # Servers started with --trace offer their traces
+        self.shared_trace = self.use_shared_trace and bool(data.get("shared_trace"))
+        self._trace_result = None
+        if self.shared_trace:
+            self.collaboration_service.subscribe_traces()
+
+        if data.get("is_host") and self.role == "host":
+            # Seed the server's session state; joiners get it from the server
+            self.collaboration_service.send_message(
+                {"type": "sync:full_state", "state": self.get_session_state()}
+            )
+        elif not (self.needs_resync and self.role == "client"):
+            # Request initial state sync (reconnects already sent sync:since)
+            self.collaboration_service.request_sync()
+
     def _on_command_received(self, message: dict[str, Any]) -> None:
         """
         Handle incoming command from another user.
@@ -355,9 +496,17 @@ class CollaborationManager(QObject):
         Args:
             message: Command message from server
         """
+        if self._queue_remote(self._on_command_received, message):
+            return
         if not self.enabled:
             return
 
+        seq = message.get("seq")
+        if seq is not None:
+            if seq <= self.last_seq:
+                return  # Already applied (e.g. included in a sync)
+            self.last_seq = seq
+
         command = message.get("command", {})
         action = command.get("action")
         item_type = command.get("item_type")
@@ -368,6 +517,8 @@ class CollaborationManager(QObject):
             f"Processing remote command: {action} {item_type} {item_id}", LogCategory.COLLABORATION
         )
 
+        # Leave the retrace to the server if it traces the session
+        deferred = self._begin_remote_change()
         # Suppress broadcasting while applying remote changes
         self._suppress_broadcast = True
         try:
@@ -377,10 +528,16 @@ class CollaborationManager(QObject):
                 self._apply_move_item(item_id, data)
             elif action == "remove_item":
                 self._apply_remove_item(item_id)
+                self._item_versions.pop(item_id, None)
             elif action == "update_item":
+                self._check_item_version(item_id, command)
                 self._apply_update_item(item_id, data)
         finally:
             self._suppress_broadcast = False
+            # Serialized again on demand
+            self._discard_item_state(item_id)
+            if deferred:
+                self._end_remote_change()
 
     def _apply_add_item(self, item_type: str, data: dict[str, Any]) -> None:
         """Apply remote add item command."""
@@ -401,7 +558,7 @@ class CollaborationManager(QObject):
             # Connect signals
             item.edited.connect(self.main_window._maybe_retrace)
             # Retrace if needed
-            if self.main_window.autotrace:
+            if self.main_window.autotrace and not self._deferring_trace:
                 self.main_window.retrace()
         else:
             self.log.error(f"ADD failed: couldn't create {item_type}", LogCategory.COLLABORATION)
@@ -484,7 +641,12 @@ class CollaborationManager(QObject):
             if "x_mm" in data and "y_mm" in data:
                 item.setPos(data["x_mm"], data["y_mm"])
             if "angle_deg" in data:
-                item.setRotation(data["angle_deg"])
+                angle = float(data["angle_deg"])
+                # Items with params send their user (clockwise) angle, see _transform_data()
+                params = getattr(item, "params", None)
+                if params is not None and hasattr(params, "angle_deg"):
+                    angle = user_angle_to_qt(angle)
+                item.setRotation(angle)
         else:
             # Item not found, might need to add it
             self.log.warning(
@@ -515,30 +677,17 @@ class CollaborationManager(QObject):
             item_type = self._get_item_type(item)
             self.log.info(f"Received UPDATE: {item_type}", LogCategory.COLLABORATION)
 
-            # For BaseObj items, use deserialize_item to update
+            # For BaseObj items, apply the (changed) fields in place
             from ..objects import BaseObj
-            from ..objects.type_registry import deserialize_item
+            from ..objects.type_registry import apply_item_fields
 
             if isinstance(item, BaseObj):
-                # Recreate item from updated data using deserialize_item
-                data_copy = data.copy()
-                if "_type" not in data_copy:
-                    data_copy["_type"] = item_type
-                updated_item = deserialize_item(data_copy)
-                if updated_item:
-                    # Copy state to existing item
-                    if hasattr(item, "params") and hasattr(updated_item, "params"):
-                        item.params = updated_item.params  # type: ignore[attr-defined]
-                    item.setPos(updated_item.pos())
-                    item.setRotation(updated_item.rotation())
-                    item.setZValue(updated_item.zValue())
-                    if isinstance(updated_item, Lockable):
-                        item.set_locked(updated_item.is_locked())
-                    # Trigger update
-                    if isinstance(item, HasShape):
-                        item._update_geom()
-                    if isinstance(item, Editable):
-                        item.update()
+                apply_item_fields(item, data)
+                # Trigger update
+                if isinstance(item, HasShape):
+                    item._update_geom()
+                if isinstance(item, Editable):
+                    item.update()
             elif callable(getattr(item, "from_dict", None)):
                 # Annotation items use their own from_dict method
                 data_copy = data.copy()
@@ -552,13 +701,42 @@ class CollaborationManager(QObject):
             )
         self.remote_item_updated.emit(item_uuid, data)
 
+    def _check_item_version(self, item_uuid: str, command: dict[str, Any]) -> None:
+        """
+        Detect a remote update made concurrently with another update of the item.
+
+        Each update_item command carries the version of the item it was made
+        on ("base_version") and the version after it ("version", more than
+        one higher for coalesced updates). If the base is not the version
+        known here, two users
+        updated the item at the same time and may have applied the updates in
+        different orders; the session state is then resynced from the server,
+        whose op log has the authoritative order.
+        """
+        base_version = command.get("base_version")
+        if base_version is None:
+            return
+        local_version = self._item_versions.get(item_uuid)
+        self._item_versions[item_uuid] = command.get("version", base_version + 1)
+        if local_version is not None and local_version != base_version:
+            self.update_conflicts += 1
+            self.log.warning(
+                f"Concurrent update of item {item_uuid[:8]} "
+                f"(local version {local_version}, remote base {base_version}) - resyncing",
+                LogCategory.COLLABORATION,
+            )
+            self.collaboration_service.request_sync()
+
     def _on_sync_state_received(self, message: dict[str, Any]) -> None:
         """Handle full state synchronization from server."""
+        if self._queue_remote(self._on_sync_state_received, message):
+            return
         state = message.get("state")
         if not state:
             return
 
         self.log.info("Received full state sync", LogCategory.COLLABORATION)
+        ops = message.get("ops", [])
 
         # Check for version conflict
         conflict_resolution = message.get("conflict_resolution", "host_wins")
@@ -574,6 +752,8 @@ class CollaborationManager(QObject):
                 f"Resolving with strategy: {conflict_resolution}", LogCategory.COLLABORATION
             )
 
+        deferred = self._begin_remote_change()
+
         # Clear scene before applying state (host wins by default)
         if self.main_window.scene:
             # Remove all items from scene
@@ -582,6 +762,8 @@ class CollaborationManager(QObject):
 
         self.item_uuid_map.clear()
 
+        self._clear_item_states()
+
         # Suppress broadcast while applying state
         self._suppress_broadcast = True
         try:
@@ -596,12 +778,15 @@ class CollaborationManager(QObject):
 
             # Update version
             self.session_version = state.get("version", 0)
+            self._item_versions = dict(state.get("item_versions", {}))
             self.last_known_state = state
             self.initial_sync_complete = True
             self.needs_resync = False
+            if "seq" in message:
+                self.last_seq = message["seq"]
 
             # Retrace if needed (autotrace and retrace always exist on MainWindow)
-            if self.main_window.autotrace:
+            if self.main_window.autotrace and not self._deferring_trace:
                 self.main_window.retrace()
 
             self.log.info(
@@ -610,23 +795,110 @@ class CollaborationManager(QObject):
         finally:
             self._suppress_broadcast = False
 
+        # Ops logged after the state snapshot
+        self._on_ops_received({"ops": ops})
+        if deferred:
+            self._end_remote_change()
+
+    def _on_ops_received(self, message: dict[str, Any]) -> None:
+        """Apply ops from the server's op log (missed while disconnected)."""
+        if self._queue_remote(self._on_ops_received, message):
+            return
+        for op in message.get("ops", []):
+            self._on_command_received(op)
+        if "seq" in message:
+            self.last_seq = max(self.last_seq, message["seq"])
+        if self.needs_resync:
+            self.needs_resync = False
+            self.initial_sync_complete = True
+            self.log.info(f"Caught up to op #{self.last_seq}", LogCategory.COLLABORATION)
+
+    def _on_command_acknowledged(self, seq: int) -> None:
+        """Record the sequence number the server gave our own command."""
+        self.last_seq = max(self.last_seq, seq)
+
+    def _shared_trace_usable(self) -> bool:
+        """Whether the server's traces show the local scene (no local changes in flight)."""
+        service = self.collaboration_service
+        return (
+            self.shared_trace
+            and self.main_window.autotrace
+            and not service.pending_commands()
+            and not service.unacked_commands
+        )
+
+    def _begin_remote_change(self) -> bool:
+        """
+        Prepare to apply remote changes, leaving their trace to the server if possible.
+
+        Returns:
+            True if local retraces were suspended; the caller then calls
+            _end_remote_change() once the changes are applied
+        """
+        if self._deferring_trace or not self._shared_trace_usable():
+            return False
+        self._deferring_trace = True
+        self.main_window.raytracing_controller.suspend_retrace()
+        return True
+
+    def _end_remote_change(self) -> None:
+        """Show the server's trace of the applied changes, or wait for it."""
+        self._deferring_trace = False
+        self.main_window.raytracing_controller.resume_retrace()
+        result = self._trace_result
+        if result is not None and result.get("seq") == self.last_seq:
+            self._show_shared_trace(result)
+            return
+        # Not restarted by later changes, so rays lag by at most the timeout
+        self._awaiting_trace = True
+        if not self._trace_timer.isActive():
+            self._trace_timer.start()
+
+    def _on_trace_received(self, message: dict[str, Any]) -> None:
+        """Keep the server's latest trace and show it if it is of the current op."""
+        if self._queue_remote(self._on_trace_received, message):
+            return
+        seq = message.get("seq")
+        if not isinstance(seq, int):
+            return
+        if self._trace_result is None or seq >= self._trace_result.get("seq", 0):
+            self._trace_result = message
+        if self._awaiting_trace and seq == self.last_seq and self._shared_trace_usable():
+            self._show_shared_trace(message)
+
+    def _show_shared_trace(self, message: dict[str, Any]) -> None:
+        """Show the rays of a trace:result instead of retracing."""
+        from ..integration import decode_trace_result
+
+        self._awaiting_trace = False
+        self._trace_timer.stop()
+        try:
+            result = decode_trace_result(message.get("rays") or {})
+        except ValueError as e:
+            self.log.warning(f"Invalid shared trace, tracing locally: {e}", LogCategory.RAYTRACING)
+            self.main_window.retrace()
+            return
+        self.main_window.raytracing_controller.show_trace_result(result)
+        self.shared_traces_shown += 1
+
+    def _on_trace_timeout(self) -> None:
+        """The server's trace lags behind the applied changes: trace locally."""
+        if not self._awaiting_trace:
+            return
+        self._awaiting_trace = False
+        self.trace_fallbacks += 1
+        self.log.debug(
+            f"No shared trace of op #{self.last_seq} yet - tracing locally",
+            LogCategory.COLLABORATION,
+        )
+        if self.main_window.autotrace:
+            self.main_window.retrace()
+
     def _on_user_joined(self, user_id: str) -> None:
         """Handle user joined notification."""
         self.log.info(f"👤 User joined: {user_id}", LogCategory.COLLABORATION)
         self.status_changed.emit(f"{user_id} joined")
 
-        # If we're the host, send full state to new client
-        if self.role == "host":
-            self.log.info(f"Sending full state to new client: {user_id}", LogCategory.COLLABORATION)
-            state = self.get_session_state()
-            self.collaboration_service.send_message(
-                {
-                    "type": "sync:full_state",
-                    "state": state,
-                    "target_user": user_id,  # Optional: target specific user
-                }
-            )
-
     def _on_user_left(self, user_id: str) -> None:
         """Handle user left notification."""
         self.log.info(f"👤 User left: {user_id}", LogCategory.COLLABORATION)
@@ -640,31 +912,76 @@ class CollaborationManager(QObject):
         """
         Get complete session state including all items.
 
+        Items are serialized once and cached until they are edited, so this
+        only calls to_dict() on items changed since the last call. The item
+        dicts are shared with the cache and must not be modified.
+
         Returns:
             Dictionary containing complete canvas state with version
         """
-        items = []
-        for item_uuid, item in self.item_uuid_map.items():
-            if isinstance(item, Serializable):
-                item_data = item.to_dict()
-                item_data["uuid"] = item_uuid
-                item_data["item_type"] = self._get_item_type(item)
+        if self._state_items is None:
+            items = []
+            for item_uuid, item in self.item_uuid_map.items():
+                item_data = self._item_states.get(item_uuid)
+                if item_data is None:
+                    if not isinstance(item, Serializable):
+                        continue
+                    item_data = self._store_item_state(
+                        item_uuid, self._get_item_type(item), item.to_dict()
+                    )
                 items.append(item_data)
+            self._state_items = items
 
         from datetime import datetime
 
         state = {
-            "items": items,
+            "items": list(self._state_items),
+            "item_versions": dict(self._item_versions),
             "version": self.session_version,
             "timestamp": datetime.now().isoformat(),
         }
 
         return state
 
+    @property
+    def last_known_state(self) -> dict[str, Any] | None:
+        """Last known session state (assembled on access after local edits)."""
+        if self._last_known_state_stale:
+            self._last_known_state = self.get_session_state()
+            self._last_known_state_stale = False
+        return self._last_known_state
+
+    @last_known_state.setter
+    def last_known_state(self, state: dict[str, Any] | None) -> None:
+        self._last_known_state = state
+        self._last_known_state_stale = False
+
+    def _store_item_state(
+        self, item_uuid: str, item_type: str | None, data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Cache the serialized data (from to_dict()) of an item."""
+        item_data = dict(data)
+        item_data["uuid"] = item_uuid
+        item_data["item_type"] = item_type
+        self._item_states[item_uuid] = item_data
+        self._state_items = None
+        return item_data
+
+    def _discard_item_state(self, item_uuid: str | None) -> None:
+        """Drop the cached data of an item that changed or was removed."""
+        if item_uuid is not None:
+            self._item_states.pop(item_uuid, None)
+        self._state_items = None
+
+    def _clear_item_states(self) -> None:
+        self._item_states.clear()
+        self._state_items = None
+
     def _increment_version(self) -> None:
         """Increment session version counter."""
         self.session_version += 1
-        self.last_known_state = self.get_session_state()
+        # last_known_state is reassembled from the cached items on access
+        self._last_known_state_stale = True
 
     def _detect_version_conflict(self, remote_state: dict[str, Any]) -> bool:
         """
@@ -9,14 +9,23 @@ from __future__ import annotations
 
 import json
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtSignal
-from PyQt6.QtWebSockets import QWebSocket
 
 from ..core.log_categories import LogCategory
+from . import wire_format
 from .log_service import get_log_service
 
+if TYPE_CHECKING:
+    from PyQt6.QtWebSockets import QWebSocket
+
+# Queued move/update commands are coalesced per item and sent at this rate
+COMMAND_FLUSH_RATE_HZ = 30.0
+
+# Actions queue_command() coalesces; others are sent right away
+COALESCED_ACTIONS = ("move_item", "update_item")
+
 
 class CollaborationService(QObject):
     """
@@ -41,41 +50,77 @@ class CollaborationService(QObject):
     user_left = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
     connection_acknowledged = pyqtSignal(dict)  # Connection ack with user list
+    ops_received = pyqtSignal(dict)  # Missed ops after sync:since
+    command_acknowledged = pyqtSignal(int)  # Sequence number of our own command
+    trace_received = pyqtSignal(dict)  # Ray trace shared by the server
 
     def __init__(self, parent: QObject | None = None):
         super().__init__(parent)
-        self.ws = QWebSocket()
+        # Created on first use (QtWebSockets is slow to load, see ws)
+        self._ws: QWebSocket | None = None
         self.session_id: str | None = None
         self.user_id: str | None = None
         self.server_url: str = "ws://localhost:8765"
         self.connected_state = False
         self.users_in_session: dict[str, dict[str, Any]] = {}  # Track connected users
 
+        # Negotiated binary wire format (see wire_format); None sends JSON text
+        self.wire_encoding: str | None = None
+        self.wire_compression: str | None = None
+        # Bytes on the wire, for comparing formats
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        # Commands sent but not yet acknowledged by the server
+        self.unacked_commands = 0
+
         # Get log service
         self.log = get_log_service()
 
-        # Connect WebSocket signals
-        self.ws.connected.connect(self._on_connected)
-        self.ws.disconnected.connect(self._on_disconnected)
-        self.ws.textMessageReceived.connect(self._on_message)
-        self.ws.errorOccurred.connect(self._on_error)
-
         # Heartbeat timer to keep connection alive
         self.heartbeat_timer = QTimer(self)
         self.heartbeat_timer.timeout.connect(self._send_heartbeat)
         self.heartbeat_timer.setInterval(30000)  # 30 seconds
 
+        # Outgoing move/update commands, coalesced per item (see queue_command)
+        self._queued_commands: dict[str, dict[str, Any]] = {}  # item uuid -> message
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush_commands)
+        self.command_flush_rate_hz = 0.0
+        self.set_command_flush_rate(COMMAND_FLUSH_RATE_HZ)
+
+    @property
+    def ws(self) -> QWebSocket:
+        """The WebSocket, created on first use to keep QtWebSockets out of startup."""
+        if self._ws is None:
+            from PyQt6.QtWebSockets import QWebSocket
+
+            self._ws = QWebSocket()
+            self._ws.connected.connect(self._on_connected)
+            self._ws.disconnected.connect(self._on_disconnected)
+            self._ws.textMessageReceived.connect(self._on_message)
+            self._ws.binaryMessageReceived.connect(self._on_binary_message)
+            self._ws.errorOccurred.connect(self._on_error)
+        return self._ws
+
+    @ws.setter
+    def ws(self, ws: QWebSocket) -> None:
+        self._ws = ws
+
     def set_server_url(self, url: str) -> None:
         """Set the collaboration server URL."""
         self.server_url = url
 
-    def connect_to_session(self, session_id: str, user_id: str) -> None:
+    def connect_to_session(self, session_id: str, user_id: str, as_host: bool = False) -> None:
         """
         Connect to a collaboration session.
 
         Args:
             session_id: The session ID to join
             user_id: Your user ID/name
+            as_host: Create the session: the server makes this user the host
+                unless another host is connected (e.g. of a session it
+                restored after a restart)
         """
         # Close existing connection if any
         if self.ws.isValid():
@@ -88,6 +133,8 @@ class CollaborationService(QObject):
         self.user_id = user_id
 
         url = f"{self.server_url}/ws/{session_id}/{user_id}"
+        if as_host:
+            url += "?role=host"
         self.log.info(f"→ Connecting to: {url}", LogCategory.COLLABORATION)
         self.log.debug(f"CollaborationService id: {id(self)}", LogCategory.COLLABORATION)
         self.log.debug(f"QWebSocket id: {id(self.ws)}", LogCategory.COLLABORATION)
@@ -101,6 +148,9 @@ class CollaborationService(QObject):
 
     def disconnect_from_session(self) -> None:
         """Disconnect from current session."""
+        if self._ws is None:
+            return  # Never connected
+        self.flush_commands()
         self.log.debug(
             f"disconnect_from_session called, isValid={self.ws.isValid()}",
             LogCategory.COLLABORATION,
@@ -127,8 +177,15 @@ class CollaborationService(QObject):
             if "user_id" not in message:
                 message["user_id"] = self.user_id
 
-            json_str = json.dumps(message)
-            self.ws.sendTextMessage(json_str)
+            frame = wire_format.encode_message(message, self.wire_encoding, self.wire_compression)
+            if message.get("type") == "command":
+                self.unacked_commands += 1
+            if isinstance(frame, bytes):
+                self.bytes_sent += len(frame)
+                self.ws.sendBinaryMessage(frame)
+            else:
+                self.bytes_sent += len(frame.encode("utf-8"))
+                self.ws.sendTextMessage(frame)
         except (TypeError, ValueError) as e:
             self.log.error(f"Error serializing message: {e}", LogCategory.COLLABORATION)
             self.error_occurred.emit(str(e))
@@ -151,6 +208,15 @@ class CollaborationService(QObject):
             LogCategory.COLLABORATION,
         )
         self.heartbeat_timer.start()
+        # Offer binary frames; messages stay JSON text until the server's wire:ack
+        self.wire_encoding = self.wire_compression = None
+        self.send_message(
+            {
+                "type": "wire:hello",
+                "encodings": wire_format.supported_encodings(),
+                "compression": wire_format.COMPRESSIONS,
+            }
+        )
         self.connected.emit()
 
     def _on_disconnected(self) -> None:
@@ -158,6 +224,10 @@ class CollaborationService(QObject):
         self.connected_state = False
         self.heartbeat_timer.stop()
         self.users_in_session.clear()
+        # Unsendable; the session state is resynced on reconnect
+        self._flush_timer.stop()
+        self._queued_commands.clear()
+        self.unacked_commands = 0
 
         close_code_enum = self.ws.closeCode()
         close_reason = self.ws.closeReason()
@@ -186,6 +256,7 @@ class CollaborationService(QObject):
             1009: "Message too big",
             1010: "Missing extension",
             1011: "Internal server error",
+            1013: "Client too slow, reconnect to resync",
             1015: "TLS handshake error",
         }
 
@@ -222,19 +293,30 @@ class CollaborationService(QObject):
 
         self.disconnected.emit()
 
-    def _on_message(self, message: str) -> None:
+    def _on_message(self, message: str | bytes) -> None:
         """
         Called when a message is received from the server.
 
         Args:
-            message: JSON string from server
+            message: JSON string, or binary frame (see wire_format), from server
         """
+        self.bytes_received += len(message if isinstance(message, bytes) else message.encode())
         try:
-            data = json.loads(message)
+            data = wire_format.decode_message(message)
             msg_type = data.get("type", "")
 
             # Handle special message types
-            if msg_type == "connection:ack":
+            if msg_type == "wire:ack":
+                # Server switched to binary frames; use them as well
+                self.wire_encoding = data.get("encoding")
+                self.wire_compression = data.get("compression")
+                self.log.info(
+                    f"Using {self.wire_encoding} binary frames "
+                    f"(compression: {self.wire_compression or 'none'})",
+                    LogCategory.COLLABORATION,
+                )
+
+            elif msg_type == "connection:ack":
                 # Connection acknowledged with user list
                 users = data.get("users", [])
                 self.log.info(
@@ -273,6 +355,21 @@ class CollaborationService(QObject):
                 self.log.info("Received full state sync", LogCategory.COLLABORATION)
                 self.sync_state_received.emit(data)
 
+            elif msg_type == "sync:ops":
+                # Ops missed while disconnected
+                self.log.info(
+                    f"Received {len(data.get('ops', []))} missed op(s)", LogCategory.COLLABORATION
+                )
+                self.ops_received.emit(data)
+
+            elif msg_type == "command:ack":
+                self.unacked_commands = max(0, self.unacked_commands - 1)
+                self.command_acknowledged.emit(data.get("seq", 0))
+
+            elif msg_type == "trace:result":
+                # Rays traced by the server for op "seq"
+                self.trace_received.emit(data)
+
             elif msg_type == "pong":
                 # Heartbeat response
                 self.log.debug("← Received heartbeat pong", LogCategory.COLLABORATION)
@@ -285,10 +382,14 @@ class CollaborationService(QObject):
         except json.JSONDecodeError as e:
             self.log.error(f"Error parsing message: {e}", LogCategory.COLLABORATION)
             self.error_occurred.emit(f"Invalid JSON: {e}")
-        except (KeyError, TypeError, ValueError) as e:
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
             self.log.error(f"Error processing message data: {e}", LogCategory.COLLABORATION)
             self.error_occurred.emit(str(e))
 
+    def _on_binary_message(self, message) -> None:
+        """Called when a binary frame is received (QByteArray)."""
+        self._on_message(bytes(message))
+
     def _on_error(self, error_code) -> None:
         """
         Called when a WebSocket error occurs.
@@ -306,28 +407,133 @@ class CollaborationService(QObject):
             self.log.debug("→ Sending heartbeat ping", LogCategory.COLLABORATION)
             self.send_message({"type": "ping"})
 
-    def send_command(self, action: str, item_type: str, item_id: str, data: dict[str, Any]) -> None:
+    def send_command(
+        self,
+        action: str,
+        item_type: str,
+        item_id: str,
+        data: dict[str, Any],
+        base_version: int | None = None,
+    ) -> None:
         """
         Send a command to other users.
 
+        Queued commands for the same item are sent first (or dropped if the
+        item is removed), so the commands of an item stay in order.
+
         Args:
             action: Action type (add_item, move_item, remove_item, update_item)
             item_type: Type of item (lens, mirror, source, etc.)
             item_id: UUID of the item
             data: Item data dictionary
+            base_version: For updates, the item version the update was made on
         """
-        message = {
-            "type": "command",
-            "command": {"action": action, "item_type": item_type, "item_id": item_id, "data": data},
-            "timestamp": datetime.now().isoformat(),
+        queued = self._queued_commands.pop(item_id, None)
+        if queued is not None and action != "remove_item":
+            self.send_message(queued)
+
+        command: dict[str, Any] = {
+            "action": action,
+            "item_type": item_type,
+            "item_id": item_id,
+            "data": data,
         }
-        self.send_message(message)
+        if base_version is not None:
+            command["base_version"] = base_version
+            command["version"] = base_version + 1
+        self.send_message(
+            {"type": "command", "command": command, "timestamp": datetime.now().isoformat()}
+        )
+
+    def queue_command(
+        self,
+        action: str,
+        item_type: str,
+        item_id: str,
+        data: dict[str, Any],
+        base_version: int | None = None,
+    ) -> None:
+        """
+        Queue a move or update command, coalescing it with queued commands.
+
+        Queued commands of the same item are merged (later fields win; a move
+        merged into an update stays an update) and sent by flush_commands(),
+        at most command_flush_rate_hz times per second. Other actions are
+        sent right away.
+
+        Args:
+            action: Action type (move_item or update_item)
+            item_type: Type of item (lens, mirror, source, etc.)
+            item_id: UUID of the item
+            data: Item data dictionary (only the changed fields for moves)
+            base_version: For updates, the item version the update was made on;
+                merged updates keep the first base and the last version
+        """
+        if action not in COALESCED_ACTIONS or self.command_flush_rate_hz <= 0:
+            self.send_command(action, item_type, item_id, data, base_version)
+            return
+
+        queued = self._queued_commands.get(item_id)
+        if queued is None:
+            self._queued_commands[item_id] = {
+                "type": "command",
+                "command": {
+                    "action": action,
+                    "item_type": item_type,
+                    "item_id": item_id,
+                    "data": dict(data),
+                },
+                "timestamp": datetime.now().isoformat(),
+            }
+        else:
+            command = queued["command"]
+            if action == "update_item":
+                command["action"] = action
+            command["data"].update(data)
+            queued["timestamp"] = datetime.now().isoformat()
+        if base_version is not None:
+            command = self._queued_commands[item_id]["command"]
+            command.setdefault("base_version", base_version)
+            command["version"] = base_version + 1
+
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush_commands(self) -> None:
+        """Send all queued commands (e.g. when a drag ends)."""
+        self._flush_timer.stop()
+        queued = list(self._queued_commands.values())
+        self._queued_commands.clear()
+        for message in queued:
+            self.send_message(message)
+
+    def pending_commands(self) -> int:
+        """Number of queued commands."""
+        return len(self._queued_commands)
+
+    def set_command_flush_rate(self, rate_hz: float) -> None:
+        """
+        Set how often queued commands are sent.
+
+        Args:
+            rate_hz: Flushes per second; 0 sends every command right away
+        """
+        self.command_flush_rate_hz = max(0.0, float(rate_hz))
+        if self.command_flush_rate_hz > 0:
+            self._flush_timer.setInterval(max(1, round(1000 / self.command_flush_rate_hz)))
+        else:
+            self.flush_commands()
 
     def request_sync(self) -> None:
         """Request full state synchronization from server."""
         if self.connected_state:
             self.send_message({"type": "sync:request"})
 
+    def subscribe_traces(self) -> None:
+        """Ask the server to send its ray traces of the session (trace:result)."""
+        if self.connected_state:
+            self.send_message({"type": "trace:subscribe"})
+
     def update_scene_state(self, state: dict[str, Any]) -> None:
         """
         Send updated scene state to server.
@@ -0,0 +1,190 @@
+"""
+Content-addressed image store of a component library.
+
+Component images are kept once per library root in {root}/_images, named by
+the hash of their content, and component.json files refer to them as
+@image/{hash}{ext}. Variants of a component sharing a housing image
+therefore share one file, one SVG cache entry and one decoded pixmap.
+Path resolution lives in platform.paths (resolve_image_ref, make_image_ref).
+
+Exported component folders stay self-contained: export_component_images()
+copies the blob back into the folder's images/ directory.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from ..platform.paths import (
+    IMAGE_REF_PREFIX,
+    image_content_hash,
+    image_store_dir,
+    make_image_ref,
+    resolve_image_ref,
+)
+
+_logger = logging.getLogger(__name__)
+
+
+def store_image(source: str | os.PathLike, library_root: Path) -> str:
+    """
+    Add an image file to a library's image store.
+
+    Args:
+        source: Image file to store
+        library_root: Library whose store receives the image
+
+    Returns:
+        The @image/{hash}{ext} reference (existing blobs are reused)
+
+    Raises:
+        OSError: If the image cannot be read or stored
+    """
+    source = Path(source)
+    store = image_store_dir(library_root)
+    blob = store / f"{image_content_hash(source)}{source.suffix.lower()}"
+    if not blob.exists():
+        store.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=store, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(source, tmp)
+            os.replace(tmp, blob)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    return f"{IMAGE_REF_PREFIX}{blob.name}"
+
+
+def _read_json(path: Path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} does not contain an object")
+    return data
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    tmp_path.replace(path)
+
+
+def import_component_images(
+    component_folder: Path, library_root: Path, source_roots: list[Path] | None = None
+) -> None:
+    """
+    Move a component folder's image into the library's image store.
+
+    The component's image (relative images/... path, absolute path or
+    @image reference of another library) is stored by content hash and
+    component.json is rewritten to reference it. A copied image inside the
+    component folder is removed afterwards.
+
+    Args:
+        component_folder: Component folder inside library_root
+        library_root: Library receiving the component
+        source_roots: Libraries to resolve @image references against
+
+    Raises:
+        OSError, ValueError: If component.json cannot be read or rewritten
+    """
+    json_path = component_folder / "component.json"
+    data = _read_json(json_path)
+    image_path = data.get("image_path")
+    if not isinstance(image_path, str) or not image_path:
+        return
+
+    local_copy: Path | None = None
+    if image_path.startswith(IMAGE_REF_PREFIX):
+        source = resolve_image_ref(image_path, [library_root, *(source_roots or [])])
+    elif image_path.startswith("@"):
+        return  # @component/@library paths are resolved at load time
+    elif os.path.isabs(image_path):
+        source = image_path
+    else:
+        local_copy = component_folder / image_path
+        source = str(local_copy)
+    if not source or not os.path.isfile(source):
+        _logger.warning("Image %s of %s not found, keeping path", image_path, component_folder)
+        return
+
+    ref = store_image(source, library_root)
+    if ref != image_path:
+        data["image_path"] = ref
+        _write_json(json_path, data)
+    if local_copy is not None:
+        local_copy.unlink()
+        try:
+            local_copy.parent.rmdir()  # images/ if it is now empty
+        except OSError:
+            pass
+
+
+def export_component_images(component_folder: Path, library_root: Path) -> None:
+    """
+    Make an exported component folder self-contained.
+
+    An @image reference is replaced by a copy of the blob in the folder's
+    images/ directory (relative path in component.json).
+
+    Raises:
+        OSError, ValueError: If component.json cannot be read or rewritten
+    """
+    json_path = component_folder / "component.json"
+    data = _read_json(json_path)
+    image_path = data.get("image_path")
+    if not isinstance(image_path, str) or not image_path.startswith(IMAGE_REF_PREFIX):
+        return
+    blob = resolve_image_ref(image_path, [library_root])
+    if blob is None:
+        _logger.warning("Image %s of %s not found in image store", image_path, component_folder)
+        return
+
+    images = component_folder / "images"
+    images.mkdir(exist_ok=True)
+    shutil.copyfile(blob, images / Path(blob).name)
+    data["image_path"] = f"images/{Path(blob).name}"
+    _write_json(json_path, data)
+
+
+def prune_image_store(library_root: Path) -> int:
+    """
+    Delete image store blobs no component of the library references.
+
+    Returns:
+        Number of blobs deleted
+    """
+    store = image_store_dir(library_root)
+    if not store.is_dir():
+        return 0
+
+    referenced: set[str] = set()
+    for folder in library_root.iterdir():
+        json_path = folder / "component.json"
+        if not json_path.is_file():
+            continue
+        try:
+            image_path = _read_json(json_path).get("image_path")
+        except (OSError, ValueError) as e:
+            # Keep everything if a reference might be missed
+            _logger.warning("Not pruning image store, unreadable %s: %s", json_path, e)
+            return 0
+        if isinstance(image_path, str) and image_path.startswith(IMAGE_REF_PREFIX):
+            referenced.add(image_path[len(IMAGE_REF_PREFIX) :])
+
+    removed = 0
+    for blob in store.iterdir():
+        if make_image_ref(str(blob)) and blob.name not in referenced:
+            try:
+                blob.unlink()
+                removed += 1
+            except OSError as e:
+                _logger.debug("Failed to delete unused image %s: %s", blob, e)
+    return removed
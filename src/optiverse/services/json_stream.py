@@ -0,0 +1,138 @@
+"""
+Incremental reader for JSON documents with a top-level object.
+
+Assembly files are one object whose large members are arrays of item
+dicts. JsonEntryStream reads the file in blocks and yields the members one
+at a time, and the elements of array members one element at a time, so a
+loader can construct items while the rest of the file is still unparsed.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from collections.abc import Iterator
+from typing import IO, Any
+
+_WHITESPACE = " \t\n\r"
+_VALUE_END = ",]}" + _WHITESPACE
+
+
+class JsonEntryStream:
+    """
+    Iterate over the members of a JSON object read from a binary stream.
+
+    Yields (key, value, is_element) tuples: for array members one tuple per
+    element with is_element=True (empty arrays yield nothing), for other
+    members a single tuple with the whole value.
+
+    Raises:
+        json.JSONDecodeError: If the document is not a valid JSON object
+    """
+
+    def __init__(self, fp: IO[bytes], block_size: int = 1 << 16):
+        self._fp = fp
+        self._block_size = block_size
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+
+    def __iter__(self) -> Iterator[tuple[str, Any, bool]]:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            self._expect_end()
+            return
+        while True:
+            key = self._decode()
+            if not isinstance(key, str):
+                self._fail("Expecting property name")
+            self._expect(":")
+            if self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield key, self._decode(), True
+                        if self._next_delimiter(",]") == "]":
+                            break
+            else:
+                yield key, self._decode(), False
+            if self._next_delimiter(",}") == "}":
+                self._expect_end()
+                return
+
+    # ----- Buffer handling -----
+
+    def _fill(self, size: int) -> bool:
+        """Append up to size more bytes of decoded text; False at end of file."""
+        if self._eof:
+            return False
+        if self._pos > (1 << 20) and self._pos > len(self._buf) // 2:
+            # Drop consumed text so the buffer stays proportional to one element
+            self._buf = self._buf[self._pos :]
+            self._pos = 0
+        data = self._fp.read(size)
+        self.bytes_read += len(data)
+        if not data:
+            self._eof = True
+            self._buf += self._utf8.decode(b"", final=True)
+            return False
+        self._buf += self._utf8.decode(data)
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill(self._block_size):
+                return ""
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            self._fail(f"Expecting {char!r}")
+        self._pos += 1
+
+    def _expect_end(self) -> None:
+        if self._peek():
+            self._fail("Extra data")
+
+    def _next_delimiter(self, allowed: str) -> str:
+        char = self._peek()
+        if not char or char not in allowed:
+            self._fail(f"Expecting one of {allowed!r}")
+        self._pos += 1
+        return char
+
+    def _decode(self) -> Any:
+        """Decode the value at the current position, reading more text as needed."""
+        self._peek()
+        size = self._block_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill(size):
+                    size *= 2  # Large values: grow geometrically to avoid re-parsing
+                    continue
+                raise
+            # A number cut at a block boundary decodes as a shorter number
+            # ("1." as 1, "2e" as 2): only accept it once a delimiter follows
+            if isinstance(value, (int, float)) and not self._delimited(end) and self._fill(size):
+                continue
+            self._pos = end
+            return value
+
+    def _delimited(self, pos: int) -> bool:
+        """Whether the text at pos ends a value (a delimiter or whitespace follows)."""
+        return pos < len(self._buf) and self._buf[pos] in _VALUE_END
+
+    def _fail(self, message: str):
+        raise json.JSONDecodeError(message, self._buf, self._pos)
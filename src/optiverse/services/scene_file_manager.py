@@ -11,18 +11,39 @@ import datetime
 import hashlib
 import json
 import os
-import tempfile
+import time
+from collections.abc import Iterable
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable
 
 from PyQt6 import QtWidgets
 
 from ..core.exceptions import AssemblyLoadError, AssemblySaveError
 from ..core.protocols import Serializable
+from .autosave_journal import (
+    SNAPSHOT_SUFFIX,
+    AutosaveJournal,
+    journal_path,
+    read_autosave,
+    remove_autosave,
+)
+from .json_stream import JsonEntryStream
+from .scene_format import is_binary_scene_path, read_scene_file, write_scene_file
 
 if TYPE_CHECKING:
     from ..core.layer_group import GroupManager
+    from ..core.undo_commands import Command
     from .log_service import LogService
 
+# Scene sections holding lists of items, in load order
+_SECTIONS = ("items", "rulers", "texts", "rectangles", "path_measures", "groups")
+
+# Time spent constructing items between progress callbacks
+_CHUNK_SECONDS = 0.05
+
+# progress(done, total) callback used while loading
+LoadProgress = Callable[[int, int], None]
+
 
 class SceneFileManager:
     """
@@ -66,6 +87,10 @@ class SceneFileManager:
         self._is_modified = False
         self._group_manager: GroupManager | None = None
 
+        # Incremental autosave (snapshot + change journal, written in the background)
+        self._journal = AutosaveJournal()
+        self._journaled_groups: list[dict] | None = None
+
     def set_group_manager(self, group_manager: GroupManager) -> None:
         """Set the group manager for saving/loading groups."""
         self._group_manager = group_manager
@@ -108,23 +133,18 @@ class SceneFileManager:
             # Hash the absolute path to create unique filename
             path_hash = hashlib.md5(self._saved_file_path.encode()).hexdigest()[:12]
             base_name = os.path.splitext(os.path.basename(self._saved_file_path))[0]
-            filename = f"{base_name}_{path_hash}.autosave.json"
+            filename = f"{base_name}_{path_hash}{SNAPSHOT_SUFFIX}"
         else:
             # For unsaved files: use timestamp + sequential ID
             if not self._unsaved_id:
                 timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                 self._unsaved_id = f"untitled_{timestamp}"
-            filename = f"{self._unsaved_id}.autosave.json"
+            filename = f"{self._unsaved_id}{SNAPSHOT_SUFFIX}"
 
         return str(autosave_dir / filename)
 
     def serialize_scene(self) -> dict:
         """Serialize scene to dictionary format."""
-        from optiverse.objects.annotations.path_measure_item import PathMeasureItem
-
-        from ..objects import BaseObj, RectangleItem
-        from ..objects.annotations import RulerItem, TextNoteItem
-
         data: dict[str, Any] = {
             "version": "2.0",
             "items": [],  # type: ignore[assignment]
@@ -136,16 +156,9 @@ class SceneFileManager:
         }
 
         for it in self.scene.items():
-            if isinstance(it, BaseObj) and isinstance(it, Serializable):
-                data["items"].append(it.to_dict())
-            elif isinstance(it, RulerItem):
-                data["rulers"].append(it.to_dict())
-            elif isinstance(it, TextNoteItem):
-                data["texts"].append(it.to_dict())
-            elif isinstance(it, RectangleItem):
-                data["rectangles"].append(it.to_dict())
-            elif isinstance(it, PathMeasureItem):
-                data["path_measures"].append(it.to_dict())
+            entry = self._serialize_entry(it)
+            if entry is not None:
+                data[entry[0]].append(entry[1])
 
         # Serialize groups
         if self._group_manager:
@@ -153,104 +166,242 @@ class SceneFileManager:
 
         return data
 
+    @staticmethod
+    def _serialize_entry(it: QtWidgets.QGraphicsItem) -> tuple[str, dict] | None:
+        """Return (scene section, dict) for a saveable item, None for other items."""
+        from optiverse.objects.annotations.path_measure_item import PathMeasureItem
+
+        from ..objects import BaseObj, RectangleItem
+        from ..objects.annotations import RulerItem, TextNoteItem
+
+        if isinstance(it, BaseObj) and isinstance(it, Serializable):
+            return "items", it.to_dict()
+        if isinstance(it, RulerItem):
+            return "rulers", it.to_dict()
+        if isinstance(it, TextNoteItem):
+            return "texts", it.to_dict()
+        if isinstance(it, RectangleItem):
+            return "rectangles", it.to_dict()
+        if isinstance(it, PathMeasureItem):
+            return "path_measures", it.to_dict()
+        return None
+
+    def record_command(self, command: Command) -> None:
+        """
+        Journal the changes of a command that was executed, undone or redone.
+
+        Only the items the command touched are serialized; they are written
+        on the next autosave. Items that cannot be journaled (no uuid) make
+        the next autosave write a full snapshot instead.
+
+        Args:
+            command: Command from the undo stack (see Command.affected_items)
+        """
+        records: list[dict] = []
+        for it in command.affected_items():
+            uuid = getattr(it, "item_uuid", None)
+            if not isinstance(uuid, str):
+                self._journal.invalidate()
+                return
+            entry = self._serialize_entry(it) if it.scene() is self.scene else None
+            if entry is None:
+                records.append({"op": "del", "uuid": uuid})
+            else:
+                section, item_data = entry
+                records.append({"op": "put", "section": section, "uuid": uuid, "data": item_data})
+
+        if self._group_manager:
+            groups = self._group_manager.to_dict_list()
+            if groups != self._journaled_groups:
+                records.append({"op": "groups", "data": groups})
+                self._journaled_groups = groups
+
+        self._journal.record(records)
+
     def do_autosave(self):
-        """Perform autosave to temporary file."""
+        """
+        Perform autosave in the background.
+
+        Normally only the journal records collected since the last autosave
+        are appended; a full snapshot is written for the first autosave of a
+        scene, when the autosave path changes, and to compact the journal.
+        """
         if not self._is_modified:
             return
 
         try:
             autosave_path = self.get_autosave_path()
 
-            # Serialize scene
-            data = self.serialize_scene()
-
-            # Add metadata for recovery UI
-            data["_autosave_meta"] = {
-                "timestamp": datetime.datetime.now().isoformat(),
-                "original_path": self._saved_file_path,
-                "version": "2.0",
-            }
-
-            # Atomic write: temp file + rename
-            autosave_dir = os.path.dirname(autosave_path)
-            with tempfile.NamedTemporaryFile(
-                mode="w", encoding="utf-8", dir=autosave_dir, delete=False, suffix=".tmp"
-            ) as tmp:
-                json.dump(data, tmp, indent=2)
-                tmp_path = tmp.name
-
-            # Atomic rename (overwrites existing autosave)
-            os.replace(tmp_path, autosave_path)
-            self._autosave_path = autosave_path
+            if self._journal.needs_snapshot(autosave_path):
+                data = self.serialize_scene()
+
+                # Add metadata for recovery UI
+                data["_autosave_meta"] = {
+                    "timestamp": datetime.datetime.now().isoformat(),
+                    "original_path": self._saved_file_path,
+                    "version": "2.0",
+                }
+                self._journaled_groups = data["groups"]
+                self._journal.write_snapshot(autosave_path, data)
+                self.log_service.debug(f"Autosave snapshot to {autosave_path}", "Autosave")
+            else:
+                self._journal.flush()
 
-            self.log_service.debug(f"Autosaved to {autosave_path}", "Autosave")
+            # A recovered autosave under another name is superseded
+            if self._autosave_path and self._autosave_path != autosave_path:
+                self._journal.remove(self._autosave_path)
+            self._autosave_path = autosave_path
 
-        except (OSError, TypeError) as e:
-            # OSError for file operations, TypeError for JSON serialization issues
+        except OSError as e:
             self.log_service.error(f"Autosave failed: {e}", "Autosave")
 
     def clear_autosave(self):
-        """Delete autosave file."""
-        try:
-            if self._autosave_path and os.path.exists(self._autosave_path):
-                os.unlink(self._autosave_path)
-                self._autosave_path = None
-                self.log_service.debug("Cleared autosave file", "Autosave")
-        except OSError as e:
-            self.log_service.error(f"Failed to clear autosave: {e}", "Autosave")
+        """Delete autosave files (after any autosave writes still in progress)."""
+        current = self._journal.path
+        self._journal.discard()
+        if self._autosave_path and self._autosave_path != current:
+            self._journal.remove(self._autosave_path)
+        if self._autosave_path or current:
+            self.log_service.debug("Cleared autosave file", "Autosave")
+        self._autosave_path = None
+
+    def wait_for_autosave(self, timeout: float | None = None) -> None:
+        """Block until background autosave writes have finished."""
+        self._journal.wait(timeout)
+
+    def load_from_data(self, data: dict, progress: LoadProgress | None = None):
+        """
+        Load scene from data dict.
 
-    def load_from_data(self, data: dict):
-        """Load scene from data dict."""
-        from optiverse.objects.annotations.path_measure_item import PathMeasureItem
+        Args:
+            data: Scene dict as produced by serialize_scene()
+            progress: Optional callback, see open_file()
+        """
+        entries = (
+            (key, value, True)
+            for key in _SECTIONS
+            if isinstance(data.get(key), list)
+            for value in data[key]
+        )
+        total = sum(len(data[key]) for key in _SECTIONS if isinstance(data.get(key), list))
+        self._load_entries(entries, None, total, progress)
 
+    def _load_entries(
+        self,
+        entries: Iterable[tuple[str, Any, bool]],
+        position: Callable[[], int] | None,
+        total: int,
+        progress: LoadProgress | None,
+    ):
+        """
+        Replace the scene contents with items built from (key, value) entries.
+
+        Items are constructed as entries arrive; every _CHUNK_SECONDS the
+        progress callback gets control so the caller can keep the UI alive.
+        Groups reference items by uuid and are applied after all items. If
+        reading the entries fails midway, the previous scene is restored.
+
+        Args:
+            entries: (key, value, is_element) tuples as yielded by JsonEntryStream
+            position: Returns the progress position; None counts entries
+            total: Progress value at completion
+            progress: Optional progress callback
+        """
         from ..objects import BaseObj, RectangleItem
         from ..objects.annotations import RulerItem, TextNoteItem
-        from ..objects.type_registry import deserialize_item
 
-        # Clear scene
-        for it in list(self.scene.items()):
-            if isinstance(it, (BaseObj, RulerItem, TextNoteItem, RectangleItem)):
-                self.scene.removeItem(it)
+        # Detach the current scene contents (kept alive until the load succeeded)
+        old_items = [
+            it
+            for it in self.scene.items()
+            if isinstance(it, (BaseObj, RulerItem, TextNoteItem, RectangleItem))
+        ]
+        for it in old_items:
+            self.scene.removeItem(it)
+        old_groups = self._group_manager.to_dict_list() if self._group_manager else []
 
         # Clear groups
         if self._group_manager:
             self._group_manager.clear()
 
-        # Load items
-        for item_data in data.get("items", []):
+        # Bulk insertion is much faster without maintaining the BSP index per item
+        index_method = self.scene.itemIndexMethod()
+        self.scene.setItemIndexMethod(QtWidgets.QGraphicsScene.ItemIndexMethod.NoIndex)
+        groups: list[dict] = []
+        added: list[QtWidgets.QGraphicsItem] = []
+        ray_data = self._get_ray_data()
+        count = 0
+        deadline = time.perf_counter() + _CHUNK_SECONDS
+        try:
+            for key, value, is_element in entries:
+                count += 1
+                if key == "groups":
+                    groups.extend([value] if is_element else value)
+                elif is_element and key in _SECTIONS:
+                    item = self._add_entry(key, value, ray_data)
+                    if item is not None:
+                        added.append(item)
+                if progress is not None and time.perf_counter() >= deadline:
+                    progress(position() if position else count, total)
+                    deadline = time.perf_counter() + _CHUNK_SECONDS
+        except BaseException:
+            for new_item in added:
+                if new_item.scene() is self.scene:
+                    self.scene.removeItem(new_item)
+            for it in old_items:
+                self.scene.addItem(it)
+            if self._group_manager:
+                self._group_manager.from_dict_list(old_groups)
+            raise
+        finally:
+            self.scene.setItemIndexMethod(index_method)
+
+        # Load groups
+        if self._group_manager and groups:
+            self._group_manager.from_dict_list(groups)
+        self._journal.invalidate()
+        self._journaled_groups = None
+        if progress is not None:
+            progress(total, total)
+
+    def _add_entry(self, key: str, entry: dict, ray_data) -> QtWidgets.QGraphicsItem | None:
+        """Construct one item of a scene section and add it to the scene."""
+        from optiverse.objects.annotations.path_measure_item import PathMeasureItem
+
+        from ..objects import RectangleItem
+        from ..objects.annotations import RulerItem, TextNoteItem
+        from ..objects.type_registry import deserialize_item
+
+        item: QtWidgets.QGraphicsItem
+        if key == "items":
             try:
-                item = deserialize_item(item_data)
-                self.scene.addItem(item)
+                item = deserialize_item(entry)
             except (KeyError, ValueError, TypeError) as e:
                 # KeyError: missing required fields, ValueError/TypeError: invalid data
                 self.log_service.error(f"Error loading item: {e}", "Load")
-
-        # Load annotations
-        for ruler_data in data.get("rulers", []):
-            ruler = RulerItem.from_dict(ruler_data)
+                return None
+        elif key == "rulers":
+            item = RulerItem.from_dict(entry)
             if self._connect_item_signals:
-                self._connect_item_signals(ruler)
-            self.scene.addItem(ruler)
-
-        for text_data in data.get("texts", []):
-            self.scene.addItem(TextNoteItem.from_dict(text_data))
-
-        for rect_data in data.get("rectangles", []):
-            self.scene.addItem(RectangleItem.from_dict(rect_data))
-
-        # Load path measures
-        ray_data = self._get_ray_data()
-        for pm_data in data.get("path_measures", []):
+                self._connect_item_signals(item)
+        elif key == "texts":
+            item = TextNoteItem.from_dict(entry)
+        elif key == "rectangles":
+            item = RectangleItem.from_dict(entry)
+        elif key == "path_measures":
             try:
-                item = PathMeasureItem.from_dict(pm_data, ray_data)
-                self.scene.addItem(item)
+                measure = PathMeasureItem.from_dict(entry, ray_data)
             except (KeyError, ValueError, TypeError) as e:
                 # KeyError: missing required fields, ValueError/TypeError: invalid data
                 self.log_service.error(f"Error loading path measure: {e}", "Load")
-
-        # Load groups
-        if self._group_manager and "groups" in data:
-            self._group_manager.from_dict_list(data.get("groups", []))
+                return None
+            if measure is None:
+                return None
+            item = measure
+        else:
+            return None
+        self.scene.addItem(item)
+        return item
 
     def _format_time_ago(self, delta: datetime.timedelta) -> str:
         """Format timedelta as human-readable string."""
@@ -264,10 +415,13 @@ class SceneFileManager:
         else:
             return f"{seconds // 86400}d ago"
 
-    def check_autosave_recovery(self) -> bool:
+    def check_autosave_recovery(self, progress: LoadProgress | None = None) -> bool:
         """
         Check for autosave on startup and offer recovery.
 
+        Args:
+            progress: Optional progress callback, see open_file()
+
         Returns:
             True if recovery was performed, False otherwise
         """
@@ -284,8 +438,13 @@ class SceneFileManager:
         if not autosave_dir.exists():
             return False
 
+        def last_modified(path: Path) -> float:
+            journal = journal_path(str(path))
+            mtime = path.stat().st_mtime
+            return max(mtime, os.path.getmtime(journal)) if os.path.exists(journal) else mtime
+
         autosave_files = sorted(
-            autosave_dir.glob("*.autosave.json"), key=lambda p: p.stat().st_mtime, reverse=True
+            autosave_dir.glob(f"*{SNAPSHOT_SUFFIX}"), key=last_modified, reverse=True
         )
 
         if not autosave_files:
@@ -294,8 +453,7 @@ class SceneFileManager:
         most_recent = autosave_files[0]
 
         try:
-            with open(most_recent, encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_autosave(str(most_recent))
 
             if data.get("version") != "2.0":
                 raise ValueError("Incompatible autosave version")
@@ -329,7 +487,7 @@ class SceneFileManager:
             )
 
             if reply == QtWidgets.QMessageBox.StandardButton.Yes:
-                self.load_from_data(data)
+                self.load_from_data(data, progress)
                 self._saved_file_path = original_path
                 self._autosave_path = str(most_recent)
                 self.mark_modified()
@@ -341,7 +499,7 @@ class SceneFileManager:
                 )
                 return True
             else:
-                most_recent.unlink()
+                remove_autosave(str(most_recent))
 
         except (OSError, json.JSONDecodeError, KeyError, ValueError) as e:
             # OSError: file access, JSONDecodeError: corrupt file
@@ -363,21 +521,30 @@ class SceneFileManager:
         data = self.serialize_scene()
 
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            write_scene_file(path, data)
 
             self._saved_file_path = path
             self.mark_clean()
             self.clear_autosave()
             return True
 
-        except (OSError, json.JSONDecodeError) as e:
+        except (OSError, TypeError, ValueError) as e:
             raise AssemblySaveError(path, str(e)) from e
 
-    def open_file(self, path: str) -> bool:
+    def open_file(self, path: str, progress: LoadProgress | None = None) -> bool:
         """
         Open and load a scene file.
 
+        JSON files are parsed incrementally and items are constructed while
+        parsing, so the whole document is never held as one dict. Binary
+        (.oab) files are decoded in one pass and then loaded in chunks.
+
+        Args:
+            path: Assembly file to open
+            progress: Optional callback progress(done, total) invoked between
+                      chunks of items (done/total in bytes of the file); it
+                      may process events to keep the UI responsive
+
         Returns:
             True if open was successful
 
@@ -385,12 +552,16 @@ class SceneFileManager:
             AssemblyLoadError: If the file cannot be opened or parsed
         """
         try:
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
-        except (OSError, json.JSONDecodeError) as e:
+            if is_binary_scene_path(path):
+                self.load_from_data(read_scene_file(path), progress)
+            else:
+                with open(path, "rb") as f:
+                    total = os.fstat(f.fileno()).st_size
+                    stream = JsonEntryStream(f)
+                    self._load_entries(stream, lambda: stream.bytes_read, total, progress)
+        except (OSError, ValueError) as e:
             raise AssemblyLoadError(path, str(e)) from e
 
-        self.load_from_data(data)
         self._saved_file_path = path
         self._unsaved_id = None
         self.mark_clean()
@@ -0,0 +1,353 @@
+"""
+Scene file formats: pretty-printed JSON and a compact binary container.
+
+Both formats hold the same dict produced by SceneFileManager.serialize_scene();
+the format is chosen by file extension. The binary container (.oab) is a
+versioned header followed by an optionally zlib-compressed tagged encoding of
+that dict:
+
+- strings (keys, type names, uuids, image paths) are interned: each distinct
+  string is stored once and later occurrences are table references, so the
+  image paths shared by many components cost a few bytes per item
+- lists of floats or ints, and lists of equal-length float lists (point
+  lists), are stored as packed little-endian float64/int64 blocks
+- everything else maps 1:1 onto JSON values, so converting between the two
+  forms is lossless (floats are stored as IEEE doubles, ints and floats keep
+  their distinct types)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+import sys
+import zlib
+from typing import Any
+
+import numpy as np
+
+BINARY_SCENE_SUFFIX = ".oab"
+
+_MAGIC = b"OVAB"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHH")
+_FLAG_ZLIB = 0x1
+
+# Value tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT = 0, 1, 2, 3, 4
+_STR_NEW, _STR_REF, _LIST, _DICT = 5, 6, 7, 8
+_F64_ARRAY, _I64_ARRAY, _F64_MATRIX = 9, 10, 11
+
+# Shorter numeric lists are cheaper as tagged values
+_MIN_PACKED = 4
+_I64_MIN, _I64_MAX = -(1 << 63), (1 << 63) - 1
+
+_F64 = struct.Struct("<d")
+
+
+def is_binary_scene_path(path: str | os.PathLike) -> bool:
+    """Whether a scene path uses the binary container (by extension)."""
+    return os.fspath(path).lower().endswith(BINARY_SCENE_SUFFIX)
+
+
+# ----- Encoding -----
+
+
+class _Encoder:
+    def __init__(self):
+        self.out = bytearray()
+        self._strings: dict[str, int] = {}
+
+    def varint(self, n: int) -> None:
+        out = self.out
+        while n > 0x7F:
+            out.append((n & 0x7F) | 0x80)
+            n >>= 7
+        out.append(n)
+
+    def string(self, s: str) -> None:
+        index = self._strings.get(s)
+        if index is not None:
+            self.out.append(_STR_REF)
+            self.varint(index)
+            return
+        self._strings[s] = len(self._strings)
+        raw = s.encode("utf-8")
+        self.out.append(_STR_NEW)
+        self.varint(len(raw))
+        self.out += raw
+
+    def value(self, v: Any) -> None:
+        out = self.out
+        t = type(v)
+        if t is str:
+            self.string(v)
+        elif t is float:
+            out.append(_FLOAT)
+            out += _F64.pack(v)
+        elif v is None:
+            out.append(_NONE)
+        elif t is bool:
+            out.append(_TRUE if v else _FALSE)
+        elif t is int:
+            out.append(_INT)
+            self.varint((v << 1) if v >= 0 else ((-v << 1) - 1))  # zigzag
+        elif t is dict:
+            out.append(_DICT)
+            self.varint(len(v))
+            for key, item in v.items():
+                if type(key) is not str:
+                    raise TypeError(f"Scene keys must be str, not {type(key).__name__}")
+                self.string(key)
+                self.value(item)
+        elif t is list or t is tuple:
+            self.sequence(v)
+        elif isinstance(v, (str, int, float)):
+            # Subclasses such as str/int enums, written as their base value like json.dump
+            if isinstance(v, str):
+                self.value(str.__str__(v))
+            else:
+                self.value(float.__float__(v) if isinstance(v, float) else int.__int__(v))
+        else:
+            raise TypeError(f"Object of type {t.__name__} is not scene serializable")
+
+    def sequence(self, v: list | tuple) -> None:
+        out = self.out
+        n = len(v)
+        if n >= _MIN_PACKED:
+            t0 = type(v[0])
+            if t0 is float and all(type(x) is float for x in v):
+                out.append(_F64_ARRAY)
+                self.varint(n)
+                out += np.asarray(v, dtype="<f8").tobytes()
+                return
+            if (
+                t0 is int
+                and all(type(x) is int for x in v)
+                and _I64_MIN <= min(v)
+                and max(v) <= _I64_MAX
+            ):
+                out.append(_I64_ARRAY)
+                self.varint(n)
+                out += np.asarray(v, dtype="<i8").tobytes()
+                return
+        if n >= 2 and type(v[0]) in (list, tuple):
+            cols = len(v[0])
+            if cols and all(
+                type(row) in (list, tuple)
+                and len(row) == cols
+                and all(type(x) is float for x in row)
+                for row in v
+            ):
+                out.append(_F64_MATRIX)
+                self.varint(n)
+                self.varint(cols)
+                out += np.asarray(v, dtype="<f8").tobytes()
+                return
+        out.append(_LIST)
+        self.varint(n)
+        for item in v:
+            self.value(item)
+
+
+def encode_scene(data: dict, compress: bool = True) -> bytes:
+    """
+    Encode a scene dict in the binary container format.
+
+    Args:
+        data: Scene dict (JSON-compatible values only)
+        compress: zlib-compress the body
+
+    Returns:
+        The complete file contents
+
+    Raises:
+        TypeError: If data contains values JSON cannot represent
+    """
+    encoder = _Encoder()
+    encoder.value(data)
+    body = bytes(encoder.out)
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 6)
+        flags |= _FLAG_ZLIB
+    return _HEADER.pack(_MAGIC, FORMAT_VERSION, flags) + body
+
+
+# ----- Decoding -----
+
+
+class _Decoder:
+    def __init__(self, buf: bytes):
+        self.buf = buf
+        self.pos = 0
+        self._strings: list[str] = []
+
+    def _take(self, n: int) -> bytes:
+        end = self.pos + n
+        if end > len(self.buf):
+            raise ValueError("Truncated binary scene data")
+        chunk = self.buf[self.pos : end]
+        self.pos = end
+        return chunk
+
+    def varint(self) -> int:
+        buf = self.buf
+        result = shift = 0
+        while True:
+            if self.pos >= len(buf):
+                raise ValueError("Truncated binary scene data")
+            byte = buf[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def value(self) -> Any:
+        if self.pos >= len(self.buf):
+            raise ValueError("Truncated binary scene data")
+        tag = self.buf[self.pos]
+        self.pos += 1
+        if tag == _STR_REF:
+            index = self.varint()
+            if index >= len(self._strings):
+                raise ValueError(f"Invalid string reference {index}")
+            return self._strings[index]
+        if tag == _STR_NEW:
+            s = self._take(self.varint()).decode("utf-8")
+            self._strings.append(s)
+            return s
+        if tag == _FLOAT:
+            return _F64.unpack(self._take(8))[0]
+        if tag == _INT:
+            n = self.varint()
+            return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+        if tag == _DICT:
+            result = {}
+            for _ in range(self.varint()):
+                key = self.value()
+                if type(key) is not str:
+                    raise ValueError("Dict key is not a string")
+                result[key] = self.value()
+            return result
+        if tag == _LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == _NONE:
+            return None
+        if tag == _FALSE:
+            return False
+        if tag == _TRUE:
+            return True
+        if tag == _F64_ARRAY:
+            n = self.varint()
+            return np.frombuffer(self._take(8 * n), dtype="<f8").tolist()
+        if tag == _I64_ARRAY:
+            n = self.varint()
+            return np.frombuffer(self._take(8 * n), dtype="<i8").tolist()
+        if tag == _F64_MATRIX:
+            rows, cols = self.varint(), self.varint()
+            flat = np.frombuffer(self._take(8 * rows * cols), dtype="<f8")
+            return flat.reshape(rows, cols).tolist()
+        raise ValueError(f"Unknown value tag {tag} at offset {self.pos - 1}")
+
+
+def decode_scene(blob: bytes) -> dict:
+    """
+    Decode binary container contents produced by encode_scene().
+
+    Raises:
+        ValueError: If the data is not a valid binary scene of a known version
+    """
+    if len(blob) < _HEADER.size:
+        raise ValueError("Not a binary scene file (too short)")
+    magic, version, flags = _HEADER.unpack_from(blob)
+    if magic != _MAGIC:
+        raise ValueError("Not a binary scene file (bad magic)")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary scene version {version}")
+    body = blob[_HEADER.size :]
+    if flags & _FLAG_ZLIB:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as e:
+            raise ValueError(f"Corrupt binary scene data: {e}") from e
+
+    decoder = _Decoder(body)
+    data = decoder.value()
+    if decoder.pos != len(body):
+        raise ValueError("Trailing data after binary scene")
+    if not isinstance(data, dict):
+        raise ValueError("Binary scene does not contain an object")
+    return data
+
+
+# ----- Files -----
+
+
+def read_scene_file(path: str | os.PathLike) -> dict:
+    """
+    Read a scene file in either format (chosen by extension).
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the contents cannot be parsed (json.JSONDecodeError for JSON)
+    """
+    if is_binary_scene_path(path):
+        with open(path, "rb") as f:
+            return decode_scene(f.read())
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("Scene file does not contain an object")
+    return data
+
+
+def write_scene_file(path: str | os.PathLike, data: dict) -> None:
+    """
+    Write a scene dict in the format chosen by the path's extension.
+
+    Raises:
+        OSError: If the file cannot be written
+        TypeError: If data contains values JSON cannot represent
+    """
+    if is_binary_scene_path(path):
+        blob = encode_scene(data)
+        with open(path, "wb") as f:
+            f.write(blob)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+
+def convert_scene_file(src: str | os.PathLike, dst: str | os.PathLike) -> None:
+    """Convert a scene file between formats, as given by the two extensions."""
+    write_scene_file(dst, read_scene_file(src))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line converter: python -m optiverse.services.scene_format SRC DST."""
+    parser = argparse.ArgumentParser(
+        description=f"Convert Optiverse assemblies between JSON (.json) and "
+        f"binary ({BINARY_SCENE_SUFFIX}) formats; the format follows each file's extension."
+    )
+    parser.add_argument("src", help="Assembly file to read")
+    parser.add_argument("dst", help="Assembly file to write")
+    args = parser.parse_args(argv)
+
+    try:
+        convert_scene_file(args.src, args.dst)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Conversion failed: {e}", file=sys.stderr)
+        return 1
+    print(
+        f"{args.src} ({os.path.getsize(args.src)} bytes) -> "
+        f"{args.dst} ({os.path.getsize(args.dst)} bytes)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
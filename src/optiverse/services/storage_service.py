@@ -13,10 +13,18 @@ from ..core.models import (
     serialize_component,
 )
 from ..core.utils import slugify
+from ..objects.library_index import LibraryIndex
 from ..platform.paths import (
     get_all_library_roots,
     get_custom_library_path,
     get_user_library_root,
+    resolve_image_ref,
+)
+from .image_store import (
+    export_component_images,
+    import_component_images,
+    prune_image_store,
+    store_image,
 )
 
 _logger = logging.getLogger(__name__)
@@ -26,11 +34,13 @@ class StorageService:
     """
     Manages component library storage in folder-based structure.
 
-    Each component is stored in its own folder:
-        component_folder/
-            component.json
-            images/
-                image_file.png
+    Each component is stored in its own folder; images live once per
+    library in its content-addressed image store:
+        library_root/
+            _images/
+                {content_hash}.png
+            component_folder/
+                component.json      (image_path: "@image/{content_hash}.png")
 
     Supports:
     - User library (default: Documents/Optiverse/ComponentLibraries/user_library/)
@@ -71,61 +81,24 @@ class StorageService:
         """
         Load all components from the folder-based library.
 
+        Uses the library's persistent index, so only component folders that
+        changed since the last load are parsed.
+
         Returns:
             List of component dictionaries with absolute image paths for UI display
         """
-        components: list[dict[str, Any]] = []
-
-        for folder in self._iter_component_folders():
-            try:
-                json_path = folder / "component.json"
-                with open(json_path, encoding="utf-8") as f:
-                    data = json.load(f)
-
-                # Resolve image path relative to component folder
-                image_path = data.get("image_path", "")
-                if image_path and not Path(image_path).is_absolute():
-                    # Convert relative path to absolute (relative to component folder)
-                    abs_image_path = (folder / image_path).resolve()
-                    data["image_path"] = str(abs_image_path)
-
-                # Deserialize and re-serialize to normalize
-                rec = deserialize_component(data, self.settings_service)
-                if rec is None:
-                    continue
-
-                # Convert back to dict with absolute paths for UI
-                component_dict = {
-                    "name": rec.name,
-                    "image_path": rec.image_path,  # Already absolute from deserialize
-                    "object_height_mm": float(rec.object_height_mm),
-                    "angle_deg": float(rec.angle_deg),
-                    "notes": rec.notes or "",
-                }
-
-                if rec.category:
-                    component_dict["category"] = rec.category
-
-                if rec.interfaces:
-                    component_dict["interfaces"] = [iface.to_dict() for iface in rec.interfaces]
-
-                components.append(component_dict)
-
-            except (json.JSONDecodeError, OSError, KeyError, TypeError, ValueError) as e:
-                _logger.warning("Failed to load component from %s: %s", folder, e)
-                continue
-
-        return components
+        if self._library_root is None:
+            return []
+        index = LibraryIndex(self._library_root, settings_service=self.settings_service)
+        return index.load()
 
     def save_component(self, rec: ComponentRecord) -> None:
         """
         Save a component to the folder-based library.
 
-        Creates:
-            {library_root}/{component_folder}/
-                component.json
-                images/
-                    image_file.png
+        Creates {library_root}/{component_folder}/component.json. The image
+        is added to the library's image store, so components sharing an
+        image share one stored file.
 
         Args:
             rec: ComponentRecord to save
@@ -137,43 +110,14 @@ class StorageService:
         component_folder = self._library_root / folder_name
         component_folder.mkdir(parents=True, exist_ok=True)
 
-        # Create images subdirectory
-        images_folder = component_folder / "images"
-        images_folder.mkdir(exist_ok=True)
-
         # Handle image path
         saved_image_path = ""
-        if rec.image_path:
-            source_image = Path(rec.image_path)
-
-            # Only copy if image exists and is not already in the component folder
-            if source_image.exists():
-                # Check if image is already in this component's images folder
-                try:
-                    source_image.resolve().relative_to(images_folder.resolve())
-                    # Image is already in the right place
-                    saved_image_path = f"images/{source_image.name}"
-                except ValueError:
-                    # Image is elsewhere, copy it
-                    dest_image = images_folder / source_image.name
-
-                    # Handle name collision
-                    counter = 1
-                    while dest_image.exists() and not self._same_file(source_image, dest_image):
-                        stem = source_image.stem
-                        suffix = source_image.suffix
-                        dest_image = images_folder / f"{stem}_{counter}{suffix}"
-                        counter += 1
-
-                    # Copy image
-                    if not self._same_file(source_image, dest_image):
-                        shutil.copy2(source_image, dest_image)
-
-                    saved_image_path = f"images/{dest_image.name}"
+        if rec.image_path and Path(rec.image_path).exists():
+            saved_image_path = store_image(rec.image_path, self._library_root)
 
         # Create a copy of the record with relative image path
         serialized = serialize_component(rec, self.settings_service)
-        serialized["image_path"] = saved_image_path  # Store as relative path
+        serialized["image_path"] = saved_image_path
 
         # Save component.json
         json_path = component_folder / "component.json"
@@ -185,13 +129,6 @@ class StorageService:
         # Atomic replace
         tmp_path.replace(json_path)
 
-    def _same_file(self, path1: Path, path2: Path) -> bool:
-        """Check if two paths point to the same file."""
-        try:
-            return path1.resolve() == path2.resolve()
-        except OSError:
-            return False
-
     def delete_component(self, name: str) -> bool:
         """
         Delete a component from the library.
@@ -209,6 +146,7 @@ class StorageService:
 
         if component_folder.exists() and component_folder.is_dir():
             shutil.rmtree(component_folder)
+            prune_image_store(self._library_root)
             return True
 
         return False
@@ -238,7 +176,10 @@ class StorageService:
 
             # Resolve image path
             image_path = data.get("image_path", "")
-            if image_path and not Path(image_path).is_absolute():
+            if image_path.startswith("@image/"):
+                roots = [self._library_root, *self.get_all_library_roots()]
+                data["image_path"] = resolve_image_ref(image_path, roots) or image_path
+            elif image_path and not Path(image_path).is_absolute():
                 abs_image_path = (component_folder / image_path).resolve()
                 data["image_path"] = str(abs_image_path)
 
@@ -250,6 +191,9 @@ class StorageService:
         """
         Export a component folder to a destination.
 
+        The exported folder is self-contained: its image is copied from the
+        image store into the folder's images/ directory.
+
         Args:
             name: Component name
             destination: Destination directory path
@@ -276,14 +220,17 @@ class StorageService:
                 shutil.rmtree(dest_component)
 
             shutil.copytree(component_folder, dest_component)
+            export_component_images(dest_component, self._library_root)
             return True
-        except OSError as e:
+        except (OSError, ValueError) as e:
             raise ComponentSaveError(str(destination), str(e)) from e
 
     def import_component(self, source_folder: str, overwrite: bool = False) -> bool:
         """
         Import a component from a folder.
 
+        The component's image is moved into this library's image store.
+
         Args:
             source_folder: Path to component folder containing component.json
             overwrite: If True, overwrite existing component with same name
@@ -324,9 +271,13 @@ class StorageService:
 
             # Copy the component folder
             shutil.copytree(source_path, dest_folder)
+            # @image refs of a folder inside another library resolve there
+            import_component_images(
+                dest_folder, self._library_root, [source_path.parent, *self.get_all_library_roots()]
+            )
             return True
 
-        except (OSError, json.JSONDecodeError, KeyError) as e:
+        except (OSError, ValueError, KeyError) as e:
             _logger.error("Import failed for %s: %s", source_folder, e)
             return False
 
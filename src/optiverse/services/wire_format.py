@@ -0,0 +1,127 @@
+"""
+Collaboration wire format: JSON text frames or compact binary frames.
+
+Messages are JSON text frames until the client and the server agree on a
+binary format: the client sends "wire:hello" with the encodings and
+compressions it supports, and a server that knows binary frames answers
+"wire:ack" with its choice. Older servers ignore the hello and older
+clients never send one, so both keep talking JSON.
+
+A binary frame is a one-byte header followed by the payload. The low bits
+of the header give the encoding (see ENCODINGS), FRAME_ZLIB marks a
+zlib-compressed payload. Payloads of COMPRESS_MIN_BYTES or more are
+compressed, so full scene states shrink while moves stay cheap to encode.
+
+MessagePack is used if the msgpack package is installed, otherwise the
+payload is compact JSON. tools/collaboration_server.py implements the same
+format.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any
+
+# Encoding ids in the binary frame header
+ENCODINGS = {"json": 0, "msgpack": 1}
+
+# Header flag of zlib-compressed payloads
+FRAME_ZLIB = 0x80
+
+# Payloads from this size (bytes) are compressed
+COMPRESS_MIN_BYTES = 1024
+
+# zlib level: full states compress nearly as well as at 6 in a fraction of the time
+COMPRESS_LEVEL = 1
+
+# Supported compressions, in order of preference
+COMPRESSIONS = ["zlib"]
+
+_JSON_SEPARATORS = (",", ":")
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        return None
+    return msgpack
+
+
+def supported_encodings() -> list[str]:
+    """Binary encodings available here, in order of preference."""
+    if _msgpack() is not None:
+        return ["msgpack", "json"]
+    return ["json"]
+
+
+def encode_message(
+    data: dict[str, Any], encoding: str | None = None, compression: str | None = None
+) -> str | bytes:
+    """
+    Encode a message for sending.
+
+    Args:
+        data: The message
+        encoding: Binary encoding (see ENCODINGS), or None for a JSON text frame
+        compression: "zlib" to compress large payloads, or None
+
+    Returns:
+        str for a text frame, bytes for a binary frame
+
+    Raises:
+        TypeError: If data contains values the encoding cannot represent
+        ValueError: If the encoding is unknown
+    """
+    if encoding is None:
+        return json.dumps(data)
+    if encoding == "json":
+        payload = json.dumps(data, separators=_JSON_SEPARATORS).encode("utf-8")
+    elif encoding == "msgpack":
+        msgpack = _msgpack()
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+        payload = msgpack.packb(data, use_bin_type=True)
+    else:
+        raise ValueError(f"Unknown wire encoding {encoding!r}")
+
+    header = ENCODINGS[encoding]
+    if compression == "zlib" and len(payload) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(payload, COMPRESS_LEVEL)
+        if len(compressed) < len(payload):
+            payload = compressed
+            header |= FRAME_ZLIB
+    return bytes((header,)) + payload
+
+
+def decode_message(message: str | bytes | bytearray) -> Any:
+    """
+    Decode a received text or binary frame.
+
+    Raises:
+        ValueError: If the frame cannot be decoded (json.JSONDecodeError for JSON)
+    """
+    if isinstance(message, str):
+        return json.loads(message)
+    if not message:
+        raise ValueError("Empty binary frame")
+    header = message[0]
+    payload = bytes(message[1:])
+    if header & FRAME_ZLIB:
+        try:
+            payload = zlib.decompress(payload)
+        except zlib.error as e:
+            raise ValueError(f"Corrupt compressed frame: {e}") from e
+    encoding = header & ~FRAME_ZLIB
+    if encoding == ENCODINGS["json"]:
+        return json.loads(payload)
+    if encoding == ENCODINGS["msgpack"]:
+        msgpack = _msgpack()
+        if msgpack is None:
+            raise ValueError("Received a MessagePack frame but msgpack is not installed")
+        try:
+            return msgpack.unpackb(payload, raw=False)
+        except Exception as e:
+            raise ValueError(f"Invalid MessagePack frame: {e}") from e
+    raise ValueError(f"Unknown wire encoding id {encoding}")
@@ -268,6 +268,15 @@ class ActionBuilder:
         w.act_show_log.setShortcutContext(QtCore.Qt.ShortcutContext.WindowShortcut)
         w.act_show_log.triggered.connect(w.show_log_window)
 
+        w.act_detector_profiles = QtGui.QAction("Detector Profiles…", w)
+        w.act_detector_profiles.triggered.connect(w.show_detector_profiles)
+
+        w.act_sweep = QtGui.QAction("Parameter Sweep…", w)
+        w.act_sweep.triggered.connect(w.open_sweep_dialog)
+
+        w.act_optimize = QtGui.QAction("Optimize Layout…", w)
+        w.act_optimize.triggered.connect(w.open_optimizer_dialog)
+
         # --- Collaboration Actions ---
         w.act_collaborate = QtGui.QAction("Connect/Host Session…", w)
         w.act_collaborate.setShortcut("Ctrl+Shift+C")
@@ -425,6 +434,9 @@ class ActionBuilder:
         mTools.addAction(w.act_inspect)
         mTools.addAction(w.act_measure_path)
         mTools.addAction(w.act_measure_angle)
+        mTools.addAction(w.act_detector_profiles)
+        mTools.addAction(w.act_sweep)
+        mTools.addAction(w.act_optimize)
         mTools.addSeparator()
         mTools.addAction(w.act_editor)
         mTools.addAction(w.act_reload)
@@ -7,7 +7,6 @@ Supports importing assemblies as grouped layers.
 
 from __future__ import annotations
 
-import json
 import os
 from typing import TYPE_CHECKING, Callable
 
@@ -15,7 +14,13 @@ from PyQt6 import QtCore, QtWidgets
 
 from ...core.constants import AUTOSAVE_DEBOUNCE_MS
 from ...services.error_handler import ErrorContext
-from ...services.scene_file_manager import SceneFileManager
+from ...services.scene_file_manager import LoadProgress, SceneFileManager
+from ...services.scene_format import BINARY_SCENE_SUFFIX, is_binary_scene_path, read_scene_file
+
+# File dialog filters for assembly files (JSON and compact binary)
+_OPEN_FILTER = f"Optics Assembly (*.json *{BINARY_SCENE_SUFFIX})"
+_JSON_FILTER = "Optics Assembly (*.json)"
+_BINARY_FILTER = f"Binary Optics Assembly (*{BINARY_SCENE_SUFFIX})"
 
 if TYPE_CHECKING:
     from ...core.layer_group import GroupManager
@@ -34,6 +39,9 @@ class FileController(QtCore.QObject):
     traceRequested = QtCore.pyqtSignal()
     # Signal emitted when window title should be updated
     windowTitleChanged = QtCore.pyqtSignal(str)
+    # Signals bracketing a scene load, so per-item updates can be suspended
+    loadStarted = QtCore.pyqtSignal()
+    loadFinished = QtCore.pyqtSignal()
 
     def __init__(
         self,
@@ -54,6 +62,7 @@ class FileController(QtCore.QObject):
         self._log_service = log_service
         self._scene = scene
         self._connect_item_signals = connect_item_signals
+        self._loading = False
 
         # Create file manager
         self.file_manager = SceneFileManager(
@@ -69,19 +78,19 @@ class FileController(QtCore.QObject):
         if group_manager:
             self.file_manager.set_group_manager(group_manager)
 
-    def set_group_manager(self, group_manager: GroupManager) -> None:
-        """Set the group manager for import-as-layer functionality."""
-        self._group_manager = group_manager
-        self.file_manager.set_group_manager(group_manager)
-
         # Autosave timer
-        self._autosave_timer = QtCore.QTimer()
+        self._autosave_timer = QtCore.QTimer(self)
         self._autosave_timer.setSingleShot(True)
         self._autosave_timer.setInterval(AUTOSAVE_DEBOUNCE_MS)
         self._autosave_timer.timeout.connect(self._do_autosave)
 
-        # Connect undo stack to modification tracking
-        self._undo_stack.commandPushed.connect(self._on_command_pushed)
+        # Connect undo stack to modification tracking and the autosave journal
+        self._undo_stack.commandApplied.connect(self._on_command_applied)
+
+    def set_group_manager(self, group_manager: GroupManager) -> None:
+        """Set the group manager for import-as-layer functionality."""
+        self._group_manager = group_manager
+        self.file_manager.set_group_manager(group_manager)
 
     @property
     def saved_file_path(self) -> str | None:
@@ -98,8 +107,9 @@ class FileController(QtCore.QObject):
         """Check if there are unsaved changes."""
         return self._is_modified
 
-    def _on_command_pushed(self):
-        """Handle command pushed - mark modified and schedule autosave."""
+    def _on_command_applied(self, command):
+        """Handle command push/undo/redo - journal it, mark modified, schedule autosave."""
+        self.file_manager.record_command(command)
         self.mark_modified()
         self._schedule_autosave()
 
@@ -137,16 +147,65 @@ class FileController(QtCore.QObject):
             self._autosave_timer.start()
 
     def _do_autosave(self):
-        """Perform autosave (delegated to file manager)."""
+        """Perform autosave (delegated to file manager); deferred while a scene loads."""
+        if self._loading:
+            return
         self.file_manager.do_autosave()
 
     def check_autosave_recovery(self) -> bool:
         """Check for autosave on startup."""
-        if self.file_manager.check_autosave_recovery():
+        if self._run_load(self.file_manager.check_autosave_recovery, "Recovering autosave…"):
             self.traceRequested.emit()
             return True
         return False
 
+    def _run_load(self, load: Callable[[LoadProgress], bool], label: str) -> bool:
+        """
+        Run a scene load with a progress dialog, bracketed by load signals.
+
+        The loader calls the progress callback between chunks of items; the
+        callback updates a window-modal progress dialog (created on first use
+        and shown only for slow loads) and processes pending events so the
+        window stays responsive. Autosave waits until the load has finished,
+        so it never writes a half-loaded scene.
+
+        Args:
+            load: Callable taking a progress callback, returning success
+            label: Progress dialog label
+
+        Returns:
+            The loader's result (False if a load is already running)
+        """
+        if self._loading:
+            return False
+        dialog: QtWidgets.QProgressDialog | None = None
+
+        def progress(done: int, total: int) -> None:
+            nonlocal dialog
+            if dialog is None:
+                dialog = QtWidgets.QProgressDialog(label, "", 0, 1000, self._parent)
+                dialog.setCancelButton(None)
+                dialog.setWindowTitle("Loading")
+                dialog.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
+                dialog.setMinimumDuration(300)
+            dialog.setValue(min(1000, 1000 * done // total) if total > 0 else 1000)
+            QtCore.QCoreApplication.processEvents()
+
+        self._loading = True
+        self._autosave_timer.stop()
+        self.loadStarted.emit()
+        try:
+            return load(progress)
+        finally:
+            self._loading = False
+            if dialog is not None:
+                dialog.close()
+                dialog.deleteLater()
+            self.loadFinished.emit()
+            if self._is_modified:
+                # Changes pending before the load (kept if it failed)
+                self._schedule_autosave()
+
     def prompt_save_changes(self) -> QtWidgets.QMessageBox.StandardButton:
         """
         Prompt user to save unsaved changes.
@@ -172,9 +231,11 @@ class FileController(QtCore.QObject):
     def save_assembly_as(self):
         """Save As: always prompt for new file location."""
         with ErrorContext("while saving assembly", suppress=True):
-            path, _ = QtWidgets.QFileDialog.getSaveFileName(
-                self._parent, "Save Assembly As", "", "Optics Assembly (*.json)"
+            path, selected = QtWidgets.QFileDialog.getSaveFileName(
+                self._parent, "Save Assembly As", "", f"{_JSON_FILTER};;{_BINARY_FILTER}"
             )
+            if path and selected == _BINARY_FILTER and not is_binary_scene_path(path):
+                path += BINARY_SCENE_SUFFIX
             if path:
                 self.file_manager.save_to_file(path)
 
@@ -192,12 +253,16 @@ class FileController(QtCore.QObject):
                     return False
 
             path, _ = QtWidgets.QFileDialog.getOpenFileName(
-                self._parent, "Open Assembly", "", "Optics Assembly (*.json)"
+                self._parent, "Open Assembly", "", _OPEN_FILTER
             )
             if not path:
                 return False
 
-            if not self.file_manager.open_file(path):
+            opened = self._run_load(
+                lambda progress: self.file_manager.open_file(path, progress),
+                "Opening assembly…",
+            )
+            if not opened:
                 return False
 
         # Clear undo history after loading
@@ -218,15 +283,14 @@ class FileController(QtCore.QObject):
         """
         with ErrorContext("while importing assembly as layer", suppress=True):
             path, _ = QtWidgets.QFileDialog.getOpenFileName(
-                self._parent, "Import Assembly as Layer", "", "Optics Assembly (*.json)"
+                self._parent, "Import Assembly as Layer", "", _OPEN_FILTER
             )
             if not path:
                 return False
 
             try:
-                with open(path, encoding="utf-8") as f:
-                    data = json.load(f)
-            except (OSError, json.JSONDecodeError) as e:
+                data = read_scene_file(path)
+            except (OSError, ValueError) as e:
                 self._log_service.error(f"Failed to load file: {e}", "Import")
                 QtWidgets.QMessageBox.warning(
                     self._parent,
@@ -6,17 +6,30 @@ This module extracts library loading and import logic from MainWindow.
 
 from __future__ import annotations
 
-import os
+import logging
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable
 
 from PyQt6 import QtCore, QtGui, QtWidgets
 
+from ..widgets.library_tree import THUMBNAIL_PATH_ROLE, LibraryTree
+
 if TYPE_CHECKING:
     from ...services.log_service import LogService
     from ...services.storage_service import StorageService
 
 
+_logger = logging.getLogger(__name__)
+
+# Components per batch delivered to the tree while loading
+BATCH_SIZE = 64
+# Library roots loaded concurrently
+ROOT_WORKERS = 4
+# Threads statting/parsing component folders (I/O bound, e.g. network drives)
+FOLDER_WORKERS = 8
+
 # Category display order
 CATEGORY_ORDER = [
     "Lenses",
@@ -45,7 +58,95 @@ CATEGORY_MAP = {
 }
 
 
-class LibraryManager:
+class _LibraryLoader(QtCore.QObject):
+    """
+    Loads custom library roots on a thread pool.
+
+    Roots are loaded concurrently, and each root stats and parses its
+    component folders on a shared folder pool. Results are emitted in
+    batches from the worker threads while the roots are still being parsed;
+    receivers in the GUI thread get them through queued connections.
+    """
+
+    batchLoaded = QtCore.pyqtSignal(list)
+    finished = QtCore.pyqtSignal()
+
+    def __init__(self, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self._cancelled = threading.Event()
+        self._folder_pool = ThreadPoolExecutor(
+            max_workers=FOLDER_WORKERS, thread_name_prefix="library-folder"
+        )
+        self._root_pool = ThreadPoolExecutor(
+            max_workers=ROOT_WORKERS, thread_name_prefix="library-root"
+        )
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Discover the custom library roots and load them in the background."""
+        self._root_pool.submit(self._discover)
+
+    def cancel(self) -> None:
+        """Stop emitting batches and release the pools without waiting."""
+        self._cancelled.set()
+        self._shutdown()
+
+    def _discover(self) -> None:
+        from ...platform.paths import get_all_custom_library_roots
+
+        try:
+            roots = get_all_custom_library_roots()
+        except OSError as e:
+            _logger.warning("Failed to list custom libraries: %s", e)
+            roots = []
+        with self._lock:
+            self._pending = len(roots)
+        if not roots:
+            self._done()
+            return
+        for root in roots:
+            try:
+                self._root_pool.submit(self._load_root, root)
+            except RuntimeError:
+                # Pool shut down by cancel()
+                return
+
+    def _load_root(self, root: Path) -> None:
+        from ...objects.library_index import load_indexed_component_dicts
+
+        def emit(records: list[dict]) -> None:
+            if not self._cancelled.is_set():
+                self.batchLoaded.emit(records)
+
+        try:
+            if not self._cancelled.is_set():
+                # Batches are emitted while the root is still being parsed
+                load_indexed_component_dicts(
+                    root, executor=self._folder_pool, on_batch=emit, batch_size=BATCH_SIZE
+                )
+        except (OSError, RuntimeError, CancelledError) as e:
+            # RuntimeError, CancelledError: folder pool shut down by cancel()
+            if not self._cancelled.is_set():
+                _logger.warning("Failed to load library from %s: %s", root, e)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                last = self._pending == 0
+            if last:
+                self._done()
+
+    def _done(self) -> None:
+        self._shutdown()
+        if not self._cancelled.is_set():
+            self.finished.emit()
+
+    def _shutdown(self) -> None:
+        self._folder_pool.shutdown(wait=False, cancel_futures=True)
+        self._root_pool.shutdown(wait=False, cancel_futures=True)
+
+
+class LibraryManager(QtCore.QObject):
     """
     Manages component library loading, display, and import operations.
 
@@ -54,7 +155,7 @@ class LibraryManager:
 
     def __init__(
         self,
-        library_tree: QtWidgets.QTreeWidget,
+        library_tree: LibraryTree,
         storage_service: StorageService,
         log_service: LogService,
         get_dark_mode: Callable[[], bool],
@@ -72,6 +173,7 @@ class LibraryManager:
             get_style: Callable returning current widget style
             parent_widget: Parent widget for dialogs
         """
+        super().__init__(parent_widget)
         self.library_tree = library_tree
         self.storage_service = storage_service
         self.log_service = log_service
@@ -82,42 +184,75 @@ class LibraryManager:
         # Component templates for toolbar placement
         self.component_templates: dict[str, dict] = {}
 
+        # Category header items currently in the tree
+        self._category_items: dict[str, QtWidgets.QTreeWidgetItem] = {}
+        self._loader: _LibraryLoader | None = None
+
     def populate(self) -> dict[str, dict]:
         """
         Load and populate component library organized by category.
 
+        Built-in components are loaded immediately (they are few and
+        indexed); custom library roots are loaded in the background and
+        appear in the tree batch by batch.
+
         Returns:
-            Dictionary mapping toolbar type strings to component data
+            Dictionary mapping toolbar type strings to component data. Custom
+            libraries may add missing templates to this dict while loading.
         """
         from ...objects.component_registry import ComponentRegistry
-        from ...objects.definitions_loader import load_component_dicts_from_multiple
-        from ...platform.paths import get_all_custom_library_roots
 
+        self.cancel_loading()
         self.library_tree.clear()
+        self._category_items = {}
 
         # Load built-in (standard) components
         builtin_records = ComponentRegistry.get_standard_components()
         for rec in builtin_records:
             rec["_source"] = "builtin"
 
-        # Load custom library components
-        custom_library_paths = get_all_custom_library_roots()
-        user_records = load_component_dicts_from_multiple([str(p) for p in custom_library_paths])
-        for rec in user_records:
-            rec["_source"] = "user"
-
-        all_records = builtin_records + user_records
-
         # Cache standard component templates for toolbar
-        self.component_templates = self._extract_toolbar_templates(all_records)
-
-        # Organize and display by category
-        categories = self._categorize_records(all_records)
-        self._populate_tree(categories)
-
+        self.component_templates = self._extract_toolbar_templates(builtin_records)
+        self._populate_tree(self._categorize_records(builtin_records))
         self.library_tree.expandAll()
+
+        # Load custom library components without blocking the GUI
+        self._loader = _LibraryLoader()
+        # The PyQt6 stubs omit connect()'s connection type argument
+        self._loader.batchLoaded.connect(
+            self._on_batch_loaded,
+            QtCore.Qt.ConnectionType.QueuedConnection,  # type: ignore[call-arg]
+        )
+        self._loader.finished.connect(self._on_loading_finished)
+        self._loader.start()
         return self.component_templates
 
+    @property
+    def is_loading(self) -> bool:
+        """Whether custom libraries are still being loaded in the background."""
+        return self._loader is not None
+
+    def cancel_loading(self) -> None:
+        """Stop a running background load; batches still in flight are dropped."""
+        if self._loader is not None:
+            self._loader.cancel()
+            self._loader.batchLoaded.disconnect(self._on_batch_loaded)
+            self._loader.finished.disconnect(self._on_loading_finished)
+            self._loader = None
+
+    def _on_batch_loaded(self, records: list[dict]):
+        """Add a batch of custom library components to the tree."""
+        if self.sender() is not self._loader:
+            return
+        for rec in records:
+            rec["_source"] = "user"
+        for key, rec in self._extract_toolbar_templates(records).items():
+            self.component_templates.setdefault(key, rec)
+        self._populate_tree(self._categorize_records(records))
+
+    def _on_loading_finished(self):
+        self._loader = None
+
     def _extract_toolbar_templates(self, records: list[dict]) -> dict[str, dict]:
         """Extract standard component templates for toolbar placement."""
         templates = {}
@@ -158,47 +293,61 @@ class LibraryManager:
         return categories
 
     def _populate_tree(self, categories: dict[str, list[dict]]):
-        """Populate tree widget with categorized components."""
+        """
+        Add categorized components to the tree widget.
+
+        Category headers are created on demand at their position in
+        CATEGORY_ORDER, so batches can be added as they arrive. Thumbnails
+        are decoded lazily by the tree once items scroll into view.
+        """
         is_dark = self._get_dark_mode()
-        style = self._get_style()
+        placeholder = self._get_style().standardIcon(QtWidgets.QStyle.StandardPixmap.SP_FileIcon)
 
         for category_name in CATEGORY_ORDER:
             comps = categories.get(category_name, [])
             if not comps:
                 continue
 
-            # Create category header
-            category_item = QtWidgets.QTreeWidgetItem([category_name])
-            category_item.setFlags(category_item.flags() & ~QtCore.Qt.ItemFlag.ItemIsDragEnabled)
-
-            # Style category header
-            font = category_item.font(0)
-            font.setBold(True)
-            font.setPointSize(10)
-            category_item.setFont(0, font)
-
-            # Color adapts to dark/light mode
-            if is_dark:
-                category_item.setForeground(0, QtGui.QColor(140, 150, 200))
-            else:
-                category_item.setForeground(0, QtGui.QColor(60, 60, 100))
-
-            self.library_tree.addTopLevelItem(category_item)
+            category_item = self._category_items.get(category_name)
+            if category_item is None:
+                category_item = self._create_category_item(category_name, is_dark)
 
             # Add components under category
             for rec in comps:
                 name = rec.get("name", "(unnamed)")
-                img = rec.get("image_path")
-
-                if img and os.path.exists(img):
-                    icon = QtGui.QIcon(img)
-                else:
-                    icon = style.standardIcon(QtWidgets.QStyle.StandardPixmap.SP_FileIcon)
-
                 comp_item = QtWidgets.QTreeWidgetItem([name])
-                comp_item.setIcon(0, icon)
+                comp_item.setIcon(0, placeholder)
                 comp_item.setData(0, QtCore.Qt.ItemDataRole.UserRole, rec)
+                img = rec.get("image_path")
+                if img:
+                    comp_item.setData(0, THUMBNAIL_PATH_ROLE, img)
                 category_item.addChild(comp_item)
+            category_item.setExpanded(True)
+
+        self.library_tree.schedule_thumbnail_update()
+
+    def _create_category_item(self, category_name: str, is_dark: bool) -> QtWidgets.QTreeWidgetItem:
+        """Create a category header and insert it in CATEGORY_ORDER position."""
+        category_item = QtWidgets.QTreeWidgetItem([category_name])
+        category_item.setFlags(category_item.flags() & ~QtCore.Qt.ItemFlag.ItemIsDragEnabled)
+
+        # Style category header
+        font = category_item.font(0)
+        font.setBold(True)
+        font.setPointSize(10)
+        category_item.setFont(0, font)
+
+        # Color adapts to dark/light mode
+        if is_dark:
+            category_item.setForeground(0, QtGui.QColor(140, 150, 200))
+        else:
+            category_item.setForeground(0, QtGui.QColor(60, 60, 100))
+
+        rank = CATEGORY_ORDER.index(category_name)
+        position = sum(1 for name in self._category_items if CATEGORY_ORDER.index(name) < rank)
+        self.library_tree.insertTopLevelItem(position, category_item)
+        self._category_items[category_name] = category_item
+        return category_item
 
     def import_library(self) -> bool:
         """
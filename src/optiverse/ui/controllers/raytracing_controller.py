@@ -33,6 +33,7 @@ class RaytracingController(QtCore.QObject):
     - Ray tracing through optical elements
     - Debounced retrace scheduling
     - Ray data storage for tools (inspect, path measure)
+    - Detector readings for the detector profile view
     - Ray rendering coordination
 
     Signals:
@@ -65,6 +66,7 @@ class RaytracingController(QtCore.QObject):
 
         # State
         self._ray_data: list = []
+        self._detector_readings: list = []
         self._ray_width_px: float = 2.0
         self._autotrace: bool = True
 
@@ -75,11 +77,19 @@ class RaytracingController(QtCore.QObject):
         self._retrace_timer.setInterval(1)  # 1ms debounce delay
         self._retrace_timer.timeout.connect(self._do_retrace)
 
+        # Nesting depth of suspend_retrace() calls (e.g. while loading a file)
+        self._suspend_depth = 0
+
     @property
     def ray_data(self) -> list:
         """Get the current ray data (list of RayPath objects)."""
         return self._ray_data
 
+    @property
+    def detector_readings(self) -> list:
+        """Get the detector histograms of the last trace (list of DetectorReading)."""
+        return self._detector_readings
+
     @property
     def autotrace(self) -> bool:
         """Get autotrace enabled state."""
@@ -105,6 +115,22 @@ class RaytracingController(QtCore.QObject):
         """Remove all ray graphics from scene."""
         self._ray_renderer.clear()
         self._ray_data.clear()
+        self._detector_readings = []
+
+    def suspend_retrace(self) -> None:
+        """
+        Ignore retrace requests until resume_retrace() is called.
+
+        Used for bulk scene changes; the caller requests one retrace after
+        resuming. Calls nest.
+        """
+        self._suspend_depth += 1
+        self._retrace_timer.stop()
+        self._retrace_pending = False
+
+    def resume_retrace(self) -> None:
+        """Undo one suspend_retrace() call."""
+        self._suspend_depth = max(0, self._suspend_depth - 1)
 
     def schedule_retrace(self) -> None:
         """
@@ -115,7 +141,7 @@ class RaytracingController(QtCore.QObject):
         - Adding a small delay to batch rapid changes together
         - Checking if autotrace is enabled before scheduling
         """
-        if not self._autotrace:
+        if not self._autotrace or self._suspend_depth:
             return
         if not self._retrace_pending:
             self._retrace_pending = True
@@ -166,15 +192,33 @@ class RaytracingController(QtCore.QObject):
 
             # Trace using polymorphic engine
             try:
-                from ...raytracing import trace_rays_polymorphic
+                from ...raytracing import trace_rays_with_detectors
 
-                paths = trace_rays_polymorphic(elements, srcs, max_events=MAX_RAYTRACING_EVENTS)
+                result = trace_rays_with_detectors(elements, srcs, max_events=MAX_RAYTRACING_EVENTS)
             except Exception as e:
                 self._log_service.error(f"Error in raytracing: {e}", LogCategory.RAYTRACING)
                 return
 
             # Render paths
-            self._render_ray_paths(paths)
+            self._detector_readings = result.detectors
+            self._render_ray_paths(result.paths)
+
+    def show_trace_result(self, result) -> None:
+        """
+        Show a trace of the current scene made elsewhere instead of retracing.
+
+        Used for traces shared by the collaboration server; a retrace already
+        scheduled is cancelled.
+
+        Args:
+            result: TraceResult with paths and detector readings
+        """
+        self._retrace_timer.stop()
+        self._retrace_pending = False
+        with ErrorContext("while showing rays", show_dialog=False, suppress=True):
+            self.clear_rays()
+            self._detector_readings = result.detectors
+            self._render_ray_paths(result.paths)
 
     def _render_ray_paths(self, paths) -> None:
         """
@@ -15,7 +15,6 @@ from ..widgets.interface_tree_panel import InterfaceTreePanel
 from ..widgets.ruler_widget import CanvasWithRulers
 from .component_image_handler import ComponentImageHandler
 from .component_library_io import ComponentLibraryIO
-from .zemax_importer import ZemaxImporter
 
 _logger = logging.getLogger(__name__)
 
@@ -52,6 +51,10 @@ class MoveInterfaceCommand(Command):
         """Restore old positions."""
         self._apply_positions(self.old_positions)
 
+    def affected_items(self) -> list:
+        """Interfaces of the component being edited are not scene items."""
+        return []
+
     def _apply_positions(self, positions: list[tuple[float, float, float, float]]):
         """Apply given positions to interfaces."""
         interfaces = self.editor.interface_panel.get_interfaces()
@@ -111,8 +114,8 @@ class ComponentEditor(QtWidgets.QMainWindow):
         )
         self.canvas.imageDropped.connect(self._image_handler.on_image_dropped)
 
-        # Zemax importer
-        self._zemax_importer = ZemaxImporter(self)
+        # Zemax importer, created on first import
+        self._zemax_importer = None
 
         self._build_side_dock()
         self._build_library_dock()
@@ -667,6 +670,10 @@ class ComponentEditor(QtWidgets.QMainWindow):
 
     def _import_zemax(self):
         """Import Zemax ZMX file."""
+        if self._zemax_importer is None:
+            from .zemax_importer import ZemaxImporter
+
+            self._zemax_importer = ZemaxImporter(self)
         component = self._zemax_importer.import_file()
         if component:
             self._load_component_record(component)
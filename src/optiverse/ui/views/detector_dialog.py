@@ -0,0 +1,119 @@
+"""
+Detector profile window showing histograms recorded by detector elements.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from PyQt6 import QtWidgets
+
+from ..widgets.detector_profile import HistogramPlot
+
+if TYPE_CHECKING:
+    from ..controllers.raytracing_controller import RaytracingController
+
+# (label, DetectorReading attribute, axis label)
+_PROFILES = (
+    ("Position", "position", "Position along detector (mm)"),
+    ("Angle", "angle", "Incidence angle (°)"),
+    ("Wavelength", "wavelength", "Wavelength (nm)"),
+)
+
+
+class DetectorProfileDialog(QtWidgets.QDialog):
+    """
+    Non-modal window plotting detector histograms.
+
+    Refreshes whenever the raytracing controller reports new rays, so the
+    profile follows the scene while components are moved.
+    """
+
+    def __init__(
+        self,
+        raytracing_controller: RaytracingController,
+        parent: QtWidgets.QWidget | None = None,
+    ):
+        super().__init__(parent)
+        self.setWindowTitle("Detector Profiles")
+        self.resize(560, 380)
+        self._controller = raytracing_controller
+
+        self._build_ui()
+        self._controller.rays_changed.connect(self.refresh)
+        self.finished.connect(self._disconnect)
+        self.refresh()
+
+    def _build_ui(self):
+        """Build the dialog UI."""
+        layout = QtWidgets.QVBoxLayout(self)
+
+        toolbar = QtWidgets.QHBoxLayout()
+        toolbar.addWidget(QtWidgets.QLabel("Detector:"))
+        self.detector_combo = QtWidgets.QComboBox()
+        self.detector_combo.currentIndexChanged.connect(self._update_plot)
+        toolbar.addWidget(self.detector_combo, 1)
+
+        toolbar.addWidget(QtWidgets.QLabel("Profile:"))
+        self.profile_combo = QtWidgets.QComboBox()
+        for label, attr, _axis in _PROFILES:
+            self.profile_combo.addItem(label, attr)
+        self.profile_combo.currentIndexChanged.connect(self._update_plot)
+        toolbar.addWidget(self.profile_combo)
+
+        self.counts_check = QtWidgets.QCheckBox("Ray counts")
+        self.counts_check.setToolTip("Plot number of rays per bin instead of power")
+        self.counts_check.toggled.connect(self._update_plot)
+        toolbar.addWidget(self.counts_check)
+        layout.addLayout(toolbar)
+
+        self.plot = HistogramPlot(self)
+        layout.addWidget(self.plot, 1)
+
+        self.summary_label = QtWidgets.QLabel()
+        layout.addWidget(self.summary_label)
+
+    def refresh(self):
+        """Reload readings from the controller, keeping the current selection."""
+        readings = self._controller.detector_readings
+        current = self.detector_combo.currentIndex()
+
+        self.detector_combo.blockSignals(True)
+        self.detector_combo.clear()
+        for i, reading in enumerate(readings):
+            name = reading.name or "Detector"
+            self.detector_combo.addItem(f"{i + 1}: {name}")
+        if readings:
+            self.detector_combo.setCurrentIndex(min(max(current, 0), len(readings) - 1))
+        self.detector_combo.blockSignals(False)
+
+        self._update_plot()
+
+    def _update_plot(self):
+        """Plot the selected histogram of the selected detector."""
+        readings = self._controller.detector_readings
+        index = self.detector_combo.currentIndex()
+        if not (0 <= index < len(readings)):
+            self.plot.clear()
+            self.summary_label.setText("No detector in the scene was traced.")
+            return
+
+        reading = readings[index]
+        _label, attr, axis_label = _PROFILES[self.profile_combo.currentIndex()]
+        histogram = getattr(reading, attr)
+        if self.counts_check.isChecked():
+            self.plot.set_histogram(histogram.edges, histogram.counts, axis_label, "Rays")
+        else:
+            self.plot.set_histogram(histogram.edges, histogram.power, axis_label, "Power")
+
+        summary = f"{reading.n_hits} rays, total power {reading.total_power:.4g}"
+        if reading.out_of_range_power > 0.0:
+            summary += f" ({reading.out_of_range_power:.4g} outside angle/wavelength range)"
+        self.summary_label.setText(summary)
+
+    def _disconnect(self, _result: int = 0):
+        """Stop following the controller once the window is closed."""
+        try:
+            self._controller.rays_changed.disconnect(self.refresh)
+        except TypeError:
+            pass
@@ -44,7 +44,6 @@ from ..controllers.library_manager import LibraryManager
 from ..controllers.ray_renderer import RayRenderer
 from ..widgets.layer_panel import LayerPanel
 from ..widgets.library_tree import LibraryTree
-from .log_window import LogWindow
 from .placement_handler import PlacementHandler
 from .ruler_placement_handler import RulerPlacementHandler
 from .scene_event_handler import SceneEventHandler
@@ -101,6 +100,9 @@ class MainWindow(QtWidgets.QMainWindow):
     act_open_library_folder: QtGui.QAction
     act_import_library: QtGui.QAction
     act_show_log: QtGui.QAction
+    act_detector_profiles: QtGui.QAction
+    act_sweep: QtGui.QAction
+    act_optimize: QtGui.QAction
     act_collaborate: QtGui.QAction
     act_disconnect: QtGui.QAction
     act_import_as_layer: QtGui.QAction
@@ -145,6 +147,9 @@ class MainWindow(QtWidgets.QMainWindow):
         # Ruler placement cursor backup
         self._prev_cursor = None
 
+        # Set while a scene file is loading (layer panel refreshes deferred)
+        self._scene_loading = False
+
         # Services
         self.settings_service = SettingsService()
         self.storage_service = StorageService(settings_service=self.settings_service)
@@ -201,6 +206,16 @@ class MainWindow(QtWidgets.QMainWindow):
         # Check for autosave recovery on startup
         QtCore.QTimer.singleShot(100, self.file_controller.check_autosave_recovery)
 
+        # Trim the SVG render cache to its budget in the background
+        from ...objects.svg_render_cache import apply_cache_settings
+
+        apply_cache_settings(self.settings_service).start_cleanup()
+
+        # Compile the raytracing kernels once the window is up, before the first trace
+        from ...core.kernel_warmup import start_kernel_warmup
+
+        QtCore.QTimer.singleShot(0, start_kernel_warmup)
+
     def _init_handlers(self):
         """Initialize extracted handler classes."""
         # Ray renderer for rendering traced paths
@@ -227,6 +242,8 @@ class MainWindow(QtWidgets.QMainWindow):
         # Connect file controller signals
         self.file_controller.traceRequested.connect(self._schedule_retrace)
         self.file_controller.windowTitleChanged.connect(self.setWindowTitle)
+        self.file_controller.loadStarted.connect(self._begin_scene_load)
+        self.file_controller.loadFinished.connect(self._end_scene_load)
 
         # Collaboration controller - handles hosting/joining sessions
         self.collab_controller = CollaborationController(
@@ -351,9 +368,24 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _refresh_layer_panel(self):
         """Refresh the layer panel to reflect scene changes."""
-        if hasattr(self, "layer_panel"):
+        if hasattr(self, "layer_panel") and not self._scene_loading:
             self.layer_panel.refresh()
 
+    def _begin_scene_load(self):
+        """Suspend retracing, layer refreshes and collaboration while a file loads."""
+        self._scene_loading = True
+        self.raytracing_controller.suspend_retrace()
+        self.collaboration_manager.suspend_broadcasts()
+        self.collaboration_manager.suspend_remote_changes()
+
+    def _end_scene_load(self):
+        """Resume updates after a file load and refresh the layer panel once."""
+        self._scene_loading = False
+        self.raytracing_controller.resume_retrace()
+        self.collaboration_manager.resume_broadcasts()
+        self.collaboration_manager.resume_remote_changes()
+        self._refresh_layer_panel()
+
     def _init_event_handlers(self):
         """Initialize handlers that require actions to be created first."""
         # Ruler placement handler
@@ -535,8 +567,6 @@ class MainWindow(QtWidgets.QMainWindow):
             for item in self.scene.items():
                 if isinstance(item, Editable):
                     item.edited.connect(self._maybe_retrace)
-            # Refresh layer panel
-            self.layer_panel.refresh()
 
     def import_assembly_as_layer(self):
         """Import an assembly file as a new layer (grouped items)."""
@@ -707,6 +737,10 @@ class MainWindow(QtWidgets.QMainWindow):
         # Reload library to pick up new library paths
         self.populate_library()
 
+        from ...objects.svg_render_cache import apply_cache_settings
+
+        apply_cache_settings(self.settings_service)
+
         # Log the change
         self.log_service.info("Settings updated - library reloaded", "Settings")
 
@@ -733,9 +767,35 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def show_log_window(self):
         """Show the application log window."""
+        from .log_window import LogWindow
+
         log_window = LogWindow(self)
         log_window.show()
 
+    def show_detector_profiles(self):
+        """Show histograms recorded by detector elements in the last trace."""
+        from .detector_dialog import DetectorProfileDialog
+
+        dialog = DetectorProfileDialog(self.raytracing_controller, self)
+        dialog.setAttribute(QtCore.Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.show()
+
+    def open_sweep_dialog(self):
+        """Open the parameter sweep dialog for the current scene."""
+        from .sweep_dialog import SweepDialog
+
+        dialog = SweepDialog(self.scene, self)
+        dialog.setAttribute(QtCore.Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.show()
+
+    def open_optimizer_dialog(self):
+        """Open the layout optimizer for the selected items."""
+        from .optimizer_dialog import OptimizerDialog
+
+        dialog = OptimizerDialog(self.scene, self.undo_stack, self)
+        dialog.setAttribute(QtCore.Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.show()
+
     # ----- Collaboration (delegated to CollaborationController) -----
     def open_collaboration_dialog(self):
         """Open dialog to connect to or host a collaboration session."""
@@ -771,6 +831,10 @@ class MainWindow(QtWidgets.QMainWindow):
                 self._comp_editor.close()
             # Disconnect from collaboration (collab_controller always exists after __init__)
             self.collab_controller.cleanup()
+            # Drop pending sprite renders and stop the render workers
+            from ...objects.svg_rasterizer import get_svg_rasterizer
+
+            get_svg_rasterizer().shutdown()
         except (OSError, RuntimeError):
             # Ignore cleanup errors during shutdown
             pass
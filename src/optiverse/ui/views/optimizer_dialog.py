@@ -0,0 +1,329 @@
+"""
+Layout optimizer dialog.
+
+Adjusts the position and angle of the selected items within bounds to
+minimize a trace-based objective, then applies the result as one undoable
+command.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from PyQt6 import QtCore, QtWidgets
+
+from ...core.undo_commands import RotateItemsCommand
+from ...core.utils import user_angle_to_qt
+from ...integration.optimize import (
+    OptimizationResult,
+    OptimizationVariable,
+    SpotSize,
+    TargetDistance,
+    TotalPathLength,
+    optimize_layout,
+)
+from ...integration.sweep import SceneSnapshot, SweepParameter
+from ...objects.base_obj import BaseObj
+from ..widgets.smart_spinbox import SmartDoubleSpinBox
+
+# Variables offered per item: (field, label, default ± bound)
+_FIELDS = [
+    ("x_mm", "X", 10.0),
+    ("y_mm", "Y", 10.0),
+    ("angle_deg", "Angle", 5.0),
+]
+
+_OBJECTIVES = [
+    "Minimize detector spot size",
+    "Minimize distance to target point",
+    "Minimize total path length",
+    "Match total path length",
+]
+
+
+class _OptimizeThread(QtCore.QThread):
+    """Runs optimize_layout off the GUI thread and reports progress via signals."""
+
+    progressed = QtCore.pyqtSignal(int, float)
+    completed = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, snapshot, variables, objective, max_evaluations, parent=None):
+        super().__init__(parent)
+        self.snapshot = snapshot
+        self.variables = variables
+        self.objective = objective
+        self.max_evaluations = max_evaluations
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        try:
+            result = optimize_layout(
+                self.snapshot,
+                self.variables,
+                self.objective,
+                max_evaluations=self.max_evaluations,
+                progress=self.progressed.emit,
+                cancel=self.cancel_event,
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.completed.emit(result)
+
+
+class OptimizerDialog(QtWidgets.QDialog):
+    """
+    Dialog for optimizing the layout of the selected items.
+
+    Each selected component or source contributes X, Y and angle variables
+    with a symmetric bound around its current value. The result is only
+    applied to the scene when the user presses Apply.
+    """
+
+    def __init__(
+        self,
+        scene: QtWidgets.QGraphicsScene,
+        undo_stack,
+        parent: QtWidgets.QWidget | None = None,
+    ):
+        super().__init__(parent)
+        self.setWindowTitle("Optimize Layout")
+        self.resize(560, 520)
+        self._scene = scene
+        self._undo_stack = undo_stack
+        self._snapshot = SceneSnapshot.from_scene_items(scene.items())
+        known = {snapshot.item_id for snapshot in self._snapshot.items}
+        self._items: list[BaseObj] = [
+            item
+            for item in scene.selectedItems()
+            if isinstance(item, BaseObj) and item.item_uuid in known
+        ]
+        self._thread: _OptimizeThread | None = None
+        self._result: OptimizationResult | None = None
+        self._variables: list[OptimizationVariable] = []
+
+        self._build_ui()
+        self._populate_variables()
+        self._update_objective_controls()
+
+    def _build_ui(self):
+        """Build the dialog UI."""
+        layout = QtWidgets.QVBoxLayout(self)
+
+        self.table = QtWidgets.QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Item", "Parameter", "± Bound", "Optimize"])
+        header = self.table.horizontalHeader()
+        if header is not None:
+            header.setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table, 1)
+
+        form = QtWidgets.QFormLayout()
+        self.objective_combo = QtWidgets.QComboBox()
+        self.objective_combo.addItems(_OBJECTIVES)
+        self.objective_combo.currentIndexChanged.connect(self._update_objective_controls)
+        form.addRow("Objective:", self.objective_combo)
+
+        self.detector_spin = QtWidgets.QSpinBox()
+        self.detector_spin.setRange(1, 999)
+        self.detector_spin.setPrefix("Detector ")
+        form.addRow("Detector:", self.detector_spin)
+
+        target_row = QtWidgets.QHBoxLayout()
+        self.target_x_spin = SmartDoubleSpinBox()
+        self.target_y_spin = SmartDoubleSpinBox()
+        for spin in (self.target_x_spin, self.target_y_spin):
+            spin.setRange(-1e6, 1e6)
+            spin.setDecimals(3)
+            spin.setSuffix(" mm")
+        target_row.addWidget(self.target_x_spin)
+        target_row.addWidget(self.target_y_spin)
+        form.addRow("Target point:", target_row)
+
+        self.length_spin = SmartDoubleSpinBox()
+        self.length_spin.setRange(0.0, 1e7)
+        self.length_spin.setDecimals(3)
+        self.length_spin.setSuffix(" mm")
+        form.addRow("Target length:", self.length_spin)
+
+        self.budget_spin = QtWidgets.QSpinBox()
+        self.budget_spin.setRange(10, 100000)
+        self.budget_spin.setValue(400)
+        form.addRow("Max evaluations:", self.budget_spin)
+        layout.addLayout(form)
+
+        self.status_label = QtWidgets.QLabel("")
+        layout.addWidget(self.status_label)
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        buttons = QtWidgets.QHBoxLayout()
+        buttons.addStretch()
+        self.run_button = QtWidgets.QPushButton("Run")
+        self.run_button.clicked.connect(self._run)
+        self.run_button.setEnabled(bool(self._items))
+        buttons.addWidget(self.run_button)
+        self.cancel_button = QtWidgets.QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self._cancel)
+        buttons.addWidget(self.cancel_button)
+        self.apply_button = QtWidgets.QPushButton("Apply")
+        self.apply_button.setEnabled(False)
+        self.apply_button.clicked.connect(self._apply)
+        buttons.addWidget(self.apply_button)
+        close_button = QtWidgets.QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+        if not self._items:
+            self.status_label.setText("Select the components or sources to optimize.")
+
+    def _populate_variables(self):
+        """One row per selected item and field."""
+        for item in self._items:
+            name = self._snapshot.find(item.item_uuid).name
+            for field_name, label, bound in _FIELDS:
+                row = self.table.rowCount()
+                self.table.insertRow(row)
+                name_cell = QtWidgets.QTableWidgetItem(name)
+                name_cell.setData(QtCore.Qt.ItemDataRole.UserRole, (item.item_uuid, field_name))
+                name_cell.setFlags(name_cell.flags() & ~QtCore.Qt.ItemFlag.ItemIsEditable)
+                self.table.setItem(row, 0, name_cell)
+                field_cell = QtWidgets.QTableWidgetItem(label)
+                field_cell.setFlags(field_cell.flags() & ~QtCore.Qt.ItemFlag.ItemIsEditable)
+                self.table.setItem(row, 1, field_cell)
+                spin = SmartDoubleSpinBox()
+                spin.setRange(0.001, 1e5)
+                spin.setDecimals(3)
+                spin.setValue(bound)
+                self.table.setCellWidget(row, 2, spin)
+                check = QtWidgets.QCheckBox()
+                # Angles only by default: the usual task is aligning mirrors
+                check.setChecked(field_name == "angle_deg")
+                self.table.setCellWidget(row, 3, check)
+
+    def _update_objective_controls(self):
+        index = self.objective_combo.currentIndex()
+        self.detector_spin.setEnabled(index == 0)
+        self.target_x_spin.setEnabled(index == 1)
+        self.target_y_spin.setEnabled(index == 1)
+        self.length_spin.setEnabled(index == 3)
+
+    def _objective(self):
+        index = self.objective_combo.currentIndex()
+        if index == 0:
+            return SpotSize(self.detector_spin.value() - 1)
+        if index == 1:
+            return TargetDistance(self.target_x_spin.value(), self.target_y_spin.value())
+        if index == 2:
+            return TotalPathLength()
+        return TotalPathLength(self.length_spin.value())
+
+    def _collect_variables(self) -> list[OptimizationVariable]:
+        variables = []
+        for row in range(self.table.rowCount()):
+            check = self.table.cellWidget(row, 3)
+            if not isinstance(check, QtWidgets.QCheckBox) or not check.isChecked():
+                continue
+            cell = self.table.item(row, 0)
+            spin = self.table.cellWidget(row, 2)
+            if cell is None or not isinstance(spin, QtWidgets.QDoubleSpinBox):
+                continue
+            item_id, field_name = cell.data(QtCore.Qt.ItemDataRole.UserRole)
+            current = float(getattr(self._snapshot.find(item_id).params, field_name))
+            bound = spin.value()
+            variables.append(
+                OptimizationVariable(
+                    SweepParameter(item_id, field_name), current - bound, current + bound
+                )
+            )
+        return variables
+
+    def _run(self):
+        """Snapshot the scene and start the optimizer in the background."""
+        self._snapshot = SceneSnapshot.from_scene_items(self._scene.items())
+        self._variables = self._collect_variables()
+        if not self._variables:
+            self.status_label.setText("Tick at least one parameter to optimize.")
+            return
+
+        self._result = None
+        self.apply_button.setEnabled(False)
+        self._thread = _OptimizeThread(
+            self._snapshot, self._variables, self._objective(), self.budget_spin.value(), self
+        )
+        self._thread.progressed.connect(self._on_progress)
+        self._thread.completed.connect(self._on_completed)
+        self._thread.failed.connect(self._on_failed)
+        self._thread.finished.connect(self._on_thread_finished)
+
+        self.progress_bar.setRange(0, 0)
+        self.status_label.setText("Optimizing…")
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self._thread.start()
+
+    def _cancel(self):
+        if self._thread is not None:
+            self._thread.cancel_event.set()
+
+    def _on_progress(self, iteration: int, best: float):
+        self.status_label.setText(f"Iteration {iteration}: objective {best:.6g}")
+
+    def _on_completed(self, result: OptimizationResult):
+        self._result = result
+        state = "cancelled" if result.cancelled else f"{result.iterations} iterations"
+        self.status_label.setText(
+            f"Objective {result.initial_objective:.6g} → {result.objective:.6g} "
+            f"({state}, {result.evaluations} evaluations)"
+        )
+        self.apply_button.setEnabled(result.improved)
+
+    def _on_failed(self, message: str):
+        QtWidgets.QMessageBox.warning(self, "Optimization failed", message)
+
+    def _on_thread_finished(self):
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setValue(1)
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self._thread = None
+
+    def _apply(self):
+        """Move the items to the optimized layout as one undoable command."""
+        if self._result is None:
+            return
+        by_id = {item.item_uuid: item for item in self._items}
+        changes: dict[str, dict[str, float]] = {}
+        for variable, value in zip(self._variables, self._result.values):
+            parameter = variable.parameter
+            changes.setdefault(parameter.item_id, {})[parameter.field] = float(value)
+
+        items = [by_id[item_id] for item_id in changes if item_id in by_id]
+        old_positions = {item: QtCore.QPointF(item.pos()) for item in items}
+        old_rotations = {item: item.rotation() for item in items}
+        new_positions = {}
+        new_rotations = {}
+        for item in items:
+            fields = changes[item.item_uuid]
+            pos = item.pos()
+            new_positions[item] = QtCore.QPointF(
+                fields.get("x_mm", pos.x()), fields.get("y_mm", pos.y())
+            )
+            new_rotations[item] = (
+                user_angle_to_qt(fields["angle_deg"]) if "angle_deg" in fields else item.rotation()
+            )
+
+        self._undo_stack.push(
+            RotateItemsCommand(items, old_positions, new_positions, old_rotations, new_rotations)
+        )
+        self.apply_button.setEnabled(False)
+
+    def closeEvent(self, event):
+        """Cancel a running optimization before closing."""
+        if self._thread is not None:
+            self._thread.cancel_event.set()
+            self._thread.wait()
+        super().closeEvent(event)
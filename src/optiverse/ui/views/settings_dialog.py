@@ -11,6 +11,11 @@ from pathlib import Path
 
 from PyQt6 import QtCore, QtGui, QtWidgets
 
+from ...objects.svg_render_cache import (
+    DEFAULT_MAX_MB,
+    MAX_SIZE_SETTING,
+    get_svg_render_cache,
+)
 from ...platform.paths import get_user_library_root
 from ...services.settings_service import SettingsService
 
@@ -92,15 +97,15 @@ class SettingsDialog(QtWidgets.QDialog):
             "Library", "Component library locations and organization", self.library_page
         )
 
+        # Performance Settings
+        self._build_performance_page()
+        self._add_category("Performance", "Rendering cache options", self.performance_page)
+
         # Future categories can be added here:
         # self._build_appearance_page()
         # self._add_category("Appearance", "Theme, colors, and UI preferences",
         #                   self.appearance_page)
 
-        # self._build_performance_page()
-        # self._add_category("Performance", "Raytracing and rendering options",
-        #                   self.performance_page)
-
     def _add_category(self, name: str, description: str, page: QtWidgets.QWidget):
         """Add a category to the list."""
         item = QtWidgets.QListWidgetItem(name)
@@ -179,8 +184,62 @@ class SettingsDialog(QtWidgets.QDialog):
 
         layout.addStretch()
 
+    def _build_performance_page(self):
+        """Build the Performance settings page."""
+        self.performance_page = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(self.performance_page)
+        layout.setContentsMargins(10, 10, 10, 10)
+
+        desc = QtWidgets.QLabel(
+            "SVG component images are rendered once at high resolution and kept on disk. "
+            "When the cache exceeds its size limit, the least recently used renders are "
+            "deleted."
+        )
+        desc.setWordWrap(True)
+        desc.setStyleSheet("color: palette(dark); padding: 5px;")
+        layout.addWidget(desc)
+
+        cache_label = QtWidgets.QLabel("SVG Render Cache:")
+        cache_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
+        layout.addWidget(cache_label)
+
+        form = QtWidgets.QFormLayout()
+        self.svg_cache_size_spin = QtWidgets.QSpinBox()
+        self.svg_cache_size_spin.setRange(64, 65536)
+        self.svg_cache_size_spin.setSingleStep(256)
+        self.svg_cache_size_spin.setSuffix(" MB")
+        form.addRow("Maximum size:", self.svg_cache_size_spin)
+
+        usage_layout = QtWidgets.QHBoxLayout()
+        self.svg_cache_usage_label = QtWidgets.QLabel()
+        usage_layout.addWidget(self.svg_cache_usage_label, 1)
+        self.clear_svg_cache_btn = QtWidgets.QPushButton("Clear Cache")
+        self.clear_svg_cache_btn.clicked.connect(self._clear_svg_cache)
+        usage_layout.addWidget(self.clear_svg_cache_btn)
+        form.addRow("Current usage:", usage_layout)
+        layout.addLayout(form)
+
+        layout.addStretch()
+
+    def _update_svg_cache_usage(self):
+        """Show the render cache's current size."""
+        stats = get_svg_render_cache().stats()
+        self.svg_cache_usage_label.setText(
+            f"{stats.total_bytes / (1024 * 1024):.1f} MB in {stats.entries} file(s)"
+        )
+
+    def _clear_svg_cache(self):
+        """Delete all cached SVG renders."""
+        get_svg_render_cache().clear()
+        self._update_svg_cache_usage()
+
     def _load_settings(self):
         """Load current settings from SettingsService."""
+        self.svg_cache_size_spin.setValue(
+            self.settings_service.get_value(MAX_SIZE_SETTING, DEFAULT_MAX_MB, int)
+        )
+        self._update_svg_cache_usage()
+
         # Load library paths
         library_paths = self.settings_service.get_value("library_paths", [], list)
 
@@ -316,6 +375,7 @@ class SettingsDialog(QtWidgets.QDialog):
 
         # Save to settings
         self.settings_service.set_value("library_paths", library_paths)
+        self.settings_service.set_value(MAX_SIZE_SETTING, self.svg_cache_size_spin.value())
 
     def accept(self):
         """Override accept to save settings."""
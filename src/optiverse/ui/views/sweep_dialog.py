@@ -0,0 +1,293 @@
+"""
+Parameter sweep dialog.
+
+Varies one parameter of a scene item over a range of values, traces the
+scene for each value in a background process pool and plots a metric.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+from PyQt6 import QtCore, QtWidgets
+
+from ...core.interface_types import get_property_label, get_type_properties
+from ...integration.sweep import (
+    DetectorCentroid,
+    DetectorHits,
+    DetectorPower,
+    ItemSnapshot,
+    PathLength,
+    SceneSnapshot,
+    SweepParameter,
+    run_sweep,
+)
+from ..widgets.line_plot import LinePlot
+from ..widgets.smart_spinbox import SmartDoubleSpinBox
+
+# Parameters offered for every item kind: (field, label)
+_ITEM_FIELDS = {
+    "component": [
+        ("x_mm", "X Position (mm)"),
+        ("y_mm", "Y Position (mm)"),
+        ("angle_deg", "Angle (°)"),
+    ],
+    "source": [
+        ("x_mm", "X Position (mm)"),
+        ("y_mm", "Y Position (mm)"),
+        ("angle_deg", "Angle (°)"),
+        ("size_mm", "Size (mm)"),
+        ("spread_deg", "Spread (°)"),
+        ("wavelength_nm", "Wavelength (nm)"),
+        ("n_rays", "Number of Rays"),
+    ],
+}
+
+# Metric label -> factory taking the detector index
+_METRICS = {
+    "Detector power": DetectorPower,
+    "Detector hits": DetectorHits,
+    "Detector centroid (mm)": DetectorCentroid,
+    "Mean path length (mm)": lambda _detector: PathLength("mean"),
+    "Max path length (mm)": lambda _detector: PathLength("max"),
+}
+
+
+class _SweepThread(QtCore.QThread):
+    """Runs run_sweep off the GUI thread and reports progress via signals."""
+
+    progressed = QtCore.pyqtSignal(int, int)
+    completed = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, snapshot, parameter, values, metric, parent=None):
+        super().__init__(parent)
+        self.snapshot = snapshot
+        self.parameter = parameter
+        self.values = values
+        self.metric = metric
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        try:
+            result = run_sweep(
+                self.snapshot,
+                [self.parameter],
+                [self.values],
+                self.metric,
+                progress=self.progressed.emit,
+                cancel=self.cancel_event,
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.completed.emit(result)
+
+
+class SweepDialog(QtWidgets.QDialog):
+    """
+    Dialog for sweeping one item parameter and plotting a metric.
+
+    The scene is snapshotted when Run is pressed, so the user can keep
+    editing while a sweep is running.
+    """
+
+    def __init__(
+        self,
+        scene: QtWidgets.QGraphicsScene,
+        parent: QtWidgets.QWidget | None = None,
+    ):
+        super().__init__(parent)
+        self.setWindowTitle("Parameter Sweep")
+        self.resize(620, 520)
+        self._scene = scene
+        self._snapshot = SceneSnapshot.from_scene_items(scene.items())
+        self._thread: _SweepThread | None = None
+        self._values = np.zeros(0)
+        self._result = np.zeros(0)
+
+        self._build_ui()
+        self._populate_items()
+
+    def _build_ui(self):
+        """Build the dialog UI."""
+        layout = QtWidgets.QVBoxLayout(self)
+        form = QtWidgets.QFormLayout()
+
+        self.item_combo = QtWidgets.QComboBox()
+        self.item_combo.currentIndexChanged.connect(self._populate_fields)
+        form.addRow("Item:", self.item_combo)
+
+        self.field_combo = QtWidgets.QComboBox()
+        self.field_combo.currentIndexChanged.connect(self._update_range)
+        form.addRow("Parameter:", self.field_combo)
+
+        range_row = QtWidgets.QHBoxLayout()
+        self.start_spin = SmartDoubleSpinBox()
+        self.stop_spin = SmartDoubleSpinBox()
+        for spin in (self.start_spin, self.stop_spin):
+            spin.setRange(-1e6, 1e6)
+            spin.setDecimals(3)
+        self.steps_spin = QtWidgets.QSpinBox()
+        self.steps_spin.setRange(2, 100000)
+        self.steps_spin.setValue(101)
+        range_row.addWidget(QtWidgets.QLabel("from"))
+        range_row.addWidget(self.start_spin)
+        range_row.addWidget(QtWidgets.QLabel("to"))
+        range_row.addWidget(self.stop_spin)
+        range_row.addWidget(QtWidgets.QLabel("steps"))
+        range_row.addWidget(self.steps_spin)
+        form.addRow("Values:", range_row)
+
+        metric_row = QtWidgets.QHBoxLayout()
+        self.metric_combo = QtWidgets.QComboBox()
+        self.metric_combo.addItems(list(_METRICS))
+        self.detector_spin = QtWidgets.QSpinBox()
+        self.detector_spin.setRange(1, 999)
+        self.detector_spin.setPrefix("Detector ")
+        metric_row.addWidget(self.metric_combo, 1)
+        metric_row.addWidget(self.detector_spin)
+        form.addRow("Metric:", metric_row)
+        layout.addLayout(form)
+
+        self.plot = LinePlot(self)
+        layout.addWidget(self.plot, 1)
+
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        buttons = QtWidgets.QHBoxLayout()
+        self.copy_button = QtWidgets.QPushButton("Copy as CSV")
+        self.copy_button.setEnabled(False)
+        self.copy_button.clicked.connect(self._copy_csv)
+        buttons.addWidget(self.copy_button)
+        buttons.addStretch()
+        self.run_button = QtWidgets.QPushButton("Run")
+        self.run_button.clicked.connect(self._run)
+        buttons.addWidget(self.run_button)
+        self.cancel_button = QtWidgets.QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self._cancel)
+        buttons.addWidget(self.cancel_button)
+        close_button = QtWidgets.QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+    def _populate_items(self):
+        """Fill the item combo, preferring the current selection."""
+        selected = {getattr(item, "item_uuid", None) for item in self._scene.selectedItems()}
+        self.item_combo.clear()
+        for item in self._snapshot.items:
+            self.item_combo.addItem(item.name, item.item_id)
+            if item.item_id in selected:
+                self.item_combo.setCurrentIndex(self.item_combo.count() - 1)
+        self._populate_fields()
+
+    def _current_item(self) -> ItemSnapshot | None:
+        item_id = self.item_combo.currentData()
+        if item_id is None:
+            return None
+        return self._snapshot.find(item_id)
+
+    def _populate_fields(self):
+        """Fill the parameter combo for the selected item."""
+        self.field_combo.clear()
+        item = self._current_item()
+        if item is None:
+            return
+        for name, label in _ITEM_FIELDS[item.kind]:
+            self.field_combo.addItem(label, name)
+        for i, iface in enumerate(getattr(item.params, "interfaces", None) or []):
+            for prop in get_type_properties(iface.element_type):
+                value = getattr(iface, prop, None)
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                label = get_property_label(iface.element_type, prop)
+                self.field_combo.addItem(f"Interface {i + 1}: {label}", f"interfaces.{i}.{prop}")
+
+    def _update_range(self):
+        """Center the value range on the current value of the selected parameter."""
+        item = self._current_item()
+        field_name = self.field_combo.currentData()
+        if item is None or field_name is None:
+            return
+        target = item.params
+        attr = field_name
+        if field_name.startswith("interfaces."):
+            _, index, attr = field_name.split(".", 2)
+            target = target.interfaces[int(index)]  # type: ignore[union-attr]
+        current = float(getattr(target, attr))
+        span = max(abs(current) * 0.1, 10.0)
+        self.start_spin.setValue(current - span)
+        self.stop_spin.setValue(current + span)
+
+    def _run(self):
+        """Snapshot the scene and start the sweep in the background."""
+        item = self._current_item()
+        field_name = self.field_combo.currentData()
+        if item is None or field_name is None:
+            return
+
+        # Re-snapshot so the sweep uses the scene as it is now
+        self._snapshot = SceneSnapshot.from_scene_items(self._scene.items())
+        parameter = SweepParameter(item.item_id, field_name)
+        self._values = np.linspace(
+            self.start_spin.value(), self.stop_spin.value(), self.steps_spin.value()
+        )
+        metric = _METRICS[self.metric_combo.currentText()](self.detector_spin.value() - 1)
+
+        self._thread = _SweepThread(self._snapshot, parameter, self._values, metric, self)
+        self._thread.progressed.connect(self._on_progress)
+        self._thread.completed.connect(self._on_completed)
+        self._thread.failed.connect(self._on_failed)
+        self._thread.finished.connect(self._on_thread_finished)
+
+        self.progress_bar.setRange(0, len(self._values))
+        self.progress_bar.setValue(0)
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self._thread.start()
+
+    def _cancel(self):
+        if self._thread is not None:
+            self._thread.cancel_event.set()
+
+    def _on_progress(self, done: int, total: int):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+
+    def _on_completed(self, result: np.ndarray):
+        self._result = result
+        self.plot.set_data(
+            self._values,
+            result,
+            self.field_combo.currentText(),
+            self.metric_combo.currentText(),
+        )
+        self.copy_button.setEnabled(True)
+
+    def _on_failed(self, message: str):
+        QtWidgets.QMessageBox.warning(self, "Sweep failed", message)
+
+    def _on_thread_finished(self):
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self._thread = None
+
+    def _copy_csv(self):
+        """Copy parameter values and results to the clipboard."""
+        lines = [f"{self.field_combo.currentData()},{self.metric_combo.currentText()}"]
+        lines += [f"{v:.6g},{r:.6g}" for v, r in zip(self._values, self._result)]
+        clipboard = QtWidgets.QApplication.clipboard()
+        if clipboard is not None:
+            clipboard.setText("\n".join(lines))
+
+    def closeEvent(self, event):
+        """Cancel a running sweep before closing."""
+        if self._thread is not None:
+            self._thread.cancel_event.set()
+            self._thread.wait()
+        super().closeEvent(event)
@@ -1,5 +1,6 @@
 """Custom widgets for Optiverse UI."""
 
+from .detector_profile import HistogramPlot
 from .interface_properties_widget import InterfacePropertiesWidget
 from .interface_tree_panel import InterfaceTreePanel
 from .interface_widgets import (
@@ -14,6 +15,7 @@ from .layer_panel import (
     LayerTreeWidget,
 )
 from .library_tree import LibraryTree
+from .line_plot import LinePlot
 from .ruler_widget import CanvasWithRulers, RulerWidget
 from .smart_spinbox import SmartDoubleSpinBox, SmartSpinBox
 
@@ -28,6 +30,9 @@ __all__ = [
     # Smart spinboxes
     "SmartDoubleSpinBox",
     "SmartSpinBox",
+    # Plots
+    "HistogramPlot",
+    "LinePlot",
     # Property widgets
     "InterfacePropertiesWidget",
     # Interface widgets
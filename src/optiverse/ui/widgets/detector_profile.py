@@ -0,0 +1,117 @@
+"""
+Histogram plot widget for detector profiles.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+
+class HistogramPlot(QtWidgets.QWidget):
+    """
+    Minimal bar plot of a binned histogram, painted with QPainter.
+
+    Shows the bins as filled bars with the axis range and the peak value
+    as labels; no plotting library is needed.
+    """
+
+    _MARGIN_LEFT = 56
+    _MARGIN_RIGHT = 12
+    _MARGIN_TOP = 12
+    _MARGIN_BOTTOM = 36
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        self._edges = np.zeros(0)
+        self._values = np.zeros(0)
+        self._x_label = ""
+        self._y_label = ""
+        self._color = QtGui.QColor(220, 40, 40)
+        self.setMinimumSize(320, 200)
+
+    def set_histogram(
+        self, edges: np.ndarray, values: np.ndarray, x_label: str = "", y_label: str = ""
+    ) -> None:
+        """
+        Set the data to plot.
+
+        Args:
+            edges: Bin edges (len(values) + 1)
+            values: Bin heights
+            x_label: Horizontal axis label
+            y_label: Vertical axis label
+        """
+        self._edges = np.asarray(edges, dtype=float)
+        self._values = np.asarray(values, dtype=float)
+        self._x_label = x_label
+        self._y_label = y_label
+        self.update()
+
+    def clear(self) -> None:
+        """Remove the plotted data."""
+        self.set_histogram(np.zeros(0), np.zeros(0))
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, False)
+        palette = self.palette()
+        painter.fillRect(self.rect(), palette.color(QtGui.QPalette.ColorRole.Base))
+
+        plot = QtCore.QRectF(
+            self._MARGIN_LEFT,
+            self._MARGIN_TOP,
+            max(1, self.width() - self._MARGIN_LEFT - self._MARGIN_RIGHT),
+            max(1, self.height() - self._MARGIN_TOP - self._MARGIN_BOTTOM),
+        )
+        text_color = palette.color(QtGui.QPalette.ColorRole.Text)
+
+        if len(self._values) == 0 or len(self._edges) != len(self._values) + 1:
+            painter.setPen(text_color)
+            painter.drawText(plot, QtCore.Qt.AlignmentFlag.AlignCenter, "No data")
+            painter.end()
+            return
+
+        peak = float(self._values.max())
+        x0, x1 = float(self._edges[0]), float(self._edges[-1])
+        span = x1 - x0 if x1 > x0 else 1.0
+
+        # Bars
+        if peak > 0.0:
+            painter.setPen(QtCore.Qt.PenStyle.NoPen)
+            painter.setBrush(self._color)
+            for left, right, value in zip(self._edges[:-1], self._edges[1:], self._values):
+                if value <= 0.0:
+                    continue
+                bar_left = plot.left() + (left - x0) / span * plot.width()
+                bar_width = max(1.0, (right - left) / span * plot.width())
+                bar_height = value / peak * plot.height()
+                painter.drawRect(
+                    QtCore.QRectF(bar_left, plot.bottom() - bar_height, bar_width, bar_height)
+                )
+
+        # Axes
+        painter.setPen(QtGui.QPen(text_color, 1))
+        painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+        painter.drawLine(plot.bottomLeft(), plot.bottomRight())
+        painter.drawLine(plot.bottomLeft(), plot.topLeft())
+
+        metrics = painter.fontMetrics()
+        line_height = metrics.height()
+        below = QtCore.QRectF(plot.left(), plot.bottom() + 2, plot.width(), line_height)
+        painter.drawText(below, QtCore.Qt.AlignmentFlag.AlignLeft, f"{x0:.4g}")
+        painter.drawText(below, QtCore.Qt.AlignmentFlag.AlignRight, f"{x1:.4g}")
+        painter.drawText(below, QtCore.Qt.AlignmentFlag.AlignHCenter, self._x_label)
+
+        left_column = QtCore.QRectF(0, plot.top(), self._MARGIN_LEFT - 4, line_height)
+        painter.drawText(
+            left_column,
+            QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignTop,
+            f"{peak:.3g}",
+        )
+        if self._y_label:
+            label_rect = QtCore.QRectF(
+                0, plot.bottom() + 2 + line_height, self.width(), line_height
+            )
+            painter.drawText(label_rect, QtCore.Qt.AlignmentFlag.AlignLeft, self._y_label)
+        painter.end()
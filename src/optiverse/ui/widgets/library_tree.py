@@ -9,6 +9,9 @@ from PyQt6 import QtCore, QtGui, QtWidgets
 from ...core.constants import MIME_OPTICS_COMPONENT
 from ..protocols import HasComponentEditor
 
+# Item data role holding the image path of a thumbnail not decoded yet
+THUMBNAIL_PATH_ROLE = QtCore.Qt.ItemDataRole.UserRole + 1
+
 
 class LibraryTree(QtWidgets.QTreeWidget):
     """Drag-enabled library tree for component templates organized by category."""
@@ -25,9 +28,69 @@ class LibraryTree(QtWidgets.QTreeWidget):
         self.setContextMenuPolicy(QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self._show_context_menu)
 
+        # Decoded thumbnails by image path, shared across library reloads
+        self._icon_cache: dict[str, QtGui.QIcon] = {}
+        self._thumbnail_timer = QtCore.QTimer(self)
+        self._thumbnail_timer.setSingleShot(True)
+        self._thumbnail_timer.setInterval(0)
+        self._thumbnail_timer.timeout.connect(self._load_visible_thumbnails)
+        scroll_bar = self.verticalScrollBar()
+        if scroll_bar is not None:
+            scroll_bar.valueChanged.connect(self.schedule_thumbnail_update)
+        self.itemExpanded.connect(self.schedule_thumbnail_update)
+
         # Expand all categories by default
         self.expandAll()
 
+    def schedule_thumbnail_update(self, *_args) -> None:
+        """Decode thumbnails of visible items on the next event loop pass."""
+        self._thumbnail_timer.start()
+
+    def resizeEvent(self, event: QtGui.QResizeEvent | None) -> None:
+        super().resizeEvent(event)
+        self.schedule_thumbnail_update()
+
+    def showEvent(self, event: QtGui.QShowEvent | None) -> None:
+        super().showEvent(event)
+        self.schedule_thumbnail_update()
+
+    def _load_visible_thumbnails(self) -> None:
+        """Replace placeholder icons of items inside the viewport with thumbnails."""
+        viewport = self.viewport()
+        if viewport is None:
+            return
+        height = viewport.height()
+        item = self.itemAt(QtCore.QPoint(0, 0))
+        while item is not None:
+            if self.visualItemRect(item).top() > height:
+                break
+            path = item.data(0, THUMBNAIL_PATH_ROLE)
+            if path:
+                item.setData(0, THUMBNAIL_PATH_ROLE, None)
+                icon = self._thumbnail(path)
+                if icon is not None:
+                    item.setIcon(0, icon)
+            item = self.itemBelow(item)
+
+    def _thumbnail(self, path: str) -> QtGui.QIcon | None:
+        """Decode an image at icon size, or None if it cannot be read."""
+        icon = self._icon_cache.get(path)
+        if icon is None:
+            reader = QtGui.QImageReader(path)
+            reader.setAutoTransform(True)
+            size = reader.size()
+            if size.isValid():
+                # Decode directly at icon size (cheap for large images and SVGs)
+                reader.setScaledSize(
+                    size.scaled(self.iconSize(), QtCore.Qt.AspectRatioMode.KeepAspectRatio)
+                )
+            image = reader.read()
+            if image.isNull():
+                return None
+            icon = QtGui.QIcon(QtGui.QPixmap.fromImage(image))
+            self._icon_cache[path] = icon
+        return icon
+
     def focusOutEvent(self, event: QtGui.QFocusEvent | None) -> None:
         """Clear selection when focus leaves the library tree."""
         self.clearSelection()
@@ -0,0 +1,161 @@
+"""
+Line plot widget for sampled curves.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+
+class LinePlot(QtWidgets.QWidget):
+    """
+    Minimal line plot of y over x, painted with QPainter.
+
+    Draws the samples as markers joined by lines, with the x and y ranges
+    as labels. The y range spans the data, so negative values are shown
+    below a zero line; NaN samples leave a gap in the line.
+    """
+
+    _MARGIN_LEFT = 56
+    _MARGIN_RIGHT = 12
+    _MARGIN_TOP = 12
+    _MARGIN_BOTTOM = 36
+    _MARKER_RADIUS = 2.5
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        self._x = np.zeros(0)
+        self._y = np.zeros(0)
+        self._x_label = ""
+        self._y_label = ""
+        self._color = QtGui.QColor(220, 40, 40)
+        self.setMinimumSize(320, 200)
+
+    def set_data(self, x: np.ndarray, y: np.ndarray, x_label: str = "", y_label: str = "") -> None:
+        """
+        Set the data to plot.
+
+        Args:
+            x: Sample positions
+            y: Sample values (same length as x; NaN for missing samples)
+            x_label: Horizontal axis label
+            y_label: Vertical axis label
+        """
+        self._x = np.asarray(x, dtype=float)
+        self._y = np.asarray(y, dtype=float)
+        self._x_label = x_label
+        self._y_label = y_label
+        self.update()
+
+    def clear(self) -> None:
+        """Remove the plotted data."""
+        self.set_data(np.zeros(0), np.zeros(0))
+
+    def data_range(self) -> tuple[float, float, float, float] | None:
+        """
+        Axis ranges of the plot.
+
+        Returns:
+            (x_min, x_max, y_min, y_max) over the finite samples, widened so
+            that no range is empty, or None if there is nothing to plot
+        """
+        if len(self._x) != len(self._y):
+            return None
+        finite = np.isfinite(self._x) & np.isfinite(self._y)
+        if not finite.any():
+            return None
+        x_min, x_max = float(self._x[finite].min()), float(self._x[finite].max())
+        y_min, y_max = float(self._y[finite].min()), float(self._y[finite].max())
+        if x_max <= x_min:
+            x_min, x_max = x_min - 0.5, x_max + 0.5
+        if y_max <= y_min:
+            pad = 0.5 * abs(y_min) if y_min else 0.5
+            y_min, y_max = y_min - pad, y_max + pad
+        return x_min, x_max, y_min, y_max
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, True)
+        palette = self.palette()
+        painter.fillRect(self.rect(), palette.color(QtGui.QPalette.ColorRole.Base))
+
+        plot = QtCore.QRectF(
+            self._MARGIN_LEFT,
+            self._MARGIN_TOP,
+            max(1, self.width() - self._MARGIN_LEFT - self._MARGIN_RIGHT),
+            max(1, self.height() - self._MARGIN_TOP - self._MARGIN_BOTTOM),
+        )
+        text_color = palette.color(QtGui.QPalette.ColorRole.Text)
+
+        ranges = self.data_range()
+        if ranges is None:
+            painter.setPen(text_color)
+            painter.drawText(plot, QtCore.Qt.AlignmentFlag.AlignCenter, "No data")
+            painter.end()
+            return
+        x0, x1, y0, y1 = ranges
+
+        def to_view(x: float, y: float) -> QtCore.QPointF:
+            return QtCore.QPointF(
+                plot.left() + (x - x0) / (x1 - x0) * plot.width(),
+                plot.bottom() - (y - y0) / (y1 - y0) * plot.height(),
+            )
+
+        # Zero line when the data changes sign
+        if y0 < 0.0 < y1:
+            painter.setPen(QtGui.QPen(text_color, 1, QtCore.Qt.PenStyle.DotLine))
+            zero = to_view(x0, 0.0).y()
+            painter.drawLine(QtCore.QPointF(plot.left(), zero), QtCore.QPointF(plot.right(), zero))
+
+        # Curve: consecutive finite samples are joined, NaN samples break the line
+        painter.setPen(QtGui.QPen(self._color, 1.5))
+        previous = None
+        for x, y in zip(self._x, self._y):
+            if not (np.isfinite(x) and np.isfinite(y)):
+                previous = None
+                continue
+            point = to_view(float(x), float(y))
+            if previous is not None:
+                painter.drawLine(previous, point)
+            previous = point
+        painter.setBrush(self._color)
+        for x, y in zip(self._x, self._y):
+            if np.isfinite(x) and np.isfinite(y):
+                painter.drawEllipse(
+                    to_view(float(x), float(y)), self._MARKER_RADIUS, self._MARKER_RADIUS
+                )
+
+        # Axes
+        painter.setPen(QtGui.QPen(text_color, 1))
+        painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+        painter.drawLine(plot.bottomLeft(), plot.bottomRight())
+        painter.drawLine(plot.bottomLeft(), plot.topLeft())
+
+        metrics = painter.fontMetrics()
+        line_height = metrics.height()
+        below = QtCore.QRectF(plot.left(), plot.bottom() + 2, plot.width(), line_height)
+        painter.drawText(below, QtCore.Qt.AlignmentFlag.AlignLeft, f"{x0:.4g}")
+        painter.drawText(below, QtCore.Qt.AlignmentFlag.AlignRight, f"{x1:.4g}")
+        painter.drawText(below, QtCore.Qt.AlignmentFlag.AlignHCenter, self._x_label)
+
+        top_label = QtCore.QRectF(0, plot.top(), self._MARGIN_LEFT - 4, line_height)
+        painter.drawText(
+            top_label,
+            QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignTop,
+            f"{y1:.3g}",
+        )
+        bottom_label = QtCore.QRectF(
+            0, plot.bottom() - line_height, self._MARGIN_LEFT - 4, line_height
+        )
+        painter.drawText(
+            bottom_label,
+            QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignBottom,
+            f"{y0:.3g}",
+        )
+        if self._y_label:
+            label_rect = QtCore.QRectF(
+                0, plot.bottom() + 2 + line_height, self.width(), line_height
+            )
+            painter.drawText(label_rect, QtCore.Qt.AlignmentFlag.AlignLeft, self._y_label)
+        painter.end()
@@ -0,0 +1,69 @@
+"""Tests for startup profiling and lazily loaded startup dependencies."""
+
+import io
+import os
+import subprocess
+import sys
+
+from optiverse.app.startup_profile import StartupProfiler, finish_startup_profiling
+
+
+def test_profiler_times_phases_and_imports(tmp_path, monkeypatch):
+    pkg = tmp_path / "profiled_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("from . import child\n")
+    (pkg / "child.py").write_text("import time\ntime.sleep(0.02)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler()
+    profiler.start()
+    try:
+        with profiler.phase("Import"):
+            import profiled_pkg  # noqa: F401
+    finally:
+        profile = profiler.stop()
+        for name in ("profiled_pkg", "profiled_pkg.child"):
+            sys.modules.pop(name, None)
+
+    assert [p.name for p in profile.phases] == ["Import"]
+    assert profile.phases[0].modules == 2
+    parent = profile.modules["profiled_pkg"]
+    child = profile.modules["profiled_pkg.child"]
+    assert child.self_s >= 0.015
+    assert child.phase == "Import"
+    # The child's time counts towards the parent's cumulative time only
+    assert parent.cumulative_s >= child.cumulative_s
+    assert parent.self_s < child.self_s
+    assert profile.slowest_modules(1)[0] is child
+    assert profiler._finder not in sys.meta_path
+
+
+def test_report_lists_phases_and_modules():
+    profiler = StartupProfiler()
+    profiler.start()
+    with profiler.phase("Create main window"):
+        pass
+    profile = profiler.stop()
+    report = profile.format_report()
+    assert "Create main window" in report
+    assert "target" in report
+    assert finish_startup_profiling(io.StringIO()) is None  # Not enabled
+
+
+def test_main_window_import_skips_feature_dependencies():
+    # Feature-specific dependencies are imported on first use, not at startup
+    code = (
+        "import sys; import optiverse.ui.views.main_window; "
+        "print(','.join(m for m in ('numba', 'PyQt6.QtWebSockets', "
+        "'optiverse.ui.views.log_window', 'optiverse.ui.views.zemax_importer', "
+        "'optiverse.ui.views.settings_dialog') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        timeout=120,
+        env={**os.environ, "QT_QPA_PLATFORM": "offscreen"},
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
@@ -0,0 +1,75 @@
+"""Tests for raytracing kernel warm-up and ahead-of-time kernel loading."""
+
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from optiverse.core import kernel_warmup, raytracing_math
+
+
+def test_warm_up_compiles_every_kernel():
+    timings = raytracing_math.warm_up_kernels()
+    assert set(raytracing_math.AOT_KERNELS) <= set(timings)
+    assert {"ray_hit_element", "ray_hit_segment"} <= set(timings)
+    if raytracing_math.NUMBA_AVAILABLE:
+        kernel = raytracing_math.ray_hit_element
+        assert kernel.signatures
+
+
+def test_start_kernel_warmup_runs_once(monkeypatch, caplog):
+    monkeypatch.setattr(kernel_warmup, "_thread", None)
+    with caplog.at_level("INFO", logger=kernel_warmup.__name__):
+        thread = kernel_warmup.start_kernel_warmup()
+        assert kernel_warmup.start_kernel_warmup() is thread
+        thread.join(timeout=120)
+    assert not thread.is_alive()
+    kind = "AOT" if raytracing_math.AOT_KERNELS_LOADED else "JIT"
+    assert "Raytracing kernels ready in" in caplog.text
+    assert f"({kind}, slowest:" in caplog.text
+    if raytracing_math.NUMBA_AVAILABLE and not raytracing_math.AOT_KERNELS_LOADED:
+        assert raytracing_math.ray_hit_segment.signatures
+
+
+def test_warm_up_without_kernels(monkeypatch, caplog):
+    monkeypatch.setattr(raytracing_math, "warm_up_kernels", lambda: {})
+    with caplog.at_level("INFO", logger=kernel_warmup.__name__):
+        kernel_warmup._warm_up()
+    assert "nothing to warm up" in caplog.text
+
+
+def test_aot_wrapper_applies_defaults_and_falls_back():
+    calls = []
+
+    def jit_kernel(v, scale=2.0):
+        calls.append("jit")
+        return np.multiply(v, scale)
+
+    def aot_kernel(v, scale):
+        calls.append("aot")
+        return np.multiply(v, scale)
+
+    kernel = raytracing_math._with_jit_fallback(aot_kernel, jit_kernel, "f8[:](f8[:], f8)")
+    assert kernel(np.array([1.0])) == pytest.approx([2.0])
+    assert calls == ["aot"]
+
+    # Integer arrays, lists and other dimensions are not passed to the AOT kernel
+    for arg in (np.array([1]), [1.0], np.ones((1, 1))):
+        kernel(arg, 1.0)
+    assert calls == ["aot", "jit", "jit", "jit"]
+
+
+def test_outdated_aot_module_is_ignored(monkeypatch):
+    name = f"{raytracing_math.__package__}.{raytracing_math.AOT_MODULE}"
+    fake = types.ModuleType(name)
+    fake.source_hash = lambda: raytracing_math.kernel_source_hash() + 1
+    monkeypatch.setitem(sys.modules, name, fake)
+    assert not raytracing_math._use_aot_kernels()
+
+    fake.source_hash = raytracing_math.kernel_source_hash
+    for kernel in raytracing_math.AOT_KERNELS:
+        monkeypatch.setattr(raytracing_math, kernel, getattr(raytracing_math, kernel))
+        setattr(fake, kernel, getattr(raytracing_math, kernel))
+    assert raytracing_math._use_aot_kernels()
+    assert raytracing_math.deg2rad(180.0) == pytest.approx(np.pi)
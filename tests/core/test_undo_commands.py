@@ -29,6 +29,20 @@ class TestCommand:
         """Command should have undo method."""
         assert hasattr(Command, "undo")
 
+    def test_every_command_declares_affected_items(self):
+        """affected_items() is abstract, so every command must implement it."""
+        import optiverse.ui.views.component_editor_dialog  # noqa: F401 - MoveInterfaceCommand
+
+        assert "affected_items" in Command.__abstractmethods__
+        for command_class in Command.__subclasses__():
+            assert "affected_items" in vars(command_class), command_class.__name__
+
+    def test_affected_items_of_move(self, qapp):
+        """A move affects only its item."""
+        item = SourceItem(SourceParams())
+        command = MoveItemCommand(item, item.pos(), item.pos())
+        assert command.affected_items() == [item]
+
 
 class TestAddItemCommand:
     """Test AddItemCommand for adding items to scene."""
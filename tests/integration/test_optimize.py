@@ -0,0 +1,171 @@
+"""
+Tests for gradient-free layout optimization.
+"""
+
+import math
+import threading
+
+import numpy as np
+import pytest
+
+from optiverse.core.interface_definition import InterfaceDefinition
+from optiverse.core.models import ComponentParams, SourceParams
+from optiverse.integration.optimize import (
+    OptimizationVariable,
+    SpotSize,
+    TargetDistance,
+    TotalPathLength,
+    optimize_layout,
+)
+from optiverse.integration.sweep import (
+    ItemSnapshot,
+    SceneSnapshot,
+    SweepParameter,
+    _SweepEvaluator,
+)
+from optiverse.raytracing.engine import trace_rays_with_detectors
+
+
+def _screen_snapshot(screen_angle: float = 90.0, n_rays: int = 11) -> SceneSnapshot:
+    """Source at the origin shooting +x onto a 40 mm detector at x=100."""
+    screen = ComponentParams(
+        x_mm=100.0,
+        angle_deg=screen_angle,
+        interfaces=[
+            InterfaceDefinition(x1_mm=-20.0, x2_mm=20.0, element_type="detector"),
+        ],
+    )
+    source = SourceParams(x_mm=0.0, n_rays=n_rays, size_mm=10.0, ray_length_mm=500.0)
+    return SceneSnapshot(
+        items=[
+            ItemSnapshot("screen", "component", screen),
+            ItemSnapshot("source", "source", source),
+        ]
+    )
+
+
+class TestObjectives:
+    """Test objective values on known layouts."""
+
+    def test_tilted_screen_widens_spot(self):
+        snapshot = _screen_snapshot()
+        evaluator = _SweepEvaluator(
+            snapshot, [SweepParameter("screen", "angle_deg")], SpotSize(), {"parallel": False}
+        )
+        square = evaluator.evaluate([90.0])
+        tilted = evaluator.evaluate([60.0])
+        assert 0.0 < square < tilted
+
+    def test_target_distance_early_exit(self):
+        snapshot = _screen_snapshot()
+        parameters = [SweepParameter("source", "angle_deg")]
+        evaluator = _SweepEvaluator(
+            snapshot, parameters, TargetDistance(100.0, 50.0), {"parallel": False}
+        )
+        full = evaluator.evaluate([0.0])
+        assert full > 40.0
+        assert evaluator.evaluate([0.0], bound=1.0) == math.inf
+        assert evaluator.evaluate([0.0], bound=full + 1.0) == pytest.approx(full)
+
+    def test_point_source_normalized_by_emitted_rays(self):
+        # A point source emits one ray whatever n_rays says
+        source = SourceParams(x_mm=0.0, n_rays=20, size_mm=0.0, ray_length_mm=100.0)
+        snapshot = SceneSnapshot(items=[ItemSnapshot("source", "source", source)])
+        evaluator = _SweepEvaluator(
+            snapshot, [SweepParameter("source", "y_mm")], TargetDistance(50.0, 10.0), {}
+        )
+        assert evaluator.evaluate([0.0]) == pytest.approx(10.0)
+        assert evaluator.evaluate([0.0], bound=10.5) == pytest.approx(10.0)
+
+    @pytest.mark.parametrize("objective", [TargetDistance(150.0, 30.0), TotalPathLength()])
+    def test_metric_matches_per_ray_evaluation(self, objective):
+        # A beamsplitter splits every source ray; both paths group branches per source ray
+        splitter = ComponentParams(
+            x_mm=50.0,
+            angle_deg=45.0,
+            interfaces=[
+                InterfaceDefinition(
+                    x1_mm=-20.0, x2_mm=20.0, element_type="beam_splitter", split_T=50.0
+                ),
+            ],
+        )
+        source = SourceParams(x_mm=0.0, n_rays=5, size_mm=10.0, ray_length_mm=300.0)
+        snapshot = SceneSnapshot(
+            items=[
+                ItemSnapshot("splitter", "component", splitter),
+                ItemSnapshot("source", "source", source),
+            ]
+        )
+        result = trace_rays_with_detectors(
+            snapshot.build_elements(), snapshot.sources, parallel=False
+        )
+        assert len(result.paths) > len(result.ray_groups()) == 5
+
+        evaluator = _SweepEvaluator(snapshot, [SweepParameter("source", "y_mm")], objective, {})
+        assert evaluator.evaluate([0.0]) == pytest.approx(objective(result))
+
+
+class TestOptimizeLayout:
+    """Test the bounded pattern search."""
+
+    def test_aligns_screen_for_smallest_spot(self):
+        snapshot = _screen_snapshot(screen_angle=70.0)
+        variables = [OptimizationVariable(SweepParameter("screen", "angle_deg"), 60.0, 120.0)]
+
+        result = optimize_layout(snapshot, variables, SpotSize(), workers=0)
+
+        assert result.improved
+        assert result.converged
+        assert result.values[0] == pytest.approx(90.0, abs=0.5)
+        # The snapshot itself is untouched
+        assert snapshot.find("screen").params.angle_deg == 70.0
+
+    def test_steers_source_onto_target(self):
+        snapshot = _screen_snapshot(n_rays=1)
+        variables = [OptimizationVariable(SweepParameter("source", "angle_deg"), -30.0, 30.0)]
+
+        result = optimize_layout(snapshot, variables, TargetDistance(80.0, 20.0), workers=0)
+
+        # Scene y points down, so the sign of the angle depends on the convention
+        expected = math.degrees(math.atan2(20.0, 80.0))
+        assert abs(result.values[0]) == pytest.approx(expected, abs=0.2)
+        assert result.objective < 0.5
+        assert np.all(np.diff(result.history) <= 0.0)
+
+    def test_respects_bounds(self):
+        snapshot = _screen_snapshot()
+        variables = [OptimizationVariable(SweepParameter("screen", "x_mm"), 60.0, 150.0)]
+
+        result = optimize_layout(snapshot, variables, TotalPathLength(), workers=0)
+
+        # Shorter is better, so the screen ends on the lower bound
+        assert result.values[0] == pytest.approx(60.0)
+        assert result.objective == pytest.approx(60.0)
+
+    def test_cancel_returns_start(self):
+        cancel = threading.Event()
+        cancel.set()
+        variables = [OptimizationVariable(SweepParameter("screen", "x_mm"), 60.0, 150.0)]
+
+        result = optimize_layout(
+            _screen_snapshot(), variables, TotalPathLength(), workers=0, cancel=cancel
+        )
+
+        assert result.cancelled
+        assert result.values[0] == pytest.approx(100.0)
+        assert result.evaluations == 1
+
+    def test_invalid_bounds(self):
+        variables = [OptimizationVariable(SweepParameter("screen", "x_mm"), 5.0, 5.0)]
+        with pytest.raises(ValueError):
+            optimize_layout(_screen_snapshot(), variables, TotalPathLength(), workers=0)
+
+    def test_process_pool_matches_inline(self):
+        snapshot = _screen_snapshot(screen_angle=75.0)
+        variables = [OptimizationVariable(SweepParameter("screen", "angle_deg"), 60.0, 120.0)]
+
+        inline = optimize_layout(snapshot, variables, SpotSize(), workers=0, max_evaluations=20)
+        pooled = optimize_layout(snapshot, variables, SpotSize(), workers=2, max_evaluations=20)
+
+        np.testing.assert_allclose(pooled.values, inline.values)
+        assert pooled.objective == pytest.approx(inline.objective)
@@ -0,0 +1,88 @@
+"""
+Tests for tracing collaboration session states.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from optiverse.core.interface_definition import InterfaceDefinition
+from optiverse.core.models import SourceParams
+from optiverse.integration import (
+    convert_scene_to_polymorphic,
+    decode_trace_result,
+    encode_trace_result,
+    trace_session_state,
+)
+from optiverse.objects import SourceItem
+from optiverse.raytracing import trace_rays_with_detectors
+
+
+def _scene_state(scene, component_factory):
+    source = SourceItem(SourceParams(x_mm=-100.0, y_mm=2.0, n_rays=5, spread_deg=4.0))
+    mirror = component_factory(
+        x_mm=50.0,
+        y_mm=5.0,
+        angle_deg=100.0,
+        interfaces=[InterfaceDefinition(x1_mm=-20.0, x2_mm=20.0, element_type="mirror")],
+    )
+    screen = component_factory(
+        x_mm=0.0,
+        y_mm=120.0,
+        interfaces=[InterfaceDefinition(x1_mm=-60.0, x2_mm=60.0, element_type="detector")],
+    )
+    items = [source, mirror, screen]
+    for item in items:
+        scene.addItem(item)
+    state = {
+        "items": [
+            {**item.to_dict(), "uuid": item.item_uuid, "item_type": item.type_name}
+            for item in items
+        ]
+    }
+    # As received over the wire
+    return json.loads(json.dumps(state)), source
+
+
+def test_session_state_trace_matches_scene_trace(scene, component_factory):
+    state, source = _scene_state(scene, component_factory)
+
+    expected = trace_rays_with_detectors(
+        convert_scene_to_polymorphic(scene.items()), [source.params], max_events=80
+    )
+    actual = trace_session_state(state)
+
+    def endpoints(result):
+        return sorted(tuple(np.round(p.points[-1], 6)) for p in result.paths)
+
+    assert len(actual.paths) == len(expected.paths) > 0
+    assert endpoints(actual) == endpoints(expected)
+    assert [r.n_hits for r in actual.detectors] == [r.n_hits for r in expected.detectors]
+
+
+def test_encoded_trace_round_trips(scene, component_factory):
+    state, _ = _scene_state(scene, component_factory)
+    result = trace_session_state(state)
+
+    decoded = decode_trace_result(json.loads(json.dumps(encode_trace_result(result))))
+
+    assert len(decoded.paths) == len(result.paths)
+    for a, b in zip(decoded.paths, result.paths, strict=True):
+        np.testing.assert_allclose(a.points, b.points, atol=1e-3)
+        assert a.rgba == b.rgba
+        np.testing.assert_allclose(
+            a.polarization.jones_vector, b.polarization.jones_vector, atol=1e-6
+        )
+    (reading,) = decoded.detectors
+    assert reading.n_hits == result.detectors[0].n_hits
+    np.testing.assert_array_equal(reading.position.counts, result.detectors[0].position.counts)
+
+
+def test_invalid_payload_is_rejected():
+    with pytest.raises(ValueError):
+        decode_trace_result({"format": 99})
+    payload = encode_trace_result(trace_session_state({"items": []}))
+    payload["counts"] = "AQAAAA=="  # One path of one point, but no points
+    with pytest.raises(ValueError):
+        decode_trace_result(payload)
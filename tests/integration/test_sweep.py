@@ -0,0 +1,140 @@
+"""
+Tests for parameter sweeps over scene snapshots.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from optiverse.core.interface_definition import InterfaceDefinition
+from optiverse.core.models import ComponentParams, SourceParams
+from optiverse.integration import convert_scene_to_polymorphic
+from optiverse.integration.sweep import (
+    DetectorHits,
+    DetectorPower,
+    ItemSnapshot,
+    PathLength,
+    SceneSnapshot,
+    SweepParameter,
+    run_sweep,
+)
+
+
+def _screen_snapshot() -> SceneSnapshot:
+    """Source at the origin shooting +x onto a 20 mm detector at x=100."""
+    screen = ComponentParams(
+        x_mm=100.0,
+        angle_deg=90.0,
+        interfaces=[
+            InterfaceDefinition(x1_mm=-10.0, x2_mm=10.0, element_type="detector"),
+        ],
+    )
+    source = SourceParams(x_mm=0.0, n_rays=21, size_mm=10.0, ray_length_mm=500.0)
+    return SceneSnapshot(
+        items=[
+            ItemSnapshot("screen", "component", screen),
+            ItemSnapshot("source", "source", source),
+        ]
+    )
+
+
+class TestSceneSnapshot:
+    """Test capturing the scene without Qt."""
+
+    def test_matches_scene_geometry(self, scene, component_factory):
+        item = component_factory(
+            x_mm=12.0,
+            y_mm=-7.0,
+            angle_deg=30.0,
+            interfaces=[InterfaceDefinition(x1_mm=-5.0, y1_mm=1.0, x2_mm=5.0, y2_mm=2.0)],
+        )
+        scene.addItem(item)
+
+        expected = convert_scene_to_polymorphic(scene.items())
+        actual = SceneSnapshot.from_scene_items(scene.items()).build_elements()
+
+        assert len(actual) == len(expected) == 1
+        np.testing.assert_allclose(actual[0].p1, expected[0].p1, atol=1e-9)
+        np.testing.assert_allclose(actual[0].p2, expected[0].p2, atol=1e-9)
+
+    def test_parameter_validation(self):
+        snapshot = _screen_snapshot()
+        SweepParameter("screen", "y_mm").validate(snapshot)
+        SweepParameter("screen", "interfaces.0.detector_bins").validate(snapshot)
+        SweepParameter("source", "spread_deg").validate(snapshot)
+        with pytest.raises(ValueError):
+            SweepParameter("screen", "focal_length").validate(snapshot)
+        with pytest.raises(ValueError):
+            SweepParameter("screen", "interfaces.3.efl_mm").validate(snapshot)
+        with pytest.raises(ValueError):
+            SweepParameter("missing", "x_mm").validate(snapshot)
+
+    def test_apply_does_not_modify_snapshot(self):
+        snapshot = _screen_snapshot()
+        item = snapshot.find("screen")
+        moved = SweepParameter("screen", "interfaces.0.x1_mm").apply(item, -20.0)
+        assert moved.params.interfaces[0].x1_mm == -20.0
+        assert item.params.interfaces[0].x1_mm == -10.0
+
+
+class TestRunSweep:
+    """Test sweep evaluation."""
+
+    def test_detector_power_vs_offset(self):
+        snapshot = _screen_snapshot()
+        offsets = np.array([0.0, 4.0, 10.0, 40.0])
+
+        result = run_sweep(
+            snapshot, [SweepParameter("screen", "y_mm")], [offsets], DetectorHits(), workers=0
+        )
+
+        assert result.shape == (4,)
+        # Beam is 10 mm wide, detector 20 mm: fully hit, partly hit, then missed
+        assert result[0] == 21
+        assert result[1] == 21
+        assert 0 < result[2] < 21
+        assert result[3] == 0
+
+    def test_grid_shape_and_progress(self):
+        snapshot = _screen_snapshot()
+        calls = []
+        result = run_sweep(
+            snapshot,
+            [SweepParameter("screen", "x_mm"), SweepParameter("source", "n_rays")],
+            [[50.0, 100.0, 150.0], [3, 5]],
+            PathLength("max"),
+            workers=0,
+            progress=lambda done, total: calls.append((done, total)),
+        )
+        assert result.shape == (3, 2)
+        # Path ends on the detector, so the longest path equals the distance
+        np.testing.assert_allclose(result[:, 0], [50.0, 100.0, 150.0])
+        assert calls[-1] == (6, 6)
+
+    def test_cancel_leaves_nan(self):
+        cancel = threading.Event()
+        cancel.set()
+        result = run_sweep(
+            _screen_snapshot(),
+            [SweepParameter("screen", "y_mm")],
+            [np.linspace(0.0, 5.0, 4)],
+            DetectorPower(),
+            workers=0,
+            cancel=cancel,
+        )
+        assert np.all(np.isnan(result))
+
+    def test_process_pool_matches_inline(self):
+        snapshot = _screen_snapshot()
+        parameters = [SweepParameter("screen", "angle_deg")]
+        grid = [np.linspace(60.0, 120.0, 7)]
+
+        inline = run_sweep(snapshot, parameters, grid, DetectorPower(), workers=0)
+        pooled = run_sweep(snapshot, parameters, grid, DetectorPower(), workers=2)
+
+        np.testing.assert_allclose(pooled, inline)
+
+    def test_mismatched_grids(self):
+        with pytest.raises(ValueError):
+            run_sweep(_screen_snapshot(), [SweepParameter("screen", "x_mm")], [], DetectorPower())
@@ -0,0 +1,153 @@
+"""
+Tests for the persistent component library index.
+"""
+
+import json
+import os
+import time
+
+from optiverse.objects.definitions_loader import load_component_records
+from optiverse.objects.library_index import LibraryIndex, component_record_to_dict
+
+_PAST_NS = time.time_ns() - 3600 * 1_000_000_000
+
+
+def _write_component(root, folder, name, efl=100.0, mtime_ns=_PAST_NS):
+    """Write a component folder with an mtime safely in the past."""
+    path = root / folder
+    path.mkdir(parents=True, exist_ok=True)
+    data = {
+        "name": name,
+        "image_path": "images/part.png",
+        "object_height_mm": 25.4,
+        "category": "lenses",
+        "interfaces": [{"x1_mm": -10.0, "x2_mm": 10.0, "element_type": "lens", "efl_mm": efl}],
+    }
+    json_path = path / "component.json"
+    json_path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(json_path, ns=(mtime_ns, mtime_ns))
+    return json_path
+
+
+def _library(tmp_path, n=3):
+    root = tmp_path / "lib"
+    for i in range(n):
+        _write_component(root, f"part_{i}", f"Part {i}")
+    return root
+
+
+def test_second_load_reuses_index(tmp_path):
+    root = _library(tmp_path)
+    index = LibraryIndex(root, index_path=tmp_path / "index.json")
+
+    first = index.load()
+    assert index.stats.parsed == 3
+    second = index.load()
+    assert index.stats.parsed == 0
+    assert index.stats.reused == 3
+    assert second == first
+
+
+def test_matches_direct_parse(tmp_path):
+    root = _library(tmp_path)
+    expected = [component_record_to_dict(rec) for rec in load_component_records(root)]
+
+    index = LibraryIndex(root, index_path=tmp_path / "index.json")
+    index.load()
+    records = index.load()
+
+    by_name = {rec["name"]: rec for rec in records}
+    assert by_name == {rec["name"]: rec for rec in expected}
+    image = by_name["Part 0"]["image_path"]
+    assert image == str((root / "part_0" / "images" / "part.png").resolve())
+
+
+def test_batches_are_delivered_while_loading(tmp_path):
+    root = _library(tmp_path, n=5)
+    index = LibraryIndex(root, index_path=tmp_path / "index.json")
+    batches = []
+
+    records = index.load(on_batch=batches.append, batch_size=2)
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert sorted(r["name"] for batch in batches for r in batch) == sorted(
+        r["name"] for r in records
+    )
+
+    # Indexed records are delivered first, re-parsed ones after them
+    _write_component(root, "part_0", "Part 0", efl=50.0)
+    batches.clear()
+    index.load(on_batch=batches.append, batch_size=2)
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[-1][0]["interfaces"][0]["efl_mm"] == 50.0
+
+
+def test_only_changed_folders_are_parsed(tmp_path):
+    root = _library(tmp_path)
+    index = LibraryIndex(root, index_path=tmp_path / "index.json")
+    index.load()
+
+    _write_component(root, "part_1", "Part 1", efl=250.0, mtime_ns=_PAST_NS + 1_000_000_000)
+    _write_component(root, "part_new", "New Part")
+    (root / "part_2" / "component.json").unlink()
+
+    records = index.load()
+    assert index.stats.parsed == 2
+    assert index.stats.reused == 1
+    assert index.stats.removed == 1
+    by_name = {rec["name"]: rec for rec in records}
+    assert set(by_name) == {"Part 0", "Part 1", "New Part"}
+    assert by_name["Part 1"]["interfaces"][0]["efl_mm"] == 250.0
+
+
+def test_recently_modified_files_are_revalidated(tmp_path):
+    root = tmp_path / "lib"
+    _write_component(root, "fresh", "Fresh", mtime_ns=time.time_ns())
+    index = LibraryIndex(root, index_path=tmp_path / "index.json")
+
+    index.load()
+    index.load()
+    # The mtime was too close to the index write to be trusted
+    assert index.stats.parsed == 1
+
+
+def test_broken_component_is_cached(tmp_path, caplog):
+    root = _library(tmp_path, n=1)
+    broken = root / "broken"
+    broken.mkdir()
+    (broken / "component.json").write_text("{not json", encoding="utf-8")
+    os.utime(broken / "component.json", ns=(_PAST_NS, _PAST_NS))
+    index = LibraryIndex(root, index_path=tmp_path / "index.json")
+
+    assert len(index.load()) == 1
+    caplog.clear()
+    assert len(index.load()) == 1
+    assert index.stats.parsed == 0
+    assert "Failed to load component" not in caplog.text
+
+
+def test_stale_or_corrupt_index_is_rebuilt(tmp_path):
+    root = _library(tmp_path)
+    index_path = tmp_path / "index.json"
+    index = LibraryIndex(root, index_path=index_path)
+    index.load()
+
+    data = json.loads(index_path.read_text(encoding="utf-8"))
+    data["version"] = -1
+    index_path.write_text(json.dumps(data), encoding="utf-8")
+    assert len(index.load()) == 3
+    assert index.stats.parsed == 3
+
+    index_path.write_text("garbage", encoding="utf-8")
+    assert len(index.load()) == 3
+    assert index.stats.parsed == 3
+
+
+def test_unwritable_index_location(tmp_path):
+    root = _library(tmp_path)
+    blocker = tmp_path / "blocker"
+    blocker.write_text("", encoding="utf-8")
+    # The index directory cannot be created below a regular file
+    index = LibraryIndex(root, index_path=blocker / "sub" / "index.json")
+
+    assert len(index.load()) == 3
+    assert len(index.load()) == 3
@@ -0,0 +1,128 @@
+"""Tests for background SVG rasterization of component sprites."""
+
+import threading
+
+import pytest
+from PyQt6 import QtCore, QtWidgets
+
+from optiverse.objects import svg_rasterizer, svg_render_cache
+from optiverse.objects.component_sprite import ComponentSprite
+from optiverse.objects.svg_rasterizer import SvgRasterizer
+
+SVG = """<?xml version="1.0"?>
+<svg width="200" height="100" xmlns="http://www.w3.org/2000/svg">
+    <rect x="10" y="10" width="180" height="80" fill="{color}"/>
+</svg>"""
+
+
+@pytest.fixture
+def render_cache(tmp_path, monkeypatch):
+    cache = svg_render_cache.SvgRenderCache(tmp_path / "cache")
+    monkeypatch.setattr(svg_render_cache, "_cache", cache)
+    monkeypatch.setattr(svg_rasterizer, "_rasterizer", SvgRasterizer())
+    monkeypatch.setattr(ComponentSprite, "_shared_pixmaps", type(ComponentSprite._shared_pixmaps)())
+    return cache
+
+
+def _svg(tmp_path, name, color="blue"):
+    path = tmp_path / name
+    path.write_text(SVG.format(color=color), encoding="utf-8")
+    return str(path)
+
+
+def test_sprite_shows_placeholder_then_render(qtbot, tmp_path, render_cache):
+    scene = QtWidgets.QGraphicsScene()
+    parent = QtWidgets.QGraphicsRectItem()
+    scene.addItem(parent)
+    sprite = ComponentSprite(_svg(tmp_path, "a.svg"), (-5.0, 0.0, 5.0, 0.0), 20.0, parent)
+
+    # Placeholder right away, with the final geometry
+    assert sprite._placeholder
+    assert sprite.isVisible()
+    placeholder_rect = sprite.sceneBoundingRect()
+    assert placeholder_rect.height() == pytest.approx(20.0)
+    assert placeholder_rect.width() == pytest.approx(40.0)
+
+    qtbot.waitUntil(lambda: not sprite._placeholder, timeout=10000)
+    assert sprite.pixmap().height() == 4000
+    rect = sprite.sceneBoundingRect()
+    assert rect.width() == pytest.approx(placeholder_rect.width(), rel=1e-3)
+    assert rect.height() == pytest.approx(placeholder_rect.height(), rel=1e-3)
+    assert render_cache.stats().entries == 1
+
+    # A copy of the same SVG is served from memory without a placeholder
+    copy = ComponentSprite(_svg(tmp_path, "copy.svg"), (-5.0, 0.0, 5.0, 0.0), 20.0, parent)
+    assert not copy._placeholder
+    assert copy.pixmap().cacheKey() == sprite.pixmap().cacheKey()
+
+
+def test_invalid_svg_hides_sprite(qtbot, tmp_path, render_cache):
+    path = tmp_path / "broken.svg"
+    path.write_text("<svg", encoding="utf-8")
+    parent = QtWidgets.QGraphicsRectItem()
+    sprite = ComponentSprite(str(path), (-5.0, 0.0, 5.0, 0.0), 20.0, parent)
+    assert not sprite.isVisible()
+
+
+def test_visible_sprites_render_first(qtbot, tmp_path, render_cache, monkeypatch):
+    order = []
+    lock = threading.Lock()
+    real_render = svg_rasterizer.render_svg_image
+
+    def recording_render(svg_path, target_height):
+        with lock:
+            order.append(svg_path)
+        return real_render(svg_path, 16)
+
+    monkeypatch.setattr(svg_rasterizer, "render_svg_image", recording_render)
+    monkeypatch.setattr(svg_rasterizer, "_rasterizer", SvgRasterizer(workers=1))
+
+    scene = QtWidgets.QGraphicsScene()
+    view = QtWidgets.QGraphicsView(scene)
+    qtbot.addWidget(view)
+    view.resize(200, 200)
+    view.setSceneRect(QtCore.QRectF(-1000, -1000, 2000, 2000))
+    view.show()
+    qtbot.waitExposed(view)
+    view.centerOn(0, 0)
+
+    paths = []
+    for i, color in enumerate(["red", "green", "blue"]):
+        parent = QtWidgets.QGraphicsRectItem()
+        # Only the last sprite is placed inside the visible area
+        offset = 0.0 if i == 2 else 800.0
+        parent.setPos(offset, offset)
+        scene.addItem(parent)
+        paths.append(_svg(tmp_path, f"{color}.svg", color))
+        ComponentSprite(paths[-1], (-5.0, 0.0, 5.0, 0.0), 20.0, parent)
+
+    qtbot.waitUntil(lambda: svg_rasterizer.get_svg_rasterizer().pending() == 0, timeout=10000)
+    assert order[0] == paths[2]
+    assert sorted(order) == sorted(paths)
+
+
+def test_shutdown_drops_render_in_flight(qtbot, tmp_path, render_cache, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    real_render = svg_rasterizer.render_svg_image
+
+    def blocking_render(svg_path, target_height):
+        started.set()
+        release.wait(10)
+        return real_render(svg_path, 16)
+
+    monkeypatch.setattr(svg_rasterizer, "render_svg_image", blocking_render)
+    rasterizer = SvgRasterizer(workers=1)
+    delivered = []
+    path = _svg(tmp_path, "a.svg")
+    rasterizer.request("a", path, 16, QtWidgets.QGraphicsRectItem(), delivered.append)
+    qtbot.waitUntil(started.is_set, timeout=10000)
+
+    rasterizer.shutdown()
+    with qtbot.waitSignal(rasterizer.rendered, timeout=10000):
+        release.set()
+
+    qtbot.wait(50)
+    assert delivered == []
+    assert rasterizer.pending() == 0
+    assert rasterizer._executor is None
@@ -0,0 +1,113 @@
+"""Tests for the indexed, size-bounded SVG render cache."""
+
+import os
+import threading
+import time
+
+from optiverse.objects import svg_render_cache
+from optiverse.objects.svg_render_cache import INDEX_FILENAME, SvgRenderCache
+
+
+def _render(cache, key, size, source=""):
+    path = cache.file_for(key)
+    path.write_bytes(b"x" * size)
+    cache.add(key, path, source=source)
+    return path
+
+
+def test_lookup_uses_index_and_survives_restart(tmp_path):
+    cache = SvgRenderCache(tmp_path)
+    path = _render(cache, "a", 100)
+
+    assert cache.lookup("a") == path
+    assert cache.lookup("missing") is None
+    assert (tmp_path / INDEX_FILENAME).exists()
+
+    reopened = SvgRenderCache(tmp_path)
+    assert reopened.lookup("a") == path
+    assert reopened.stats().entries == 1
+    assert reopened.stats().total_bytes == 100
+
+
+def test_evicts_least_recently_used_beyond_budget(tmp_path):
+    cache = SvgRenderCache(tmp_path, max_bytes=250)
+    a = _render(cache, "a", 100)
+    time.sleep(0.01)
+    _render(cache, "b", 100)
+    time.sleep(0.01)
+    cache.lookup("a")  # a is now more recent than b
+    time.sleep(0.01)
+    _render(cache, "c", 100)
+
+    assert cache.lookup("b") is None
+    assert not (tmp_path / "b.png").exists()
+    assert cache.lookup("a") == a
+    assert cache.stats().total_bytes == 200
+
+    cache.set_max_bytes(100)
+    assert cache.stats().entries == 1
+
+
+def test_new_render_of_same_source_replaces_stale_one(tmp_path):
+    cache = SvgRenderCache(tmp_path)
+    _render(cache, "old", 100, source="/lib/lens.svg:4000")
+    _render(cache, "other_size", 100, source="/lib/lens.svg:8000")
+    _render(cache, "new", 100, source="/lib/lens.svg:4000")
+
+    assert cache.lookup("old") is None
+    assert not (tmp_path / "old.png").exists()
+    assert cache.lookup("other_size") is not None
+    assert cache.lookup("new") is not None
+
+
+def test_cleanup_reconciles_directory_and_index(tmp_path):
+    cache = SvgRenderCache(tmp_path)
+    _render(cache, "kept", 100)
+    gone = _render(cache, "gone", 100)
+    gone.unlink()
+    orphan = tmp_path / "legacy.png"
+    orphan.write_bytes(b"x" * 10)
+    os.utime(orphan, (time.time() - 3600, time.time() - 3600))
+    fresh = tmp_path / "being_written.png"
+    fresh.write_bytes(b"x")
+
+    cache.start_cleanup().join()
+
+    assert not orphan.exists()
+    assert fresh.exists()
+    assert cache.lookup("gone") is None
+    assert cache.stats().entries == 1
+
+    cache.clear()
+    assert cache.stats().entries == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == [INDEX_FILENAME]
+
+
+def test_cleanup_deletes_files_without_holding_the_lock(tmp_path, monkeypatch):
+    cache = SvgRenderCache(tmp_path)
+    kept = _render(cache, "kept", 100)
+    orphan = tmp_path / "legacy.png"
+    orphan.write_bytes(b"x")
+    os.utime(orphan, (time.time() - 3600, time.time() - 3600))
+    looked_up = []
+
+    def unlink(path):
+        # A lookup from another thread must not wait for the cleanup
+        thread = threading.Thread(target=lambda: looked_up.append(cache.lookup("kept")))
+        thread.start()
+        thread.join(5.0)
+        path.unlink()
+
+    monkeypatch.setattr(svg_render_cache, "_unlink", unlink)
+    cache.cleanup()
+
+    assert looked_up == [kept]
+    assert not orphan.exists()
+
+
+def test_corrupt_index_is_rebuilt(tmp_path):
+    (tmp_path / INDEX_FILENAME).write_text("{not json", encoding="utf-8")
+    cache = SvgRenderCache(tmp_path)
+    assert cache.lookup("a") is None
+    _render(cache, "a", 5)
+    assert SvgRenderCache(tmp_path).lookup("a") is not None
@@ -0,0 +1,161 @@
+"""
+Tests for the detector element and its histograms.
+"""
+
+import pickle
+import threading
+
+import numpy as np
+import pytest
+
+from optiverse.core.interface_definition import InterfaceDefinition
+from optiverse.core.models import SourceParams
+from optiverse.data import DetectorProperties, LineSegment, OpticalInterface
+from optiverse.integration import create_polymorphic_element
+from optiverse.integration.adapter import convert_legacy_interface_to_optical
+from optiverse.raytracing import (
+    Detector,
+    DetectorAccumulator,
+    DetectorElement,
+    accumulate_trace,
+    trace_rays_with_detectors,
+)
+from optiverse.raytracing.ray import Polarization, RayState
+
+
+def _ray(direction, wavelength_nm=633.0, intensity=1.0):
+    return RayState(
+        position=np.zeros(2),
+        direction=np.array(direction, dtype=float),
+        intensity=intensity,
+        polarization=Polarization.horizontal(),
+        wavelength_nm=wavelength_nm,
+    )
+
+
+def _screen(**kwargs):
+    props = DetectorProperties(**kwargs)
+    geom = LineSegment(np.array([100.0, -10.0]), np.array([100.0, 10.0]))
+    return create_polymorphic_element(OpticalInterface(geometry=geom, properties=props))
+
+
+class TestDetectorElement:
+    """Test hit recording and binning."""
+
+    def test_absorbs_and_records(self):
+        det = DetectorElement(p1=[0.0, -5.0], p2=[0.0, 5.0], bins=10)
+        out = det.interact(_ray([1.0, 0.0]), np.array([0.0, 2.5]), np.zeros(2), np.zeros(2))
+        assert out == []
+
+        reading = det.reading()
+        assert reading.n_hits == 1
+        assert reading.total_power == pytest.approx(1.0)
+        # 2.5 mm above center on a 10 mm detector -> bin 7 of 10
+        assert np.argmax(reading.position.power) == 7
+        # Normal incidence falls in the middle of the angle range
+        assert reading.angle.power[5] == pytest.approx(1.0)
+
+    def test_exact_position_moments(self):
+        det = DetectorElement(p1=[0.0, -5.0], p2=[0.0, 5.0], bins=3)
+        for y in (1.0, 3.0):
+            det.interact(_ray([1.0, 0.0]), np.array([0.0, y]), np.zeros(2), np.zeros(2))
+        reading = det.reading()
+        assert reading.centroid_mm == pytest.approx(2.0)
+        assert reading.rms_width_mm == pytest.approx(1.0)
+
+    def test_signed_angle(self):
+        det = DetectorElement(p1=[0.0, -5.0], p2=[0.0, 5.0])
+        direction = np.array([[np.cos(0.2), np.sin(0.2)], [np.cos(0.2), -np.sin(0.2)]])
+        _, angles = det.project_hits(np.zeros((2, 2)), direction)
+        np.testing.assert_allclose(angles, np.degrees([0.2, -0.2]))
+
+    def test_out_of_range_power(self):
+        det = DetectorElement(p1=[0.0, -5.0], p2=[0.0, 5.0], wavelength_range_nm=(400.0, 700.0))
+        det.interact(_ray([1.0, 0.0], 1064.0, 0.5), np.zeros(2), np.zeros(2), np.zeros(2))
+        reading = det.reading()
+        assert reading.wavelength.power.sum() == 0.0
+        assert reading.out_of_range_power == pytest.approx(0.5)
+
+    def test_empty_reading(self):
+        reading = DetectorElement(p1=[0.0, -1.0], p2=[0.0, 1.0], bins=4).reading()
+        assert reading.n_hits == 0
+        assert len(reading.position.edges) == 5
+
+    def test_thread_buffers_are_merged(self):
+        det = DetectorElement(p1=[0.0, -5.0], p2=[0.0, 5.0])
+
+        def record():
+            for _ in range(250):
+                det.interact(_ray([1.0, 0.0]), np.zeros(2), np.zeros(2), np.zeros(2))
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert det.reading().n_hits == 1000
+        det.reset()
+        assert det.reading().n_hits == 0
+
+    def test_picklable(self):
+        det = DetectorElement(p1=[0.0, -5.0], p2=[0.0, 5.0])
+        det.interact(_ray([1.0, 0.0]), np.zeros(2), np.zeros(2), np.zeros(2))
+        clone = pickle.loads(pickle.dumps(det))
+        assert clone.reading().n_hits == 0
+        clone.interact(_ray([1.0, 0.0]), np.zeros(2), np.zeros(2), np.zeros(2))
+        assert clone.reading().n_hits == 1
+
+    def test_legacy_interface_conversion(self):
+        iface = InterfaceDefinition(element_type="detector", detector_bins=25.0)
+        element = create_polymorphic_element(convert_legacy_interface_to_optical(iface))
+        assert isinstance(element, Detector)
+        assert element.bins == 25
+
+
+class TestDetectorTracing:
+    """Test detectors in full traces."""
+
+    def test_readings_returned_with_paths(self):
+        screen = _screen(bins=20)
+        source = SourceParams(x_mm=0.0, n_rays=11, size_mm=10.0, ray_length_mm=500.0)
+
+        for parallel in (False, True):
+            result = trace_rays_with_detectors(
+                [screen], [source], parallel=parallel, parallel_threshold=1
+            )
+            assert len(result.paths) == 11
+            assert len(result.detectors) == 1
+            reading = result.detectors[0]
+            # Repeated traces start from an empty detector
+            assert reading.n_hits == 11
+            assert reading.position.counts.sum() == 11
+            # All rays hit the screen within ±5 mm of its center
+            centers = reading.position.centers[reading.position.counts > 0]
+            assert np.all(np.abs(centers) <= 5.5)
+
+    def test_streaming_accumulator(self):
+        screen = _screen(bins=16)
+        source = SourceParams(
+            x_mm=0.0,
+            n_rays=400,
+            size_mm=8.0,
+            spread_deg=2.0,
+            ray_length_mm=500.0,
+            sampling_mode="monte_carlo",
+            bandwidth_nm=20.0,
+        )
+        accumulators = DetectorAccumulator.for_elements([screen])
+        accumulate_trace([screen], [source], accumulators, chunk_size=64, parallel=False)
+        streamed = accumulators[0].reading
+
+        assert streamed.n_hits == 400
+        assert streamed.position.power.sum() == pytest.approx(streamed.total_power)
+        # Streaming does not keep hits beyond the current chunk
+        assert screen.reading().n_hits <= 64
+
+        # Per-run accumulators merge into the combined histogram
+        other = DetectorAccumulator.for_elements([screen])[0]
+        accumulate_trace([screen], [source], [other], chunk_size=64, seed=1, parallel=False)
+        accumulators[0].merge(other)
+        assert accumulators[0].reading.n_hits == 800
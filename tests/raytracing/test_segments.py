@@ -0,0 +1,109 @@
+"""
+Tests for precomputed segment records and batched intersection.
+"""
+
+import numpy as np
+import pytest
+
+from optiverse.core.raytracing_math import ray_hit_element, ray_hit_segment, ray_hit_segments
+from optiverse.data import CurvedSegment, LineSegment, MirrorProperties, OpticalInterface
+from optiverse.integration import create_polymorphic_element
+from optiverse.raytracing.elements import MirrorElement
+from optiverse.raytracing.segments import SegmentRecord, SegmentTable
+
+
+class TestSegmentRecord:
+    """Test SegmentRecord construction."""
+
+    def test_matches_ray_hit_element_conventions(self):
+        p1 = np.array([10.0, -5.0])
+        p2 = np.array([10.0, 5.0])
+        record = SegmentRecord.from_endpoints(p1, p2)
+
+        result = ray_hit_element(np.array([0.0, 0.0]), np.array([1.0, 0.0]), p1, p2)
+        assert result is not None
+        _, _, t_hat, n_hat, center, length = result
+
+        np.testing.assert_allclose(record.tangent, t_hat)
+        np.testing.assert_allclose(record.normal, n_hat)
+        np.testing.assert_allclose(record.center, center)
+        assert record.length == pytest.approx(length)
+
+    def test_is_immutable(self):
+        record = SegmentRecord.from_endpoints([0.0, 0.0], [1.0, 0.0])
+        with pytest.raises(AttributeError):
+            record.half_length = 2.0  # type: ignore[misc]
+        with pytest.raises(ValueError):
+            record.normal[0] = 5.0
+
+    def test_element_carries_record(self):
+        mirror = MirrorElement(p1=[0.0, -1.0], p2=[0.0, 1.0])
+        assert mirror.segment.half_length == pytest.approx(1.0)
+        np.testing.assert_allclose(mirror.segment.p1, [0.0, -1.0])
+
+    def test_degenerate_segment_never_hit(self):
+        record = SegmentRecord.from_endpoints([1.0, 0.0], [1.0, 0.0])
+        hit = ray_hit_segment(
+            np.array([0.0, 0.0]),
+            np.array([1.0, 0.0]),
+            record.center,
+            record.tangent,
+            record.normal,
+            record.half_length,
+        )
+        assert hit is None
+
+
+class TestBatchedIntersection:
+    """Test that the batched routine agrees with the per-segment one."""
+
+    def test_batch_matches_scalar(self):
+        rng = np.random.default_rng(1234)
+        endpoints = rng.uniform(-50.0, 50.0, size=(200, 2, 2))
+        records = [SegmentRecord.from_endpoints(a, b) for a, b in endpoints]
+        table = SegmentTable.from_elements([MirrorElement(p1=a, p2=b) for a, b in endpoints])
+
+        for _ in range(20):
+            P = rng.uniform(-60.0, 60.0, size=2)
+            angle = rng.uniform(0.0, 2.0 * np.pi)
+            V = np.array([np.cos(angle), np.sin(angle)])
+
+            t_batch = ray_hit_segments(
+                P, V, table.centers, table.tangents, table.normals, table.half_lengths
+            )
+            for i, (a, b) in enumerate(endpoints):
+                expected = ray_hit_element(P, V, a, b)
+                if expected is None:
+                    assert np.isinf(t_batch[i])
+                else:
+                    assert t_batch[i] == pytest.approx(expected[0])
+                    rec = records[i]
+                    scalar = ray_hit_segment(
+                        P, V, rec.center, rec.tangent, rec.normal, rec.half_length
+                    )
+                    assert scalar is not None
+                    np.testing.assert_allclose(scalar[1], expected[1])
+
+    def test_table_separates_curved_elements(self):
+        flat = create_polymorphic_element(
+            OpticalInterface(
+                geometry=LineSegment(np.array([0.0, -1.0]), np.array([0.0, 1.0])),
+                properties=MirrorProperties(),
+            )
+        )
+        curved = create_polymorphic_element(
+            OpticalInterface(
+                geometry=CurvedSegment(
+                    p1=np.array([5.0, -1.0]),
+                    p2=np.array([5.0, 1.0]),
+                    radius_of_curvature_mm=20.0,
+                ),
+                properties=MirrorProperties(),
+            )
+        )
+
+        table = SegmentTable.from_elements([curved, flat])
+
+        assert len(table) == 1
+        assert list(table.element_indices) == [1]
+        assert table.curved_indices == [0]
@@ -0,0 +1,141 @@
+"""
+Tests for Monte Carlo source sampling and the streaming trace API.
+"""
+
+import numpy as np
+import pytest
+
+from optiverse.core.models import SourceParams
+from optiverse.data import BeamBlockProperties, LineSegment, MirrorProperties, OpticalInterface
+from optiverse.integration import create_polymorphic_element
+from optiverse.raytracing import (
+    PowerAccumulator,
+    RayTermination,
+    accumulate_trace,
+    trace_rays_polymorphic,
+    trace_rays_streaming,
+)
+from optiverse.raytracing.sampling import sample_angles, sample_source, source_rng
+
+
+def _element(props, p1, p2):
+    geom = LineSegment(np.array(p1, dtype=float), np.array(p2, dtype=float))
+    return create_polymorphic_element(OpticalInterface(geometry=geom, properties=props))
+
+
+def _mc_source(**kwargs) -> SourceParams:
+    params = dict(
+        x_mm=0.0,
+        y_mm=0.0,
+        angle_deg=0.0,
+        size_mm=4.0,
+        n_rays=500,
+        ray_length_mm=200.0,
+        spread_deg=10.0,
+        sampling_mode="monte_carlo",
+    )
+    params.update(kwargs)
+    return SourceParams(**params)
+
+
+class TestSampling:
+    """Test random source sampling."""
+
+    def test_same_seed_same_rays(self):
+        source = _mc_source(bandwidth_nm=5.0)
+        a = sample_source(source, 100, source_rng(source))
+        b = sample_source(source, 100, source_rng(source))
+        for x, y in zip(a, b):
+            np.testing.assert_array_equal(x, y)
+
+    def test_different_streams_differ(self):
+        source = _mc_source()
+        a = sample_source(source, 100, source_rng(source, stream=(0, 0)))
+        b = sample_source(source, 100, source_rng(source, stream=(0, 1)))
+        assert not np.array_equal(a[0], b[0])
+
+    def test_offsets_within_aperture(self):
+        source = _mc_source(size_mm=6.0)
+        offsets, _, wavelengths = sample_source(source, 1000, source_rng(source))
+        assert np.all(np.abs(offsets) <= 3.0)
+        np.testing.assert_array_equal(wavelengths, source.wavelength_nm)
+
+    @pytest.mark.parametrize("distribution", ["lambertian", "uniform"])
+    def test_bounded_distributions(self, distribution):
+        rng = np.random.default_rng(0)
+        angles = sample_angles(distribution, np.radians(15.0), 5000, rng)
+        assert np.all(np.abs(angles) <= np.radians(15.0) + 1e-12)
+
+    def test_gaussian_width(self):
+        rng = np.random.default_rng(0)
+        angles = sample_angles("gaussian", 0.2, 20000, rng)
+        assert np.std(angles) == pytest.approx(0.1, rel=0.05)
+
+    def test_unknown_distribution(self):
+        with pytest.raises(ValueError):
+            sample_angles("cauchy", 0.1, 10, np.random.default_rng(0))
+
+    def test_polymorphic_trace_uses_monte_carlo_count(self):
+        paths = trace_rays_polymorphic([], [_mc_source(n_rays=37)], parallel=False)
+        assert len(paths) == 37
+
+
+class TestStreaming:
+    """Test chunked tracing and accumulators."""
+
+    def test_chunks_cover_all_rays(self):
+        chunks = list(
+            trace_rays_streaming(
+                [], [_mc_source()], rays_per_source=1000, chunk_size=300, parallel=False
+            )
+        )
+        assert [c.n_emitted for c in chunks] == [300, 300, 300, 100]
+        assert all(c.paths is None for c in chunks)
+        assert all(np.all(c.terminations == RayTermination.ESCAPED) for c in chunks)
+
+    def test_reproducible_and_independent_of_threading(self):
+        block = _element(BeamBlockProperties(), (50.0, -3.0), (50.0, 3.0))
+        runs = []
+        for parallel in (False, True):
+            chunks = list(
+                trace_rays_streaming(
+                    [block], [_mc_source()], chunk_size=128, seed=42, parallel=parallel
+                )
+            )
+            runs.append(np.concatenate([c.points for c in chunks]))
+        np.testing.assert_array_equal(runs[0], runs[1])
+
+    def test_power_bookkeeping(self):
+        block = _element(BeamBlockProperties(), (50.0, -3.0), (50.0, 3.0))
+        mirror = _element(MirrorProperties(reflectivity=0.5), (-50.0, -100.0), (-50.0, 100.0))
+        power = PowerAccumulator(n_elements=2)
+
+        accumulate_trace([block, mirror], [_mc_source()], [power], parallel=False)
+
+        assert power.emitted == 500
+        assert power.absorbed_by_element[0] == pytest.approx(power.absorbed)
+        assert 0.0 < power.absorbed < power.emitted
+        assert power.escaped + power.absorbed + power.truncated + power.lost == pytest.approx(
+            power.emitted
+        )
+
+    def test_merge(self):
+        a = PowerAccumulator(n_elements=1, emitted=10.0, escaped=4.0)
+        b = PowerAccumulator(n_elements=1, emitted=5.0, absorbed=5.0)
+        b.absorbed_by_element[0] = 5.0
+        a.merge(b)
+        assert a.emitted == 15.0
+        assert a.absorbed_by_element[0] == 5.0
+
+    def test_keep_paths(self):
+        chunks = list(
+            trace_rays_streaming([], [_mc_source(n_rays=10)], keep_paths=True, parallel=False)
+        )
+        assert len(chunks) == 1
+        assert chunks[0].paths is not None and len(chunks[0].paths) == 10
+
+    def test_fan_source_single_chunk(self):
+        source = SourceParams(n_rays=7, size_mm=5.0)
+        chunks = list(trace_rays_streaming([], [source], chunk_size=2, parallel=False))
+        assert len(chunks) == 1
+        assert len(chunks[0]) == 7
@@ -0,0 +1,181 @@
+"""Tests for the journaled incremental autosave."""
+
+import json
+
+import pytest
+
+from optiverse.services.autosave_journal import (
+    AutosaveJournal,
+    journal_path,
+    read_autosave,
+    replay_journal,
+)
+
+
+def _entry(uuid, x=0.0):
+    return {"item_uuid": uuid, "x_mm": x}
+
+
+def test_replay_applies_puts_deletes_and_groups():
+    snapshot = {
+        "version": "2.0",
+        "items": [_entry("a"), _entry("b"), {"no_uuid": True}],
+        "rulers": [_entry("r")],
+        "groups": [],
+        "_autosave_meta": {},
+    }
+    records = [
+        {"op": "put", "section": "items", "uuid": "a", "data": _entry("a", 5.0)},
+        {"op": "del", "uuid": "b"},
+        {"op": "put", "section": "texts", "uuid": "t", "data": _entry("t")},
+        {"op": "del", "uuid": "missing"},
+        {"op": "groups", "data": [{"name": "g", "item_uuids": ["a"]}]},
+    ]
+
+    data = replay_journal(snapshot, records)
+
+    assert data["items"] == [_entry("a", 5.0), {"no_uuid": True}]
+    assert data["rulers"] == [_entry("r")]
+    assert data["texts"] == [_entry("t")]
+    assert data["groups"] == [{"name": "g", "item_uuids": ["a"]}]
+
+
+def test_journal_roundtrip_through_files(tmp_path):
+    path = str(tmp_path / "scene.autosave.json")
+    journal = AutosaveJournal()
+    journal.write_snapshot(path, {"version": "2.0", "items": [_entry("a")], "groups": []})
+    journal.record([{"op": "put", "section": "items", "uuid": "b", "data": _entry("b")}])
+    journal.flush()
+    journal.record([{"op": "del", "uuid": "a"}])
+    journal.flush()
+    journal.wait()
+
+    assert not journal.needs_snapshot(path)
+    with open(journal_path(path), encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+    assert read_autosave(path)["items"] == [_entry("b")]
+    journal.close()
+
+
+def test_snapshot_supersedes_older_journal_records(tmp_path):
+    path = str(tmp_path / "scene.autosave.json")
+    journal = AutosaveJournal()
+    journal.write_snapshot(path, {"version": "2.0", "items": [], "groups": []})
+    journal.record([{"op": "put", "section": "items", "uuid": "a", "data": _entry("a")}])
+    journal.flush()
+    journal.wait()
+    old_lines = open(journal_path(path), encoding="utf-8").read()
+
+    journal.write_snapshot(path, {"version": "2.0", "items": [_entry("a", 1.0)], "groups": []})
+    journal.wait()
+    # Simulate a crash before the journal was truncated, plus a torn append
+    with open(journal_path(path), "w", encoding="utf-8") as f:
+        f.write(old_lines + '{"gen": 2, "op": "del", "uu')
+
+    assert read_autosave(path)["items"] == [_entry("a", 1.0)]
+    journal.close()
+
+
+def test_new_session_ignores_records_of_previous_session(tmp_path):
+    path = str(tmp_path / "scene.autosave.json")
+    previous = AutosaveJournal()
+    previous.write_snapshot(path, {"version": "2.0", "items": [], "groups": []})
+    previous.record([{"op": "put", "section": "items", "uuid": "a", "data": _entry("a")}])
+    previous.flush()
+    previous.close()
+    old_lines = open(journal_path(path), encoding="utf-8").read()
+
+    # The next session snapshots the same path and crashes before truncating the journal
+    journal = AutosaveJournal()
+    journal.write_snapshot(path, {"version": "2.0", "items": [_entry("b")], "groups": []})
+    journal.wait()
+    with open(journal_path(path), "w", encoding="utf-8") as f:
+        f.write(old_lines)
+
+    assert read_autosave(path)["items"] == [_entry("b")]
+    journal.close()
+
+
+def test_compaction_due_after_record_limit(tmp_path):
+    path = str(tmp_path / "scene.autosave.json")
+    journal = AutosaveJournal(compact_after=3)
+    assert journal.needs_snapshot(path)
+    journal.write_snapshot(path, {"version": "2.0", "items": [], "groups": []})
+    for uuid in "abc":
+        journal.record([{"op": "del", "uuid": uuid}])
+        journal.flush()
+    assert journal.needs_snapshot(path)
+    assert journal.needs_snapshot(str(tmp_path / "other.autosave.json"))
+
+    journal.discard()
+    journal.wait()
+    assert not (tmp_path / "scene.autosave.json").exists()
+    assert not (tmp_path / "scene.autosave.journal").exists()
+    journal.close()
+
+
+@pytest.fixture
+def file_manager(scene, mock_log_service, tmp_path, monkeypatch):
+    from optiverse.services.scene_file_manager import SceneFileManager
+
+    manager = SceneFileManager(
+        scene=scene,
+        log_service=mock_log_service,
+        get_ray_data=lambda: [],
+        on_modified=lambda modified: None,
+        parent_widget=None,
+    )
+    path = str(tmp_path / "untitled.autosave.json")
+    monkeypatch.setattr(manager, "get_autosave_path", lambda: path)
+    yield manager
+    manager._journal.close()
+
+
+def _by_uuid(data):
+    return {entry["item_uuid"]: entry for entry in data["items"]}
+
+
+def test_autosave_journals_only_changed_items(file_manager, scene, tmp_path):
+    from optiverse.core.models import SourceParams
+    from optiverse.core.undo_commands import AddItemCommand, RemoveItemCommand
+    from optiverse.core.undo_stack import UndoStack
+    from optiverse.objects import SourceItem
+
+    stack = UndoStack()
+    stack.commandApplied.connect(file_manager.record_command)
+    sources = [SourceItem(SourceParams(x_mm=float(i))) for i in range(3)]
+    for source in sources[:2]:
+        stack.push(AddItemCommand(scene, source))
+    file_manager.mark_modified()
+    file_manager.do_autosave()  # First autosave: full snapshot
+    file_manager.wait_for_autosave()
+    snapshot = (tmp_path / "untitled.autosave.json").read_text(encoding="utf-8")
+
+    stack.push(AddItemCommand(scene, sources[2]))
+    stack.push(RemoveItemCommand(scene, sources[0]))
+    stack.undo()  # Restores sources[0]
+    stack.push(RemoveItemCommand(scene, sources[1]))
+    file_manager.do_autosave()
+    file_manager.wait_for_autosave()
+
+    # The snapshot was not rewritten; the journal holds one record per change
+    assert (tmp_path / "untitled.autosave.json").read_text(encoding="utf-8") == snapshot
+    lines = (tmp_path / "untitled.autosave.journal").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["op"] for line in lines] == ["put", "del", "put", "del"]
+
+    recovered = read_autosave(str(tmp_path / "untitled.autosave.json"))
+    assert _by_uuid(recovered) == _by_uuid(file_manager.serialize_scene())
+    assert set(_by_uuid(recovered)) == {sources[0].item_uuid, sources[2].item_uuid}
+
+
+def test_clear_autosave_removes_snapshot_and_journal(file_manager, scene, tmp_path):
+    from optiverse.core.models import SourceParams
+    from optiverse.objects import SourceItem
+
+    scene.addItem(SourceItem(SourceParams()))
+    file_manager.mark_modified()
+    file_manager.do_autosave()
+    file_manager.clear_autosave()
+    file_manager.wait_for_autosave()
+
+    assert list(tmp_path.iterdir()) == []
@@ -172,7 +172,8 @@ class TestCollaborationFullFlow(unittest.TestCase):
 
         # Verify item was moved
         item_b.setPos.assert_called_once_with(300.0, 200.0)
-        item_b.setRotation.assert_called_once_with(45.0)
+        # angle_deg is the user (clockwise) angle; Qt rotates counter-clockwise
+        item_b.setRotation.assert_called_once_with(-45.0)
 
     def test_simulate_delete_from_a_to_b(self):
         """Simulate user A deleting item and user B receiving delete."""
@@ -0,0 +1,159 @@
+"""Tests for field-level diffs of collaborative item updates."""
+
+from unittest.mock import Mock
+
+import pytest
+from PyQt6.QtWidgets import QGraphicsScene
+
+from optiverse.core.models import SourceParams
+from optiverse.objects import SourceItem, type_registry
+from optiverse.services.collaboration_manager import CollaborationManager
+
+
+@pytest.fixture
+def manager(qapp):
+    main_window = Mock()
+    main_window.scene = QGraphicsScene()
+    main_window.autotrace = False
+    collab = CollaborationManager(main_window)
+    collab.role = "host"
+    collab.enabled = True
+    collab.initial_sync_complete = True
+    collab.collaboration_service = Mock()
+    return collab
+
+
+def _add_source(manager, **params):
+    item = SourceItem(SourceParams(**params))
+    manager.main_window.scene.addItem(item)
+    manager.item_uuid_map[item.item_uuid] = item
+    return item
+
+
+def test_update_sends_only_changed_fields(manager):
+    item = _add_source(manager, n_rays=9)
+    manager.get_session_state()  # Caches the serialized item
+
+    item.params.n_rays = 21
+    item.params.color_hex = "#00FF00"
+    item._color.setNamedColor("#00FF00")
+    manager.broadcast_update_item(item)
+
+    call = manager.collaboration_service.queue_command.call_args
+    assert call.kwargs["action"] == "update_item"
+    assert call.kwargs["data"] == {
+        "n_rays": 21,
+        "color_hex": "#00ff00",
+        "item_uuid": item.item_uuid,
+    }
+    assert call.kwargs["base_version"] == 0
+
+    # No change: nothing sent, version unchanged
+    manager.collaboration_service.queue_command.reset_mock()
+    manager.broadcast_update_item(item)
+    manager.collaboration_service.queue_command.assert_not_called()
+    assert manager.get_session_state()["item_versions"] == {item.item_uuid: 1}
+
+
+def test_remote_update_is_applied_in_place(manager, monkeypatch):
+    item = _add_source(manager, n_rays=9, size_mm=10.0)
+    monkeypatch.setattr(
+        type_registry, "deserialize_item", Mock(side_effect=AssertionError("item rebuilt"))
+    )
+
+    manager._on_command_received(
+        {
+            "command": {
+                "action": "update_item",
+                "item_type": "source",
+                "item_id": item.item_uuid,
+                "data": {"n_rays": 3, "x_mm": 25.0, "angle_deg": 90.0, "locked": True},
+                "base_version": 0,
+                "version": 1,
+            }
+        }
+    )
+
+    assert item.params.n_rays == 3
+    assert item.params.size_mm == 10.0
+    assert item.pos().x() == pytest.approx(25.0)
+    assert item.params.angle_deg == pytest.approx(90.0)
+    assert item.is_locked()
+    assert manager.item_uuid_map[item.item_uuid] is item
+    manager.collaboration_service.request_sync.assert_not_called()
+
+
+def test_move_round_trips_rotated_item(manager):
+    sender = _add_source(manager, x_mm=10.0, y_mm=20.0, angle_deg=30.0)
+    receiver = _add_source(manager)
+    manager.broadcast_move_item(sender)
+    data = manager.collaboration_service.queue_command.call_args.kwargs["data"]
+
+    manager._apply_move_item(receiver.item_uuid, data)
+
+    assert receiver.params.angle_deg == pytest.approx(30.0)
+    assert receiver.rotation() == pytest.approx(sender.rotation())
+    assert receiver.pos() == sender.pos()
+
+
+def test_concurrent_update_triggers_resync(manager):
+    item = _add_source(manager)
+    manager.get_session_state()
+
+    # Local update: version 0 -> 1
+    item.params.n_rays = 5
+    manager.broadcast_update_item(item)
+
+    # Remote update made on version 0 as well
+    manager._on_command_received(
+        {
+            "command": {
+                "action": "update_item",
+                "item_id": item.item_uuid,
+                "data": {"n_rays": 7},
+                "base_version": 0,
+                "version": 1,
+            }
+        }
+    )
+    assert manager.update_conflicts == 1
+    manager.collaboration_service.request_sync.assert_called_once()
+
+
+def test_coalesced_updates_keep_first_base_version(qapp):
+    from optiverse.services.collaboration_service import CollaborationService
+
+    service = CollaborationService()
+    service.queue_command("update_item", "source", "a", {"n_rays": 3}, base_version=4)
+    service.queue_command("update_item", "source", "a", {"size_mm": 2.0}, base_version=5)
+
+    (queued,) = service._queued_commands.values()
+    command = queued["command"]
+    assert command["data"] == {"n_rays": 3, "size_mm": 2.0}
+    assert (command["base_version"], command["version"]) == (4, 6)
+
+
+def test_remote_changes_wait_while_suspended(manager):
+    item = _add_source(manager, n_rays=9)
+    message = {
+        "seq": 1,
+        "command": {
+            "action": "update_item",
+            "item_type": "source",
+            "item_id": item.item_uuid,
+            "data": {"n_rays": 4},
+            "base_version": 0,
+            "version": 1,
+        },
+    }
+
+    manager.suspend_remote_changes()
+    manager.suspend_remote_changes()
+    manager._on_command_received(message)
+    manager.resume_remote_changes()
+    assert item.params.n_rays == 9
+    assert manager.last_seq == 0
+
+    manager.resume_remote_changes()
+    assert item.params.n_rays == 4
+    assert manager.last_seq == 1
@@ -6,6 +6,7 @@ Tests for:
 2. Reconnection triggers state comparison
 3. Conflict resolution (host wins)
 4. Re-sync after reconnection
+5. Delta sync from the server's op log
 """
 
 import unittest
@@ -116,6 +117,7 @@ class TestReconnection(unittest.TestCase):
         collab.role = "client"
         collab.needs_resync = True
         collab.session_version = 5
+        collab.last_seq = 42
 
         # Mock service
         collab.collaboration_service = Mock()
@@ -124,19 +126,43 @@ class TestReconnection(unittest.TestCase):
         # Simulate reconnection
         collab._on_connected()
 
-        # Should send sync request with version
+        # Should request the missed ops, with version
         calls = collab.collaboration_service.send_message.call_args_list
         sync_request_sent = False
         for call_args in calls:
             msg = call_args[0][0]
-            if msg.get("type") == "sync:request":
+            if msg.get("type") == "sync:since":
                 sync_request_sent = True
+                assert msg["since"] == 42
                 assert "local_version" in msg
                 assert msg["local_version"] == 5
                 break
 
         assert sync_request_sent
 
+    def test_recreated_session_reclaims_hosting(self):
+        """Test that a host recreating a restored session pushes its canvas."""
+        from optiverse.services.collaboration_manager import CollaborationManager
+
+        main_window = Mock()
+        main_window.scene = QGraphicsScene()
+
+        collab = CollaborationManager(main_window)
+        collab.collaboration_service = Mock()
+        collab.create_session("lab", "alice")
+        collab.connect_to_session("ws://localhost:8765", "lab", "alice")
+
+        collab.collaboration_service.connect_to_session.assert_called_once_with(
+            "lab", "alice", as_host=True
+        )
+
+        # The server grants hosting of the session it restored
+        collab._on_connection_acknowledged({"is_host": True, "users": [{"user_id": "alice"}]})
+
+        msg = collab.collaboration_service.send_message.call_args[0][0]
+        assert msg["type"] == "sync:full_state"
+        assert not collab.collaboration_service.request_sync.called
+
 
 class TestConflictResolution(unittest.TestCase):
     """Test conflict resolution when states diverge."""
@@ -391,6 +417,69 @@ class TestResync(unittest.TestCase):
         # (This is implementation-dependent - might send immediately or queue)
 
 
+class TestDeltaSync(unittest.TestCase):
+    """Test catching up from the server's op log."""
+
+    def _client(self):
+        from optiverse.services.collaboration_manager import CollaborationManager
+
+        main_window = Mock()
+        main_window.scene = None
+        collab = CollaborationManager(main_window)
+        collab.role = "client"
+        collab.enabled = True
+        collab.collaboration_service = Mock()
+        collab._apply_move_item = Mock()
+        return collab
+
+    def _move(self, seq, item_id="a"):
+        return {
+            "type": "command",
+            "seq": seq,
+            "command": {"action": "move_item", "item_id": item_id, "data": {"x_mm": seq}},
+        }
+
+    def test_missed_ops_are_applied_once(self):
+        """Test that ops are applied in order and duplicates are skipped."""
+        collab = self._client()
+        collab.needs_resync = True
+        collab.last_seq = 4
+
+        collab._on_ops_received({"ops": [self._move(4), self._move(5), self._move(6)], "seq": 6})
+        # Live broadcast of an op already received in the delta
+        collab._on_command_received(self._move(6))
+        collab._on_command_received(self._move(7))
+
+        applied = [c.args[1]["x_mm"] for c in collab._apply_move_item.call_args_list]
+        self.assertEqual(applied, [5, 6, 7])
+        self.assertEqual(collab.last_seq, 7)
+        self.assertFalse(collab.needs_resync)
+
+    def test_snapshot_tail_is_applied_after_state(self):
+        """Test that ops after the server snapshot are applied to it."""
+        collab = self._client()
+        collab.main_window.autotrace = False
+
+        collab._on_sync_state_received(
+            {
+                "type": "sync:full_state",
+                "state": {"items": [], "version": 3},
+                "seq": 10,
+                "ops": [self._move(11), self._move(12)],
+            }
+        )
+
+        self.assertEqual(collab._apply_move_item.call_count, 2)
+        self.assertEqual(collab.last_seq, 12)
+
+    def test_own_command_ack_advances_seq(self):
+        """Test that acks of our own commands advance the last applied op."""
+        collab = self._client()
+        collab.last_seq = 3
+        collab._on_command_acknowledged(4)
+        self.assertEqual(collab.last_seq, 4)
+
+
 class TestServerStateManagement(unittest.TestCase):
     """Test server-side state management."""
 
@@ -0,0 +1,100 @@
+"""Tests for showing rays traced by the collaboration server."""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from PyQt6.QtWidgets import QGraphicsScene
+
+from optiverse.core.models import Polarization, SourceParams
+from optiverse.integration import encode_trace_result
+from optiverse.objects import SourceItem
+from optiverse.raytracing import RayPath
+from optiverse.raytracing.engine import TraceResult
+from optiverse.services.collaboration_manager import CollaborationManager
+
+
+@pytest.fixture
+def manager(qapp):
+    main_window = Mock()
+    main_window.scene = QGraphicsScene()
+    main_window.autotrace = True
+    collab = CollaborationManager(main_window)
+    collab.role = "client"
+    collab.enabled = True
+    collab.initial_sync_complete = True
+    collab.shared_trace = True
+    collab.collaboration_service = Mock()
+    collab.collaboration_service.pending_commands.return_value = 0
+    collab.collaboration_service.unacked_commands = 0
+    item = SourceItem(SourceParams())
+    main_window.scene.addItem(item)
+    collab.item_uuid_map[item.item_uuid] = item
+    collab.source = item
+    return collab
+
+
+def _trace_result(seq):
+    path = RayPath(
+        points=[np.array([0.0, 0.0]), np.array([10.0, float(seq)])],
+        rgba=(255, 0, 0, 255),
+        polarization=Polarization.horizontal(),
+        wavelength_nm=633.0,
+    )
+    return {"type": "trace:result", "seq": seq, "rays": encode_trace_result(TraceResult([path]))}
+
+
+def _move(manager, seq):
+    manager._on_command_received(
+        {
+            "seq": seq,
+            "command": {
+                "action": "move_item",
+                "item_type": "source",
+                "item_id": manager.source.item_uuid,
+                "data": {"x_mm": float(seq), "y_mm": 0.0},
+            },
+        }
+    )
+
+
+def test_remote_change_shows_server_trace(manager):
+    controller = manager.main_window.raytracing_controller
+    _move(manager, 1)
+    controller.suspend_retrace.assert_called_once()
+    controller.resume_retrace.assert_called_once()
+    controller.show_trace_result.assert_not_called()
+
+    # A trace of an older op is not shown
+    manager._on_trace_received(_trace_result(0))
+    controller.show_trace_result.assert_not_called()
+
+    manager._on_trace_received(_trace_result(1))
+    (result,), _ = controller.show_trace_result.call_args
+    np.testing.assert_allclose(result.paths[0].points[1], [10.0, 1.0])
+    assert manager.shared_traces_shown == 1
+    manager.main_window.retrace.assert_not_called()
+
+    # Already received: shown right after the change
+    manager._on_trace_received(_trace_result(2))
+    _move(manager, 2)
+    assert manager.shared_traces_shown == 2
+
+
+def test_lagging_server_trace_falls_back_to_local_trace(manager):
+    _move(manager, 1)
+    _move(manager, 2)
+    manager._on_trace_received(_trace_result(1))
+    assert manager._trace_timer.isActive()
+
+    manager._on_trace_timeout()
+    manager.main_window.retrace.assert_called_once()
+    assert manager.trace_fallbacks == 1
+    manager.main_window.raytracing_controller.show_trace_result.assert_not_called()
+
+
+def test_local_changes_in_flight_are_traced_locally(manager):
+    manager.collaboration_service.unacked_commands = 1
+    _move(manager, 1)
+    manager.main_window.raytracing_controller.suspend_retrace.assert_not_called()
+    assert not manager._trace_timer.isActive()
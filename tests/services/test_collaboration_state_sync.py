@@ -11,6 +11,7 @@ Tests for:
 import json
 import unittest
 import uuid
+from types import SimpleNamespace
 from unittest.mock import Mock
 
 from PyQt6.QtWidgets import QGraphicsScene
@@ -108,8 +109,8 @@ class TestSessionCreation(unittest.TestCase):
 class TestInitialStateSync(unittest.TestCase):
     """Test initial state synchronization when joining."""
 
-    def test_host_sends_initial_state_to_new_client(self):
-        """Test that host sends full state when client joins."""
+    def test_host_seeds_server_state_on_connect(self):
+        """Test that the host uploads its state once, not to every new client."""
         from optiverse.services.collaboration_manager import CollaborationManager
 
         # Setup host
@@ -118,7 +119,7 @@ class TestInitialStateSync(unittest.TestCase):
 
         collab_host = CollaborationManager(main_window)
         collab_host.role = "host"
-        collab_host.enabled = True
+        collab_host.rebuild_uuid_map = Mock()
 
         # Add items to host's scene
         item1 = Mock()
@@ -133,24 +134,27 @@ class TestInitialStateSync(unittest.TestCase):
         collab_host.collaboration_service = Mock()
         collab_host.collaboration_service.send_message = Mock()
 
-        # Simulate new client connection
-        collab_host._on_user_joined("new-client")
-
-        # Verify host sent initial state
-        calls = collab_host.collaboration_service.send_message.call_args_list
-        assert len(calls) > 0
+        # Server acknowledges the session's first user as host
+        collab_host._on_connection_acknowledged({"is_host": True, "users": [], "seq": 0})
 
         # Check that a state sync message was sent
+        calls = collab_host.collaboration_service.send_message.call_args_list
         state_sync_sent = False
         for call_args in calls:
             msg = call_args[0][0]
             if msg.get("type") == "sync:full_state":
                 state_sync_sent = True
                 assert "state" in msg
-                assert "items" in msg["state"]
+                assert len(msg["state"]["items"]) == 1
                 break
 
-        assert state_sync_sent, "Host should send full state to new client"
+        assert state_sync_sent, "Host should seed the server with its state"
+        collab_host.collaboration_service.request_sync.assert_not_called()
+
+        # New clients get the state from the server's op log
+        collab_host.collaboration_service.send_message.reset_mock()
+        collab_host._on_user_joined("new-client")
+        collab_host.collaboration_service.send_message.assert_not_called()
 
     def test_client_receives_and_applies_initial_state(self):
         """Test that client receives and applies full canvas state."""
@@ -385,6 +389,57 @@ class TestSessionState(unittest.TestCase):
         except (TypeError, ValueError) as e:
             self.fail(f"Session state not JSON serializable: {e}")
 
+    def test_session_state_serializes_only_edited_items(self):
+        """Test that an edit only re-serializes the edited item."""
+        from optiverse.services.collaboration_manager import CollaborationManager
+
+        main_window = Mock()
+        main_window.scene = None
+
+        collab = CollaborationManager(main_window)
+        collab.role = "host"
+        collab.enabled = True
+        collab.initial_sync_complete = True
+        collab.collaboration_service = Mock()
+        collab._get_item_type = Mock(return_value="lens")
+
+        def make_item(x):
+            item = Mock()
+            item.item_uuid = str(uuid.uuid4())
+            item.to_dict = Mock(return_value={"x_mm": x, "y_mm": 0.0, "angle_deg": 0.0})
+            item.params = SimpleNamespace(x_mm=x, y_mm=0.0, angle_deg=0.0)
+            item.x.return_value = item.y.return_value = item.rotation.return_value = 0.0
+            return item
+
+        items = [make_item(float(i)) for i in range(20)]
+        for item in items:
+            collab.item_uuid_map[item.item_uuid] = item
+
+        assert len(collab.get_session_state()["items"]) == 20
+        assert all(item.to_dict.call_count == 1 for item in items)
+
+        # Move one item: only its transform is sent, nothing is serialized
+        items[3].params.x_mm = 99.0
+        collab.broadcast_move_item(items[3])
+        # Add one item
+        added = make_item(-1.0)
+        collab.broadcast_add_item(added)
+
+        state = collab.get_session_state()
+        assert added.to_dict.call_count == 1
+        assert all(item.to_dict.call_count == 1 for item in items)
+        by_uuid = {item_data["uuid"]: item_data for item_data in state["items"]}
+        assert len(by_uuid) == 21
+        assert by_uuid[items[3].item_uuid]["x_mm"] == 99.0
+        assert by_uuid[added.item_uuid]["item_type"] == "lens"
+        assert collab.last_known_state["version"] == 1
+
+        # Remote changes are serialized again on demand
+        collab._on_command_received(
+            {"command": {"action": "remove_item", "item_id": items[0].item_uuid}}
+        )
+        assert len(collab.get_session_state()["items"]) == 20
+
 
 # Run tests if executed directly
 if __name__ == "__main__":
@@ -198,7 +198,8 @@ class TestCollaborationReceive(unittest.TestCase):
 
         # Verify item was moved
         item.setPos.assert_called_once_with(300.0, 200.0)
-        item.setRotation.assert_called_once_with(90.0)
+        # angle_deg is the user (clockwise) angle; Qt rotates counter-clockwise
+        item.setRotation.assert_called_once_with(-90.0)
 
     def test_remote_remove_item_deletes_item(self):
         """Test that receiving remove_item deletes the item."""
@@ -352,6 +353,110 @@ class TestCollaborationMessageFormat(unittest.TestCase):
         assert message["command"]["data"]["angle_deg"] == 45.0
 
 
+class TestCommandCoalescing(unittest.TestCase):
+    """Test coalescing of queued move/update commands."""
+
+    def _service(self):
+        from optiverse.services.collaboration_service import CollaborationService
+
+        service = CollaborationService()
+        service.connected_state = True
+        service.user_id = "test_user"
+        service.ws = Mock()
+        return service
+
+    def _sent(self, service):
+        import json
+
+        return [json.loads(c.args[0]) for c in service.ws.sendTextMessage.call_args_list]
+
+    def test_moves_are_coalesced_per_item(self):
+        """Test that queued moves of an item are sent once, with the latest data."""
+        service = self._service()
+        for i in range(50):
+            service.queue_command("move_item", "lens", "a", {"x_mm": float(i), "y_mm": 1.0})
+        service.queue_command("move_item", "lens", "b", {"x_mm": 7.0, "y_mm": 2.0})
+        assert not service.ws.sendTextMessage.called
+        assert service.pending_commands() == 2
+
+        service.flush_commands()
+
+        sent = self._sent(service)
+        assert [m["command"]["item_id"] for m in sent] == ["a", "b"]
+        assert sent[0]["command"]["data"] == {"x_mm": 49.0, "y_mm": 1.0}
+        assert service.pending_commands() == 0
+
+    def test_move_merged_into_update_stays_update(self):
+        """Test that a move merged with an update sends the update's fields too."""
+        service = self._service()
+        service.queue_command("update_item", "lens", "a", {"x_mm": 0.0, "name": "L1"})
+        service.queue_command("move_item", "lens", "a", {"x_mm": 5.0})
+        service.flush_commands()
+
+        (message,) = self._sent(service)
+        assert message["command"]["action"] == "update_item"
+        assert message["command"]["data"] == {"x_mm": 5.0, "name": "L1"}
+
+    def test_remove_drops_queued_commands(self):
+        """Test that removing an item drops its queued moves."""
+        service = self._service()
+        service.queue_command("move_item", "lens", "a", {"x_mm": 5.0})
+        service.send_command("remove_item", "lens", "a", {})
+
+        assert [m["command"]["action"] for m in self._sent(service)] == ["remove_item"]
+        assert service.pending_commands() == 0
+
+    def test_queued_commands_are_flushed_at_flush_rate(self):
+        """Test that the flush timer sends queued commands."""
+        from PyQt6.QtTest import QTest
+
+        service = self._service()
+        service.set_command_flush_rate(100)
+        service.queue_command("move_item", "lens", "a", {"x_mm": 5.0})
+        QTest.qWait(100)
+
+        assert len(self._sent(service)) == 1
+
+    def test_zero_rate_sends_immediately(self):
+        """Test that a flush rate of 0 disables coalescing."""
+        service = self._service()
+        service.set_command_flush_rate(0)
+        service.queue_command("move_item", "lens", "a", {"x_mm": 5.0})
+
+        assert len(self._sent(service)) == 1
+
+    def test_move_broadcast_sends_only_transform(self):
+        """Test that moves send the transform without serializing the item."""
+        from types import SimpleNamespace
+
+        from optiverse.services.collaboration_manager import CollaborationManager
+
+        collab = CollaborationManager(Mock())
+        collab.enabled = True
+        collab.collaboration_service = Mock()
+        collab._get_item_type = Mock(return_value="lens")
+
+        item = Mock()
+        item.item_uuid = "a"
+        item.params = SimpleNamespace(x_mm=1.0, y_mm=2.0, angle_deg=30.0)
+        item.x.return_value = item.y.return_value = item.rotation.return_value = 0.0
+        item._transform_edit = True
+
+        # edited emitted for the move: no update broadcast
+        collab.broadcast_update_item(item)
+        collab.broadcast_move_item(item)
+
+        item.to_dict.assert_not_called()
+        (call,) = collab.collaboration_service.queue_command.call_args_list
+        assert call.kwargs["action"] == "move_item"
+        assert call.kwargs["data"] == {
+            "x_mm": 1.0,
+            "y_mm": 2.0,
+            "angle_deg": 30.0,
+            "item_uuid": "a",
+        }
+
+
 class TestUUIDManagement(unittest.TestCase):
     """Test UUID assignment and tracking."""
 
@@ -0,0 +1,71 @@
+"""Tests for the binary collaboration wire format of CollaborationService."""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from optiverse.services import wire_format
+from optiverse.services.collaboration_service import CollaborationService
+
+
+@pytest.fixture
+def service(qapp):
+    service = CollaborationService()
+    service.ws = Mock()
+    service.connected_state = True
+    return service
+
+
+def _full_state(items):
+    return {
+        "type": "sync:full_state",
+        "state": {
+            "items": [
+                {"uuid": f"item-{i}", "item_type": "source", "x_mm": float(i), "n_rays": 9}
+                for i in range(items)
+            ]
+        },
+    }
+
+
+def test_connect_offers_binary_frames_as_text(service):
+    service._on_connected()
+
+    (frame,), _ = service.ws.sendTextMessage.call_args
+    hello = json.loads(frame)
+    assert hello["type"] == "wire:hello"
+    assert hello["encodings"] == wire_format.supported_encodings()
+    assert hello["compression"] == ["zlib"]
+    service.ws.sendBinaryMessage.assert_not_called()
+
+
+def test_wire_ack_switches_to_binary_frames(service):
+    service._on_message(json.dumps({"type": "wire:ack", "encoding": "json", "compression": "zlib"}))
+    service.send_message(_full_state(100))
+
+    service.ws.sendTextMessage.assert_not_called()
+    (frame,), _ = service.ws.sendBinaryMessage.call_args
+    assert frame[0] & wire_format.FRAME_ZLIB
+    assert wire_format.decode_message(frame)["state"]["items"][99]["uuid"] == "item-99"
+    assert service.bytes_sent == len(frame)
+
+
+def test_binary_frames_are_dispatched(service):
+    received = Mock()
+    service.sync_state_received.connect(received)
+
+    frame = wire_format.encode_message(_full_state(100), "json", "zlib")
+    service._on_binary_message(frame)
+
+    (data,), _ = received.call_args
+    assert len(data["state"]["items"]) == 100
+    assert service.bytes_received == len(frame)
+
+
+def test_small_and_text_frames_stay_uncompressed():
+    frame = wire_format.encode_message({"type": "ping"}, "json", "zlib")
+    assert frame == b"\x00" + b'{"type":"ping"}'
+    assert wire_format.encode_message({"type": "ping"}) == '{"type": "ping"}'
+    with pytest.raises(ValueError):
+        wire_format.decode_message(b"\x7f{}")
@@ -0,0 +1,113 @@
+"""Tests for the content-addressed component image store."""
+
+import json
+
+from optiverse.core.models import ComponentRecord
+from optiverse.platform.paths import (
+    image_content_hash,
+    image_store_dir,
+    make_image_ref,
+    resolve_image_ref,
+    to_absolute_path,
+)
+from optiverse.services.image_store import prune_image_store, store_image
+from optiverse.services.storage_service import StorageService
+
+PNG_A = b"\x89PNG\r\n\x1a\n" + b"A" * 64
+PNG_B = b"\x89PNG\r\n\x1a\n" + b"B" * 64
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+def _record(name, image_path):
+    return ComponentRecord(name=name, image_path=str(image_path))
+
+
+def _library(path):
+    path.mkdir()
+    return path, StorageService(str(path))
+
+
+def _stored_ref(library, name):
+    data = json.loads((library / name / "component.json").read_text(encoding="utf-8"))
+    return data["image_path"]
+
+
+def test_store_deduplicates_by_content(tmp_path):
+    library = tmp_path / "lib"
+    first = _write(tmp_path / "a" / "lens.png", PNG_A)
+    copy = _write(tmp_path / "b" / "other_name.PNG", PNG_A)
+
+    ref = store_image(first, library)
+    assert store_image(copy, library) == ref
+    assert ref == f"@image/{image_content_hash(first)}.png"
+    assert [p.name for p in image_store_dir(library).iterdir()] == [ref[len("@image/") :]]
+
+    blob = resolve_image_ref(ref, [tmp_path / "missing", library])
+    assert blob == str(image_store_dir(library) / ref[len("@image/") :])
+    assert to_absolute_path(ref, [library]) == blob
+    assert make_image_ref(blob) == ref
+    assert image_content_hash(blob) == image_content_hash(first)
+    assert make_image_ref(str(first)) is None
+
+
+def test_storage_service_shares_images_between_components(tmp_path):
+    library, svc = _library(tmp_path / "lib")
+    svc.save_component(_record("Lens A", _write(tmp_path / "x" / "lens.png", PNG_A)))
+    svc.save_component(_record("Lens B", _write(tmp_path / "y" / "lens.png", PNG_A)))
+    svc.save_component(_record("Lens C", _write(tmp_path / "z" / "lens.png", PNG_B)))
+
+    assert _stored_ref(library, "lens_a") == _stored_ref(library, "lens_b")
+    assert len(list(image_store_dir(library).iterdir())) == 2
+    assert not (library / "lens_a" / "images").exists()
+
+    loaded = {row["name"]: row["image_path"] for row in svc.load_library()}
+    assert loaded["Lens A"] == loaded["Lens B"]
+    assert loaded["Lens A"].startswith(str(image_store_dir(library)))
+    assert svc.get_component("Lens C")["image_path"] == loaded["Lens C"]
+
+    # Blobs go away with the last component using them
+    svc.delete_component("Lens A")
+    assert len(list(image_store_dir(library).iterdir())) == 2
+    svc.delete_component("Lens C")
+    assert len(list(image_store_dir(library).iterdir())) == 1
+    assert prune_image_store(library) == 0
+
+
+def test_export_is_self_contained_and_import_restores_store(tmp_path):
+    source_lib, svc = _library(tmp_path / "source")
+    svc.save_component(_record("Lens A", _write(tmp_path / "img" / "lens.png", PNG_A)))
+
+    export_dir = tmp_path / "export"
+    assert svc.export_component("Lens A", str(export_dir))
+    exported = json.loads((export_dir / "lens_a" / "component.json").read_text(encoding="utf-8"))
+    assert exported["image_path"].startswith("images/")
+    assert (export_dir / "lens_a" / exported["image_path"]).read_bytes() == PNG_A
+
+    target_lib, target = _library(tmp_path / "target")
+    assert target.import_component(str(export_dir / "lens_a"))
+    assert _stored_ref(target_lib, "lens_a") == _stored_ref(source_lib, "lens_a")
+    assert not (target_lib / "lens_a" / "images").exists()
+
+    # Importing straight from another library resolves its image store
+    other_lib, other = _library(tmp_path / "other")
+    assert other.import_component(str(source_lib / "lens_a"))
+    blob = resolve_image_ref(_stored_ref(other_lib, "lens_a"), [other_lib])
+    assert blob is not None and open(blob, "rb").read() == PNG_A
+
+
+def test_sprite_cache_key_follows_content(tmp_path):
+    from optiverse.objects.component_sprite import ComponentSprite
+
+    first = _write(tmp_path / "a" / "housing.svg", b"<svg/>")
+    copy = _write(tmp_path / "b" / "housing.svg", b"<svg/>")
+    other = _write(tmp_path / "c" / "housing.svg", b"<svg></svg>")
+
+    key = ComponentSprite._get_cache_key(str(first), 100)
+    assert ComponentSprite._get_cache_key(str(copy), 100) == key
+    assert ComponentSprite._get_cache_key(str(other), 100) != key
+    assert ComponentSprite._get_cache_key(str(first), 200) != key
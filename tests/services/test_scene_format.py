@@ -0,0 +1,131 @@
+"""Tests for the binary scene container and format selection by extension."""
+
+import enum
+import json
+import math
+
+import pytest
+
+from optiverse.services.scene_format import (
+    convert_scene_file,
+    decode_scene,
+    encode_scene,
+    is_binary_scene_path,
+    main,
+    read_scene_file,
+    write_scene_file,
+)
+
+
+def _scene(n=50):
+    return {
+        "version": "2.0",
+        "items": [
+            {
+                "_type": "lens",
+                "x_mm": i * 0.1,
+                "y_mm": -1e-300,
+                "n_rays": i,
+                "locked": bool(i % 2),
+                "image_path": "@library/lens_1in/images/lens.png",
+                "notes": None if i % 3 else "ünïcode ✓",
+                "coefficients": [1.0, 2.5, -3.25, float(i)],
+                "indices": [0, -1, 2**62, 7],
+                "points": [[0.0, 1.0], [2.0, 3.0], [4.5, -6.0]],
+                "mixed": [1, 1.0, "1", [1.0, 2.0]],
+                "big": 2**80,
+            }
+            for i in range(n)
+        ],
+        "rulers": [],
+        "groups": [{"name": "g", "item_uuids": ["a", "b"], "nested": {}}],
+    }
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_binary_roundtrip_is_lossless(compress):
+    data = _scene()
+    decoded = decode_scene(encode_scene(data, compress=compress))
+
+    assert decoded == data
+    # Types survive exactly (1 vs 1.0, bool vs int)
+    assert json.dumps(decoded) == json.dumps(data)
+
+
+def test_binary_is_smaller_than_pretty_json():
+    data = _scene(500)
+    assert len(encode_scene(data)) < len(json.dumps(data, indent=2)) / 10
+    # Uncompressed, interning and packing alone already shrink the file
+    assert len(encode_scene(data, compress=False)) < len(json.dumps(data, indent=2)) / 2
+
+
+def test_special_floats_and_enums():
+    class Kind(str, enum.Enum):
+        LENS = "lens"
+
+    decoded = decode_scene(encode_scene({"k": Kind.LENS, "v": [math.inf, -0.0, 1.0, 2.0]}))
+    assert decoded["k"] == "lens" and type(decoded["k"]) is str
+    assert decoded["v"][0] == math.inf and math.copysign(1.0, decoded["v"][1]) < 0
+
+
+@pytest.mark.parametrize(
+    "blob",
+    [b"", b"NOPE\x01\x00\x00\x00", b"OVAB\x63\x00\x00\x00"],
+)
+def test_decode_rejects_invalid_headers(blob):
+    with pytest.raises(ValueError):
+        decode_scene(blob)
+
+
+def test_decode_rejects_truncated_body():
+    blob = encode_scene(_scene(5), compress=False)
+    with pytest.raises(ValueError):
+        decode_scene(blob[:-3])
+
+
+def test_unserializable_value_raises_type_error():
+    with pytest.raises(TypeError):
+        encode_scene({"x": object()})
+
+
+def test_files_follow_extension_and_convert(tmp_path):
+    data = _scene(5)
+    json_path = tmp_path / "a.json"
+    oab_path = tmp_path / "a.OAB"
+    write_scene_file(json_path, data)
+
+    convert_scene_file(json_path, oab_path)
+    assert is_binary_scene_path(oab_path)
+    assert oab_path.read_bytes()[:4] == b"OVAB"
+    assert read_scene_file(oab_path) == data
+
+    back = tmp_path / "b.json"
+    assert main([str(oab_path), str(back)]) == 0
+    assert json.loads(back.read_text(encoding="utf-8")) == data
+
+
+def test_scene_file_manager_saves_and_opens_binary(scene, mock_log_service, tmp_path):
+    from optiverse.core.models import SourceParams
+    from optiverse.objects import SourceItem
+    from optiverse.services.scene_file_manager import SceneFileManager
+
+    manager = SceneFileManager(
+        scene=scene,
+        log_service=mock_log_service,
+        get_ray_data=lambda: [],
+        on_modified=lambda modified: None,
+        parent_widget=None,
+    )
+    for i in range(3):
+        scene.addItem(SourceItem(SourceParams(x_mm=10.0 * i, y_mm=-5.0)))
+    expected = manager.serialize_scene()
+    path = tmp_path / "layout.oab"
+
+    assert manager.save_to_file(str(path))
+    assert read_scene_file(path) == expected
+    for it in list(scene.items()):
+        scene.removeItem(it)
+
+    assert manager.open_file(str(path))
+    positions = sorted(it.params.x_mm for it in scene.items() if isinstance(it, SourceItem))
+    assert positions == [0.0, 10.0, 20.0]
@@ -0,0 +1,129 @@
+"""Tests for incremental JSON parsing and chunked scene loading."""
+
+import io
+import json
+
+import pytest
+
+from optiverse.services.json_stream import JsonEntryStream
+
+
+def _entries(text, block_size):
+    return list(JsonEntryStream(io.BytesIO(text.encode("utf-8")), block_size=block_size))
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 7, 4096])
+def test_stream_yields_array_elements(block_size):
+    doc = {
+        "version": "2.0",
+        "items": [{"type": "lens", "x": 1.5e3, "name": "ä\\n"}, [1, 2], 12345],
+        "empty": [],
+        "meta": {"nested": [1, {"a": None}]},
+        "n": -0.25,
+    }
+    entries = _entries(json.dumps(doc, indent=1), block_size)
+
+    assert entries == [
+        ("version", "2.0", False),
+        ("items", doc["items"][0], True),
+        ("items", [1, 2], True),
+        ("items", 12345, True),
+        ("meta", doc["meta"], False),
+        ("n", -0.25, False),
+    ]
+
+
+def test_stream_round_trips_numbers_split_at_any_block_boundary():
+    doc = {
+        "values": [1.25, -3e5, 7e-2, 0.5, 10, -0.0, 6.02e23, 1e-7],
+        "scale": 12.5e1,
+        "count": 42,
+    }
+    text = json.dumps(doc, separators=(",", ":"))
+    for block_size in range(1, len(text) + 1):
+        entries = _entries(text, block_size)
+        values = [value for key, value, _ in entries if key == "values"]
+        assert values == doc["values"], block_size
+        assert entries[-2:] == [("scale", 125.0, False), ("count", 42, False)], block_size
+
+
+@pytest.mark.parametrize("text", ['{"items": [1, 2', '{"a" 1}', "[1, 2]", '{"a": 1} x', "{} 1"])
+def test_stream_rejects_malformed_documents(text):
+    with pytest.raises(json.JSONDecodeError):
+        _entries(text, 4)
+
+
+@pytest.fixture
+def file_manager(scene, mock_log_service):
+    from optiverse.services.scene_file_manager import SceneFileManager
+
+    return SceneFileManager(
+        scene=scene,
+        log_service=mock_log_service,
+        get_ray_data=lambda: [],
+        on_modified=lambda modified: None,
+        parent_widget=None,
+    )
+
+
+def _add_sources(scene, n):
+    from optiverse.core.models import SourceParams
+    from optiverse.objects import SourceItem
+
+    for i in range(n):
+        scene.addItem(SourceItem(SourceParams(x_mm=float(i), y_mm=0.0)))
+
+
+def _sources(scene):
+    from optiverse.objects import SourceItem
+
+    return sorted(it.params.x_mm for it in scene.items() if isinstance(it, SourceItem))
+
+
+def test_open_file_streams_items_with_progress(file_manager, scene, tmp_path, monkeypatch):
+    import optiverse.services.scene_file_manager as module
+
+    monkeypatch.setattr(module, "_CHUNK_SECONDS", 0.0)
+    _add_sources(scene, 40)
+    path = tmp_path / "layout.json"
+    path.write_text(json.dumps(file_manager.serialize_scene()), encoding="utf-8")
+    for it in list(scene.items()):
+        scene.removeItem(it)
+
+    calls = []
+    assert file_manager.open_file(str(path), lambda done, total: calls.append((done, total)))
+
+    assert _sources(scene) == [float(i) for i in range(40)]
+    size = path.stat().st_size
+    assert len(calls) > 10
+    assert all(total == size for _, total in calls)
+    assert [done for done, _ in calls] == sorted(done for done, _ in calls)
+    assert calls[-1] == (size, size)
+    assert file_manager.saved_file_path == str(path)
+
+
+def test_corrupt_file_keeps_previous_scene(file_manager, scene, tmp_path):
+    from optiverse.core.exceptions import AssemblyLoadError
+
+    _add_sources(scene, 5)
+    text = json.dumps(file_manager.serialize_scene())
+    path = tmp_path / "broken.json"
+    # Truncated inside the items array: some items are built before the error
+    path.write_text(text[: text.index('"rulers"') - 10], encoding="utf-8")
+
+    with pytest.raises(AssemblyLoadError):
+        file_manager.open_file(str(path))
+
+    assert _sources(scene) == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert file_manager.saved_file_path is None
+
+
+def test_load_from_data_reports_entry_counts(file_manager, scene):
+    _add_sources(scene, 3)
+    data = file_manager.serialize_scene()
+
+    calls = []
+    file_manager.load_from_data(data, lambda done, total: calls.append((done, total)))
+
+    assert _sources(scene) == [0.0, 1.0, 2.0]
+    assert calls[-1] == (3, 3)
@@ -26,6 +26,8 @@ class TestFileControllerImport:
         # FileController is a QObject with signals
         assert hasattr(FileController, "traceRequested")
         assert hasattr(FileController, "windowTitleChanged")
+        assert hasattr(FileController, "loadStarted")
+        assert hasattr(FileController, "loadFinished")
 
     def test_file_controller_instantiation(self, qapp, scene):
         """Test that FileController can be instantiated with mocks."""
@@ -49,6 +51,32 @@ class TestFileControllerImport:
         assert hasattr(controller, "open_assembly")
         assert hasattr(controller, "is_modified")
 
+    def test_file_controller_defers_autosave_while_loading(self, qapp, scene):
+        """Test that autosave never runs against a scene that is still loading."""
+        from optiverse.core.undo_stack import UndoStack
+        from optiverse.ui.controllers.file_controller import FileController
+
+        controller = FileController(
+            scene=scene,
+            undo_stack=UndoStack(),
+            log_service=MagicMock(),
+            get_ray_data=MagicMock(return_value=[]),
+            parent_widget=None,
+        )
+        controller.file_manager = MagicMock()
+        controller._is_modified = True
+
+        def load(progress):
+            controller._do_autosave()  # e.g. the timer firing while events are processed
+            controller.file_manager.do_autosave.assert_not_called()
+            return True
+
+        controller._schedule_autosave()
+        assert controller._run_load(load, "Loading")
+        controller.file_manager.do_autosave.assert_not_called()
+        assert controller._autosave_timer.isActive()
+        controller._autosave_timer.stop()
+
 
 class TestCollaborationControllerImport:
     """Verify that CollaborationController can be imported and instantiated."""
@@ -153,6 +181,28 @@ class TestRaytracingControllerImport:
         # Renderer's clear should be called
         mock_renderer.clear.assert_called_once()
 
+    def test_raytracing_controller_suspend_retrace(self, qapp, scene):
+        """Test that retrace requests are ignored while suspended."""
+        from optiverse.ui.controllers.raytracing_controller import RaytracingController
+
+        controller = RaytracingController(
+            scene=scene,
+            ray_renderer=MagicMock(),
+            log_service=MagicMock(),
+            parent=None,
+        )
+
+        controller.schedule_retrace()
+        controller.suspend_retrace()
+        assert not controller._retrace_timer.isActive()
+        controller.schedule_retrace()
+        assert not controller._retrace_timer.isActive()
+
+        controller.resume_retrace()
+        controller.schedule_retrace()
+        assert controller._retrace_timer.isActive()
+        controller._retrace_timer.stop()
+
 
 class TestToolModeControllerImport:
     """Verify that ToolModeController can be imported and instantiated."""
@@ -0,0 +1,33 @@
+"""Fixtures for tests of the scripts in tools/."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parents[2] / "tools"
+
+
+def load_tool(name: str):
+    """Import tools/<name>.py as a module."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, TOOLS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def collab_server():
+    """The tools/collaboration_server.py module."""
+    pytest.importorskip("websockets")
+    return load_tool("collaboration_server")
+
+
+@pytest.fixture(scope="session")
+def collab_load_test(collab_server):
+    """The tools/collaboration_load_test.py module."""
+    return load_tool("collaboration_load_test")
@@ -0,0 +1,41 @@
+"""Tests for the collaboration server load test."""
+
+import asyncio
+
+import pytest
+
+
+def test_load_test_reports_latency_and_delivery(collab_server, collab_load_test, monkeypatch):
+    serve = pytest.importorskip("websockets.asyncio.server").serve
+    monkeypatch.setattr(collab_load_test, "DRAIN_TIME", 0.2)
+    config = collab_load_test.LoadTestConfig(
+        sessions=2, users=3, items=10, rate=40.0, duration=0.5, binary=True
+    )
+
+    async def scenario():
+        server = collab_server.CollaborationServer()
+        async with serve(
+            server.handler, "127.0.0.1", 0, process_request=server.process_request
+        ) as s:
+            port = s.sockets[0].getsockname()[1]
+            return await collab_load_test.run_load_test(f"ws://127.0.0.1:{port}", config)
+
+    report = asyncio.run(scenario())
+    assert report["commands_sent"] > 0
+    # Every command reaches the two other users of its session
+    assert report["expected_deliveries"] == 2 * report["commands_sent"]
+    assert report["delivery_ratio"] == 1.0
+    latency = report["propagation_latency_ms"]
+    assert latency["samples"] == report["deliveries"]
+    assert 0.0 < latency["p50"] <= latency["p99"] <= latency["max"]
+    assert report["ack_latency_ms"]["samples"] == report["commands_sent"]
+    assert report["server_metrics"]["connections"] == 6
+    assert report["errors"] == []
+    assert collab_load_test.check_report(report, max_p99_ms=latency["p99"]) == []
+    assert collab_load_test.check_report(report, max_p99_ms=0.0)
+
+
+def test_parse_mix(collab_load_test):
+    assert collab_load_test.parse_mix("add=1,move=3") == {"add": 0.25, "move": 0.75}
+    with pytest.raises(ValueError):
+        collab_load_test.parse_mix("add=1,remove=1")
@@ -0,0 +1,568 @@
+"""Tests for session rooms, send queues and op logs of the collaboration server."""
+
+import asyncio
+import json
+import os
+import time
+import urllib.request
+
+import pytest
+
+
+class FakeWebSocket:
+    """Records sent messages; send() blocks while `unblocked` is cleared."""
+
+    def __init__(self):
+        self.sent = []
+        self.closed = None
+        self.unblocked = asyncio.Event()
+        self.unblocked.set()
+
+    async def send(self, message):
+        await self.unblocked.wait()
+        # Binary frames are kept as they are
+        self.sent.append(json.loads(message) if isinstance(message, str) else message)
+
+    async def close(self, code=1000, reason=""):
+        self.closed = code
+
+
+def _connect(collab_server, server, session_id, user_id):
+    ws = FakeWebSocket()
+    connection = collab_server.Connection(user_id, ws, server.metrics, server.max_queue)
+    connection.start()
+    server.room(session_id).join(connection)
+    return connection, ws
+
+
+def test_messages_stay_in_their_session(collab_server):
+    async def scenario():
+        server = collab_server.CollaborationServer()
+        a1, ws_a1 = _connect(collab_server, server, "lab-a", "alice")
+        _a2, ws_a2 = _connect(collab_server, server, "lab-a", "bob")
+        _b1, ws_b1 = _connect(collab_server, server, "lab-b", "carol")
+
+        command = {"type": "command", "command": {"action": "move_item"}}
+        server.handle_message(server.room("lab-a"), a1, json.dumps(command))
+        await asyncio.sleep(0.01)
+        return ws_a1, ws_a2, ws_b1
+
+    ws_a1, ws_a2, ws_b1 = asyncio.run(scenario())
+    assert ws_a2.sent == [{"type": "command", "command": {"action": "move_item"}, "seq": 1}]
+    assert ws_a1.sent == [{"type": "command:ack", "seq": 1}]
+    assert ws_b1.sent == []
+
+
+def test_slow_consumer_is_evicted_without_stalling_others(collab_server):
+    async def scenario():
+        server = collab_server.CollaborationServer(max_queue=4)
+        sender, _ = _connect(collab_server, server, "s", "sender")
+        _slow, ws_slow = _connect(collab_server, server, "s", "slow")
+        _fast, ws_fast = _connect(collab_server, server, "s", "fast")
+        ws_slow.unblocked.clear()
+
+        for i in range(10):
+            message = json.dumps({"type": "command", "command": {"n": i}})
+            server.handle_message(server.room("s"), sender, message)
+            await asyncio.sleep(0)  # As the connection handler does
+        await asyncio.sleep(0.01)
+        return server, ws_slow, ws_fast
+
+    server, ws_slow, ws_fast = asyncio.run(scenario())
+    assert [m["command"]["n"] for m in ws_fast.sent] == list(range(10))
+    assert ws_slow.closed == collab_server.CLOSE_SLOW_CONSUMER
+    assert server.metrics.evictions == 1
+
+
+def test_metrics_report_latency_and_queue_depth(collab_server):
+    async def scenario():
+        server = collab_server.CollaborationServer()
+        sender, _ = _connect(collab_server, server, "s", "sender")
+        _stuck, ws_stuck = _connect(collab_server, server, "s", "stuck")
+        _ok, _ = _connect(collab_server, server, "s", "ok")
+        ws_stuck.unblocked.clear()
+        for _ in range(3):
+            server.handle_message(server.room("s"), sender, json.dumps({"type": "command"}))
+        await asyncio.sleep(0.01)
+        return server.metrics_snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot["rooms"] == 1
+    assert snapshot["connections"] == 3
+    # Three commands to "ok" and three acks to the sender
+    assert snapshot["messages_sent"] == 6
+    # The stuck client's sender holds one message, two are queued
+    assert snapshot["queue_depth_max"] == 2
+    assert snapshot["broadcast_latency_ms"]["max"] >= 0.0
+
+
+def test_server_end_to_end(collab_server):
+    serve = pytest.importorskip("websockets.asyncio.server").serve
+    connect = pytest.importorskip("websockets.asyncio.client").connect
+
+    async def scenario():
+        server = collab_server.CollaborationServer()
+        async with serve(
+            server.handler, "127.0.0.1", 0, process_request=server.process_request
+        ) as s:
+            port = s.sockets[0].getsockname()[1]
+            url = f"ws://127.0.0.1:{port}/ws"
+            async with (
+                connect(f"{url}/one/alice") as alice,
+                connect(f"{url}/one/bob") as bob,
+                connect(f"{url}/two/carol") as carol,
+            ):
+                ack = json.loads(await alice.recv())
+                assert ack["type"] == "connection:ack" and ack["is_host"]
+                assert json.loads(await bob.recv())["users"] == [
+                    {"user_id": "alice"},
+                    {"user_id": "bob"},
+                ]
+                assert json.loads(await carol.recv())["is_host"]
+
+                await bob.send(json.dumps({"type": "command", "command": {"action": "x"}}))
+                messages = [json.loads(await alice.recv()) for _ in range(2)]
+                assert [m["type"] for m in messages] == ["user:joined", "command"]
+                assert messages[1]["seq"] == 1
+                assert json.loads(await bob.recv()) == {"type": "command:ack", "seq": 1}
+
+                # Joiners fetch the snapshot with the ops after it
+                async with connect(f"{url}/one/dave") as dave:
+                    assert json.loads(await dave.recv())["seq"] == 1
+                    await dave.send(json.dumps({"type": "sync:request"}))
+                    state = json.loads(await dave.recv())
+                    assert state["type"] == "sync:full_state"
+                    assert state["seq"] == 0
+                    assert [op["seq"] for op in state["ops"]] == [1]
+
+                metrics = await asyncio.to_thread(
+                    lambda: json.load(urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics"))
+                )
+                assert metrics["rooms"] == 2
+                assert metrics["connections"] == 3
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(carol.recv(), 0.1)
+
+                # Binary frames after negotiating them
+                hello = {"type": "wire:hello", "encodings": ["json"], "compression": ["zlib"]}
+                await carol.send(json.dumps(hello))
+                assert json.loads(await carol.recv())["type"] == "wire:ack"
+                await carol.send(collab_server.encode_message({"type": "ping"}, ("json", "zlib")))
+                pong = await carol.recv()
+                assert isinstance(pong, bytes)
+                assert collab_server.decode_message(pong)["type"] == "pong"
+
+    asyncio.run(scenario())
+
+
+def _command(action, item_id, **data):
+    return {
+        "type": "command",
+        "command": {"action": action, "item_type": "lens", "item_id": item_id, "data": data},
+    }
+
+
+def test_op_log_snapshots_and_materializes_state(collab_server):
+    log = collab_server.OpLog(snapshot_interval=3)
+    log.append(_command("add_item", "a", x_mm=0.0, name="L1"))
+    log.append(_command("add_item", "b", x_mm=5.0))
+    assert log.snapshot_seq == 0
+    log.append(_command("move_item", "a", x_mm=10.0))
+    # Folded into a snapshot after three ops
+    assert log.snapshot_seq == 3
+    assert log.tail() == []
+    log.append(_command("remove_item", "b"))
+    log.append(_command("update_item", "a", name="L2"))
+
+    items = log.state()["items"]
+    assert items == [
+        {"x_mm": 10.0, "name": "L2", "uuid": "a", "item_type": "lens"},
+    ]
+    assert [op["seq"] for op in log.tail()] == [4, 5]
+
+    # A host full state replaces the log
+    seq = log.reset({"items": [], "version": 7})
+    assert seq == 6
+    assert log.ops_since(5) is None
+    assert log.ops_since(6) == []
+
+
+def test_op_log_delta_falls_back_when_gap_too_large(collab_server):
+    log = collab_server.OpLog(snapshot_interval=10, max_ops=20)
+    for i in range(30):
+        log.append(_command("move_item", "a", x_mm=float(i)))
+    assert [op["seq"] for op in log.ops_since(27)] == [28, 29, 30]
+    # Ops 1-10 are no longer logged
+    assert log.ops_since(5) is None
+    assert log.ops_since(20, max_ops=5) is None
+    # Ahead of the log (ops lost in a server restart)
+    assert log.ops_since(31) is None
+
+
+def test_sync_since_sends_missed_ops_or_snapshot(collab_server, monkeypatch):
+    monkeypatch.setattr(collab_server, "MAX_DELTA_OPS", 5)
+
+    async def scenario():
+        server = collab_server.CollaborationServer()
+        room = server.room("s")
+        host, _ = _connect(collab_server, server, "s", "host")
+        client, ws = _connect(collab_server, server, "s", "client")
+        room.log = collab_server.OpLog(snapshot_interval=4)
+        server.handle_message(room, host, json.dumps({"type": "sync:full_state", "state": {}}))
+        for i in range(8):
+            server.handle_message(room, host, json.dumps(_command("add_item", str(i))))
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        ws.sent.clear()
+
+        server.handle_message(room, client, json.dumps({"type": "sync:since", "since": 7}))
+        server.handle_message(room, client, json.dumps({"type": "sync:since", "since": 2}))
+        await asyncio.sleep(0.01)
+        return server, ws.sent
+
+    server, (delta, snapshot) = asyncio.run(scenario())
+    assert delta["type"] == "sync:ops"
+    assert delta["seq"] == 9
+    assert [op["command"]["item_id"] for op in delta["ops"]] == ["6", "7"]
+
+    # Too far behind: snapshot after op 9 (state, then 8 adds) with no tail
+    assert snapshot["type"] == "sync:full_state"
+    assert snapshot["seq"] == 9
+    assert snapshot["ops"] == []
+    assert len(snapshot["state"]["items"]) == 8
+    assert server.metrics.delta_syncs == 1
+    assert server.metrics.snapshot_syncs == 1
+
+
+def _state(items):
+    return {
+        "items": [
+            {
+                "uuid": f"item-{i}",
+                "item_type": "lens",
+                "x_mm": float(i),
+                "interfaces": [{"x1_mm": -5.0, "x2_mm": 5.0, "element_type": "lens"}],
+            }
+            for i in range(items)
+        ]
+    }
+
+
+def test_wire_hello_switches_client_to_binary_frames(collab_server):
+    async def scenario():
+        server = collab_server.CollaborationServer()
+        room = server.room("s")
+        host, _ = _connect(collab_server, server, "s", "host")
+        binary, ws_binary = _connect(collab_server, server, "s", "binary")
+        _legacy, ws_legacy = _connect(collab_server, server, "s", "legacy")
+
+        hello = {"type": "wire:hello", "encodings": ["json"], "compression": ["zlib"]}
+        server.handle_message(room, binary, json.dumps(hello))
+        state = {"type": "sync:full_state", "state": _state(50)}
+        server.handle_message(room, host, json.dumps(state))
+        # Binary frames from the client are accepted as well
+        command = collab_server.encode_message(_command("add_item", "x"), binary.wire)
+        server.handle_message(room, binary, command)
+        await asyncio.sleep(0.01)
+        return server, ws_binary.sent, ws_legacy.sent
+
+    server, binary_sent, legacy_sent = asyncio.run(scenario())
+    # The ack is the last text frame
+    assert binary_sent[0] == {"type": "wire:ack", "encoding": "json", "compression": "zlib"}
+    full_state, ack = binary_sent[1:]
+    assert full_state[0] == collab_server.WIRE_ENCODINGS["json"] | collab_server.FRAME_ZLIB
+    decoded = collab_server.decode_message(full_state)
+    assert decoded["seq"] == 1 and len(decoded["state"]["items"]) == 50
+    assert collab_server.decode_message(ack) == {"type": "command:ack", "seq": 2}
+
+    legacy_state, legacy_command = legacy_sent
+    assert legacy_state["state"]["items"] == decoded["state"]["items"]
+    assert legacy_command["command"]["item_id"] == "x"
+    assert len(full_state) * 5 < len(json.dumps(legacy_state))
+    assert server.metrics_snapshot()["bytes_sent"] > 0
+
+
+def test_wire_hello_without_common_encoding_keeps_json(collab_server):
+    async def scenario():
+        server = collab_server.CollaborationServer()
+        client, ws = _connect(collab_server, server, "s", "client")
+        hello = {"type": "wire:hello", "encodings": ["cbor"], "compression": []}
+        server.handle_message(server.room("s"), client, json.dumps(hello))
+        server.handle_message(server.room("s"), client, json.dumps({"type": "ping"}))
+        await asyncio.sleep(0.01)
+        return client, ws.sent
+
+    client, sent = asyncio.run(scenario())
+    assert client.wire is None
+    assert [m["type"] for m in sent] == ["pong"]
+
+
+@pytest.mark.parametrize("encoding", ["json", "msgpack"])
+def test_wire_format_matches_client(collab_server, encoding):
+    if encoding == "msgpack":
+        pytest.importorskip("msgpack")
+    from optiverse.services import wire_format
+
+    for message in ({"type": "ping"}, {"type": "sync:full_state", "state": _state(40)}):
+        client_frame = wire_format.encode_message(message, encoding, "zlib")
+        server_frame = collab_server.encode_message(message, (encoding, "zlib"))
+        assert client_frame == server_frame
+        assert collab_server.decode_message(client_frame) == message
+        assert wire_format.decode_message(server_frame) == message
+
+
+def _persisted_session(collab_server, data_dir, commands, snapshot_interval=200):
+    """Run a session of the host, then stop the server."""
+
+    async def scenario():
+        server = collab_server.CollaborationServer(data_dir=data_dir)
+        room = server.room("lab/1")
+        host, _ = _connect(collab_server, server, "lab/1", "host")
+        room.log = collab_server.OpLog(snapshot_interval)
+        state = {"type": "sync:full_state", "state": {"items": [], "version": 3}}
+        server.handle_message(room, host, json.dumps(state))
+        for i in range(commands):
+            server.handle_message(room, host, json.dumps(_command("add_item", str(i), x_mm=i)))
+        await server.store.flush()
+        return server
+
+    server = asyncio.run(scenario())
+    server.store.close()
+    return server
+
+
+def test_sessions_survive_restart(collab_server, tmp_path):
+    old = _persisted_session(collab_server, tmp_path, commands=6, snapshot_interval=4)
+    # Snapshots at #1 (host state) and #5; the log is fsynced before the
+    # second one and at the end of the batch
+    assert old.metrics.snapshots_saved == 2
+    assert old.metrics.wal_fsyncs == 2
+    assert old.metrics.wal_ops == 6
+
+    server = collab_server.CollaborationServer(data_dir=tmp_path)
+    room = server.rooms["lab/1"]
+    assert room.host == "host"
+    assert (room.log.seq, room.log.snapshot_seq) == (7, 5)
+    assert room.log.state()["items"] == old.rooms["lab/1"].log.state()["items"]
+    assert [op["command"]["item_id"] for op in room.log.ops_since(5)] == ["4", "5"]
+    assert os.listdir(tmp_path) == ["session-lab%2F1"]
+
+
+def test_creator_reclaims_hosting_of_restored_session(collab_server, tmp_path):
+    _persisted_session(collab_server, tmp_path, commands=1)
+    assert collab_server.requests_host("/ws/lab%2F1/alice?role=host")
+    assert not collab_server.requests_host("/ws/lab%2F1/alice")
+
+    async def scenario():
+        server = collab_server.CollaborationServer(data_dir=tmp_path)
+        room = server.rooms["lab/1"]
+        results = []
+        for user_id, claim_host in [("bob", False), ("alice", True), ("carol", True)]:
+            connection = collab_server.Connection(
+                user_id, FakeWebSocket(), server.metrics, server.max_queue
+            )
+            connection.start()
+            results.append(room.join(connection, claim_host=claim_host))
+        server.store.close()
+        return room, results
+
+    room, results = asyncio.run(scenario())
+    # The recorded host is offline after the restart, so the creator takes
+    # over; a later creator does not replace the connected host
+    assert results == [False, True, False]
+    assert room.host == "alice"
+
+
+def test_restore_stops_at_damaged_log_line(collab_server, tmp_path):
+    _persisted_session(collab_server, tmp_path, commands=3)
+    wal = tmp_path / "session-lab%2F1" / collab_server.WAL_FILE
+    with open(wal, "a") as f:
+        f.write('{"type": "command", "se')  # Torn by a crash
+
+    room = collab_server.CollaborationServer(data_dir=tmp_path).rooms["lab/1"]
+    assert room.log.seq == 4
+    assert len(room.log.state()["items"]) == 3
+
+
+def test_expired_sessions_are_deleted(collab_server, tmp_path):
+    _persisted_session(collab_server, tmp_path, commands=1)
+    session_dir = tmp_path / "session-lab%2F1"
+
+    # Still within the retention time: restored, and pruned once it expires
+    server = collab_server.CollaborationServer(data_dir=tmp_path, retention_days=1)
+    assert "lab/1" in server.rooms
+    assert server.prune_sessions(now=time.time() + 2 * 86400) == ["lab/1"]
+    server.store.close()
+    assert not session_dir.exists()
+
+    _persisted_session(collab_server, tmp_path, commands=1)
+    old = time.time() - 2 * 86400
+    for path in session_dir.iterdir():
+        os.utime(path, (old, old))
+    assert collab_server.CollaborationServer(data_dir=tmp_path, retention_days=1).rooms == {}
+    assert not session_dir.exists()
+
+
+def test_hash_ring_is_balanced_and_stable(collab_server):
+    sessions = [f"session-{i}" for i in range(3000)]
+    ring = collab_server.HashRing(range(3))
+    owners = {s: ring.node_for(s) for s in sessions}
+    counts = [list(owners.values()).count(node) for node in range(3)]
+    assert min(counts) > 600
+
+    # A fourth worker only takes over sessions; the others stay put
+    bigger = collab_server.HashRing(range(4))
+    moved = [s for s in sessions if bigger.node_for(s) != owners[s]]
+    assert all(bigger.node_for(s) == 3 for s in moved)
+    assert 400 < len(moved) < 1200
+
+
+def test_router_forwards_sessions_to_their_workers(collab_server):
+    serve = pytest.importorskip("websockets.asyncio.server").serve
+    connect = pytest.importorskip("websockets.asyncio.client").connect
+
+    async def scenario():
+        workers = [collab_server.CollaborationServer() for _ in range(2)]
+        async with (
+            serve(
+                workers[0].handler, "127.0.0.1", 0, process_request=workers[0].process_request
+            ) as s0,
+            serve(
+                workers[1].handler, "127.0.0.1", 0, process_request=workers[1].process_request
+            ) as s1,
+        ):
+            ports = [s.sockets[0].getsockname()[1] for s in (s0, s1)]
+            router = collab_server.ShardRouter(ports)
+            front = await asyncio.start_server(router.handle, "127.0.0.1", 0)
+            port = front.sockets[0].getsockname()[1]
+            sessions = [f"lab-{i}" for i in range(6)]
+            async with front:
+                for session in sessions:
+                    url = f"ws://127.0.0.1:{port}/ws/{session}"
+                    async with connect(f"{url}/alice") as alice, connect(f"{url}/bob") as bob:
+                        await alice.recv()
+                        await bob.recv()
+                        await bob.send(json.dumps(_command("add_item", "a")))
+                        assert json.loads(await alice.recv())["type"] == "user:joined"
+                        assert json.loads(await alice.recv())["command"]["item_id"] == "a"
+                metrics = await router.metrics()
+        return workers, router, sessions, metrics
+
+    workers, router, sessions, metrics = asyncio.run(scenario())
+    for session in sessions:
+        owner = router.worker_for(session)
+        assert session in workers[owner].rooms
+        assert session not in workers[1 - owner].rooms
+    assert sum(router.routed) == 2 * len(sessions)
+    assert metrics["workers_up"] == 2
+    assert metrics["messages_received"] == len(sessions)
+    assert [w["routed"] for w in metrics["workers"]] == router.routed
+
+
+def test_workers_restore_only_their_sessions(collab_server, tmp_path):
+    for i in range(8):
+
+        async def scenario(session=f"lab-{i}"):
+            server = collab_server.CollaborationServer(data_dir=tmp_path)
+            host, _ = _connect(collab_server, server, session, "host")
+            server.handle_message(server.room(session), host, json.dumps(_command("add_item", "a")))
+            await server.store.flush()
+            server.store.close()
+
+        asyncio.run(scenario())
+
+    shards = [collab_server.CollaborationServer(data_dir=tmp_path, shard=(i, 2)) for i in range(2)]
+    ring = collab_server.HashRing(range(2))
+    for index, server in enumerate(shards):
+        owned = {f"lab-{i}" for i in range(8) if ring.node_for(f"lab-{i}") == index}
+        assert set(server.rooms) == owned
+    assert len(shards[0].rooms) + len(shards[1].rooms) == 8
+
+
+def test_merge_metrics(collab_server):
+    merged = collab_server.merge_metrics(
+        [
+            {"connections": 2, "queue_depth_max": 3, "broadcast_latency_ms": {"p99": 1.5}},
+            {"connections": 5, "queue_depth_max": 1, "broadcast_latency_ms": {"p99": 4.0}},
+        ]
+    )
+    assert merged == {"connections": 7, "queue_depth_max": 3, "broadcast_latency_ms": {"p99": 4.0}}
+
+
+def test_traces_are_coalesced_and_sent_to_subscribers(collab_server):
+    traced = []
+
+    def trace(state):
+        traced.append(len(state["items"]))
+        time.sleep(0.02)
+        return {"n": len(state["items"])}
+
+    async def scenario():
+        server = collab_server.CollaborationServer(trace=trace)
+        room = server.room("s")
+        host, ws_host = _connect(collab_server, server, "s", "host")
+        _other, ws_other = _connect(collab_server, server, "s", "other")
+        server.handle_message(room, host, json.dumps({"type": "trace:subscribe"}))
+        for i in range(5):
+            server.handle_message(room, host, json.dumps(_command("add_item", str(i))))
+            await asyncio.sleep(0)
+        for _ in range(50):
+            if (room.trace or {}).get("seq") == room.log.seq:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+
+        # A late subscriber gets the current trace without tracing again
+        late, ws_late = _connect(collab_server, server, "s", "late")
+        server.handle_message(room, late, json.dumps({"type": "trace:subscribe"}))
+        await asyncio.sleep(0.01)
+        return server, ws_host, ws_other, ws_late
+
+    server, ws_host, ws_other, ws_late = asyncio.run(scenario())
+    # Ops arriving during a trace are traced together
+    assert traced[-1] == 5 and len(traced) < 5
+    results = [m for m in ws_host.sent if m["type"] == "trace:result"]
+    assert results[-1]["seq"] == 5 and results[-1]["rays"] == {"n": 5}
+    assert not any(m["type"] == "trace:result" for m in ws_other.sent)
+    assert [(m["seq"], m["rays"]) for m in ws_late.sent] == [(5, {"n": 5})]
+    assert server.metrics_snapshot()["traces"] == len(traced)
+
+
+def test_failed_trace_is_counted(collab_server):
+    def trace(state):
+        raise RuntimeError("no sources")
+
+    async def scenario():
+        server = collab_server.CollaborationServer(trace=trace)
+        room = server.room("s")
+        host, ws = _connect(collab_server, server, "s", "host")
+        server.handle_message(room, host, json.dumps({"type": "trace:subscribe"}))
+        await asyncio.sleep(0.05)
+        return server, ws
+
+    server, ws = asyncio.run(scenario())
+    assert server.metrics.trace_errors == 1
+    assert ws.sent == []
+
+
+def test_server_traces_session_with_optiverse(collab_server):
+    pytest.importorskip("optiverse.integration.shared_trace")
+    from optiverse.integration import decode_trace_result
+
+    trace = collab_server.load_tracer()
+    state = {
+        "items": [
+            {"uuid": "src", "item_type": "source", "x_mm": -100.0, "n_rays": 3},
+            {
+                "uuid": "block",
+                "item_type": "component",
+                "x_mm": 50.0,
+                "angle_deg": 90.0,
+                "interfaces": [{"x1_mm": -20.0, "x2_mm": 20.0, "element_type": "beam_block"}],
+            },
+        ]
+    }
+    result = decode_trace_result(json.loads(json.dumps(trace(state))))
+    assert len(result.paths) == 3
+    for path in result.paths:
+        assert path.points[-1][0] == pytest.approx(50.0, abs=1e-3)
@@ -0,0 +1,161 @@
+"""Test background library loading and lazy thumbnails in the library dock."""
+
+import json
+import os
+import threading
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from optiverse.ui.controllers import library_manager as library_manager_module
+from optiverse.ui.controllers.library_manager import LibraryManager
+from optiverse.ui.widgets.library_tree import THUMBNAIL_PATH_ROLE, LibraryTree
+
+
+def _write_library(root, n, category="mirrors", with_image=False):
+    for i in range(n):
+        folder = root / f"part_{i:03d}"
+        folder.mkdir(parents=True)
+        data = {"name": f"{root.name} {i}", "category": category, "object_height_mm": 25.4}
+        if with_image:
+            image = QtGui.QImage(256, 256, QtGui.QImage.Format.Format_RGB32)
+            image.fill(QtGui.QColor("red"))
+            image.save(str(folder / "part.png"))
+            data["image_path"] = "part.png"
+        (folder / "component.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+def _make_manager(qtbot, monkeypatch, tmp_path, roots):
+    import optiverse.platform.paths as paths
+
+    index_dir = tmp_path / "index"
+    index_dir.mkdir()
+    monkeypatch.setattr(paths, "get_all_custom_library_roots", lambda: roots)
+    monkeypatch.setattr(paths, "library_index_dir", lambda: str(index_dir))
+
+    parent = QtWidgets.QWidget()
+    qtbot.addWidget(parent)
+    tree = LibraryTree(parent)
+    manager = LibraryManager(
+        library_tree=tree,
+        storage_service=None,
+        log_service=None,
+        get_dark_mode=lambda: False,
+        get_style=parent.style,
+        parent_widget=parent,
+    )
+    return manager, tree
+
+
+def _names(tree, category):
+    for i in range(tree.topLevelItemCount()):
+        item = tree.topLevelItem(i)
+        if item.text(0) == category:
+            return {item.child(j).text(0) for j in range(item.childCount())}
+    return set()
+
+
+def _lab_names(n):
+    return {f"lab {i}" for i in range(n)}
+
+
+def test_custom_libraries_stream_into_tree(qtbot, monkeypatch, tmp_path):
+    monkeypatch.setattr(library_manager_module, "BATCH_SIZE", 5)
+    roots = [tmp_path / "lab", tmp_path / "vendor"]
+    _write_library(roots[0], 12)
+    _write_library(roots[1], 3, category="misc")
+    manager, tree = _make_manager(qtbot, monkeypatch, tmp_path, roots)
+
+    templates = manager.populate()
+
+    # Built-in components (and toolbar templates) are available immediately
+    assert {"lens", "mirror", "beamsplitter"} <= set(templates)
+    assert manager.is_loading
+
+    qtbot.waitUntil(lambda: not manager.is_loading, timeout=5000)
+    assert {f"lab {i}" for i in range(12)} <= _names(tree, "Mirrors")
+    assert {f"vendor {i}" for i in range(3)} <= _names(tree, "Misc")
+
+    # Categories keep their display order regardless of arrival order
+    order = [tree.topLevelItem(i).text(0) for i in range(tree.topLevelItemCount())]
+    ranks = [library_manager_module.CATEGORY_ORDER.index(name) for name in order]
+    assert ranks == sorted(ranks)
+
+
+def test_batches_arrive_while_root_is_parsed(qtbot, monkeypatch, tmp_path):
+    from optiverse.objects.library_index import LibraryIndex
+
+    monkeypatch.setattr(library_manager_module, "BATCH_SIZE", 5)
+    root = tmp_path / "lab"
+    _write_library(root, 12)
+    # Hold back the folders after the first batch (in scan order)
+    order = [entry.name for entry in os.scandir(root) if entry.is_dir()]
+    held = set(order[5:])
+    release = threading.Event()
+    real_parse = LibraryIndex._parse
+
+    def parse(self, folder):
+        if folder.name in held:
+            release.wait(10)
+        return real_parse(self, folder)
+
+    monkeypatch.setattr(LibraryIndex, "_parse", parse)
+    manager, tree = _make_manager(qtbot, monkeypatch, tmp_path, [root])
+
+    manager.populate()
+    try:
+        qtbot.waitUntil(lambda: len(_names(tree, "Mirrors") & _lab_names(12)) == 5, timeout=5000)
+        assert manager.is_loading
+    finally:
+        release.set()
+    qtbot.waitUntil(lambda: not manager.is_loading, timeout=5000)
+    assert _lab_names(12) <= _names(tree, "Mirrors")
+
+
+def test_repopulate_drops_stale_batches(qtbot, monkeypatch, tmp_path):
+    root = tmp_path / "lab"
+    _write_library(root, 20)
+    manager, tree = _make_manager(qtbot, monkeypatch, tmp_path, [root])
+
+    manager.populate()
+    manager.populate()
+    qtbot.waitUntil(lambda: not manager.is_loading, timeout=5000)
+    qtbot.wait(50)
+
+    # Each custom component appears exactly once
+    mirrors = next(
+        tree.topLevelItem(i)
+        for i in range(tree.topLevelItemCount())
+        if tree.topLevelItem(i).text(0) == "Mirrors"
+    )
+    names = [mirrors.child(j).text(0) for j in range(mirrors.childCount())]
+    assert len(names) == len(set(names))
+
+
+def test_thumbnails_decode_only_when_visible(qtbot, monkeypatch, tmp_path):
+    root = tmp_path / "lab"
+    _write_library(root, 40, with_image=True)
+    manager, tree = _make_manager(qtbot, monkeypatch, tmp_path, [root])
+    tree.resize(300, 300)
+    tree.show()
+
+    manager.populate()
+    qtbot.waitUntil(lambda: not manager.is_loading, timeout=5000)
+    qtbot.wait(50)
+
+    def pending():
+        items = []
+        iterator = QtWidgets.QTreeWidgetItemIterator(tree)
+        while iterator.value() is not None:
+            if iterator.value().data(0, THUMBNAIL_PATH_ROLE):
+                items.append(iterator.value())
+            iterator += 1
+        return items
+
+    before = len(pending())
+    assert before > 0
+    # Items in the viewport got their thumbnails
+    top = tree.itemAt(QtCore.QPoint(0, 0))
+    assert top is not None and not top.data(0, THUMBNAIL_PATH_ROLE)
+
+    tree.scrollToBottom()
+    qtbot.waitUntil(lambda: len(pending()) < before, timeout=2000)
@@ -0,0 +1,37 @@
+"""Tests for the parameter sweep plot."""
+
+from __future__ import annotations
+
+import numpy as np
+from PyQt6 import QtWidgets
+
+from optiverse.ui.views.sweep_dialog import SweepDialog
+from optiverse.ui.widgets import LinePlot
+
+
+def test_line_plot_range_covers_negative_values(qapp):
+    plot = LinePlot()
+    plot.set_data(np.array([-2.0, -1.0, 0.0, 1.0]), np.array([-3.0, -0.5, np.nan, 2.0]))
+
+    assert plot.data_range() == (-2.0, 1.0, -3.0, 2.0)
+    assert not plot.grab().isNull()
+
+
+def test_line_plot_without_finite_samples_has_no_range(qapp):
+    plot = LinePlot()
+    assert plot.data_range() is None
+    plot.set_data(np.array([0.0, 1.0]), np.array([np.nan, np.nan]))
+    assert plot.data_range() is None
+
+
+def test_sweep_plots_signed_metric_over_parameter_values(qapp):
+    dialog = SweepDialog(QtWidgets.QGraphicsScene())
+    values = np.linspace(10.0, 20.0, 5)
+    result = np.array([-4.0, -2.0, 0.0, 1.5, -1.0])
+    dialog._values = values
+
+    dialog._on_completed(result)
+
+    assert dialog.plot.data_range() == (10.0, 20.0, -4.0, 1.5)
+    assert dialog.copy_button.isEnabled()
+    dialog.close()
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Load test for tools/collaboration_server.py.
+
+Simulates --sessions sessions of --users users each. The first user of a
+session is its host and uploads a canvas of --items components; the others
+fetch it with sync:request, as the application does. Then every user sends
+commands (adds, moves and updates, mixed as given by --mix) at --rate
+commands per second on average (Poisson arrivals) for --duration seconds.
+
+Measured:
+- propagation latency: from a user sending a command to another user of
+  the session receiving it (commands carry their send time, which the
+  server relays untouched; all clients run in this process)
+- ack latency: from sending a command to its command:ack (a round trip)
+- throughput: commands sent and deliveries received per second, and the
+  delivery ratio (deliveries / commands x other users of the session)
+
+Without --url a server is started on a free local port for the test (with
+--server-workers worker processes, see --workers of the server). The
+report, including the server's /metrics, is written as JSON (--report). The
+exit code is 1 if the p99 propagation latency exceeds --max-p99-ms or the
+delivery ratio is below --min-delivery, so the test can gate CI:
+
+    python tools/collaboration_load_test.py --sessions 4 --users 5 --duration 10 \\
+        --report load-report.json --max-p99-ms 250
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from dataclasses import asdict, dataclass, field
+
+# Seconds to wait for a spawned server to accept connections
+SERVER_START_TIMEOUT = 10.0
+
+# Seconds to wait for in-flight deliveries after the senders stop
+DRAIN_TIME = 1.0
+
+DEFAULT_MIX = "add=0.1,move=0.7,update=0.2"
+
+ACTIONS = {"add": "add_item", "move": "move_item", "update": "update_item"}
+
+
+@dataclass
+class LoadTestConfig:
+    """Parameters of a load test run."""
+
+    sessions: int = 2
+    users: int = 4
+    items: int = 50
+    # Average commands per second per user
+    rate: float = 10.0
+    duration: float = 10.0
+    # Share of each action (keys of ACTIONS)
+    mix: dict = field(default_factory=lambda: parse_mix(DEFAULT_MIX))
+    # Negotiate binary frames (see wire:hello in the server)
+    binary: bool = False
+    seed: int = 0
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """
+    Parse an action mix such as "add=0.1,move=0.7,update=0.2".
+
+    Raises:
+        ValueError: If an action is unknown or the shares do not add up to a positive total
+    """
+    mix = {}
+    for part in text.split(","):
+        name, _, share = part.partition("=")
+        name = name.strip()
+        if name not in ACTIONS:
+            raise ValueError(f"Unknown action {name!r} (expected {', '.join(ACTIONS)})")
+        mix[name] = float(share)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("The action shares must add up to more than 0")
+    return {name: share / total for name, share in mix.items()}
+
+
+def percentiles(samples: list[float]) -> dict:
+    """p50/p95/p99/max of latencies in seconds, in ms."""
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        if not ordered:
+            return 0.0
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+    return {
+        "samples": len(ordered),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+def component_data(index: int, rng: random.Random) -> dict:
+    """Item data resembling a library lens with one interface."""
+    return {
+        "x_mm": rng.uniform(-500.0, 500.0),
+        "y_mm": rng.uniform(-300.0, 300.0),
+        "angle_deg": rng.choice([0.0, 45.0, 90.0]),
+        "object_height_mm": 25.4,
+        "mm_per_pixel": 0.0254,
+        "name": f"Lens {index}",
+        "image_path": "objects/library/lens_1_inch/images/lens_1_inch.png",
+        "reference_line_mm": [0.0, -12.7, 0.0, 12.7],
+        "interfaces": [
+            {
+                "x1_mm": 0.0,
+                "y1_mm": -12.7,
+                "x2_mm": 0.0,
+                "y2_mm": 12.7,
+                "element_type": "lens",
+                "name": "",
+                "efl_mm": 100.0,
+            }
+        ],
+        "category": "lenses",
+        "notes": "",
+        "locked": False,
+        "z_value": 0.0,
+    }
+
+
+@dataclass
+class LoadStats:
+    """Measurements of a run."""
+
+    sent: int = 0
+    delivered: int = 0
+    # Deliveries if every command reached every other user of its session
+    expected: int = 0
+    propagation: list = field(default_factory=list)
+    ack: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    measuring: bool = False
+
+
+class Session:
+    """Items of one simulated session, shared by its users."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.items: list[str] = []
+        self.versions: dict[str, int] = {}
+        self.users: list[User] = []
+
+
+class User:
+    """One simulated client connection."""
+
+    def __init__(self, session: Session, user_id: str, stats: LoadStats, codec):
+        self.session = session
+        self.user_id = user_id
+        self.stats = stats
+        self.codec = codec
+        self.ws = None
+        self.wire = None
+        self.synced = asyncio.Event()
+        # Send times of commands waiting for their ack (acks come in order)
+        self._unacked: list[float] = []
+
+    @property
+    def is_host(self) -> bool:
+        return self.session.users[0] is self
+
+    async def send(self, data: dict) -> None:
+        data["user_id"] = self.user_id
+        await self.ws.send(self.codec.encode_message(data, self.wire))
+
+    async def receive(self) -> None:
+        """Record the latencies of received commands and acks until closed."""
+        try:
+            async for frame in self.ws:
+                data = self.codec.decode_message(frame)
+                now = time.perf_counter()
+                msg_type = data.get("type")
+                if msg_type == "command":
+                    sent_at = data.get("sent_at")
+                    if sent_at is not None and self.stats.measuring:
+                        self.stats.propagation.append(now - sent_at)
+                        self.stats.delivered += 1
+                elif msg_type == "command:ack":
+                    if self._unacked:
+                        sent_at = self._unacked.pop(0)
+                        if self.stats.measuring:
+                            self.stats.ack.append(now - sent_at)
+                elif msg_type == "sync:full_state":
+                    self.synced.set()
+                elif msg_type == "wire:ack":
+                    self.wire = (data["encoding"], data.get("compression"))
+        except Exception as e:  # Closed by the server (e.g. evicted)
+            self.stats.errors.append(f"{self.user_id}: {e}")
+
+    async def run_commands(self, config: LoadTestConfig, rng: random.Random, stop_at: float):
+        """Send commands at config.rate per second until stop_at."""
+        actions = list(config.mix)
+        weights = [config.mix[a] for a in actions]
+        while True:
+            await asyncio.sleep(rng.expovariate(config.rate))
+            if time.perf_counter() >= stop_at:
+                return
+            action = rng.choices(actions, weights)[0]
+            items = self.session.items
+            if action == "add" or not items:
+                item_id = f"{self.user_id}-{len(items)}"
+                items.append(item_id)
+                data = component_data(len(items), rng)
+                action = "add"
+            elif action == "move":
+                item_id = rng.choice(items)
+                data = {
+                    "x_mm": rng.uniform(-500.0, 500.0),
+                    "y_mm": rng.uniform(-300.0, 300.0),
+                    "angle_deg": rng.uniform(0.0, 360.0),
+                }
+            else:
+                item_id = rng.choice(items)
+                data = {"name": f"Lens {rng.randrange(1000)}", "notes": "edited"}
+            command = {
+                "action": ACTIONS[action],
+                "item_type": "lens",
+                "item_id": item_id,
+                "data": data,
+            }
+            if action == "update":
+                base = self.session.versions.get(item_id, 0)
+                self.session.versions[item_id] = base + 1
+                command.update(base_version=base, version=base + 1)
+            sent_at = time.perf_counter()
+            self._unacked.append(sent_at)
+            await self.send({"type": "command", "command": command, "sent_at": sent_at})
+            if self.stats.measuring:
+                self.stats.sent += 1
+                self.stats.expected += len(self.session.users) - 1
+
+
+def _load_codec():
+    """The server module, for its wire format encode/decode functions."""
+    tools_dir = os.path.dirname(os.path.abspath(__file__))
+    if tools_dir not in sys.path:
+        sys.path.insert(0, tools_dir)
+    import collaboration_server
+
+    return collaboration_server
+
+
+async def run_load_test(url: str, config: LoadTestConfig) -> dict:
+    """
+    Run a load test against the server at url (ws://host:port).
+
+    Returns:
+        The report (see write_report())
+    """
+    from websockets.asyncio.client import connect
+
+    codec = _load_codec()
+    rng = random.Random(config.seed)
+    stats = LoadStats()
+    sessions = [Session(f"load-{i}") for i in range(config.sessions)]
+    users = []
+    for session in sessions:
+        for j in range(config.users):
+            user = User(session, f"{session.session_id}-user{j}", stats, codec)
+            session.users.append(user)
+            users.append(user)
+
+    receivers = []
+    try:
+        # Connect and sync: hosts upload their canvas, the others fetch it
+        for user in users:
+            user.ws = await connect(
+                f"{url}/ws/{user.session.session_id}/{user.user_id}", max_size=None
+            )
+            await user.ws.recv()  # connection:ack
+            receivers.append(asyncio.create_task(user.receive()))
+            if config.binary:
+                hello = {"type": "wire:hello", "encodings": ["json"], "compression": ["zlib"]}
+                await user.send(hello)
+            if user.is_host:
+                session = user.session
+                state_items = []
+                for k in range(config.items):
+                    item_id = f"{session.session_id}-item{k}"
+                    session.items.append(item_id)
+                    state_items.append(
+                        {**component_data(k, rng), "uuid": item_id, "item_type": "lens"}
+                    )
+                await user.send({"type": "sync:full_state", "state": {"items": state_items}})
+                user.synced.set()
+            else:
+                await user.send({"type": "sync:request"})
+        await asyncio.wait_for(asyncio.gather(*(u.synced.wait() for u in users)), 30.0)
+
+        # Measure
+        stats.measuring = True
+        stop_at = time.perf_counter() + config.duration
+        await asyncio.gather(
+            *(u.run_commands(config, random.Random(rng.random()), stop_at) for u in users)
+        )
+        await asyncio.sleep(DRAIN_TIME)
+        stats.measuring = False
+        # While the users are still connected
+        server_metrics = await asyncio.to_thread(fetch_server_metrics, url)
+    finally:
+        for user in users:
+            if user.ws is not None:
+                await user.ws.close()
+        for task in receivers:
+            task.cancel()
+        await asyncio.gather(*receivers, return_exceptions=True)
+
+    return {
+        "config": asdict(config),
+        "url": url,
+        "duration_s": config.duration,
+        "commands_sent": stats.sent,
+        "deliveries": stats.delivered,
+        "expected_deliveries": stats.expected,
+        "delivery_ratio": round(stats.delivered / stats.expected, 6) if stats.expected else 1.0,
+        "throughput": {
+            "commands_per_s": round(stats.sent / config.duration, 1),
+            "deliveries_per_s": round(stats.delivered / config.duration, 1),
+        },
+        "propagation_latency_ms": percentiles(stats.propagation),
+        "ack_latency_ms": percentiles(stats.ack),
+        "errors": stats.errors,
+        "server_metrics": server_metrics,
+    }
+
+
+def fetch_server_metrics(url: str) -> dict | None:
+    """The server's /metrics, or None if unavailable."""
+    http_url = url.replace("ws://", "http://", 1).replace("wss://", "https://", 1)
+    try:
+        with urllib.request.urlopen(f"{http_url}/metrics", timeout=5) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return None
+
+
+def start_server(port: int, workers: int = 1) -> subprocess.Popen:
+    """Start tools/collaboration_server.py on localhost and wait until it accepts."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "collaboration_server.py")
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            script,
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"Server did not start within {SERVER_START_TIMEOUT} s")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def format_summary(report: dict) -> str:
+    """Human-readable summary of a report."""
+    propagation = report["propagation_latency_ms"]
+    ack = report["ack_latency_ms"]
+    config = report["config"]
+    return "\n".join(
+        [
+            f"{config['sessions']} session(s) x {config['users']} user(s), "
+            f"{config['rate']:g} commands/s per user for {report['duration_s']:.1f} s",
+            f"Commands sent:     {report['commands_sent']:>8} "
+            f"({report['throughput']['commands_per_s']:.0f}/s)",
+            f"Deliveries:        {report['deliveries']:>8} "
+            f"({report['throughput']['deliveries_per_s']:.0f}/s, "
+            f"ratio {report['delivery_ratio']:.4f})",
+            f"Propagation (ms):  p50 {propagation['p50']:.2f}  p95 {propagation['p95']:.2f}  "
+            f"p99 {propagation['p99']:.2f}  max {propagation['max']:.2f}",
+            f"Ack (ms):          p50 {ack['p50']:.2f}  p95 {ack['p95']:.2f}  "
+            f"p99 {ack['p99']:.2f}  max {ack['max']:.2f}",
+            f"Errors:            {len(report['errors']):>8}",
+        ]
+    )
+
+
+def check_report(report: dict, max_p99_ms=None, min_delivery=1.0) -> list[str]:
+    """Failed thresholds of a report (empty if it passes)."""
+    failures = []
+    p99 = report["propagation_latency_ms"]["p99"]
+    if max_p99_ms is not None and p99 > max_p99_ms:
+        failures.append(f"p99 propagation latency {p99:.2f} ms exceeds {max_p99_ms:g} ms")
+    if report["delivery_ratio"] < min_delivery:
+        failures.append(f"delivery ratio {report['delivery_ratio']:.4f} below {min_delivery:g}")
+    return failures
+
+
+def main(argv=None) -> int:
+    defaults = LoadTestConfig()
+    parser = argparse.ArgumentParser(description="Load test the collaboration server")
+    parser.add_argument("--url", help="Server to test, e.g. ws://host:8765 (default: start one)")
+    parser.add_argument("--sessions", type=int, default=defaults.sessions)
+    parser.add_argument("--users", type=int, default=defaults.users, help="Users per session")
+    parser.add_argument(
+        "--items", type=int, default=defaults.items, help="Items in each host's canvas"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=defaults.rate, help="Commands per second per user"
+    )
+    parser.add_argument("--duration", type=float, default=defaults.duration, help="Seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Action mix (default: {DEFAULT_MIX})")
+    parser.add_argument("--binary", action="store_true", help="Negotiate binary frames")
+    parser.add_argument(
+        "--server-workers", type=int, default=1, help="Worker processes of the started server"
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--report", help="Write the JSON report to this file")
+    parser.add_argument("--max-p99-ms", type=float, help="Fail above this p99 propagation latency")
+    parser.add_argument(
+        "--min-delivery", type=float, default=1.0, help="Fail below this delivery ratio"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    config = LoadTestConfig(
+        sessions=args.sessions,
+        users=args.users,
+        items=args.items,
+        rate=args.rate,
+        duration=args.duration,
+        mix=mix,
+        binary=args.binary,
+        seed=args.seed,
+    )
+
+    server = None
+    url = args.url
+    if url is None:
+        port = _free_port()
+        server = start_server(port, args.server_workers)
+        url = f"ws://127.0.0.1:{port}"
+    try:
+        report = asyncio.run(run_load_test(url.rstrip("/"), config))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    print(format_summary(report))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.report}")
+
+    failures = check_report(report, args.max_p99_ms, args.min_delivery)
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,195 +2,1384 @@
 """
 Simple collaboration server specifically for websockets 15.x
 Designed to work with Qt WebSocket without issues.
+
+Clients connect to ws://host:port/ws/<session_id>/<user_id>. Each session is
+a Room: messages are only relayed between users of the same session.
+Every connection has a bounded send queue drained by its own task, so a
+broadcast only enqueues and one slow client cannot stall the others; a
+client whose queue overflows is disconnected (it resyncs on reconnect).
+
+Every room keeps an operation log: each command gets the next sequence
+number of its session, is broadcast with it ("seq") and acknowledged to its
+sender ("command:ack"). Every SNAPSHOT_INTERVAL ops the log is folded into a
+snapshot of the session state. A reconnecting client sends "sync:since"
+with the last sequence number it applied and receives only the ops it
+missed ("sync:ops"), or the snapshot plus the ops after it
+("sync:full_state" with "seq" and "ops") if the gap is too large. A full
+state from the host replaces the snapshot and starts a new log. The host is
+the first user of a session, or a user creating the session anew
+(/ws/<session_id>/<user_id>?role=host) while the recorded host is not
+connected, e.g. after a restart restored the session.
+
+Messages are JSON text frames unless the client negotiates binary frames:
+it sends "wire:hello" with the encodings and compressions it supports and
+the server answers "wire:ack" with its choice, then sends that client
+binary frames (a header byte with the encoding id and FRAME_ZLIB, then the
+payload; payloads from COMPRESS_MIN_BYTES are zlib-compressed). Clients
+without a hello, and clients of older servers, keep using JSON text. The
+format matches src/optiverse/services/wire_format.py; MessagePack is only
+offered if the msgpack package is installed.
+
+With --data-dir, sessions survive a restart: every op is appended to the
+session's write-ahead log (<data-dir>/session-<id>/wal.jsonl) and every
+snapshot of the op log replaces the session's snapshot.json, which makes
+the ops before it redundant. Appends are batched and fsynced at most every
+--fsync-interval seconds by a writer thread, so a crash loses at most the
+ops of that interval; clients that applied them are ahead of the restored
+log and get the snapshot when they resync. On startup the sessions are
+restored from their snapshots and logs; sessions idle for longer than
+--retention-days are deleted.
+
+With --workers N, the server runs as a supervisor: N worker processes
+each serve the sessions assigned to them by consistent hashing of the
+session ID (HashRing), and the supervisor's front process (ShardRouter)
+accepts the connections and forwards each one to the worker owning its
+session. The front only reads the request line and then copies bytes, so
+encoding and decoding run on as many cores as there are workers. Workers
+that exit are restarted; with --data-dir they share the directory and each
+restores only its own sessions.
+
+With --trace, the server also traces the rays of every session once per op
+(TraceService, using the raytracing engine of optiverse from the source tree
+or an installed package) and sends the result as compact arrays
+("trace:result" with the "seq" of the op it shows) to the clients that
+subscribed with "trace:subscribe". Those clients show remote changes with
+the server's rays instead of all retracing the same scene, and trace
+locally when the result lags behind the ops they applied.
+
+Queue depths, evictions, bytes sent and broadcast latency (enqueue to sent)
+are logged periodically and served as JSON at http://host:port/metrics.
 """
 
 import asyncio
+import bisect
+import hashlib
 import json
 import logging
+import os
+import shutil
 import signal
+import socket
+import subprocess
 import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from urllib.parse import parse_qs, quote, unquote, urlsplit
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-# Store connections and session state
-connections = {}
-session_state = {}  # session_id -> {state: dict, version: int, host: str}
-server = None
+# Messages waiting per connection before it is evicted as a slow consumer
+SEND_QUEUE_SIZE = 256
+
+# Close code for evicted clients (1013: try again later)
+CLOSE_SLOW_CONSUMER = 1013
+
+# Seconds between metrics log lines
+METRICS_INTERVAL = 60.0
+
+# Broadcast latency samples kept for the metrics percentiles
+LATENCY_SAMPLES = 2048
+
+# Ops between snapshots of a session's state
+SNAPSHOT_INTERVAL = 200
+
+# Ops kept per session for delta sync (must exceed SNAPSHOT_INTERVAL)
+OP_LOG_SIZE = 2000
+
+# Clients further behind get the snapshot and its tail instead of the ops
+MAX_DELTA_OPS = 500
+
+# Binary frames: encoding ids, compressed payload flag and threshold (bytes)
+WIRE_ENCODINGS = {"json": 0, "msgpack": 1}
+FRAME_ZLIB = 0x80
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 1
+
+# Persistence (--data-dir): seconds between write-ahead log fsyncs
+FSYNC_INTERVAL = 0.05
 
+# Sessions idle for longer are deleted from the data directory (0 keeps them)
+RETENTION_DAYS = 7.0
 
-async def handler(websocket):
-    """Handle a WebSocket connection."""
-    path = websocket.request.path if hasattr(websocket.request, "path") else websocket.path
-    logger.info(f"New connection: {path}")
+# Seconds between checks for expired sessions
+PRUNE_INTERVAL = 3600.0
 
-    # Parse path
-    parts = path.strip("/").split("/")
+SNAPSHOT_FILE = "snapshot.json"
+WAL_FILE = "wal.jsonl"
+SESSION_DIR_PREFIX = "session-"
+
+# Points per worker on the consistent hash ring (--workers)
+HASH_RING_REPLICAS = 64
+
+# Seconds between checks that the worker processes are running
+WORKER_CHECK_INTERVAL = 1.0
+
+# Seconds to wait for a worker process to accept connections
+WORKER_START_TIMEOUT = 10.0
+
+# Largest HTTP request head the front process reads before routing
+MAX_REQUEST_HEAD = 65536
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def parse_session_path(path: str) -> tuple[str, str] | None:
+    """(session_id, user_id) of a /ws/<session_id>/<user_id> path, or None."""
+    parts = path.split("?", 1)[0].strip("/").split("/")
     if len(parts) < 3 or parts[0] != "ws":
-        await websocket.close(1008, "Invalid path")
-        return
+        return None
+    return parts[1], parts[2]
 
-    session_id = parts[1]
-    user_id = parts[2]
 
-    # Store connection
-    connections[user_id] = websocket
-    logger.info(f"User {user_id} joined session {session_id}")
+def requests_host(path: str) -> bool:
+    """Whether a session path asks to host the session (?role=host)."""
+    return parse_qs(urlsplit(path).query).get("role") == ["host"]
 
-    # Determine if this is the first user (becomes host)
-    is_first_user = (session_id not in session_state) or (
-        session_state[session_id].get("host") is None
-    )
 
-    if is_first_user:
-        session_state[session_id] = {
-            "state": {"items": [], "version": 0, "timestamp": "2025-10-28T12:00:00"},
-            "version": 0,
-            "host": user_id,
-        }
-        logger.info(f"User {user_id} is the host of session {session_id}")
+def _ring_hash(key: str) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent hashing of session IDs onto nodes (worker indices).
+
+    Every node has `replicas` points on the ring and a session belongs to
+    the node of the first point after the session's hash, so a worker added
+    or removed only moves the sessions it takes over or had.
+    """
 
+    def __init__(self, nodes, replicas=HASH_RING_REPLICAS):
+        points = sorted(
+            (_ring_hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas)
+        )
+        self._hashes = [h for h, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key: str):
+        i = bisect.bisect(self._hashes, _ring_hash(key)) % len(self._hashes)
+        return self._nodes[i]
+
+
+def _msgpack():
     try:
-        # Send connection ack
-        await websocket.send(
-            json.dumps(
+        import msgpack
+    except ImportError:
+        return None
+    return msgpack
+
+
+def supported_encodings() -> list[str]:
+    """Binary encodings the server can use, in order of preference."""
+    return ["msgpack", "json"] if _msgpack() is not None else ["json"]
+
+
+def encode_message(data: dict, wire: tuple | None = None) -> str | bytes:
+    """
+    Encode a message for a client.
+
+    Args:
+        data: The message
+        wire: Negotiated (encoding, compression), or None for a JSON text frame
+    """
+    if wire is None:
+        return json.dumps(data)
+    encoding, compression = wire
+    if encoding == "msgpack":
+        payload = _msgpack().packb(data, use_bin_type=True)
+    else:
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    header = WIRE_ENCODINGS[encoding]
+    if compression == "zlib" and len(payload) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(payload, COMPRESS_LEVEL)
+        if len(compressed) < len(payload):
+            payload = compressed
+            header |= FRAME_ZLIB
+    return bytes((header,)) + payload
+
+
+def decode_message(message) -> dict:
+    """
+    Decode a text or binary frame of a client.
+
+    Raises:
+        ValueError: If the frame cannot be decoded
+    """
+    if isinstance(message, str):
+        return json.loads(message)
+    if not message:
+        raise ValueError("Empty binary frame")
+    header = message[0]
+    payload = bytes(message[1:])
+    if header & FRAME_ZLIB:
+        try:
+            payload = zlib.decompress(payload)
+        except zlib.error as e:
+            raise ValueError(f"Corrupt compressed frame: {e}") from e
+    encoding = header & ~FRAME_ZLIB
+    if encoding == WIRE_ENCODINGS["json"]:
+        return json.loads(payload)
+    if encoding == WIRE_ENCODINGS["msgpack"] and _msgpack() is not None:
+        try:
+            return _msgpack().unpackb(payload, raw=False)
+        except Exception as e:
+            raise ValueError(f"Invalid MessagePack frame: {e}") from e
+    raise ValueError(f"Unsupported wire encoding id {encoding}")
+
+
+@dataclass
+class ServerMetrics:
+    """Counters and latency samples of the server."""
+
+    messages_received: int = 0
+    messages_sent: int = 0
+    bytes_sent: int = 0
+    send_errors: int = 0
+    evictions: int = 0
+    delta_syncs: int = 0
+    snapshot_syncs: int = 0
+    # Persistence: ops appended to write-ahead logs, fsyncs and snapshots written
+    wal_ops: int = 0
+    wal_fsyncs: int = 0
+    snapshots_saved: int = 0
+    # Shared raytracing (--trace): traces sent and failed
+    traces: int = 0
+    trace_errors: int = 0
+    # Seconds from enqueueing a message to it being sent
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
+    # Seconds per trace, including the encoding of the result
+    trace_times: deque = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
+
+    def record_latency(self, seconds: float, size: int = 0) -> None:
+        self.messages_sent += 1
+        self.bytes_sent += size
+        self.latencies.append(seconds)
+
+    def record_trace(self, seconds: float) -> None:
+        self.traces += 1
+        self.trace_times.append(seconds)
+
+    def snapshot(self, rooms: dict) -> dict:
+        """Metrics as a JSON-serializable dict."""
+        depths = [c.queue.qsize() for room in rooms.values() for c in room.connections.values()]
+        latencies = sorted(self.latencies)
+        trace_times = sorted(self.trace_times)
+
+        def percentile(p: float, samples=latencies) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+        return {
+            "rooms": sum(1 for room in rooms.values() if room.connections),
+            "connections": len(depths),
+            "messages_received": self.messages_received,
+            "messages_sent": self.messages_sent,
+            "bytes_sent": self.bytes_sent,
+            "send_errors": self.send_errors,
+            "evictions": self.evictions,
+            "delta_syncs": self.delta_syncs,
+            "snapshot_syncs": self.snapshot_syncs,
+            "wal_ops": self.wal_ops,
+            "wal_fsyncs": self.wal_fsyncs,
+            "snapshots_saved": self.snapshots_saved,
+            "traces": self.traces,
+            "trace_errors": self.trace_errors,
+            "queue_depth_max": max(depths, default=0),
+            "queue_depth_total": sum(depths),
+            "broadcast_latency_ms": {
+                "p50": round(percentile(0.50), 3),
+                "p95": round(percentile(0.95), 3),
+                "p99": round(percentile(0.99), 3),
+                "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            },
+            "trace_ms": {
+                "p50": round(percentile(0.50, trace_times), 3),
+                "p99": round(percentile(0.99, trace_times), 3),
+                "max": round(trace_times[-1] * 1000, 3) if trace_times else 0.0,
+            },
+        }
+
+
+class Connection:
+    """A client connection with its own send queue and sender task."""
+
+    def __init__(self, user_id, websocket, metrics: ServerMetrics, max_queue=SEND_QUEUE_SIZE):
+        self.user_id = user_id
+        self.websocket = websocket
+        self.metrics = metrics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.evicted = False
+        # Negotiated (encoding, compression) of binary frames; None sends JSON text
+        self.wire: tuple | None = None
+        # Subscribed to the session's traces ("trace:subscribe")
+        self.traces = False
+        self._sender: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start draining the send queue."""
+        self._sender = asyncio.create_task(self._drain(), name=f"send:{self.user_id}")
+
+    def send(self, message: str | bytes) -> bool:
+        """
+        Queue an encoded message without waiting for it to be sent.
+
+        Returns:
+            False if the connection is (now) evicted because its queue is full
+        """
+        if self.evicted:
+            return False
+        try:
+            self.queue.put_nowait((message, time.perf_counter()))
+        except asyncio.QueueFull:
+            self._evict()
+            return False
+        return True
+
+    def send_json(self, data: dict) -> bool:
+        return self.send(encode_message(data, self.wire))
+
+    def negotiate(self, hello: dict) -> None:
+        """Answer a client's "wire:hello" and switch to binary frames if possible."""
+        encoding = next((e for e in supported_encodings() if e in hello.get("encodings", [])), None)
+        if encoding is None:
+            return  # Nothing in common: stay on JSON text
+        compression = "zlib" if "zlib" in hello.get("compression", []) else None
+        # The ack is the last text frame
+        self.send_json({"type": "wire:ack", "encoding": encoding, "compression": compression})
+        self.wire = (encoding, compression)
+        logger.info(f"{self.user_id} uses {encoding} frames (compression: {compression})")
+
+    async def close(self) -> None:
+        """Stop the sender task (queued messages are dropped)."""
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+
+    async def _drain(self) -> None:
+        while True:
+            message, enqueued = await self.queue.get()
+            try:
+                await self.websocket.send(message)
+            except Exception as e:
+                self.metrics.send_errors += 1
+                logger.debug(f"Send to {self.user_id} failed: {e}")
+                return  # Connection closed; the handler cleans up
+            self.metrics.record_latency(
+                time.perf_counter() - enqueued,
+                len(message) if isinstance(message, bytes) else len(message.encode("utf-8")),
+            )
+
+    def _evict(self) -> None:
+        self.evicted = True
+        self.metrics.evictions += 1
+        logger.warning(f"Evicting slow client {self.user_id}: {self.queue.qsize()} messages queued")
+        # Unsent messages are dropped; the client resyncs when it reconnects
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        asyncio.create_task(self.websocket.close(CLOSE_SLOW_CONSUMER, "Too slow, reconnect"))
+
+
+def _empty_state() -> dict:
+    return {"items": [], "version": 0, "timestamp": _now()}
+
+
+def apply_command(items: dict, command: dict, versions: dict | None = None) -> None:
+    """
+    Apply a command to a session state's items.
+
+    Updates may carry only the changed fields; they are merged into the item.
+
+    Args:
+        items: Item data by item UUID (modified in place)
+        command: "command" of a command message (action, item_type, item_id, data)
+        versions: Item versions by item UUID (modified in place), see "version"
+    """
+    action = command.get("action")
+    item_id = command.get("item_id")
+    data = command.get("data") or {}
+    if action == "add_item":
+        items[item_id] = {**data, "uuid": item_id, "item_type": command.get("item_type")}
+    elif action in ("move_item", "update_item"):
+        if item_id in items:
+            items[item_id].update(data)
+    elif action == "remove_item":
+        items.pop(item_id, None)
+    if versions is not None:
+        if action == "remove_item":
+            versions.pop(item_id, None)
+        elif "version" in command:
+            versions[item_id] = command["version"]
+
+
+class OpLog:
+    """
+    Sequence-numbered command log of a session, with periodic snapshots.
+
+    snapshot is the session state after op snapshot_seq; ops holds the
+    most recent OP_LOG_SIZE ops, including all ops after the snapshot.
+    """
+
+    def __init__(self, snapshot_interval=SNAPSHOT_INTERVAL, max_ops=OP_LOG_SIZE):
+        self.snapshot_interval = snapshot_interval
+        self.seq = 0
+        self.snapshot = _empty_state()
+        self.snapshot_seq = 0
+        self.ops: deque = deque(maxlen=max_ops)
+
+    def append(self, message: dict) -> int:
+        """
+        Log a command message, setting its "seq".
+
+        Returns:
+            The sequence number of the op
+        """
+        self.seq += 1
+        message["seq"] = self.seq
+        self.ops.append(message)
+        if self.seq - self.snapshot_seq >= self.snapshot_interval:
+            self.take_snapshot()
+        return self.seq
+
+    def reset(self, state: dict) -> int:
+        """Replace the state (host full state); ops before it can no longer be replayed."""
+        self.seq += 1
+        self.snapshot = state
+        self.snapshot_seq = self.seq
+        self.ops.clear()
+        return self.seq
+
+    def tail(self) -> list[dict]:
+        """Ops after the snapshot."""
+        return [op for op in self.ops if op["seq"] > self.snapshot_seq]
+
+    def state(self) -> dict:
+        """Current session state (snapshot with the tail applied)."""
+        items = {
+            item.get("uuid") or item.get("item_uuid"): dict(item)
+            for item in self.snapshot.get("items", [])
+        }
+        versions = dict(self.snapshot.get("item_versions", {}))
+        for op in self.tail():
+            apply_command(items, op.get("command", {}), versions)
+        return {
+            **self.snapshot,
+            "items": list(items.values()),
+            "item_versions": versions,
+            "timestamp": _now(),
+        }
+
+    def take_snapshot(self) -> None:
+        """Fold the tail into the snapshot."""
+        self.snapshot = self.state()
+        self.snapshot_seq = self.seq
+
+    def restore(self, snapshot: dict, snapshot_seq: int, ops: list[dict]) -> None:
+        """Load a persisted snapshot and the ops after it (consecutive seqs)."""
+        self.snapshot = snapshot
+        self.snapshot_seq = snapshot_seq
+        self.ops.clear()
+        self.ops.extend(ops)
+        self.seq = ops[-1]["seq"] if ops else snapshot_seq
+        if self.seq - self.snapshot_seq >= self.snapshot_interval:
+            self.take_snapshot()
+
+    def ops_since(self, since: int, max_ops=None) -> list[dict] | None:
+        """
+        Ops after sequence number since.
+
+        Returns:
+            The ops, or None if they are no longer all logged (or more than
+            max_ops, or since is ahead of the log after a restart); the
+            client then needs the snapshot and its tail
+        """
+        if since == self.seq:
+            return []
+        if since > self.seq:
+            return None
+        if max_ops is None:
+            max_ops = MAX_DELTA_OPS
+        if since < 0 or self.seq - since > max_ops:
+            return None
+        first = self.ops[0]["seq"] if self.ops else self.seq + 1
+        if since < first - 1:
+            return None
+        return [op for op in self.ops if op["seq"] > since]
+
+
+class Room:
+    """Users and stored state of one collaboration session."""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.connections: dict[str, Connection] = {}
+        self.log = OpLog()
+        self.host = None
+        # Latest "trace:result" of the session (--trace)
+        self.trace: dict | None = None
+
+    def join(self, connection: Connection, claim_host: bool = False) -> bool:
+        """
+        Add a connection, replacing an older connection of the same user.
+
+        Args:
+            connection: The new connection
+            claim_host: The user creates the session; it takes over hosting
+                if the recorded host (e.g. of a restored session) is not
+                connected or is the same user
+
+        Returns:
+            True if the user is the session host (the first user, or one
+            that claimed hosting)
+        """
+        user_id = connection.user_id
+        old = self.connections.get(user_id)
+        if old is not None:
+            asyncio.create_task(old.websocket.close(1000, "Replaced by new connection"))
+        host_free = self.host is None or self.host == user_id or self.host not in self.connections
+        self.connections[user_id] = connection
+        if self.host is None or (claim_host and host_free):
+            self.host = user_id
+            return True
+        return False
+
+    def leave(self, connection: Connection) -> bool:
+        """Remove a connection; False if it was already replaced."""
+        if self.connections.get(connection.user_id) is not connection:
+            return False
+        del self.connections[connection.user_id]
+        return True
+
+    def broadcast(self, data: dict, exclude=None, where=None) -> int:
+        """
+        Queue a message for every user except exclude (and, if given, for
+        whose connection where(connection) is true).
+
+        The message is encoded once per wire format in use.
+
+        Returns:
+            Number of users it was queued for
+        """
+        sent = 0
+        encoded: dict = {}
+        for user_id, connection in list(self.connections.items()):
+            if user_id == exclude or (where is not None and not where(connection)):
+                continue
+            message = encoded.get(connection.wire)
+            if message is None:
+                message = encoded[connection.wire] = encode_message(data, connection.wire)
+            if connection.send(message):
+                sent += 1
+        return sent
+
+
+def _sync_close(f) -> None:
+    f.flush()
+    os.fsync(f.fileno())
+    f.close()
+
+
+class SessionStore:
+    """
+    Snapshots and write-ahead logs of sessions in a local directory.
+
+    record() only queues writes; flush() hands them to a single writer
+    thread, which keeps them in order and fsyncs each session's log once
+    per batch.
+    """
+
+    def __init__(self, directory, metrics: ServerMetrics, retention_days=RETENTION_DAYS, owns=None):
+        self.directory = os.fspath(directory)
+        self.metrics = metrics
+        self.retention_s = retention_days * 86400.0
+        # Predicate for the session IDs this process serves (None: all)
+        self.owns = owns
+        # (kind, session_id, payload) in submission order
+        self._pending: list[tuple] = []
+        # Sequence number of the last snapshot queued per session
+        self._snapshot_seqs: dict[str, int] = {}
+        # time.time() of the last write per session
+        self._last_active: dict[str, float] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-store")
+
+    def session_dir(self, session_id) -> str:
+        return os.path.join(self.directory, SESSION_DIR_PREFIX + quote(session_id, safe=""))
+
+    def load(self) -> dict[str, Room]:
+        """
+        Restore the persisted sessions (expired ones are deleted).
+
+        Sessions of other workers (see owns) are left alone. A damaged
+        snapshot skips its session; a torn or damaged log line ends the
+        log, as do gaps in its sequence numbers.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        rooms = {}
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if not name.startswith(SESSION_DIR_PREFIX) or not os.path.isdir(path):
+                continue
+            session_id = unquote(name[len(SESSION_DIR_PREFIX) :])
+            if self.owns is not None and not self.owns(session_id):
+                continue
+            last_active = max(
+                (os.path.getmtime(os.path.join(path, f)) for f in os.listdir(path)),
+                default=os.path.getmtime(path),
+            )
+            if 0 < self.retention_s < time.time() - last_active:
+                shutil.rmtree(path, ignore_errors=True)
+                logger.info(f"🗑 Deleted expired session {session_id}")
+                continue
+            self._last_active[session_id] = last_active
+            try:
+                rooms[session_id] = self._load_room(session_id, path)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error(f"Cannot restore session {session_id}: {e}")
+                continue
+            log = rooms[session_id].log
+            logger.info(
+                f"📂 Restored session {session_id}: snapshot #{log.snapshot_seq}, "
+                f"{log.seq - log.snapshot_seq} op(s) after it"
+            )
+        return rooms
+
+    def _load_room(self, session_id, path) -> Room:
+        room = Room(session_id)
+        snapshot, snapshot_seq = _empty_state(), 0
+        try:
+            with open(os.path.join(path, SNAPSHOT_FILE), encoding="utf-8") as f:
+                saved = json.load(f)
+            snapshot, snapshot_seq = saved["state"], saved["seq"]
+            room.host = saved.get("host")
+        except FileNotFoundError:
+            pass
+
+        ops = []
+        try:
+            with open(os.path.join(path, WAL_FILE), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Session {session_id}: ignoring damaged log line")
+                        break
+                    seq = op.get("seq", 0)
+                    if seq <= snapshot_seq:
+                        continue  # Written before the snapshot replaced the log
+                    if seq != snapshot_seq + len(ops) + 1:
+                        logger.warning(f"Session {session_id}: gap in the log before #{seq}")
+                        break
+                    ops.append(op)
+        except FileNotFoundError:
+            pass
+
+        room.log.restore(snapshot, snapshot_seq, ops)
+        self._snapshot_seqs[session_id] = snapshot_seq
+        return room
+
+    def record(self, room: Room, op: dict | None = None) -> None:
+        """Queue an accepted op, and the room's snapshot if it has a new one."""
+        session_id = room.session_id
+        if op is not None:
+            self._pending.append(("op", session_id, op))
+        if room.log.snapshot_seq != self._snapshot_seqs.get(session_id):
+            self._snapshot_seqs[session_id] = room.log.snapshot_seq
+            saved = {
+                "session_id": session_id,
+                "host": room.host,
+                "seq": room.log.snapshot_seq,
+                "state": room.log.snapshot,
+                "saved_at": _now(),
+            }
+            self._pending.append(("snapshot", session_id, saved))
+        self._last_active[session_id] = time.time()
+
+    def expired_sessions(self, now: float | None = None) -> list[str]:
+        """Sessions idle for longer than the retention time."""
+        if self.retention_s <= 0:
+            return []
+        now = time.time() if now is None else now
+        return [s for s, last in self._last_active.items() if now - last > self.retention_s]
+
+    def delete(self, session_id) -> None:
+        """Queue deleting a session's files."""
+        self._pending.append(("delete", session_id, None))
+        self._last_active.pop(session_id, None)
+        self._snapshot_seqs.pop(session_id, None)
+
+    async def flush(self) -> None:
+        """Write and fsync the queued ops and snapshots on the writer thread."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._write, batch)
+
+    async def run(self, fsync_interval=FSYNC_INTERVAL) -> None:
+        """Flush every fsync_interval seconds."""
+        while True:
+            await asyncio.sleep(fsync_interval)
+            try:
+                await self.flush()
+            except OSError as e:
+                logger.error(f"Writing sessions failed: {e}")
+
+    def close(self) -> None:
+        """Write the queued ops and stop the writer thread (blocks)."""
+        batch, self._pending = self._pending, []
+        if batch:
+            self._executor.submit(self._write, batch).result()
+        self._executor.shutdown(wait=True)
+
+    def _write(self, batch: list[tuple]) -> None:
+        logs = {}  # Open write-ahead logs by session
+        try:
+            for kind, session_id, payload in batch:
+                path = self.session_dir(session_id)
+                if kind == "op":
+                    f = logs.get(session_id)
+                    if f is None:
+                        os.makedirs(path, exist_ok=True)
+                        f = logs[session_id] = open(
+                            os.path.join(path, WAL_FILE), "a", encoding="utf-8"
+                        )
+                    f.write(json.dumps(payload, separators=(",", ":")) + "\n")
+                    self.metrics.wal_ops += 1
+                    continue
+                # Ops queued before a snapshot or delete are written first
+                if session_id in logs:
+                    _sync_close(logs.pop(session_id))
+                    self.metrics.wal_fsyncs += 1
+                if kind == "snapshot":
+                    self._write_snapshot(path, payload)
+                else:
+                    shutil.rmtree(path, ignore_errors=True)
+        finally:
+            for f in logs.values():
+                _sync_close(f)
+                self.metrics.wal_fsyncs += 1
+
+    def _write_snapshot(self, path: str, saved: dict) -> None:
+        """Atomically replace the snapshot, then truncate the log."""
+        os.makedirs(path, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(saved, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, os.path.join(path, SNAPSHOT_FILE))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        # Ops up to the snapshot are skipped on restore, so a crash before
+        # this truncation is harmless
+        with open(os.path.join(path, WAL_FILE), "w", encoding="utf-8"):
+            pass
+        self.metrics.snapshots_saved += 1
+
+
+def load_tracer():
+    """
+    Import the raytracing engine for --trace.
+
+    The server itself does not depend on optiverse; it is taken from an
+    installed package or else from the source tree this script is part of.
+
+    Returns:
+        Function tracing a session state to a "rays" payload
+    """
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    if os.path.isdir(src) and src not in sys.path:
+        sys.path.append(src)
+    from optiverse.integration.shared_trace import encode_trace_result, trace_session_state
+
+    def trace(state: dict) -> dict:
+        return encode_trace_result(trace_session_state(state))
+
+    return trace
+
+
+class TraceService:
+    """
+    Traces the scenes of sessions for their clients (--trace).
+
+    A session is traced in a worker thread after each op while any of its
+    connections subscribed, and the result is sent to those connections as
+    "trace:result" with the seq of the op it shows. Ops arriving during a
+    trace are coalesced: when it finishes, the session is traced once more
+    at its latest op.
+    """
+
+    def __init__(self, metrics: ServerMetrics, trace=None):
+        """
+        Args:
+            metrics: Counts traces and their durations
+            trace: Function tracing a session state to a "rays" payload
+                (default: the engine of optiverse, see load_tracer())
+        """
+        self.metrics = metrics
+        self.trace = trace if trace is not None else load_tracer()
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="trace")
+        self._tracing: set[str] = set()  # Sessions with a trace task
+
+    def subscribe(self, room: Room, connection: Connection) -> None:
+        """Send a connection the session's traces, starting with the current one."""
+        connection.traces = True
+        if room.trace is not None and room.trace["seq"] == room.log.seq:
+            connection.send_json(room.trace)
+        else:
+            self.schedule(room)
+
+    def schedule(self, room: Room) -> None:
+        """Trace the session at its latest op (unless a trace is under way)."""
+        if room.session_id in self._tracing or not self._subscribed(room):
+            return
+        self._tracing.add(room.session_id)
+        asyncio.create_task(self._run(room), name=f"trace:{room.session_id}")
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _subscribed(room: Room) -> bool:
+        return any(c.traces for c in room.connections.values())
+
+    async def _run(self, room: Room) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while self._subscribed(room) and (room.trace or {}).get("seq") != room.log.seq:
+                seq = room.log.seq
+                state = room.log.state()
+                start = time.perf_counter()
+                try:
+                    rays = await loop.run_in_executor(self._executor, self.trace, state)
+                except Exception as e:
+                    self.metrics.trace_errors += 1
+                    logger.error(f"Tracing session {room.session_id} at #{seq} failed: {e}")
+                    return  # Clients trace locally; the next op tries again
+                self.metrics.record_trace(time.perf_counter() - start)
+                room.trace = {"type": "trace:result", "seq": seq, "rays": rays, "timestamp": _now()}
+                room.broadcast(room.trace, where=lambda c: c.traces)
+        finally:
+            self._tracing.discard(room.session_id)
+
+
+class CollaborationServer:
+    """Session rooms and message handling."""
+
+    def __init__(
+        self,
+        max_queue=SEND_QUEUE_SIZE,
+        data_dir=None,
+        retention_days=RETENTION_DAYS,
+        shard: tuple[int, int] | None = None,
+        trace=False,
+    ):
+        """
+        Args:
+            max_queue: Messages queued per connection before it is evicted
+            data_dir: Directory to persist the sessions in (None: memory only)
+            retention_days: Idle time after which stored sessions are deleted
+            shard: (index, count) of this worker of a supervisor (--workers);
+                only the stored sessions hashed to it are restored
+            trace: Trace the sessions for their clients: True for the engine
+                of optiverse, or a function as for TraceService
+        """
+        self.max_queue = max_queue
+        self.rooms: dict[str, Room] = {}
+        self.metrics = ServerMetrics()
+        # Shared raytracing (None: clients trace themselves)
+        self.tracer: TraceService | None = None
+        if trace:
+            self.tracer = TraceService(self.metrics, None if trace is True else trace)
+        # Persistence of the rooms (None keeps them in memory only)
+        self.store: SessionStore | None = None
+        if data_dir:
+            owns = None
+            if shard is not None:
+                index, count = shard
+                ring = HashRing(range(count))
+
+                def owns(session_id):
+                    return ring.node_for(session_id) == index
+
+            self.store = SessionStore(data_dir, self.metrics, retention_days, owns)
+            self.rooms = self.store.load()
+
+    def room(self, session_id) -> Room:
+        if session_id not in self.rooms:
+            self.rooms[session_id] = Room(session_id)
+        return self.rooms[session_id]
+
+    def metrics_snapshot(self) -> dict:
+        return self.metrics.snapshot(self.rooms)
+
+    async def handler(self, websocket):
+        """Handle a WebSocket connection."""
+        path = websocket.request.path if hasattr(websocket, "request") else websocket.path
+        logger.info(f"New connection: {path}")
+
+        route = parse_session_path(path)
+        if route is None:
+            await websocket.close(1008, "Invalid path")
+            return
+        session_id, user_id = route
+
+        room = self.room(session_id)
+        connection = Connection(user_id, websocket, self.metrics, self.max_queue)
+        connection.start()
+        is_host = room.join(connection, claim_host=requests_host(path))
+        logger.info(f"User {user_id} joined session {session_id} (host={is_host})")
+
+        try:
+            # Send connection ack
+            connection.send_json(
                 {
                     "type": "connection:ack",
                     "session_id": session_id,
                     "user_id": user_id,
-                    "is_host": is_first_user,
-                    "users": [{"user_id": u} for u in connections.keys()],
-                    "timestamp": "2025-10-28T12:00:00",
+                    "is_host": is_host,
+                    "users": [{"user_id": u} for u in room.connections],
+                    "seq": room.log.seq,
+                    "shared_trace": self.tracer is not None,
+                    "timestamp": _now(),
                 }
             )
-        )
-        logger.info(f"Sent ack to {user_id} (host={is_first_user})")
 
-        # Send current session state to new joiner if not the first user
-        if not is_first_user and session_id in session_state:
-            stored_state = session_state[session_id]["state"]
-            await websocket.send(
-                json.dumps({"type": "sync:full_state", "state": stored_state, "from_server": True})
-            )
-            logger.info(
-                f"Sent session state to {user_id} ({len(stored_state.get('items', []))} items)"
-            )
+            # Notify other users
+            room.broadcast({"type": "user:joined", "user_id": user_id}, user_id)
 
-        # Notify other users
-        for other_id, other_ws in connections.items():
-            if other_id != user_id:
-                try:
-                    await other_ws.send(json.dumps({"type": "user:joined", "user_id": user_id}))
-                except Exception:
-                    pass
-
-        # Handle messages
-        async for message in websocket:
-            data = json.loads(message)
-            msg_type = data.get("type", "")
-
-            if msg_type == "ping":
-                await websocket.send(
-                    json.dumps({"type": "pong", "timestamp": "2025-10-28T12:00:00"})
-                )
-                logger.debug(f"Sent pong to {user_id}")
-
-            elif msg_type == "sync:full_state":
-                # Host is sending full state update
-                if session_id in session_state and session_state[session_id]["host"] == user_id:
-                    state = data.get("state", {})
-                    session_state[session_id]["state"] = state
-                    session_state[session_id]["version"] = state.get("version", 0)
-                    logger.info(
-                        f"📦 Stored session state from host {user_id} "
-                        f"(version {state.get('version', 0)})"
-                    )
+            # Handle messages
+            async for message in websocket:
+                self.metrics.messages_received += 1
+                self.handle_message(room, connection, message)
+                # Let the sender tasks run: buffered messages are read without
+                # yielding, and a burst must not overflow healthy clients' queues
+                await asyncio.sleep(0)
 
-                # Broadcast to other users
-                for other_id, other_ws in connections.items():
-                    if other_id != user_id:
-                        try:
-                            await other_ws.send(message)
-                        except Exception as e:
-                            logger.error(f"Failed to send state to {other_id}: {e}")
-
-            elif msg_type == "sync:request":
-                # Client requesting sync (reconnection)
-                logger.info(f"📥 Sync request from {user_id}")
-                if session_id in session_state:
-                    stored_state = session_state[session_id]["state"]
-                    await websocket.send(
-                        json.dumps(
-                            {
-                                "type": "sync:full_state",
-                                "state": stored_state,
-                                "from_server": True,
-                                "conflict_resolution": "host_wins",
-                            }
-                        )
-                    )
-                    logger.info(f"📤 Sent stored state to {user_id}")
+        except Exception as e:
+            logger.error(f"Error for {user_id}: {e}")
+        finally:
+            if room.leave(connection):
+                room.broadcast({"type": "user:left", "user_id": user_id})
+            await connection.close()
+            logger.info(f"User {user_id} left session {session_id}")
+
+    def handle_message(self, room: Room, connection: Connection, message: str | bytes) -> None:
+        """Handle one (text or binary) message of a client."""
+        data = decode_message(message)
+        msg_type = data.get("type", "")
+        user_id = connection.user_id
+
+        if msg_type == "ping":
+            connection.send_json({"type": "pong", "timestamp": _now()})
 
-            elif msg_type == "command":
-                # Broadcast command to other users in the session
-                command = data.get("command", {})
-                action = command.get("action", "")
-                item_type = command.get("item_type", "")
+        elif msg_type == "wire:hello":
+            connection.negotiate(data)
+
+        elif msg_type == "sync:full_state":
+            # Host is sending full state update
+            if room.host == user_id:
+                state = data.get("state", {})
+                data["seq"] = room.log.reset(state)
+                if self.store is not None:
+                    self.store.record(room)
                 logger.info(
-                    f"📤 Broadcasting {action} ({item_type}) from {user_id} "
-                    f"to {len(connections) - 1} other(s)"
+                    f"📦 Stored session state from host {user_id} "
+                    f"(version {state.get('version', 0)}, seq {data['seq']})"
                 )
+            room.broadcast(data, user_id)
+            if self.tracer is not None:
+                self.tracer.schedule(room)
+
+        elif msg_type == "sync:request":
+            # Client requesting the full state (joining)
+            logger.info(f"📥 Sync request from {user_id}")
+            self.send_snapshot(room, connection)
 
-                for other_id, other_ws in connections.items():
-                    if other_id != user_id:
-                        try:
-                            await other_ws.send(message)
-                        except Exception as e:
-                            logger.error(f"Failed to send to {other_id}: {e}")
+        elif msg_type == "sync:since":
+            # Reconnecting client requesting the ops it missed
+            since = data.get("since", 0)
+            ops = room.log.ops_since(since) if isinstance(since, int) else None
+            if ops is None:
+                logger.info(
+                    f"📥 Sync since {since} from {user_id}: gap too large, sending snapshot"
+                )
+                self.send_snapshot(room, connection)
             else:
-                logger.info(f"Received from {user_id}: {msg_type}")
+                self.metrics.delta_syncs += 1
+                logger.info(f"📥 Sync since {since} from {user_id}: {len(ops)} op(s)")
+                connection.send_json({"type": "sync:ops", "ops": ops, "seq": room.log.seq})
 
-    except Exception as e:
-        logger.error(f"Error for {user_id}: {e}")
-    finally:
-        if user_id in connections:
-            del connections[user_id]
-        logger.info(f"User {user_id} disconnected")
+        elif msg_type == "command":
+            # Log the command and broadcast it to the other users in the session
+            command = data.get("command", {})
+            seq = room.log.append(data)
+            if self.store is not None:
+                self.store.record(room, data)
+            count = room.broadcast(data, user_id)
+            connection.send_json({"type": "command:ack", "seq": seq})
+            if self.tracer is not None:
+                self.tracer.schedule(room)
+            logger.debug(
+                f"📤 Broadcast {command.get('action', '')} ({command.get('item_type', '')}) "
+                f"#{seq} from {user_id} to {count} other(s)"
+            )
+        elif msg_type == "trace:subscribe":
+            if self.tracer is not None:
+                self.tracer.subscribe(room, connection)
+
+        else:
+            logger.info(f"Received from {user_id}: {msg_type}")
+
+    def send_snapshot(self, room: Room, connection: Connection) -> None:
+        """Send the session snapshot and the ops after it."""
+        self.metrics.snapshot_syncs += 1
+        connection.send_json(
+            {
+                "type": "sync:full_state",
+                "state": room.log.snapshot,
+                "seq": room.log.snapshot_seq,
+                "ops": room.log.tail(),
+                "from_server": True,
+                "conflict_resolution": "host_wins",
+            }
+        )
+
+    def process_request(self, connection, request):
+        """Serve GET /metrics over plain HTTP; other paths upgrade to WebSocket."""
+        if request.path == "/metrics":
+            response = connection.respond(200, json.dumps(self.metrics_snapshot()) + "\n")
+            response.headers["Content-Type"] = "application/json"
+            return response
+        return None
 
-        # Notify other users
-        for _other_id, other_ws in connections.items():
+    def prune_sessions(self, now: float | None = None) -> list[str]:
+        """
+        Delete the stored sessions that expired and nobody is connected to.
+
+        Returns:
+            The deleted session IDs
+        """
+        if self.store is None:
+            return []
+        deleted = []
+        for session_id in self.store.expired_sessions(now):
+            room = self.rooms.get(session_id)
+            if room is not None and room.connections:
+                continue
+            self.rooms.pop(session_id, None)
+            self.store.delete(session_id)
+            deleted.append(session_id)
+            logger.info(f"🗑 Deleting expired session {session_id}")
+        return deleted
+
+    async def maintain_store(self, fsync_interval=FSYNC_INTERVAL, prune_interval=PRUNE_INTERVAL):
+        """Flush the session store and periodically delete expired sessions."""
+        flusher = asyncio.create_task(self.store.run(fsync_interval))
+        try:
+            while True:
+                await asyncio.sleep(prune_interval)
+                self.prune_sessions()
+        finally:
+            flusher.cancel()
+
+    async def log_metrics(self, interval=METRICS_INTERVAL):
+        """Periodically log the metrics while clients are connected."""
+        while True:
+            await asyncio.sleep(interval)
+            snapshot = self.metrics_snapshot()
+            if snapshot["connections"]:
+                latency = snapshot["broadcast_latency_ms"]
+                logger.info(
+                    f"📊 {snapshot['connections']} connection(s) in {snapshot['rooms']} room(s), "
+                    f"queue depth max {snapshot['queue_depth_max']}, "
+                    f"latency p50 {latency['p50']:.1f} ms p99 {latency['p99']:.1f} ms, "
+                    f"{snapshot['bytes_sent']} bytes sent, "
+                    f"{snapshot['evictions']} eviction(s)"
+                )
+
+
+def merge_metrics(snapshots: list[dict]) -> dict:
+    """
+    Combine the metrics of several workers.
+
+    Counts are summed; maxima, and the latency percentiles (which cannot
+    be combined exactly), are those of the worst worker.
+    """
+    merged: dict = {}
+    for snapshot in snapshots:
+        for key, value in snapshot.items():
+            if isinstance(value, dict):
+                latency = merged.setdefault(key, {})
+                for name, v in value.items():
+                    latency[name] = max(latency.get(name, v), v)
+            elif key.endswith("_max"):
+                merged[key] = max(merged.get(key, value), value)
+            elif isinstance(value, (int, float)):
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Copy bytes until EOF (then half-close writer) or an error (then close it)."""
+    try:
+        while data := await reader.read(65536):
+            writer.write(data)
+            await writer.drain()
+        if writer.can_write_eof():
+            writer.write_eof()
+    except OSError:
+        writer.close()
+
+
+class ShardRouter:
+    """
+    Front process of a supervisor: forwards connections to the owning workers.
+
+    Reads the HTTP request head of each connection, picks the worker by
+    consistent hashing of the session ID in the path and then only copies
+    bytes between the client and the worker. GET /metrics is answered with
+    the merged metrics of all workers.
+    """
+
+    def __init__(self, ports: list[int], worker_host="127.0.0.1"):
+        self.ports = ports
+        self.worker_host = worker_host
+        self.ring = HashRing(range(len(ports)))
+        # Connections forwarded to each worker
+        self.routed = [0] * len(ports)
+
+    def worker_for(self, session_id: str) -> int:
+        return self.ring.node_for(session_id)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Route one client connection."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+            writer.close()
+            return
+        request_line = head.split(b"\r\n", 1)[0].decode("latin-1").split(" ")
+        target = request_line[1] if len(request_line) > 1 else "/"
+        if target.split("?", 1)[0] == "/metrics":
+            await self._respond(writer, "200 OK", json.dumps(await self.metrics()) + "\n")
+            return
+
+        # Invalid paths go to any worker, which rejects them
+        route = parse_session_path(target)
+        worker = self.worker_for(route[0] if route else "")
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(
+                self.worker_host, self.ports[worker]
+            )
+        except OSError as e:
+            logger.warning(f"Worker {worker} unavailable: {e}")
+            await self._respond(writer, "503 Service Unavailable", "")
+            return
+        self.routed[worker] += 1
+        upstream_writer.write(head)
+        try:
+            await asyncio.gather(_pipe(reader, upstream_writer), _pipe(upstream_reader, writer))
+        finally:
+            upstream_writer.close()
+            writer.close()
+
+    async def metrics(self) -> dict:
+        """Merged metrics of the workers, and each worker's own."""
+
+        def fetch(port):
+            url = f"http://{self.worker_host}:{port}/metrics"
             try:
-                await other_ws.send(json.dumps({"type": "user:left", "user_id": user_id}))
-            except Exception:
-                pass
+                with urllib.request.urlopen(url, timeout=5) as response:
+                    return json.load(response)
+            except (OSError, ValueError):
+                return None
+
+        snapshots = await asyncio.gather(*(asyncio.to_thread(fetch, p) for p in self.ports))
+        workers = [
+            {"worker": i, "port": port, "routed": self.routed[i], "metrics": snapshot}
+            for i, (port, snapshot) in enumerate(zip(self.ports, snapshots))
+        ]
+        return {
+            **merge_metrics([s for s in snapshots if s is not None]),
+            "workers_up": sum(1 for s in snapshots if s is not None),
+            "workers": workers,
+        }
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: str, body: str) -> None:
+        data = body.encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+            + data
+        )
+        try:
+            await writer.drain()
+        except OSError:
+            pass
+        writer.close()
 
 
-async def main(host="0.0.0.0", port=8765):
-    """Start the server."""
-    global server
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_for_port(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+            continue
+        writer.close()
+        return
+
+
+async def run_supervisor(host="0.0.0.0", port=8765, workers=2, worker_args=()):
+    """
+    Run workers worker processes and the front process routing to them.
+
+    Args:
+        host: Address the front process listens on
+        port: Port the front process listens on
+        workers: Number of worker processes
+        worker_args: Further command line options for the workers
+    """
+    ports = [_free_port() for _ in range(workers)]
+    processes: list[subprocess.Popen] = []
+
+    def start(index: int) -> subprocess.Popen:
+        command = [sys.executable, os.path.abspath(__file__), "--host", "127.0.0.1"]
+        command += ["--port", str(ports[index]), "--shard", f"{index}/{workers}", *worker_args]
+        # Workers exit when their stdin closes, i.e. with the supervisor
+        return subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    logger.info("=" * 70)
+    logger.info(f"COLLABORATION SERVER SUPERVISOR ({workers} workers)")
+    logger.info("=" * 70)
+    try:
+        processes.extend(start(i) for i in range(workers))
+        await asyncio.gather(*(_wait_for_port(p, WORKER_START_TIMEOUT) for p in ports))
+        router = ShardRouter(ports)
+        server = await asyncio.start_server(router.handle, host, port, limit=MAX_REQUEST_HEAD)
+        async with server:
+            logger.info(f"✓ Routing ws://{host}:{port} to workers on ports {ports}")
+            logger.info(f"Metrics at http://{host}:{port}/metrics")
+            while True:
+                await asyncio.sleep(WORKER_CHECK_INTERVAL)
+                for i, process in enumerate(processes):
+                    if process.poll() is not None:
+                        logger.warning(f"Worker {i} exited ({process.returncode}), restarting")
+                        processes[i] = start(i)
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def _exit_with_parent() -> None:
+    """Shut down (as on Ctrl+C) once stdin is closed by the supervisor."""
+
+    fd = sys.stdin.fileno()
+
+    def wait():
+        # Unbuffered: a daemon thread must not hold stdin's lock at exit
+        while os.read(fd, 4096):
+            pass
+        signal.raise_signal(signal.SIGINT)
+
+    threading.Thread(target=wait, name="supervisor-watch", daemon=True).start()
+
+
+async def main(
+    host="0.0.0.0",
+    port=8765,
+    max_queue=SEND_QUEUE_SIZE,
+    data_dir=None,
+    fsync_interval=FSYNC_INTERVAL,
+    retention_days=RETENTION_DAYS,
+    shard=None,
+    trace=False,
+):
+    """Start the server (persisting sessions in data_dir if given)."""
+    collab = CollaborationServer(max_queue, data_dir, retention_days, shard, trace)
+    store = collab.store
 
     logger.info("=" * 70)
     logger.info("SIMPLE COLLABORATION SERVER (websockets 15.x compatible)")
     logger.info("=" * 70)
     logger.info(f"Starting on ws://{host}:{port}")
 
+    options = {"ping_interval": None, "ping_timeout": None}
     try:
         # Try websockets 14+ async API
         from websockets.asyncio.server import serve
 
+        options["process_request"] = collab.process_request
         logger.info("Using websockets.asyncio.server API")
     except ImportError:
-        # Fall back to legacy API
+        # Fall back to legacy API (no /metrics endpoint)
         from websockets import serve
 
         logger.info("Using websockets legacy API")
 
-    async with serve(handler, host, port, ping_interval=None, ping_timeout=None) as server:
-        logger.info("✓ Server ready")
-        logger.info("Press Ctrl+C to stop")
-        logger.info("=" * 70)
-        await asyncio.Future()
+    tasks = [asyncio.create_task(collab.log_metrics())]
+    if store is not None:
+        logger.info(f"Persisting {len(collab.rooms)} session(s) in {data_dir}")
+        tasks.append(asyncio.create_task(collab.maintain_store(fsync_interval)))
+    if collab.tracer is not None:
+        logger.info("Tracing sessions for their clients")
+    try:
+        async with serve(collab.handler, host, port, **options):
+            logger.info("✓ Server ready")
+            logger.info(f"Metrics at http://{host}:{port}/metrics")
+            logger.info("Press Ctrl+C to stop")
+            logger.info("=" * 70)
+            await asyncio.Future()
+    finally:
+        for task in tasks:
+            task.cancel()
+        if store is not None:
+            store.close()
+        if collab.tracer is not None:
+            collab.tracer.close()
 
 
 def cleanup(sig=None, frame=None):
@@ -205,10 +1394,80 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Simple Collaboration Server")
     parser.add_argument("--host", default="0.0.0.0", help="Host address (default: 0.0.0.0)")
     parser.add_argument("--port", type=int, default=8765, help="Port number (default: 8765)")
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=SEND_QUEUE_SIZE,
+        help=f"Messages queued per client before it is disconnected (default: {SEND_QUEUE_SIZE})",
+    )
+    parser.add_argument(
+        "--data-dir", help="Persist sessions in this directory (default: memory only)"
+    )
+    parser.add_argument(
+        "--fsync-interval",
+        type=float,
+        default=FSYNC_INTERVAL,
+        help=f"Seconds between write-ahead log fsyncs (default: {FSYNC_INTERVAL})",
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=float,
+        default=RETENTION_DAYS,
+        help=f"Delete sessions idle for longer, 0 keeps them (default: {RETENTION_DAYS:g})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes to shard the sessions over (default: 1, no supervisor)",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Trace the sessions and send the rays to the clients (needs optiverse)",
+    )
+    # Set by the supervisor for its workers: index/count
+    parser.add_argument("--shard", help=argparse.SUPPRESS)
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     args = parser.parse_args()
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
 
     signal.signal(signal.SIGINT, cleanup)
+    signal.signal(signal.SIGTERM, cleanup)
     try:
-        asyncio.run(main(args.host, args.port))
+        if args.workers > 1:
+            worker_args = ["--max-queue", str(args.max_queue)]
+            worker_args += ["--fsync-interval", str(args.fsync_interval)]
+            worker_args += ["--retention-days", str(args.retention_days)]
+            if args.data_dir:
+                worker_args += ["--data-dir", os.path.abspath(args.data_dir)]
+            if args.trace:
+                worker_args.append("--trace")
+            if args.debug:
+                worker_args.append("--debug")
+            asyncio.run(run_supervisor(args.host, args.port, args.workers, worker_args))
+        else:
+            shard = None
+            if args.shard:
+                index, count = (int(n) for n in args.shard.split("/"))
+                shard = (index, count)
+                for handler in logging.getLogger().handlers:
+                    handler.setFormatter(
+                        logging.Formatter(f"%(asctime)s - [worker {index}] %(message)s")
+                    )
+                _exit_with_parent()
+            asyncio.run(
+                main(
+                    args.host,
+                    args.port,
+                    args.max_queue,
+                    args.data_dir,
+                    args.fsync_interval,
+                    args.retention_days,
+                    shard,
+                    args.trace,
+                )
+            )
     except KeyboardInterrupt:
         cleanup()
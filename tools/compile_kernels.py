@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Compile the raytracing kernels ahead of time.
+
+Builds src/optiverse/core/_raytracing_kernels (a C extension) from the
+kernels listed in raytracing_math.AOT_KERNELS with numba.pycc, so fresh
+installs do not JIT-compile them on the first trace. Run it before building
+a release; it needs numba and a C compiler. The extension is tied to the
+current source of raytracing_math.py and ignored once that changes.
+"""
+
+import os
+import sys
+
+
+def main() -> int:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, os.path.join(root, "src"))
+
+    try:
+        from numba.pycc import CC
+    except ImportError as e:
+        print(f"numba.pycc not available: {e}")
+        return 1
+
+    from optiverse.core import raytracing_math
+
+    if raytracing_math.AOT_KERNELS_LOADED:
+        print("Loaded kernels are already AOT-compiled; remove the old build first")
+        return 1
+
+    cc = CC(raytracing_math.AOT_MODULE)
+    cc.output_dir = os.path.dirname(raytracing_math.__file__)
+    for name, signature in raytracing_math.AOT_KERNELS.items():
+        cc.export(name, signature)(getattr(raytracing_math, name).py_func)
+
+    # Globals are frozen into compiled code as constants
+    global SOURCE_HASH
+    SOURCE_HASH = raytracing_math.kernel_source_hash()
+    cc.export("source_hash", "i8()")(_source_hash)
+
+    print(f"Compiling {', '.join(raytracing_math.AOT_KERNELS)} into {cc.output_dir}")
+    cc.compile()
+    return 0
+
+
+SOURCE_HASH = 0
+
+
+def _source_hash() -> int:
+    return SOURCE_HASH
+
+
+if __name__ == "__main__":
+    sys.exit(main())